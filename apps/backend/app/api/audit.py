@@ -8,7 +8,7 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from app.core.audit import AuditLedger, ChainVerifier, VerificationResult
+from app.core.audit import AuditLedger, VerificationResult, get_chain_verifier
 from app.core.audit.ledger import create_decision_receipt
 
 
@@ -63,25 +63,34 @@ class VerifyResponse(BaseModel):
     genesis_hash: str
     latest_hash: str
     verified_at: str
+    events_rehashed: int
+    events_trusted: int
+    incremental: bool
+    events_per_sec: float
 
 
 # === Endpoints ===
 
 @router.get("/verify", response_model=VerifyResponse, summary="Verify audit chain")
-async def verify_chain():
+async def verify_chain(
+    full: bool = Query(False, description="Rehash every event instead of trusting the prefix verified earlier"),
+):
     """
     Verify the integrity of the hash-chained audit log.
     
     Iterates through all events, recomputing hashes and checking
-    continuity to detect any tampering.
+    continuity to detect any tampering. By default events verified by an
+    earlier call are trusted and only the new tail is rehashed; pass
+    full=true to rehash the whole chain, which also catches edits to
+    events that were already verified.
     
     Returns "Chain Verified: PASS" for a valid chain.
     """
     ledger = get_ledger()
-    events = ledger.get_events()
+    events = ledger.events
     
-    verifier = ChainVerifier()
-    result = verifier.verify_chain(events)
+    verifier = get_chain_verifier()
+    result = verifier.verify_chain(events, incremental=not full)
     
     # Log the verification
     await ledger.log_chain_verified(
@@ -91,6 +100,8 @@ async def verify_chain():
     )
     
     message = "Chain Verified: PASS" if result.is_valid else f"Chain Verified: FAIL - {result.error_message}"
+    if result.incremental:
+        message += f" ({result.events_trusted} previously verified events trusted, not rehashed)"
     
     return VerifyResponse(
         status=result.status.value,
@@ -101,6 +112,10 @@ async def verify_chain():
         genesis_hash=result.genesis_hash,
         latest_hash=result.latest_hash,
         verified_at=result.verified_at.isoformat(),
+        events_rehashed=result.events_rehashed,
+        events_trusted=result.events_trusted,
+        incremental=result.incremental,
+        events_per_sec=result.events_per_sec,
     )
 
 
@@ -138,6 +153,39 @@ async def get_event(event_id: str):
     return event.model_dump(mode="json")
 
 
+@router.get("/proof/{event_id}", summary="Get Merkle inclusion proof")
+async def get_inclusion_proof(
+    event_id: str,
+    tree_size: int | None = Query(None, ge=1, description="Tree size to prove against (defaults to full chain)"),
+):
+    """
+    Get an O(log n) Merkle inclusion proof for an audit event.
+    
+    Verify with app.core.audit.verify_inclusion(chain_hash, index, tree_size, proof, root).
+    """
+    ledger = get_ledger()
+    try:
+        proof = ledger.get_inclusion_proof(event_id, tree_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if proof is None:
+        raise HTTPException(status_code=404, detail=f"Event not found: {event_id}")
+    
+    return proof
+
+
+@router.get("/checkpoints", summary="Get Merkle root checkpoints")
+async def get_checkpoints():
+    """Get recorded Merkle root checkpoints, including anchored roots"""
+    ledger = get_ledger()
+    return {
+        "checkpoints": [c.to_dict() for c in ledger.get_checkpoints()],
+        "merkle_root": ledger.merkle_root,
+        "tree_size": ledger.event_count,
+    }
+
+
 @router.get("/chain", summary="Get chain info")
 async def get_chain_info():
     """Get audit chain metadata"""
@@ -32,6 +32,10 @@ class StateAtTimeRequest(BaseModel):
     timestamp: str = Field(..., description="ISO8601 timestamp to reconstruct")
 
 
+class StatesAtTimesRequest(BaseModel):
+    timestamps: list[str] = Field(..., description="ISO8601 timestamps to reconstruct")
+
+
 class StateAtTimeResponse(BaseModel):
     timestamp: str
     telemetry: dict[str, float | None]
@@ -77,6 +81,22 @@ async def get_state_at_time(
         raise HTTPException(status_code=400, detail=f"Invalid timestamp: {e}")
 
 
+@router.post("/states-at-t", response_model=list[StateAtTimeResponse], summary="Get states at many timestamps")
+async def get_states_at_times(request: StatesAtTimesRequest):
+    """
+    Reconstruct the system belief state at several timestamps at once.
+    
+    Used for scrubber thumbnails; results are in request order.
+    """
+    engine = get_replay_engine()
+    
+    try:
+        states = await engine.get_states_at(request.timestamps)
+        return [StateAtTimeResponse(**state) for state in states]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp: {e}")
+
+
 @router.get("/timeline/events", summary="Get timeline events")
 async def get_timeline_events(
     start: str | None = Query(None, description="Start timestamp (ISO8601)"),
@@ -9,7 +9,7 @@ Endpoints:
 - GET /artifacts/{id}/export - Export artifact
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -49,6 +49,8 @@ class AnchorResponse(BaseModel):
     """Response from anchoring operation."""
     success: bool
     artifact_id: str
+    anchor_id: Optional[str] = None
+    status: Optional[str] = None
     tx_hash: Optional[str] = None
     verification_url: Optional[str] = None
     error: Optional[str] = None
@@ -106,8 +108,10 @@ async def anchor_artifact(artifact_id: str, request: AnchorRequest):
     """
     Anchor artifact on-chain via KairoAISec.
     
-    This writes the artifact hash and metadata to the blockchain
-    for tamper-evident verification.
+    This queues the artifact hash and metadata for the blockchain
+    for tamper-evident verification and returns at once with the
+    anchor_id. Poll GET /blockchain/anchors/{anchor_id} or listen for the
+    artifact_anchored WebSocket event for the transaction.
     """
     if not request.confirm:
         raise HTTPException(
@@ -178,6 +182,8 @@ async def anchor_artifact(artifact_id: str, request: AnchorRequest):
             return AnchorResponse(
                 success=True,
                 artifact_id=artifact_id,
+                anchor_id=result.anchor_record.anchor_id,
+                status=result.anchor_record.status,
                 tx_hash=result.tx_hash,
                 verification_url=result.verification_url
             )
@@ -204,6 +210,8 @@ async def anchor_artifact(artifact_id: str, request: AnchorRequest):
         return AnchorResponse(
             success=True,
             artifact_id=artifact_id,
+            anchor_id=anchor_record.anchor_id,
+            status=anchor_record.status,
             tx_hash=anchor_record.tx_hash,
             verification_url=anchor_record.verification_url
         )
@@ -418,9 +426,10 @@ async def get_blockchain_storage_status():
     Get blockchain storage status.
     
     Returns the status of MongoDB storage for blockchain anchor records
-    and full artifact data.
+    and full artifact data, the write-behind queue depth and flush
+    latency, and the anchor submitter's queue and batching.
     """
-    from app.db import get_db
+    from app.db import get_db, get_write_behind
     
     anchor_service = get_anchor_service()
     db = get_db()
@@ -434,10 +443,14 @@ async def get_blockchain_storage_status():
     return {
         "mongodb_enabled": anchor_service.mongodb_enabled,
         "mongodb_health": mongodb_status,
+        "mongodb_write_behind": get_write_behind().get_metrics(),
+        "anchor_submitter": anchor_service.submitter.get_metrics(),
         "storage_mode": "mongodb" if anchor_service.mongodb_enabled else "in_memory",
         "anchors_summary": {
             "total": len(all_anchors),
             "confirmed": len([a for a in all_anchors if a.status == "confirmed"]),
+            "queued": len([a for a in all_anchors if a.status == "queued"]),
+            "submitted": len([a for a in all_anchors if a.status == "submitted"]),
             "pending": len([a for a in all_anchors if a.status == "pending"]),
             "pending_approval": len([a for a in all_anchors if a.status == "pending_approval"]),
             "failed": len([a for a in all_anchors if a.status == "failed"]),
@@ -449,6 +462,42 @@ async def get_blockchain_storage_status():
     }
 
 
+@router.get("/blockchain/anchors")
+async def list_blockchain_anchors(
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum anchors to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    Page through anchor records, newest first.
+    
+    Pass the returned next_cursor to get the following page; it is null on
+    the last page.
+    """
+    anchor_service = get_anchor_service()
+    try:
+        page = await anchor_service.page_anchors(status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "anchors": [anchor.model_dump(mode="json") for anchor in page.items],
+        "next_cursor": page.next_cursor,
+    }
+
+
+@router.get("/blockchain/anchors/{anchor_id}")
+async def get_blockchain_anchor(anchor_id: str):
+    """
+    Get one anchor record, e.g. to poll a queued anchor until its status
+    is confirmed (or pending_approval) or failed.
+    """
+    anchor_service = get_anchor_service()
+    anchor = anchor_service.get_anchor(anchor_id)
+    if not anchor:
+        raise HTTPException(status_code=404, detail="Anchor not found")
+    return anchor.model_dump(mode="json")
+
+
 @router.get("/security-report")
 async def get_security_report():
     """
@@ -168,7 +168,7 @@ async def get_trust_breakdown():
     ]
     
     # Calculate individual trust scores
-    results = [trust_calculator.calculate_trust(inp, inputs) for inp in inputs]
+    results = trust_calculator.score_batch(inputs)
     
     # Aggregate
     aggregated = trust_calculator.aggregate_trust(results)
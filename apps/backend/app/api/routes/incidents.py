@@ -3,13 +3,14 @@ Incidents API Routes - Manage incident lifecycle.
 
 Endpoints:
 - GET /incidents - List incidents
+- GET /incidents/history - Page through stored incidents (next_cursor tokens)
 - GET /incidents/{id} - Get incident details
 - POST /incidents/{id}/triage - Triage an incident
 - POST /incidents/{id}/dispatch - Dispatch action
 - POST /incidents/{id}/close - Close incident
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -109,6 +110,27 @@ async def list_incidents(scenario_id: Optional[str] = None):
     return summaries
 
 
+@router.get("/history")
+async def incident_history(
+    scenario_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum incidents to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+):
+    """
+    Page through incidents oldest first, from MongoDB when enabled.
+    
+    Pass the returned next_cursor to get the following page; it is null on
+    the last page.
+    """
+    field_names = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        page = await get_incident_manager().page_incident_history(scenario_id, limit, cursor, field_names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"incidents": page.items, "next_cursor": page.next_cursor}
+
+
 @router.get("/{incident_id}")
 async def get_incident(incident_id: str):
     """Get full details for an incident."""
@@ -164,6 +186,7 @@ async def triage_incident(incident_id: str, request: TriageRequest):
             operator_id=request.operator_id,
             assessment=request.initial_assessment
         )
+        await audit_logger.wait_persisted()
         
         return {"success": True, "incident": incident.model_dump()}
         
@@ -213,6 +236,7 @@ async def dispatch_incident(incident_id: str, request: DispatchRequest):
             action_type=request.action_type,
             rationale=request.action_details
         )
+        await audit_logger.wait_persisted()
         
         # Generate trust receipt
         decision_card = decision_engine.get_decision(incident.decision_card_id) if incident.decision_card_id else None
@@ -272,6 +296,7 @@ async def close_incident(incident_id: str, request: CloseRequest):
             operator_id=request.operator_id,
             resolution=request.resolution_summary
         )
+        await audit_logger.wait_persisted()
         
         # Build artifact
         scenario_data = data_loader.load_fixed_scenario()
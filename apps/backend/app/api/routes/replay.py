@@ -98,7 +98,9 @@ async def get_clustered_markers(
     Get clustered markers for zoomed-out view.
     
     When zoomed out, markers are grouped into clusters like:
-    "6 Trust Updates" or "3 Contradictions"
+    "6 Trust Updates" or "3 Contradictions". Multi-marker clusters are
+    summaries (counts per type, no embedded markers); drill down by
+    requesting the cluster's start_time..end_time.
     """
     try:
         start_dt = datetime.fromisoformat(start)
@@ -117,7 +119,7 @@ async def get_clustered_markers(
 async def get_confidence_band(
     start: Optional[str] = Query(None, description="Start time (ISO)"),
     end: Optional[str] = Query(None, description="End time (ISO)"),
-    resolution: int = Query(20, ge=5, le=100, description="Number of points"),
+    resolution: int = Query(20, ge=5, le=20000, description="Number of points"),
 ):
     """
     Get confidence ribbon data for timeline background.
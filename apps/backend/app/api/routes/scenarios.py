@@ -90,14 +90,15 @@ if get_db().enabled:
 
 
 def _persist_scenario_state(scenario_id: str, status: ScenarioStatus):
-    """Persist scenario state to MongoDB if enabled"""
+    """Queue scenario state for write-behind persistence to MongoDB if enabled"""
     if _simulation_repo:
         try:
             state_dict = status.model_dump()
             # Convert datetime to ISO string for MongoDB
             if state_dict.get("started_at"):
                 state_dict["started_at"] = state_dict["started_at"].isoformat()
-            _simulation_repo.upsert_scenario_state(scenario_id, state_dict)
+            state_dict["scenario_id"] = scenario_id
+            _simulation_repo.queue_upsert("scenario_id", state_dict)
         except Exception as e:
             print(f"Warning: Failed to persist scenario state to MongoDB: {e}")
 
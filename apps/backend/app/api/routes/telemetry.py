@@ -1,6 +1,6 @@
 from typing import List, Optional
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 from ...data.seed_data import (
@@ -8,6 +8,7 @@ from ...data.seed_data import (
     generate_signal_summary,
     DATA_SOURCES,
 )
+from ...services.telemetry_store import TelemetryRange, get_telemetry_pipeline, parse_aggregation
 
 
 router = APIRouter()
@@ -31,7 +32,11 @@ class TelemetryQuery(BaseModel):
     metrics: Optional[List[str]] = None
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
-    aggregation: Optional[str] = None
+    aggregation: Optional[str] = Field(
+        default=None,
+        description="Downsample to one value per series and bucket: '<min|max|avg>:<interval>', e.g. 'avg:1m', 'max:500ms'",
+    )
+    limit: int = Field(default=10000, ge=1, le=1000000, description="Maximum points (or buckets) returned")
 
 
 class TelemetryChannel(BaseModel):
@@ -82,15 +87,28 @@ class SignalSummary(BaseModel):
 
 @router.post("/ingest")
 async def ingest_telemetry(batch: TelemetryBatch):
-    """Ingest a batch of telemetry points."""
-    return {"status": "accepted", "count": len(batch.points)}
+    """Ingest a batch of telemetry points (buffered and written in bulk)."""
+    count = await get_telemetry_pipeline().ingest(batch.points)
+    return {"status": "accepted", "count": count}
 
 
 @router.post("/query", response_model=List[TelemetryPoint])
 async def query_telemetry(query: TelemetryQuery):
-    """Query historical telemetry data."""
-    # For now, return empty - would query database in production
-    return []
+    """Query historical telemetry data, optionally downsampled per time bucket."""
+    try:
+        aggregation = parse_aggregation(query.aggregation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await get_telemetry_pipeline().query(
+        TelemetryRange(
+            sources=query.sources,
+            metrics=query.metrics,
+            start=query.start_time,
+            end=query.end_time,
+            limit=query.limit,
+        ),
+        aggregation,
+    )
 
 
 @router.get("/channels", response_model=List[TelemetryChannel])
@@ -168,4 +186,5 @@ async def telemetry_health():
             "healthy": summary["healthy"],
             "warnings": summary["warnings"],
         },
+        "ingest": get_telemetry_pipeline().get_metrics(),
     }
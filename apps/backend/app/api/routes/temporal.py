@@ -5,6 +5,7 @@ Provides endpoints for advanced temporal analysis:
 - Trust evolution analysis
 - Audit chain verification
 - Contradiction pattern analysis
+- Contradiction cascade graph
 - Decision provenance
 """
 
@@ -129,6 +130,32 @@ async def analyze_contradiction_patterns(
     ]
 
 
+@router.get("/contradiction-cascades")
+async def analyze_contradiction_cascades(
+    run_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get the contradiction cascade graph.
+    
+    Returns one edge per (trigger, triggered) reason code pair:
+    - How many contradictions the trigger code preceded
+    - Lag statistics (seconds) between trigger and triggered
+    """
+    edges = temporal_reasoning_engine.analyze_contradiction_cascades(run_id)
+    
+    return [
+        {
+            "trigger_code": e.trigger_code,
+            "triggered_code": e.triggered_code,
+            "count": e.count,
+            "min_lag_sec": round(e.min_lag, 2),
+            "max_lag_sec": round(e.max_lag, 2),
+            "mean_lag_sec": round(e.mean_lag, 2),
+        }
+        for e in edges
+    ]
+
+
 @router.get("/decision-provenance")
 async def get_decision_provenance(
     receipt_id: Optional[str] = None,
@@ -15,6 +15,7 @@ from app.services.scenario_simulator import (
     create_simulator,
     get_simulator,
     get_all_simulators,
+    get_scheduler_metrics,
     ScenarioEvent,
     TelemetryUpdate,
     DecisionRequest,
@@ -254,14 +255,8 @@ async def get_telemetry_range(
 
     if engine.scenario_runner._active_scenario is None:
         raise HTTPException(status_code=400, detail="No active scenario")
-    data = engine.scenario_runner.get_telemetry_range(start_sec, end_sec)
-    result = {}
-    for tag_id, points in data.items():
-        result[tag_id] = [
-            {"timestamp": p.timestamp.isoformat(), "value": p.value, "quality": p.quality.value}
-            for p in points
-        ]
-    return {"data": result}
+    data = engine.scenario_runner.get_telemetry_range_points(start_sec, end_sec)
+    return {"data": data}
 
 
 @router.post("/advance", summary="Advance simulation time")
@@ -561,5 +556,6 @@ async def list_enhanced_simulations():
                 "pending_decisions": len(sim.state.pending_decisions)
             }
             for sim_id, sim in simulators.items()
-        ]
+        ],
+        "scheduler": get_scheduler_metrics(),
     }
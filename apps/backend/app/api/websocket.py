@@ -13,14 +13,16 @@ Streams:
 - Artifact ready events
 """
 
-from typing import Set, Dict, List, Any, Optional
+from typing import Set, Dict, List, Any, Optional, Deque
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import json
 import asyncio
+from collections import deque
 from datetime import datetime
 from enum import Enum
 
 from ..data.seed_data import generate_telemetry_channels, generate_signal_summary
+from config import config
 
 
 router = APIRouter()
@@ -88,20 +90,72 @@ class EventType(str, Enum):
 # Connection Manager
 # ============================================================================
 
+class BackpressurePolicy(str, Enum):
+    """What to do when a connection's send queue is full."""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message
+    COALESCE = "coalesce"        # Replace the queued message on the same channel, else drop oldest
+    DISCONNECT = "disconnect"    # Close the slow connection
+
+
+def _serialize(message: dict) -> str:
+    """Serialize once for every recipient (same encoding as WebSocket.send_json)."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class _Outbox:
+    """Bounded send queue for one connection, drained by its own writer task."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.pending: Deque[List[Any]] = deque()  # [channel, text] entries
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.writer: Optional[asyncio.Task] = None
+    
+    def push(self, text: str, channel: Optional[str], policy: BackpressurePolicy) -> bool:
+        """Queue a message. Returns False if the connection should be dropped."""
+        if len(self.pending) >= self.max_size:
+            if policy == BackpressurePolicy.DISCONNECT:
+                return False
+            self.dropped += 1
+            if policy == BackpressurePolicy.COALESCE and channel is not None:
+                for entry in reversed(self.pending):
+                    if entry[0] == channel:
+                        entry[1] = text
+                        return True
+            self.pending.popleft()
+        self.pending.append([channel, text])
+        self.ready.set()
+        return True
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections and event broadcasting.
     
     Features:
     - Connection tracking
-    - Channel subscriptions
+    - Channel subscriptions (with a channel -> connections index)
     - Targeted and broadcast messaging
     - Event queuing
+    
+    Messages are serialized once per broadcast and pushed onto bounded
+    per-connection queues; a writer task per connection does the actual
+    sends, so one slow client never stalls the others. A full queue is
+    handled by the configured BackpressurePolicy.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        policy: Optional[BackpressurePolicy] = None,
+    ):
         self.active_connections: Set[WebSocket] = set()
         self.subscriptions: Dict[WebSocket, Set[str]] = {}
+        self._channel_index: Dict[str, Set[WebSocket]] = {}
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        self._queue_size = queue_size or config.ws_send_queue_size
+        self._policy = BackpressurePolicy(policy or config.ws_backpressure_policy)
         self._event_queue: asyncio.Queue = asyncio.Queue()
         self._running = False
     
@@ -110,21 +164,37 @@ class ConnectionManager:
         await websocket.accept()
         self.active_connections.add(websocket)
         self.subscriptions[websocket] = set()
+        outbox = self._outboxes[websocket] = _Outbox(self._queue_size)
+        outbox.writer = asyncio.create_task(self._writer(websocket, outbox))
     
     def disconnect(self, websocket: WebSocket):
         """Remove a disconnected client."""
         self.active_connections.discard(websocket)
-        self.subscriptions.pop(websocket, None)
+        for channel in self.subscriptions.pop(websocket, set()):
+            subscribers = self._channel_index.get(channel)
+            if subscribers is not None:
+                subscribers.discard(websocket)
+                if not subscribers:
+                    del self._channel_index[channel]
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox and outbox.writer and outbox.writer is not asyncio.current_task():
+            outbox.writer.cancel()
     
     def subscribe(self, websocket: WebSocket, channel: str):
         """Subscribe a connection to a channel."""
         if websocket in self.subscriptions:
             self.subscriptions[websocket].add(channel)
+            self._channel_index.setdefault(channel, set()).add(websocket)
     
     def unsubscribe(self, websocket: WebSocket, channel: str):
         """Unsubscribe a connection from a channel."""
         if websocket in self.subscriptions:
             self.subscriptions[websocket].discard(channel)
+            subscribers = self._channel_index.get(channel)
+            if subscribers is not None:
+                subscribers.discard(websocket)
+                if not subscribers:
+                    del self._channel_index[channel]
     
     async def broadcast(self, message: dict, channel: Optional[str] = None):
         """
@@ -134,23 +204,62 @@ class ConnectionManager:
             message: Message to send
             channel: Optional channel to target
         """
-        for connection in list(self.active_connections):
-            try:
-                if channel:
-                    if channel in self.subscriptions.get(connection, set()):
-                        await connection.send_json(message)
-                else:
-                    await connection.send_json(message)
-            except Exception:
-                self.disconnect(connection)
+        if channel:
+            recipients = self._channel_index.get(channel)
+        else:
+            recipients = self.active_connections
+        if not recipients:
+            return
+        
+        text = _serialize(message)
+        for connection in list(recipients):
+            self._enqueue(connection, text, channel)
     
     async def send_personal(self, websocket: WebSocket, message: dict):
         """Send message to a specific connection."""
+        self._enqueue(websocket, _serialize(message), None)
+    
+    def _enqueue(self, websocket: WebSocket, text: str, channel: Optional[str]):
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        if not outbox.push(text, channel, self._policy):
+            self.disconnect(websocket)
+            asyncio.create_task(self._close(websocket))
+    
+    async def _writer(self, websocket: WebSocket, outbox: _Outbox):
+        """Drain one connection's queue in order."""
         try:
-            await websocket.send_json(message)
+            while True:
+                if not outbox.pending:
+                    outbox.ready.clear()
+                    await outbox.ready.wait()
+                    continue
+                _, text = outbox.pending.popleft()
+                await websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
         except Exception:
             self.disconnect(websocket)
     
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection, queue and drop counts for monitoring."""
+        return {
+            "connections": len(self.active_connections),
+            "channels": {channel: len(conns) for channel, conns in self._channel_index.items()},
+            "policy": self._policy.value,
+            "queue_size": self._queue_size,
+            "queued": sum(len(o.pending) for o in self._outboxes.values()),
+            "dropped": sum(o.dropped for o in self._outboxes.values()),
+        }
+    
     async def broadcast_event(
         self,
         event_type: EventType,
@@ -288,6 +397,24 @@ async def emit_artifact_ready(artifact_id: str, incident_id: str, content_hash:
     )
 
 
+async def emit_artifact_anchored(anchor: Dict[str, Any]):
+    """Emit an anchor confirmation (or failure) event."""
+    await manager.broadcast_event(
+        EventType.ARTIFACT_ANCHORED,
+        {
+            "anchor_id": anchor.get("anchor_id"),
+            "artifact_id": anchor.get("artifact_id"),
+            "incident_id": anchor.get("incident_id"),
+            "status": anchor.get("status"),
+            "tx_hash": anchor.get("tx_hash"),
+            "block_slot": anchor.get("block_slot"),
+            "explorer_url": anchor.get("explorer_url"),
+            "error": anchor.get("error"),
+        },
+        channel="artifacts"
+    )
+
+
 async def emit_question_asked(question: Dict[str, Any], incident_id: str):
     """Emit an operator question event."""
     await manager.broadcast_event(
@@ -6,11 +6,16 @@ Hash-chained tamper-evident logging for decision accountability.
 
 from .ledger import AuditLedger
 from .hasher import HashChain
-from .verifier import ChainVerifier, VerificationResult
+from .merkle import MerkleAccumulator, MerkleCheckpoint, verify_inclusion
+from .verifier import ChainVerifier, VerificationResult, get_chain_verifier
 
 __all__ = [
     "AuditLedger",
     "HashChain",
+    "MerkleAccumulator",
+    "MerkleCheckpoint",
+    "verify_inclusion",
     "ChainVerifier",
     "VerificationResult",
+    "get_chain_verifier",
 ]
@@ -0,0 +1,340 @@
+"""
+Chain Store Module
+
+Lazy, offset-indexed access to an append-only chain_<id>.jsonl file.
+
+A fixed-width sidecar index (chain_<id>.idx) holds one record per event:
+byte offset and length of its JSONL line, an action code, a 64-bit key
+derived from event_id and the raw current_hash. The index is memory-mapped,
+so opening a chain does not parse any events; they are read and validated
+only when asked for. Action codes map to names via chain_<id>.actions.json.
+A missing or stale index is rebuilt (or caught up) by streaming the JSONL once.
+"""
+
+import hashlib
+import json
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from app.models.audit import AuditEvent
+
+INDEX_DTYPE = np.dtype([
+    ("offset", "<i8"),
+    ("length", "<i4"),
+    ("action", "<i4"),
+    ("key", "<u8"),
+    ("hash", "u1", (32,)),
+])
+
+# Appended keys are scanned linearly until there are this many (or as many
+# as the sorted part), then everything is re-sorted
+_KEY_RESORT_MIN = 4096
+
+_INDEX_BATCH = 65536
+
+
+def _event_key(event_id: str) -> int:
+    """64-bit lookup key for an event_id (candidates are confirmed by reading the event)"""
+    return int.from_bytes(hashlib.blake2b(event_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ChainStore(Sequence):
+    """
+    Read-only sequence of AuditEvents backed by a chain file and its index.
+
+    Supports len(), integer and slice indexing, event_id lookup and
+    per-action posting lists. Recently read events are kept in a small LRU.
+    """
+
+    def __init__(self, path: Path, cache_size: int = 1024):
+        self.path = Path(path)
+        self._index_path = self.path.with_suffix(".idx")
+        self._actions_path = self.path.with_suffix(".actions.json")
+
+        self._actions: list[str] = []
+        self._action_codes: dict[str, int] = {}
+        self._length = 0
+        self._end = 0  # Byte offset just past the last indexed line
+
+        self._mapped_length = -1
+        self._index = np.empty(0, dtype=INDEX_DTYPE)
+
+        self._cache: OrderedDict[int, AuditEvent] = OrderedDict()
+        self._cache_size = cache_size
+
+        # Read handle shared by every lookup, opened on first read
+        self._reader: BinaryIO | None = None
+
+        # event_id lookup: keys [0, _sorted_count) sorted once, the rest scanned
+        self._sorted_count = 0
+        self._sorted_keys: np.ndarray | None = None
+        self._key_order: np.ndarray | None = None
+
+        # action code -> positions, built on first use and extended on append
+        self._postings: dict[int, array] = {}
+
+        if self.path.exists():
+            self._open()
+
+    # =========================================================================
+    # Sequence interface
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._read_range(start, stop)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("chain index out of range")
+        return self._read(index)
+
+    def __iter__(self) -> Iterator[AuditEvent]:
+        for start in range(0, self._length, _INDEX_BATCH):
+            yield from self._read_range(start, min(start + _INDEX_BATCH, self._length))
+
+    # =========================================================================
+    # Lookups
+    # =========================================================================
+
+    def position_of(self, event_id: str) -> int | None:
+        """Position of an event by id, without reading other events"""
+        key = np.uint64(_event_key(event_id))
+        keys = self._map()["key"]
+
+        tail = self._length - self._sorted_count
+        if tail > max(_KEY_RESORT_MIN, self._sorted_count):
+            self._key_order = np.argsort(keys, kind="stable")
+            self._sorted_keys = keys[self._key_order]
+            self._sorted_count = self._length
+
+        candidates: list[int] = []
+        if self._sorted_count:
+            lo = int(np.searchsorted(self._sorted_keys, key, side="left"))
+            hi = int(np.searchsorted(self._sorted_keys, key, side="right"))
+            candidates.extend(self._key_order[lo:hi].tolist())
+        candidates.extend(
+            (np.flatnonzero(keys[self._sorted_count:] == key) + self._sorted_count).tolist()
+        )
+
+        for position in sorted(candidates):
+            if self._read(position).event_id == event_id:
+                return position
+        return None
+
+    def positions_for_action(self, action: str) -> Sequence[int]:
+        """Ascending positions of events with the given action"""
+        code = self._action_codes.get(action)
+        if code is None:
+            return array("q")
+        postings = self._postings.get(code)
+        if postings is None:
+            matches = np.flatnonzero(self._map()["action"] == code).astype(np.int64)
+            postings = self._postings[code] = array("q", matches.tobytes())
+        return postings
+
+    def events_for_action(self, action: str, start_idx: int = 0, limit: int | None = None) -> list[AuditEvent]:
+        """Events with the given action at or after start_idx, in chain order"""
+        postings = self.positions_for_action(action)
+        lo = bisect_left(postings, start_idx)
+        selected = postings[lo:lo + limit] if limit else postings[lo:]
+        return [self._read(position) for position in selected]
+
+    def current_hashes(self, start: int = 0) -> Iterator[str]:
+        """current_hash of every event from start, read from the index only"""
+        hashes = self._map()["hash"]
+        for lo in range(start, self._length, _INDEX_BATCH):
+            block = np.ascontiguousarray(hashes[lo:lo + _INDEX_BATCH]).tobytes()
+            for i in range(0, len(block), 32):
+                yield block[i:i + 32].hex()
+
+    # =========================================================================
+    # Appending
+    # =========================================================================
+
+    def append(self, event: AuditEvent) -> int:
+        """Write an event to the chain file and index. Returns its position."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = (event.model_dump_json() + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+
+        position = self._length
+        code = self._action_code(event.action)
+        self._write_records([(offset, len(line), code, _event_key(event.event_id), event.current_hash)])
+        self._end = offset + len(line)
+
+        if code in self._postings:
+            self._postings[code].append(position)
+        self._remember(position, event)
+        return position
+
+    def close(self) -> None:
+        """Close the read handle (reopened if the store is read again)"""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _open(self) -> None:
+        """Map an existing index, rebuilding or catching it up as needed"""
+        if self._actions_path.exists():
+            self._actions = json.loads(self._actions_path.read_text())
+            self._action_codes = {name: code for code, name in enumerate(self._actions)}
+
+        count = 0
+        if self._index_path.exists():
+            size = self._index_path.stat().st_size
+            count = size // INDEX_DTYPE.itemsize
+            if size % INDEX_DTYPE.itemsize:
+                # Drop a partially written record
+                with open(self._index_path, "r+b") as f:
+                    f.truncate(count * INDEX_DTYPE.itemsize)
+
+        self._length = count
+        if count:
+            last = self._map()[-1]
+            self._end = int(last["offset"]) + int(last["length"])
+            if not self._index_matches(last):
+                # Index doesn't describe this file; start over
+                self._index_path.unlink()
+                self._actions, self._action_codes = [], {}
+                self._length, self._end = 0, 0
+                self._mapped_length = -1
+
+        if self._end < self.path.stat().st_size:
+            self._index_from(self._end)
+
+    def _index_matches(self, last: np.void) -> bool:
+        """
+        Whether the last index record still describes the chain file: its
+        line parses to the same event_id and current_hash and ends in a
+        newline. An edit that shifts lines but keeps the file at least as
+        long would otherwise resume indexing mid-line.
+        """
+        if self._end > self.path.stat().st_size or int(last["action"]) >= len(self._actions):
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(int(last["offset"]))
+            line = f.read(int(last["length"]))
+        if not line.endswith(b"\n"):
+            return False
+        try:
+            data = json.loads(line)
+            return (
+                _event_key(data["event_id"]) == int(last["key"])
+                and bytes.fromhex(data["current_hash"]) == last["hash"].tobytes()
+            )
+        except (ValueError, KeyError, TypeError):
+            return False
+
+    def _index_from(self, offset: int) -> None:
+        """Index the chain file from a byte offset to its end"""
+        records = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if line.strip():
+                    data = json.loads(line)
+                    records.append((
+                        offset,
+                        len(line),
+                        self._action_code(data["action"]),
+                        _event_key(data["event_id"]),
+                        data["current_hash"],
+                    ))
+                    if len(records) >= _INDEX_BATCH:
+                        self._write_records(records)
+                        records = []
+                offset += len(line)
+        self._write_records(records)
+        self._end = offset
+
+    def _write_records(self, records: list[tuple[int, int, int, int, str]]) -> None:
+        if not records:
+            return
+        block = np.array(
+            [(o, n, a, k, np.frombuffer(bytes.fromhex(h), dtype=np.uint8)) for o, n, a, k, h in records],
+            dtype=INDEX_DTYPE,
+        )
+        with open(self._index_path, "ab") as f:
+            f.write(block.tobytes())
+        self._length += len(records)
+
+    def _action_code(self, action: str) -> int:
+        code = self._action_codes.get(action)
+        if code is None:
+            code = self._action_codes[action] = len(self._actions)
+            self._actions.append(action)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._actions_path.write_text(json.dumps(self._actions))
+        return code
+
+    def _map(self) -> np.ndarray:
+        """Memory-map the index, remapping only if records were appended"""
+        if self._mapped_length != self._length:
+            if self._length:
+                self._index = np.memmap(self._index_path, dtype=INDEX_DTYPE, mode="r", shape=(self._length,))
+            else:
+                self._index = np.empty(0, dtype=INDEX_DTYPE)
+            self._mapped_length = self._length
+        return self._index
+
+    def _read(self, position: int) -> AuditEvent:
+        event = self._cache.get(position)
+        if event is not None:
+            self._cache.move_to_end(position)
+            return event
+        record = self._map()[position]
+        f = self._file()
+        f.seek(int(record["offset"]))
+        event = AuditEvent.model_validate_json(f.read(int(record["length"])))
+        self._remember(position, event)
+        return event
+
+    def _read_range(self, start: int, stop: int) -> list[AuditEvent]:
+        """Events [start, stop) from one contiguous read"""
+        if start >= stop:
+            return []
+        records = self._map()[start:stop]
+        base = int(records[0]["offset"])
+        f = self._file()
+        f.seek(base)
+        block = f.read(int(records[-1]["offset"]) + int(records[-1]["length"]) - base)
+
+        events = []
+        for position, offset, length in zip(
+            range(start, stop), records["offset"].tolist(), records["length"].tolist()
+        ):
+            event = self._cache.get(position)
+            if event is None:
+                event = AuditEvent.model_validate_json(block[offset - base:offset - base + length])
+            events.append(event)
+        return events
+
+    def _file(self) -> BinaryIO:
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        return self._reader
+
+    def _remember(self, position: int, event: AuditEvent) -> None:
+        self._cache[position] = event
+        self._cache.move_to_end(position)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
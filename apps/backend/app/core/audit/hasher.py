@@ -6,8 +6,14 @@ Implements SHA-256 hash chaining for tamper-evident audit logging.
 
 import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
+
+# Fields that are not part of an event's hashed content
+HASH_FIELDS = ("prev_hash", "current_hash", "anchor_tx_sig")
 
 
 class HashChain:
@@ -149,13 +155,76 @@ def compute_standalone_hash(data: dict) -> str:
     return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
 
-def verify_hash_integrity(events: list[dict], genesis_hash: str | None = None) -> tuple[bool, str | None]:
+def _hash_mismatches(chunk: list[tuple[int, dict]]) -> list[int]:
+    """Indices in chunk whose recomputed hash differs from current_hash (pool worker)."""
+    chain = HashChain()
+    failed = []
+    for index, event in chunk:
+        event_data = {k: v for k, v in event.items() if k not in HASH_FIELDS}
+        if chain.compute_hash(event_data, event.get("prev_hash")) != event.get("current_hash"):
+            failed.append(index)
+    return failed
+
+
+def run_chunked(
+    worker: Callable[[list], list],
+    items: list,
+    workers: int = 1,
+) -> list:
+    """
+    Apply worker to contiguous chunks of items and concatenate the results.
+
+    With workers > 1 the chunks run in a process pool, so worker must be a
+    module-level function and items must be picklable. Falls back to a
+    single in-process call if the pool cannot be started.
+    """
+    workers = min(workers, os.cpu_count() or 1)
+    if workers <= 1 or len(items) < 2:
+        return worker(items)
+
+    # A few chunks per worker keeps the pool busy when chunk costs differ
+    n_chunks = min(len(items), workers * 4)
+    size = -(-len(items) // n_chunks)
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(worker, chunks))
+    except (BrokenProcessPool, OSError) as e:
+        print(f"Warning: Parallel verification unavailable, running serially: {e}")
+        return worker(items)
+    return [r for result in results for r in result]
+
+
+def find_hash_mismatches(events: list[dict], start: int = 0, workers: int = 1) -> list[int]:
+    """
+    Recompute hashes for events[start:] against their recorded prev_hash.
+
+    Each event's hash depends only on its own content and recorded prev_hash,
+    so the work splits across workers without any ordering between chunks.
+    Continuity (prev_hash == previous current_hash) is not checked here.
+
+    Returns:
+        Sorted indices (into events) whose recorded current_hash is wrong
+    """
+    items = [
+        (i, events[i]) for i in range(start, len(events))
+        if events[i].get("prev_hash") and events[i].get("current_hash")
+    ]
+    return run_chunked(_hash_mismatches, items, workers)
+
+
+def verify_hash_integrity(
+    events: list[dict],
+    genesis_hash: str | None = None,
+    workers: int = 1,
+) -> tuple[bool, str | None]:
     """
     Verify the integrity of a sequence of hash-chained events.
     
     Args:
         events: List of events with prev_hash and current_hash fields
         genesis_hash: Expected hash of the genesis block (defaults to standard)
+        workers: Processes to recompute hashes with (1 = in-process)
         
     Returns:
         Tuple of (is_valid, error_message)
@@ -166,7 +235,7 @@ def verify_hash_integrity(events: list[dict], genesis_hash: str | None = None) -
     if genesis_hash is None:
         genesis_hash = HashChain.GENESIS_HASH
     
-    chain = HashChain()
+    mismatches = set(find_hash_mismatches(events, workers=workers))
     
     for i, event in enumerate(events):
         # Extract hash fields
@@ -186,13 +255,9 @@ def verify_hash_integrity(events: list[dict], genesis_hash: str | None = None) -
             if recorded_prev_hash != prev_event.get("current_hash"):
                 return False, f"Event {i} prev_hash doesn't match previous event's current_hash"
         
-        # Verify the hash computation
-        # Create event data without hash fields for verification
-        event_data = {k: v for k, v in event.items() if k not in ("prev_hash", "current_hash", "anchor_tx_sig")}
-        
-        computed_hash = chain.compute_hash(event_data, recorded_prev_hash)
-        
-        if computed_hash != recorded_current_hash:
+        if i in mismatches:
+            event_data = {k: v for k, v in event.items() if k not in HASH_FIELDS}
+            computed_hash = HashChain().compute_hash(event_data, recorded_prev_hash)
             return False, f"Event {i} hash mismatch: computed {computed_hash}, recorded {recorded_current_hash}"
     
     return True, None
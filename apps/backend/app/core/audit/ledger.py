@@ -4,14 +4,17 @@ Audit Ledger Module
 Append-only audit log with hash chaining for tamper evidence.
 """
 
+import asyncio
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Literal
 
 from app.models.audit import AuditEvent, AuditChain, DecisionReceipt
+from .chain_store import ChainStore
 from .hasher import HashChain, compute_standalone_hash
+from .merkle import MerkleAccumulator, MerkleCheckpoint
 from config import config
 
 
@@ -28,21 +31,63 @@ class AuditLedger:
     
     The hash chain creates a mathematical dependency between events,
     making any modification to historical records detectable.
+    
+    Events live in chain_<id>.jsonl and are read back on demand through a
+    ChainStore (offset index, event_id lookup, per-action postings), so
+    loading a chain doesn't parse or hold every event in memory.
+    
+    A Merkle accumulator over the chain hashes provides O(log n) inclusion
+    proofs and periodic root checkpoints. In batched anchoring mode one
+    Merkle root is anchored per N events or T seconds instead of one
+    transaction per anchored event. The T-second deadline runs on a timer,
+    so a pending batch is anchored even if no further events arrive; failed
+    anchors are retried with exponential backoff.
     """
     
-    def __init__(self, anchor=None):
+    def __init__(
+        self,
+        anchor=None,
+        anchor_batch_size: int | None = None,
+        anchor_batch_interval_sec: float | None = None,
+        checkpoint_interval: int | None = None,
+    ):
         """
         Initialize the audit ledger.
         
         Args:
             anchor: Optional AuditAnchor implementation for on-chain anchoring (Kairo)
+            anchor_batch_size: Anchor a Merkle root every N events (enables batched mode)
+            anchor_batch_interval_sec: Anchor a pending Merkle root after T seconds (enables batched mode)
+            checkpoint_interval: Record a Merkle root checkpoint every N events
         """
         self._hash_chain = HashChain()
-        self._events: list[AuditEvent] = []
         self._chain_id = str(uuid.uuid4())
         self._created_at = datetime.utcnow()
         self._data_path = Path(config.data_dir) / "audit"
         self._anchor = anchor
+        
+        # Chain file reader, opened on first use
+        self._store: ChainStore | None = None
+        
+        # Merkle accumulator over current_hash values (built on first use)
+        self._merkle: MerkleAccumulator | None = None
+        self._checkpoints: list[MerkleCheckpoint] = []
+        self._checkpoint_interval = checkpoint_interval or config.audit_merkle_checkpoint_interval
+        
+        # Batched anchoring
+        self._anchor_batch_size = anchor_batch_size or config.audit_anchor_batch_size
+        self._anchor_batch_interval_sec = anchor_batch_interval_sec or config.audit_anchor_batch_interval_sec
+        self._anchor_pending_since: datetime | None = None
+        self._anchored_size = 0
+        self._anchor_requests = 0
+        self._anchor_in_progress = False
+        
+        # Deadline/retry timer for the pending batch, and backoff after failures
+        self._anchor_timer: asyncio.Task | None = None
+        self._anchor_failures = 0
+        self._anchor_retry_at: datetime | None = None
+        self._anchor_retry_base_sec = config.audit_anchor_retry_base_sec
+        self._anchor_retry_max_sec = config.audit_anchor_retry_max_sec
     
     @property
     def chain_id(self) -> str:
@@ -50,18 +95,46 @@ class AuditLedger:
     
     @property
     def event_count(self) -> int:
-        return len(self._events)
+        return len(self._chain())
+    
+    @property
+    def events(self) -> ChainStore:
+        """Read-only sequence over every event, materialized on access"""
+        return self._chain()
     
     @property
     def latest_hash(self) -> str:
         return self._hash_chain.latest_hash
     
+    @property
+    def batched_anchoring(self) -> bool:
+        return bool(self._anchor_batch_size or self._anchor_batch_interval_sec)
+    
+    @property
+    def merkle_root(self) -> str:
+        return self._merkle_tree().root()
+    
     @property
     def genesis_hash(self) -> str:
-        if self._events:
-            return self._events[0].current_hash
+        events = self._chain()
+        if events:
+            return events[0].current_hash
         return HashChain.GENESIS_HASH
     
+    def _chain(self) -> ChainStore:
+        if self._store is None:
+            self._store = ChainStore(self._data_path / f"chain_{self._chain_id}.jsonl")
+        return self._store
+    
+    def _merkle_tree(self) -> MerkleAccumulator:
+        """The Merkle accumulator, built from the index's chain hashes if needed"""
+        if self._merkle is None:
+            merkle = MerkleAccumulator()
+            for chain_hash in self._chain().current_hashes():
+                merkle.append(chain_hash)
+            self._merkle = merkle
+        return self._merkle
+    
     async def log_event(
         self,
         action: str,
@@ -80,7 +153,8 @@ class AuditLedger:
             payload: Event-specific data
             actor_id: Specific actor identifier
             data_ref: Reference to related artifact
-            anchor_on_chain: Whether to anchor on Solana via Kairo
+            anchor_on_chain: Whether to anchor on Solana via Kairo. In batched
+                mode the event is covered by the next anchored Merkle root.
             
         Returns:
             The created AuditEvent
@@ -116,7 +190,12 @@ class AuditLedger:
         )
         
         # Anchor on-chain if requested and anchor is available
-        if anchor_on_chain and self._anchor:
+        if anchor_on_chain and self._anchor and self.batched_anchoring:
+            self._anchor_requests += 1
+            if self._anchor_pending_since is None:
+                self._anchor_pending_since = timestamp
+                self._schedule_anchor_flush()
+        elif anchor_on_chain and self._anchor:
             try:
                 receipt = await self._anchor.anchor_hash(
                     current_hash,
@@ -128,14 +207,190 @@ class AuditLedger:
                 # Anchor failure doesn't block logging (sidecar pattern)
                 print(f"Warning: On-chain anchor failed: {e}")
         
-        # Append to ledger
-        self._events.append(event)
-        
-        # Persist to storage
+        # Append to ledger (persists to storage)
         await self._persist_event(event)
+        if self._merkle is not None:
+            self._merkle.append(current_hash)
+        
+        if self.event_count % self._checkpoint_interval == 0:
+            await self.record_checkpoint()
+        
+        if self._anchor_pending_since is not None and self._anchor_batch_due(timestamp):
+            await self.anchor_pending_root()
         
         return event
     
+    # =========================================================================
+    # Merkle proofs and batched anchoring
+    # =========================================================================
+    
+    def _anchor_batch_due(self, now: datetime) -> bool:
+        """Whether the pending batch has reached N events or T seconds (and isn't backing off)"""
+        if self._anchor_retry_at is not None and now < self._anchor_retry_at:
+            return False
+        if self._anchor_batch_size and self.event_count - self._anchored_size >= self._anchor_batch_size:
+            return True
+        if self._anchor_batch_interval_sec and self._anchor_pending_since is not None:
+            return (now - self._anchor_pending_since).total_seconds() >= self._anchor_batch_interval_sec
+        return False
+    
+    async def record_checkpoint(self) -> MerkleCheckpoint | None:
+        """Record the current Merkle root as a checkpoint (no-op if unchanged)"""
+        merkle = self._merkle_tree()
+        if merkle.size == 0:
+            return None
+        if self._checkpoints and self._checkpoints[-1].tree_size == merkle.size:
+            return self._checkpoints[-1]
+        checkpoint = MerkleCheckpoint(
+            tree_size=merkle.size,
+            root=merkle.root(),
+            created_at=datetime.utcnow(),
+        )
+        self._checkpoints.append(checkpoint)
+        await self._persist_checkpoint(checkpoint)
+        return checkpoint
+    
+    async def anchor_pending_root(self) -> MerkleCheckpoint | None:
+        """
+        Anchor the current Merkle root, covering every event logged so far.
+        
+        Called automatically in batched mode; call directly to flush a
+        pending batch (e.g. on shutdown). Failures, including a receipt
+        without a transaction signature, leave the batch pending and
+        schedule a retry with exponential backoff.
+        """
+        if not self._anchor or self._anchor_pending_since is None or self._anchor_in_progress:
+            return None
+        
+        self._anchor_in_progress = True
+        requests = self._anchor_requests
+        try:
+            checkpoint = await self.record_checkpoint()
+            receipt = await self._anchor.anchor_hash(
+                checkpoint.root,
+                {
+                    "chain_id": self._chain_id,
+                    "merkle_root": checkpoint.root,
+                    "tree_size": checkpoint.tree_size,
+                },
+            )
+        except Exception as e:
+            # Anchor failure doesn't block logging (sidecar pattern)
+            self._anchor_failed(str(e))
+            return None
+        finally:
+            self._anchor_in_progress = False
+        
+        tx_signature = getattr(receipt, "tx_signature", None) if receipt else None
+        if not tx_signature:
+            # Nothing was anchored: keep the batch pending like a failure
+            self._anchor_failed("no transaction signature returned")
+            return None
+        
+        checkpoint.anchor_tx_sig = tx_signature
+        await self._persist_checkpoint(checkpoint)
+        self._anchored_size = checkpoint.tree_size
+        self._anchor_failures = 0
+        self._anchor_retry_at = None
+        self._cancel_anchor_timer()
+        if self._anchor_requests != requests:
+            # Events asked to be anchored while this root was being sent
+            self._anchor_pending_since = datetime.utcnow()
+            self._schedule_anchor_flush()
+        else:
+            self._anchor_pending_since = None
+        return checkpoint
+    
+    def _anchor_failed(self, reason: str) -> None:
+        """Leave the batch pending and schedule a retry with exponential backoff"""
+        self._anchor_failures += 1
+        delay = min(
+            self._anchor_retry_max_sec,
+            self._anchor_retry_base_sec * 2 ** (self._anchor_failures - 1),
+        )
+        self._anchor_retry_at = datetime.utcnow() + timedelta(seconds=delay)
+        print(f"Warning: On-chain root anchor failed (retrying in {delay:.0f}s): {reason}")
+        self._cancel_anchor_timer()
+        self._schedule_anchor_flush()
+    
+    def _schedule_anchor_flush(self) -> None:
+        """Start a timer to anchor the pending batch at its deadline or retry time"""
+        if self._anchor_pending_since is None:
+            return
+        if self._anchor_timer is not None and not self._anchor_timer.done():
+            return
+        deadlines = []
+        if self._anchor_batch_interval_sec:
+            deadlines.append(self._anchor_pending_since + timedelta(seconds=self._anchor_batch_interval_sec))
+        if self._anchor_retry_at is not None:
+            deadlines.append(self._anchor_retry_at)
+        if not deadlines:
+            # Size-only batching: the next log_event decides
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._anchor_timer = loop.create_task(self._anchor_at(max(deadlines)))
+    
+    async def _anchor_at(self, deadline: datetime) -> None:
+        await asyncio.sleep(max(0.0, (deadline - datetime.utcnow()).total_seconds()))
+        self._anchor_timer = None
+        await self.anchor_pending_root()
+    
+    def _cancel_anchor_timer(self) -> None:
+        timer = self._anchor_timer
+        self._anchor_timer = None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+    
+    async def close(self) -> None:
+        """Anchor a pending batch now and release the chain file (on shutdown)"""
+        self._cancel_anchor_timer()
+        await self.anchor_pending_root()
+        self._cancel_anchor_timer()
+        if self._store is not None:
+            self._store.close()
+    
+    def get_checkpoints(self) -> list[MerkleCheckpoint]:
+        """Get recorded Merkle root checkpoints"""
+        return list(self._checkpoints)
+    
+    def get_inclusion_proof(self, event_id: str, tree_size: int | None = None) -> dict | None:
+        """
+        Get a Merkle inclusion proof for an event.
+        
+        Args:
+            event_id: Event to prove
+            tree_size: Tree size to prove against (defaults to the full chain;
+                pass an anchored checkpoint's tree_size to prove against it)
+        
+        Returns:
+            Proof dict for merkle.verify_inclusion, or None if not found
+        """
+        index = self._chain().position_of(event_id)
+        if index is None:
+            return None
+        merkle = self._merkle_tree()
+        if tree_size is None:
+            tree_size = merkle.size
+        if not index < tree_size <= merkle.size:
+            raise ValueError(f"tree_size must be in ({index}, {merkle.size}]")
+        
+        anchored = next(
+            (c for c in self._checkpoints if c.tree_size > index and c.anchor_tx_sig),
+            None,
+        )
+        return {
+            "event_id": event_id,
+            "index": index,
+            "chain_hash": self._chain()[index].current_hash,
+            "tree_size": tree_size,
+            "root": merkle.root(tree_size),
+            "proof": merkle.inclusion_proof(index, tree_size),
+            "anchored_checkpoint": anchored.to_dict() if anchored else None,
+        }
+    
     async def log_incident_created(
         self,
         incident_id: str,
@@ -259,29 +514,31 @@ class AuditLedger:
         action_filter: str | None = None,
     ) -> list[AuditEvent]:
         """Get events from the ledger"""
-        events = self._events[start_idx:]
+        events = self._chain()
+        start_idx = slice(start_idx, None).indices(len(events))[0]
         
         if action_filter:
-            events = [e for e in events if e.action == action_filter]
+            return events.events_for_action(action_filter, start_idx, limit)
         
         if limit:
-            events = events[:limit]
+            return events[start_idx:start_idx + limit]
         
-        return events
+        return events[start_idx:]
     
     def get_event_by_id(self, event_id: str) -> AuditEvent | None:
         """Get a specific event by ID"""
-        for event in self._events:
-            if event.event_id == event_id:
-                return event
-        return None
+        events = self._chain()
+        position = events.position_of(event_id)
+        if position is None:
+            return None
+        return events[position]
     
     def get_chain_info(self) -> dict:
         """Get chain metadata"""
         return {
             "chain_id": self._chain_id,
             "created_at": self._created_at.isoformat(),
-            "event_count": len(self._events),
+            "event_count": self.event_count,
             "genesis_hash": self.genesis_hash,
             "latest_hash": self.latest_hash,
         }
@@ -293,19 +550,23 @@ class AuditLedger:
             created_at=self._created_at,
             genesis_hash=self.genesis_hash,
             latest_hash=self.latest_hash,
-            event_count=len(self._events),
-            events=self._events.copy(),
+            event_count=self.event_count,
+            events=self._chain()[:],
         )
     
     async def _persist_event(self, event: AuditEvent) -> None:
         """Persist an event to storage"""
+        # Append to chain file and its index
+        self._chain().append(event)
+    
+    async def _persist_checkpoint(self, checkpoint: MerkleCheckpoint) -> None:
+        """Append a checkpoint record (the last record per tree_size wins on load)"""
         self._data_path.mkdir(parents=True, exist_ok=True)
         
-        # Append to chain file
-        chain_file = self._data_path / f"chain_{self._chain_id}.jsonl"
+        checkpoint_file = self._data_path / f"merkle_{self._chain_id}.jsonl"
         
-        with open(chain_file, "a") as f:
-            f.write(event.model_dump_json() + "\n")
+        with open(checkpoint_file, "a") as f:
+            f.write(json.dumps(checkpoint.to_dict()) + "\n")
     
     async def load_from_storage(self, chain_id: str | None = None) -> bool:
         """
@@ -330,23 +591,45 @@ class AuditLedger:
         if not chain_file.exists():
             return False
         
-        # Load events
-        self._events.clear()
+        # Open the chain through its index (events are read on demand)
+        if self._store is not None:
+            self._store.close()
+        self._store = ChainStore(chain_file)
+        self._merkle = None
         self._chain_id = chain_id
         
-        with open(chain_file) as f:
-            for line in f:
-                if line.strip():
-                    event = AuditEvent.model_validate_json(line)
-                    self._events.append(event)
+        # Load Merkle checkpoints
+        self._checkpoints = []
+        self._cancel_anchor_timer()
+        self._anchor_pending_since = None
+        self._anchored_size = 0
+        self._anchor_failures = 0
+        self._anchor_retry_at = None
+        checkpoint_file = self._data_path / f"merkle_{chain_id}.jsonl"
+        if checkpoint_file.exists():
+            by_size: dict[int, MerkleCheckpoint] = {}
+            with open(checkpoint_file) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        by_size[record["tree_size"]] = MerkleCheckpoint(
+                            tree_size=record["tree_size"],
+                            root=record["root"],
+                            created_at=datetime.fromisoformat(record["created_at"]),
+                            anchor_tx_sig=record.get("anchor_tx_sig"),
+                        )
+            self._checkpoints = [by_size[size] for size in sorted(by_size)]
+            anchored = [c.tree_size for c in self._checkpoints if c.anchor_tx_sig]
+            self._anchored_size = anchored[-1] if anchored else 0
         
         # Update hash chain state
-        if self._events:
+        events = self._store
+        if events:
             self._hash_chain.set_state(
-                self._events[-1].current_hash,
-                len(self._events),
+                events[-1].current_hash,
+                len(events),
             )
-            self._created_at = self._events[0].timestamp
+            self._created_at = events[0].timestamp
         
         return True
 
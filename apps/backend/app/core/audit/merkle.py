@@ -0,0 +1,154 @@
+"""
+Merkle Accumulator Module
+
+Merkle tree layered over the linear hash chain. Leaves are the chain's
+current_hash values, so one root commits to every event up to a size and
+any single event can be proven with log n sibling hashes.
+
+Hashing follows RFC 6962 (Certificate Transparency):
+    leaf = SHA256(0x00 || current_hash_bytes)
+    node = SHA256(0x01 || left || right)
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+
+def _leaf_hash(chain_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(chain_hash)).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _split_point(size: int) -> int:
+    """Largest power of two strictly less than size (size >= 2)."""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+@dataclass
+class MerkleCheckpoint:
+    """A recorded Merkle root over the first tree_size events"""
+    tree_size: int
+    root: str
+    created_at: datetime
+    anchor_tx_sig: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "tree_size": self.tree_size,
+            "root": self.root,
+            "created_at": self.created_at.isoformat(),
+            "anchor_tx_sig": self.anchor_tx_sig,
+        }
+
+
+class MerkleAccumulator:
+    """
+    Append-only Merkle tree over audit chain hashes.
+
+    Keeps every complete subtree hash level by level, so appends are
+    amortised O(1) hashes, roots are O(log n) and inclusion proofs are
+    O(log n) hashes long.
+    """
+
+    def __init__(self):
+        # _levels[k][j] = hash of the complete subtree over leaves [j*2^k, (j+1)*2^k)
+        self._levels: list[list[bytes]] = [[]]
+
+    @property
+    def size(self) -> int:
+        return len(self._levels[0])
+
+    def append(self, chain_hash: str) -> int:
+        """Add a chain hash as the next leaf. Returns its leaf index."""
+        index = self.size
+        node = _leaf_hash(chain_hash)
+        self._levels[0].append(node)
+
+        # Close every subtree this leaf completes
+        level, position = 0, index
+        while position & 1:
+            node = _node_hash(self._levels[level][position - 1], node)
+            level += 1
+            position >>= 1
+            if level == len(self._levels):
+                self._levels.append([])
+            self._levels[level].append(node)
+        return index
+
+    def root(self, tree_size: int | None = None) -> str:
+        """Merkle root over the first tree_size leaves (default: all)."""
+        if tree_size is None:
+            tree_size = self.size
+        if not 0 <= tree_size <= self.size:
+            raise ValueError(f"tree_size {tree_size} out of range (size {self.size})")
+        if tree_size == 0:
+            return hashlib.sha256(b"").hexdigest()
+        return self._subtree(0, tree_size).hex()
+
+    def inclusion_proof(self, index: int, tree_size: int | None = None) -> list[str]:
+        """
+        Audit path for leaf `index` in the tree of the first tree_size leaves.
+
+        Returns sibling hashes from the leaf upwards (RFC 6962 PATH).
+        """
+        if tree_size is None:
+            tree_size = self.size
+        if not 0 <= index < tree_size <= self.size:
+            raise ValueError(f"leaf {index} not in tree of size {tree_size}")
+
+        path: list[bytes] = []
+        start, size, m = 0, tree_size, index
+        while size > 1:
+            k = _split_point(size)
+            if m < k:
+                path.append(self._subtree(start + k, size - k))
+                size = k
+            else:
+                path.append(self._subtree(start, k))
+                start, size, m = start + k, size - k, m - k
+        return [h.hex() for h in reversed(path)]
+
+    def _subtree(self, start: int, size: int) -> bytes:
+        """Hash of leaves [start, start + size) as RFC 6962 defines it."""
+        if size & (size - 1) == 0 and start % size == 0:
+            return self._levels[size.bit_length() - 1][start // size]
+        k = _split_point(size)
+        return _node_hash(self._subtree(start, k), self._subtree(start + k, size - k))
+
+
+def verify_inclusion(
+    chain_hash: str,
+    index: int,
+    tree_size: int,
+    proof: list[str],
+    root: str,
+) -> bool:
+    """
+    Check that chain_hash is leaf `index` of the tree with the given root.
+
+    Costs len(proof) = O(log tree_size) hashes (RFC 9162 section 2.1.3.2).
+    """
+    if not 0 <= index < tree_size:
+        return False
+
+    fn, sn = index, tree_size - 1
+    r = _leaf_hash(chain_hash)
+    for sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = _node_hash(sibling, r)
+            if not fn & 1:
+                while not fn & 1 and fn != 0:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = _node_hash(r, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r.hex() == root
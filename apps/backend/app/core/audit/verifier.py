@@ -4,12 +4,16 @@ Chain Verifier Module
 Verifies integrity of the hash-chained audit log.
 """
 
+import os
+import time
+import weakref
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 
 from app.models.audit import AuditEvent, AuditChain
-from .hasher import HashChain, verify_hash_integrity
+from .hasher import HASH_FIELDS, HashChain, find_hash_mismatches, verify_hash_integrity
+from config import config
 
 
 class VerificationStatus(str, Enum):
@@ -33,6 +37,15 @@ class VerificationResult:
     latest_hash: str
     verified_at: datetime
     
+    # Work actually done this call; events_trusted is the prefix taken
+    # from an earlier pass without rehashing
+    events_rehashed: int = 0
+    events_trusted: int = 0
+    incremental: bool = False
+    workers: int = 1
+    elapsed_sec: float = 0.0
+    events_per_sec: float = 0.0
+    
     def to_dict(self) -> dict:
         return {
             "status": self.status.value,
@@ -45,6 +58,12 @@ class VerificationResult:
             "genesis_hash": self.genesis_hash,
             "latest_hash": self.latest_hash,
             "verified_at": self.verified_at.isoformat(),
+            "events_rehashed": self.events_rehashed,
+            "events_trusted": self.events_trusted,
+            "incremental": self.incremental,
+            "workers": self.workers,
+            "elapsed_sec": self.elapsed_sec,
+            "events_per_sec": self.events_per_sec,
         }
 
 
@@ -54,15 +73,45 @@ class ChainVerifier:
     
     The verifier iterates through all events, recomputing hashes
     and checking continuity to detect any tampering.
+    
+    It remembers the length and last hash of the prefix it has already
+    verified, so calling it again on the same, grown chain only checks
+    the new tail. The prefix is tied to the sequence object it was
+    verified on (e.g. the ledger's ChainStore), so a reloaded chain is
+    verified from the start again. Only the boundary hash of a trusted
+    prefix is checked, so an in-place edit of an earlier event is caught
+    only by a full pass (incremental=False). Large re-verifications
+    recompute hashes in a process pool; continuity is still checked in
+    order in this process.
     """
     
-    def __init__(self):
+    def __init__(self, workers: int | None = None, parallel_min_events: int | None = None):
         self._hash_chain = HashChain()
+        self._workers = min(workers or config.audit_verify_workers or os.cpu_count() or 1, os.cpu_count() or 1)
+        self._parallel_min_events = (
+            parallel_min_events if parallel_min_events is not None
+            else config.audit_verify_parallel_min_events
+        )
+        
+        # Verified prefix: genesis it chained from, event count, last current_hash
+        self._verified_genesis: str | None = None
+        self._verified_count = 0
+        self._verified_hash: str | None = None
+        # Sequence the prefix was verified on (None for plain lists)
+        self._verified_source: weakref.ref | None = None
+    
+    def reset(self) -> None:
+        """Forget the verified prefix so the next call re-verifies everything"""
+        self._verified_genesis = None
+        self._verified_count = 0
+        self._verified_hash = None
+        self._verified_source = None
     
     def verify_chain(
         self,
         events: list[AuditEvent] | list[dict],
         genesis_hash: str | None = None,
+        incremental: bool = True,
     ) -> VerificationResult:
         """
         Verify the integrity of an audit chain.
@@ -70,11 +119,14 @@ class ChainVerifier:
         Args:
             events: List of audit events to verify
             genesis_hash: Expected genesis hash (defaults to standard)
+            incremental: Skip the prefix verified by an earlier call, if it
+                still ends at the same hash in this chain
             
         Returns:
             VerificationResult with detailed status
         """
         verified_at = datetime.utcnow()
+        started = time.perf_counter()
         
         if not events:
             return VerificationResult(
@@ -93,25 +145,28 @@ class ChainVerifier:
         if genesis_hash is None:
             genesis_hash = HashChain.GENESIS_HASH
         
-        # Convert to dicts if needed
-        event_dicts = []
-        for event in events:
-            if isinstance(event, AuditEvent):
-                event_dicts.append(event.model_dump(mode="json"))
-            else:
-                event_dicts.append(event)
+        start = self._resume_index(events, genesis_hash) if incremental else 0
         
-        events_passed = 0
+        # Convert to dicts if needed (only the part being checked)
+        event_dicts = [self._as_dict(event) for event in events[start:]]
+        
+        workers = self._workers if len(event_dicts) >= self._parallel_min_events else 1
+        mismatches = set(find_hash_mismatches(event_dicts, workers=workers))
+        
+        events_passed = start
         first_failure_index = None
         error_message = None
+        prev_hash = genesis_hash if start == 0 else self._verified_hash
         
-        for i, event in enumerate(event_dicts):
+        for offset, event in enumerate(event_dicts):
+            i = start + offset
             is_valid, error = self._verify_single_event(
-                event, 
-                i, 
-                event_dicts[i - 1] if i > 0 else None,
-                genesis_hash,
+                event,
+                i,
+                prev_hash,
+                hash_ok=offset not in mismatches,
             )
+            prev_hash = event.get("current_hash")
             
             if is_valid:
                 events_passed += 1
@@ -120,7 +175,7 @@ class ChainVerifier:
                     first_failure_index = i
                     error_message = error
         
-        events_failed = len(event_dicts) - events_passed
+        events_failed = len(events) - events_passed
         is_valid = events_failed == 0
         
         # Determine status
@@ -132,30 +187,84 @@ class ChainVerifier:
             status = VerificationStatus.FAIL
         
         # Get hashes
-        first_event = event_dicts[0]
-        last_event = event_dicts[-1]
+        first_hash = self._current_hash(events[0])
+        latest_hash = self._current_hash(events[-1])
+        
+        if is_valid:
+            self._verified_genesis = genesis_hash
+            self._verified_count = len(events)
+            self._verified_hash = latest_hash
+            self._verified_source = self._source_ref(events)
+        
+        elapsed = time.perf_counter() - started
         
         return VerificationResult(
             status=status,
             is_valid=is_valid,
-            events_checked=len(event_dicts),
+            events_checked=len(events),
             events_passed=events_passed,
             events_failed=events_failed,
             first_failure_index=first_failure_index,
             error_message=error_message,
-            genesis_hash=first_event.get("current_hash", ""),
-            latest_hash=last_event.get("current_hash", ""),
+            genesis_hash=first_hash,
+            latest_hash=latest_hash,
             verified_at=verified_at,
+            events_rehashed=len(event_dicts),
+            events_trusted=start,
+            incremental=start > 0,
+            workers=workers,
+            elapsed_sec=elapsed,
+            events_per_sec=len(event_dicts) / elapsed if elapsed > 0 else 0.0,
         )
     
+    def _resume_index(self, events: list, genesis_hash: str) -> int:
+        """Index to resume from, or 0 if the remembered prefix doesn't match"""
+        count = self._verified_count
+        source = self._verified_source
+        if source is not None and source() is not events:
+            return 0
+        if (
+            count
+            and self._verified_genesis == genesis_hash
+            and count <= len(events)
+            and self._current_hash(events[count - 1]) == self._verified_hash
+        ):
+            return count
+        return 0
+    
+    @staticmethod
+    def _source_ref(events) -> weakref.ref | None:
+        try:
+            return weakref.ref(events)
+        except TypeError:
+            # Lists can't be weakly referenced; fall back to the hash check
+            return None
+    
+    @staticmethod
+    def _as_dict(event: AuditEvent | dict) -> dict:
+        if isinstance(event, AuditEvent):
+            return event.model_dump(mode="json")
+        return event
+    
+    @staticmethod
+    def _current_hash(event: AuditEvent | dict) -> str:
+        if isinstance(event, AuditEvent):
+            return event.current_hash or ""
+        return event.get("current_hash", "")
+    
     def _verify_single_event(
         self,
         event: dict,
         index: int,
-        prev_event: dict | None,
-        genesis_hash: str,
+        expected_prev_hash: str | None,
+        hash_ok: bool | None = None,
     ) -> tuple[bool, str | None]:
-        """Verify a single event in the chain"""
+        """
+        Verify a single event in the chain.
+        
+        hash_ok carries a hash check already done in bulk; if None the
+        hash is recomputed here.
+        """
         recorded_prev_hash = event.get("prev_hash")
         recorded_current_hash = event.get("current_hash")
         
@@ -164,28 +273,26 @@ class ChainVerifier:
             return False, f"Event {index} missing hash fields"
         
         # Check chain continuity
-        if index == 0:
-            # First event should chain from genesis
-            if recorded_prev_hash != genesis_hash:
+        if recorded_prev_hash != expected_prev_hash:
+            if index == 0:
+                # First event should chain from genesis
                 return False, f"Event 0 prev_hash doesn't match genesis"
-        else:
             # Should chain from previous event
-            if prev_event and recorded_prev_hash != prev_event.get("current_hash"):
-                return False, f"Event {index} prev_hash doesn't match previous current_hash"
+            return False, f"Event {index} prev_hash doesn't match previous current_hash"
         
         # Recompute hash to verify
-        event_data = self._extract_hashable_data(event)
-        computed_hash = self._hash_chain.compute_hash(event_data, recorded_prev_hash)
+        if hash_ok is None:
+            event_data = self._extract_hashable_data(event)
+            hash_ok = self._hash_chain.compute_hash(event_data, recorded_prev_hash) == recorded_current_hash
         
-        if computed_hash != recorded_current_hash:
+        if not hash_ok:
             return False, f"Event {index} hash mismatch"
         
         return True, None
     
     def _extract_hashable_data(self, event: dict) -> dict:
         """Extract the data that should be hashed (excludes hash fields)"""
-        exclude_keys = {"prev_hash", "current_hash", "anchor_tx_sig"}
-        return {k: v for k, v in event.items() if k not in exclude_keys}
+        return {k: v for k, v in event.items() if k not in HASH_FIELDS}
     
     def verify_single_hash(
         self,
@@ -227,6 +334,18 @@ class ChainVerifier:
         return True
 
 
+# Shared verifier for the live ledger, so repeat checks only cover new events
+_chain_verifier: ChainVerifier | None = None
+
+
+def get_chain_verifier() -> ChainVerifier:
+    """Get the shared ChainVerifier instance"""
+    global _chain_verifier
+    if _chain_verifier is None:
+        _chain_verifier = ChainVerifier()
+    return _chain_verifier
+
+
 def verify_audit_chain(events: list[AuditEvent]) -> dict:
     """
     Convenience function to verify an audit chain.
@@ -123,7 +123,7 @@ class DecisionEngine:
                 print(f"Warning: Could not initialize DecisionRepository: {e}")
     
     def _persist_decision(self, card: DecisionCard, scenario_id: Optional[str] = None, incident_id: Optional[str] = None):
-        """Persist decision to MongoDB if enabled"""
+        """Queue decision for write-behind persistence to MongoDB if enabled"""
         if self._repo:
             try:
                 # Get metadata from stored mapping if not provided
@@ -155,7 +155,7 @@ class DecisionEngine:
                     }
                     for action in card.allowed_actions
                 ]
-                self._repo.upsert_decision(card_dict)
+                self._repo.queue_upsert("card_id", card_dict)
             except Exception as e:
                 print(f"Warning: Failed to persist decision to MongoDB: {e}")
     
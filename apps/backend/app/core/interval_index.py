@@ -0,0 +1,223 @@
+"""
+Interval Index Module
+
+Answers "what was active at t" and "what overlapped [lo, hi]" without
+scanning every record.
+
+Intervals are half-open, start <= t < end, with end=None meaning still
+open. They are partitioned by a key (e.g. tag_id, or (tag_id, reason_code))
+and each partition keeps a centered interval tree for closed intervals
+plus a start-sorted list for open ones, so stabbing and range queries cost
+O(log n + k). Results come back in insertion order.
+"""
+
+from bisect import bisect_right
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+# Newly added closed intervals are scanned linearly until there are this
+# many, then frozen into a tree block
+_BLOCK_MIN = 32
+
+# Interval record: (start, end, seq, value)
+_Interval = tuple[Any, Any, int, Any]
+
+
+def _start(iv: _Interval) -> Any:
+    return iv[0]
+
+
+def _end(iv: _Interval) -> Any:
+    return iv[1]
+
+
+class _Node:
+    """Centered interval tree node over closed intervals containing `center`"""
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: list[_Interval]):
+        """intervals must be sorted by start"""
+        # The median interval contains its own start, so every node keeps at least one
+        self.center = intervals[len(intervals) // 2][0]
+
+        left, right, here = [], [], []
+        for iv in intervals:
+            if iv[1] <= self.center:
+                left.append(iv)
+            elif iv[0] > self.center:
+                right.append(iv)
+            else:
+                here.append(iv)
+
+        self.by_start = here
+        self.by_end = sorted(here, key=_end, reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+    def stab(self, t: Any, out: list[_Interval]) -> None:
+        node = self
+        while node is not None:
+            if t < node.center:
+                for iv in node.by_start:
+                    if iv[0] > t:
+                        break
+                    out.append(iv)
+                node = node.left
+            else:
+                for iv in node.by_end:
+                    if iv[1] <= t:
+                        break
+                    out.append(iv)
+                node = node.right
+
+    def overlapping(self, lo: Any, hi: Any, out: list[_Interval]) -> None:
+        if hi < self.center:
+            for iv in self.by_start:
+                if iv[0] > hi:
+                    break
+                out.append(iv)
+            if self.left:
+                self.left.overlapping(lo, hi, out)
+        elif lo >= self.center:
+            for iv in self.by_end:
+                if iv[1] <= lo:
+                    break
+                out.append(iv)
+            if self.right:
+                self.right.overlapping(lo, hi, out)
+        else:
+            out.extend(self.by_start)
+            if self.left:
+                self.left.overlapping(lo, hi, out)
+            if self.right:
+                self.right.overlapping(lo, hi, out)
+
+
+class _Partition:
+    """
+    Intervals sharing one key.
+
+    Closed intervals are buffered, then frozen into trees whose sizes
+    roughly double (merged when a newer block catches up with an older
+    one), so appends are amortised O(log^2 n) and a query visits O(log n) trees.
+    """
+
+    __slots__ = ("blocks", "pending", "open_starts", "open_intervals")
+
+    def __init__(self):
+        self.blocks: list[tuple[list[_Interval], _Node]] = []
+        self.pending: list[_Interval] = []
+        # Open-ended intervals, sorted by start
+        self.open_starts: list[Any] = []
+        self.open_intervals: list[_Interval] = []
+
+    def add(self, interval: _Interval) -> None:
+        if interval[1] is None:
+            i = bisect_right(self.open_starts, interval[0])
+            self.open_starts.insert(i, interval[0])
+            self.open_intervals.insert(i, interval)
+            return
+        self.pending.append(interval)
+        if len(self.pending) >= _BLOCK_MIN:
+            self.freeze()
+
+    def freeze(self) -> None:
+        """Move pending intervals into a tree block"""
+        if not self.pending:
+            return
+        block, self.pending = sorted(self.pending, key=_start), []
+        while self.blocks and len(self.blocks[-1][0]) <= len(block):
+            # Two start-sorted runs; timsort merges them in linear time
+            block = sorted(self.blocks.pop()[0] + block, key=_start)
+        self.blocks.append((block, _Node(block)))
+
+    def stab(self, t: Any, out: list[_Interval]) -> None:
+        for _, tree in self.blocks:
+            tree.stab(t, out)
+        out.extend(iv for iv in self.pending if iv[0] <= t < iv[1])
+        out.extend(self.open_intervals[:bisect_right(self.open_starts, t)])
+
+    def overlapping(self, lo: Any, hi: Any, out: list[_Interval]) -> None:
+        for _, tree in self.blocks:
+            tree.overlapping(lo, hi, out)
+        out.extend(iv for iv in self.pending if iv[0] <= hi and iv[1] > lo)
+        out.extend(self.open_intervals[:bisect_right(self.open_starts, hi)])
+
+
+class IntervalIndex:
+    """
+    Half-open intervals [start, end) partitioned by key.
+
+    Endpoints may be any mutually comparable type (floats, datetimes).
+    Empty intervals (end <= start) are never returned by queries.
+    """
+
+    def __init__(self):
+        self._partitions: dict[Hashable, _Partition] = {}
+        self._seq = 0
+        # Stored intervals; empty ones are dropped
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, start: Any, end: Any | None, value: Any, key: Hashable = None) -> None:
+        """Index value as active over [start, end); end=None keeps it open"""
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition()
+        self._seq += 1
+        if end is not None and end <= start:
+            return
+        partition.add((start, end, self._seq, value))
+        self._size += 1
+
+    def extend(self, items: Iterable[tuple[Any, Any | None, Any, Hashable]]) -> None:
+        """Add (start, end, value, key) tuples, building each touched partition once"""
+        touched = set()
+        for start, end, value, key in items:
+            partition = self._partitions.get(key)
+            if partition is None:
+                partition = self._partitions[key] = _Partition()
+            self._seq += 1
+            if end is None:
+                partition.add((start, end, self._seq, value))
+            elif start < end:
+                partition.pending.append((start, end, self._seq, value))
+                touched.add(key)
+            else:
+                continue
+            self._size += 1
+        for key in touched:
+            self._partitions[key].freeze()
+
+    def keys(self) -> list[Hashable]:
+        return list(self._partitions)
+
+    def stab(self, t: Any, key: Hashable = None, all_keys: bool = False) -> list[Any]:
+        """Values active at t (start <= t < end), in insertion order"""
+        found: list[_Interval] = []
+        for partition in self._select(key, all_keys):
+            partition.stab(t, found)
+        found.sort(key=lambda iv: iv[2])
+        return [iv[3] for iv in found]
+
+    def overlapping(self, lo: Any, hi: Any, key: Hashable = None, all_keys: bool = False) -> list[Any]:
+        """Values whose interval meets [lo, hi] (start <= hi and end > lo), in insertion order"""
+        found: list[_Interval] = []
+        for partition in self._select(key, all_keys):
+            partition.overlapping(lo, hi, found)
+        found.sort(key=lambda iv: iv[2])
+        return [iv[3] for iv in found]
+
+    def clear(self) -> None:
+        self._partitions.clear()
+        self._seq = 0
+        self._size = 0
+
+    def _select(self, key: Hashable, all_keys: bool) -> Iterable[_Partition]:
+        if all_keys:
+            return self._partitions.values()
+        partition = self._partitions.get(key)
+        return (partition,) if partition is not None else ()
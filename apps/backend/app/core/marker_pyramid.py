@@ -0,0 +1,203 @@
+"""
+Marker Pyramid - Multi-resolution summaries of timeline markers.
+
+Level 0 buckets markers into fixed windows of `base_sec`; each level above
+doubles the window. Every bucket keeps a small summary (count, per-type
+counts, first/last timestamp), built once per marker list and updated in
+place as markers arrive, so a zoomed-out
+view reads O(buckets) summaries from the level that matches the
+requested span instead of re-clustering every marker. Buckets cut by the
+edge of the requested range are assembled from finer levels, scanning raw
+markers only inside a level-0 window.
+"""
+
+from bisect import bisect_left, bisect_right, insort_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from math import floor
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional
+
+from app.models.temporal import MarkerCluster, MarkerType, TimelineMarker
+
+_timestamp = attrgetter("timestamp")
+
+
+@dataclass
+class BucketSummary:
+    """Aggregate of the markers in one time window"""
+    count: int = 0
+    first: Optional[datetime] = None
+    last: Optional[datetime] = None
+    # Marker type -> count, in order of first appearance
+    type_counts: Dict[MarkerType, int] = field(default_factory=dict)
+    contradictions: int = 0
+
+    def add(self, marker: TimelineMarker) -> None:
+        self.count += 1
+        if self.first is None or marker.timestamp < self.first:
+            self.first = marker.timestamp
+        if self.last is None or marker.timestamp >= self.last:
+            self.last = marker.timestamp
+        self.type_counts[marker.marker_type] = self.type_counts.get(marker.marker_type, 0) + 1
+        self.contradictions += marker.has_contradiction
+
+    def merge(self, other: "BucketSummary") -> None:
+        """Fold in a summary of later markers"""
+        if not other.count:
+            return
+        self.count += other.count
+        self.first = other.first if self.first is None else min(self.first, other.first)
+        self.last = other.last if self.last is None else max(self.last, other.last)
+        for marker_type, count in other.type_counts.items():
+            self.type_counts[marker_type] = self.type_counts.get(marker_type, 0) + count
+        self.contradictions += other.contradictions
+
+    def to_cluster(self) -> MarkerCluster:
+        # First type to reach the highest count wins ties, as Counter.most_common does
+        dominant = max(self.type_counts.items(), key=lambda item: item[1])[0]
+        return MarkerCluster(
+            start_time=self.first,
+            end_time=self.last,
+            count=self.count,
+            dominant_type=dominant,
+            label=f"{self.count} {dominant.value.replace('_', ' ').title()}s",
+            type_counts=dict(self.type_counts),
+            has_contradiction=self.contradictions > 0,
+        )
+
+
+class MarkerPyramid:
+    """
+    Level-of-detail index over timeline markers.
+
+    Owns the time-sorted marker list that range reads and drill-down
+    bisect into; the bucket summaries are derived from it in build() and
+    kept current by add().
+    """
+
+    def __init__(self, base_sec: float = 1.0, levels: int = 24):
+        self.base_sec = base_sec
+        self.levels = levels
+        self._origin: Optional[datetime] = None
+        self._buckets: List[Dict[int, BucketSummary]] = [{} for _ in range(levels)]
+        self._markers: List[TimelineMarker] = []
+
+    def __len__(self) -> int:
+        return len(self._markers)
+
+    # =========================================================================
+    # Building
+    # =========================================================================
+
+    def build(self, markers: Iterable[TimelineMarker]) -> None:
+        """Index `markers`, replacing any earlier ones (ties keep their given order)"""
+        self._markers = sorted(markers, key=_timestamp)
+        self._buckets = [{} for _ in range(self.levels)]
+        self._origin = self._markers[0].timestamp if self._markers else None
+        for marker in self._markers:
+            self._summarize_marker(marker)
+
+    def add(self, marker: TimelineMarker) -> None:
+        """Index one more marker, after any with the same timestamp"""
+        insort_right(self._markers, marker, key=_timestamp)
+        if self._origin is None:
+            self._origin = marker.timestamp
+        # Markers before the origin land in negative buckets
+        self._summarize_marker(marker)
+
+    def _summarize_marker(self, marker: TimelineMarker) -> None:
+        offset = self._offset(marker.timestamp)
+        for level in range(self.levels):
+            bucket = floor(offset / self._width(level))
+            summary = self._buckets[level].get(bucket)
+            if summary is None:
+                summary = self._buckets[level][bucket] = BucketSummary()
+            summary.add(marker)
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def markers(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[TimelineMarker]:
+        """Markers with start <= timestamp <= end, in time order"""
+        lo = bisect_left(self._markers, start, key=_timestamp) if start else 0
+        hi = bisect_right(self._markers, end, key=_timestamp) if end else len(self._markers)
+        return self._markers[lo:hi]
+
+    def count(self, start: datetime, end: datetime) -> int:
+        return max(0, bisect_right(self._markers, end, key=_timestamp) - bisect_left(self._markers, start, key=_timestamp))
+
+    def level_for(self, start: datetime, end: datetime, max_clusters: int) -> int:
+        """Finest level whose buckets split [start, end] into at most max_clusters windows"""
+        span = (end - start).total_seconds()
+        target = span / max(1, max_clusters - 1)
+        for level in range(self.levels):
+            if self._width(level) >= target:
+                return level
+        return self.levels - 1
+
+    def clusters(self, start: datetime, end: datetime, max_clusters: int) -> List[BucketSummary]:
+        """
+        Non-empty bucket summaries covering [start, end], in time order.
+
+        Reads O(max_clusters) buckets from the matching level; edge buckets
+        only count markers inside the range.
+        """
+        if self._origin is None or end < start:
+            return []
+        level = self.level_for(start, end, max_clusters)
+        width = self._width(level)
+        lo, hi = self._offset(start), self._offset(end)
+
+        summaries = []
+        for bucket in range(floor(lo / width), floor(hi / width) + 1):
+            summary = self._summarize(level, bucket, lo, hi, start, end)
+            if summary is not None and summary.count:
+                summaries.append(summary)
+        return summaries
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _width(self, level: int) -> float:
+        return self.base_sec * (1 << level)
+
+    def _offset(self, timestamp: datetime) -> float:
+        return (timestamp - self._origin).total_seconds()
+
+    def _summarize(
+        self,
+        level: int,
+        bucket: int,
+        lo: float,
+        hi: float,
+        start: datetime,
+        end: datetime,
+    ) -> Optional[BucketSummary]:
+        """Summary of the markers in `bucket` that fall inside [lo, hi]"""
+        summary = self._buckets[level].get(bucket)
+        if summary is None:
+            return None
+        width = self._width(level)
+        if (bucket + 1) * width <= lo or bucket * width > hi:
+            return None
+        if lo <= bucket * width and (bucket + 1) * width <= hi:
+            return summary
+
+        if level == 0:
+            # Partial level-0 window: count its markers directly
+            partial = BucketSummary()
+            first = max(start, summary.first)
+            last = min(end, summary.last)
+            for marker in self.markers(first, last):
+                partial.add(marker)
+            return partial
+
+        partial = BucketSummary()
+        for child in (2 * bucket, 2 * bucket + 1):
+            child_summary = self._summarize(level - 1, child, lo, hi, start, end)
+            if child_summary is not None:
+                partial.merge(child_summary)
+        return partial
@@ -13,12 +13,16 @@ from .converter import (
     get_video_sensor_csv_rows,
     overshoot_to_event_rows,
     overshoot_to_telemetry_rows,
+    ts_to_iso,
 )
+from .telemetry_store import ColumnarTelemetryStore
 from .video_manager import VideoDisasterManager
 
 __all__ = [
+    "ColumnarTelemetryStore",
     "VideoDisasterManager",
     "get_video_sensor_csv_rows",
     "overshoot_to_event_rows",
     "overshoot_to_telemetry_rows",
+    "ts_to_iso",
 ]
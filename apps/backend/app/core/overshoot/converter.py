@@ -42,7 +42,8 @@ UNITS = {
 }
 
 
-def _ts_to_iso(ms: int) -> str:
+def ts_to_iso(ms: int) -> str:
+    """Epoch milliseconds as the UTC ISO8601 string used in the telemetry/events CSV."""
     return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
 
 
@@ -52,7 +53,7 @@ def overshoot_to_telemetry_rows(rec: OvershootDisasterRecord, time_sec: float) -
 
     CSV columns: timestamp,tag_id,sensor_name,value,unit,quality,time_sec,redundancy_group
     """
-    ts = _ts_to_iso(rec.timestamp_ms)
+    ts = ts_to_iso(rec.timestamp_ms)
     smoke_val = SMOKE_LEVEL_MAP.get(rec.smoke_level.lower(), 0.0) if rec.smoke_level else 0.0
     damage_val = (
         STRUCTURAL_DAMAGE_MAP.get(rec.structural_damage.lower(), 0.0) if rec.structural_damage else 0.0
@@ -133,7 +134,7 @@ def overshoot_to_event_rows(
 
     CSV columns: timestamp,time_sec,event_type,severity,tag_id,reason_code,description,action_required
     """
-    ts = _ts_to_iso(rec.timestamp_ms)
+    ts = ts_to_iso(rec.timestamp_ms)
     events: list[dict] = []
 
     def ev(etype: str, sev: str, tag: str, desc: str, action: bool = True) -> None:
@@ -0,0 +1,200 @@
+"""
+Columnar telemetry store for the video disaster scenario.
+
+Append-only, per-tag segments on disk: one raw column file each for
+time_sec, value and timestamp_ms. Reads memory-map the columns with NumPy
+and answer point/range lookups with a binary search over a sorted-time
+index, so query cost does not grow with re-parsing text.
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+# Column name -> dtype. Each column is stored as <tag>.<column>.bin
+COLUMNS = {
+    "time_sec": np.float64,
+    "value": np.float64,
+    "timestamp_ms": np.int64,
+}
+
+# Tag ids in the order they were first written, one per line
+TAGS_FILE = "tags.txt"
+
+
+class _TagSegment:
+    """Append-only column files for a single tag_id."""
+
+    def __init__(self, directory: Path, tag_id: str):
+        self.tag_id = tag_id
+        self._paths = {name: directory / f"{tag_id}.{name}.bin" for name in COLUMNS}
+        self._length = 0
+        self._last_time: float | None = None
+        self._sorted = True
+
+        # Cached memory maps and sorted-time index, valid for _mapped_length rows
+        self._mapped_length = -1
+        self._columns: dict[str, np.ndarray] = {}
+        self._order: np.ndarray | None = None
+        self._sorted_time: np.ndarray | None = None
+
+        if self._paths["time_sec"].exists():
+            self._length = self._paths["time_sec"].stat().st_size // np.dtype(np.float64).itemsize
+            if self._length:
+                time_sec = self._map()["time_sec"]
+                self._last_time = float(time_sec[-1])
+                self._sorted = bool(np.all(np.diff(time_sec) >= 0))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, time_sec: np.ndarray, value: np.ndarray, timestamp_ms: np.ndarray) -> None:
+        """Append rows to every column file."""
+        if not len(time_sec):
+            return
+        if self._sorted:
+            if self._last_time is not None and time_sec[0] < self._last_time:
+                self._sorted = False
+            elif np.any(np.diff(time_sec) < 0):
+                self._sorted = False
+        for name, data in (("time_sec", time_sec), ("value", value), ("timestamp_ms", timestamp_ms)):
+            with open(self._paths[name], "ab") as f:
+                f.write(np.ascontiguousarray(data, dtype=COLUMNS[name]).tobytes())
+        self._length += len(time_sec)
+        self._last_time = float(time_sec[-1])
+
+    def _map(self) -> dict[str, np.ndarray]:
+        """Memory-map the columns, remapping only if rows were appended."""
+        if self._mapped_length != self._length:
+            if self._length:
+                self._columns = {
+                    name: np.memmap(path, dtype=COLUMNS[name], mode="r", shape=(self._length,))
+                    for name, path in self._paths.items()
+                }
+            else:
+                self._columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+            self._mapped_length = self._length
+            self._order = None
+            self._sorted_time = None
+        return self._columns
+
+    def _index(self) -> tuple[np.ndarray, np.ndarray | None]:
+        """Sorted time_sec plus the permutation into file order (None if already sorted)."""
+        columns = self._map()
+        if self._sorted:
+            return columns["time_sec"], None
+        if self._sorted_time is None:
+            # Stable sort keeps file order within equal timestamps
+            self._order = np.argsort(columns["time_sec"], kind="stable")
+            self._sorted_time = columns["time_sec"][self._order]
+        return self._sorted_time, self._order
+
+    def latest_at(self, time_sec: float) -> tuple[float, float, int] | None:
+        """Latest (time_sec, value, timestamp_ms) with time_sec <= time_sec."""
+        sorted_time, order = self._index()
+        i = int(np.searchsorted(sorted_time, time_sec, side="right")) - 1
+        if i < 0:
+            return None
+        row = i if order is None else int(order[i])
+        columns = self._columns
+        return float(columns["time_sec"][row]), float(columns["value"][row]), int(columns["timestamp_ms"][row])
+
+    def range(self, start_sec: float, end_sec: float) -> dict[str, np.ndarray]:
+        """Columns for rows with start_sec <= time_sec <= end_sec, in time order."""
+        sorted_time, order = self._index()
+        lo = int(np.searchsorted(sorted_time, start_sec, side="left"))
+        hi = int(np.searchsorted(sorted_time, end_sec, side="right"))
+        if order is None:
+            return {name: column[lo:hi] for name, column in self._columns.items()}
+        rows = order[lo:hi]
+        return {name: column[rows] for name, column in self._columns.items()}
+
+
+class ColumnarTelemetryStore:
+    """
+    Per-tag columnar telemetry segments under a single directory.
+
+    Tags are returned in the order they were first written, which is
+    kept in TAGS_FILE so a reopened store keeps it too.
+    """
+
+    def __init__(self, directory: Path):
+        self._directory = Path(directory)
+        self._segments: dict[str, _TagSegment] = {}
+        if self._directory.exists():
+            tags_path = self._directory / TAGS_FILE
+            listed = tags_path.read_text(encoding="utf-8").splitlines() if tags_path.exists() else []
+            found = {path.name[: -len(".time_sec.bin")] for path in self._directory.glob("*.time_sec.bin")}
+            # Segments missing from the tags file (older directories) go last, by tag_id
+            for tag_id in [t for t in listed if t in found] + sorted(found - set(listed)):
+                self._segments[tag_id] = _TagSegment(self._directory, tag_id)
+
+    def reset(self) -> None:
+        """Delete all segments and start empty."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        for path in self._directory.glob("*.bin"):
+            path.unlink()
+        (self._directory / TAGS_FILE).unlink(missing_ok=True)
+        self._segments = {}
+
+    def append_rows(self, rows: Iterable[tuple[str, float, float | None, int]]) -> int:
+        """
+        Append (tag_id, time_sec, value, timestamp_ms) rows.
+
+        Rows are grouped per tag and written as one batch per column.
+        A value of None is stored as NaN. Returns the number of rows written.
+        """
+        batches: dict[str, list[tuple[float, float, int]]] = {}
+        for tag_id, time_sec, value, timestamp_ms in rows:
+            if not tag_id:
+                continue
+            batches.setdefault(tag_id, []).append(
+                (time_sec, np.nan if value is None else value, timestamp_ms)
+            )
+
+        if batches:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+        new_tags = [tag_id for tag_id in batches if tag_id not in self._segments]
+        if new_tags:
+            with open(self._directory / TAGS_FILE, "a", encoding="utf-8") as f:
+                f.writelines(f"{tag_id}\n" for tag_id in new_tags)
+
+        written = 0
+        for tag_id, batch in batches.items():
+            segment = self._segments.get(tag_id)
+            if segment is None:
+                segment = self._segments[tag_id] = _TagSegment(self._directory, tag_id)
+            time_sec, value, timestamp_ms = zip(*batch)
+            segment.append(
+                np.asarray(time_sec, dtype=np.float64),
+                np.asarray(value, dtype=np.float64),
+                np.asarray(timestamp_ms, dtype=np.int64),
+            )
+            written += len(batch)
+        return written
+
+    def tags(self) -> list[str]:
+        return list(self._segments)
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self._segments.values())
+
+    def latest_at(self, time_sec: float) -> dict[str, tuple[float, float, int]]:
+        """{ tag_id: (time_sec, value, timestamp_ms) } for the latest row at or before time_sec."""
+        out: dict[str, tuple[float, float, int]] = {}
+        for tag_id, segment in self._segments.items():
+            row = segment.latest_at(time_sec)
+            if row is not None:
+                out[tag_id] = row
+        return out
+
+    def range(self, start_sec: float, end_sec: float) -> dict[str, dict[str, np.ndarray]]:
+        """{ tag_id: {column: array} } for rows with start_sec <= time_sec <= end_sec."""
+        out: dict[str, dict[str, np.ndarray]] = {}
+        for tag_id, segment in self._segments.items():
+            columns = segment.range(start_sec, end_sec)
+            if len(columns["time_sec"]):
+                out[tag_id] = columns
+        return out
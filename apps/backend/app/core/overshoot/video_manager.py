@@ -2,10 +2,12 @@
 Video Disaster scenario manager.
 
 Handles start/stop, ingest of Overshoot JSON, and telemetry/event CSV persistence
-for the live video disaster scenario.
+for the live video disaster scenario. Telemetry reads are served from a
+columnar store; the telemetry CSV is kept as an output format only.
 """
 
 import csv
+import math
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -16,7 +18,9 @@ from .converter import (
     get_video_sensor_csv_rows,
     overshoot_to_event_rows,
     overshoot_to_telemetry_rows,
+    ts_to_iso,
 )
+from .telemetry_store import ColumnarTelemetryStore
 
 TELEMETRY_FIELDS = [
     "timestamp", "tag_id", "sensor_name", "value", "unit", "quality", "time_sec", "redundancy_group"
@@ -41,6 +45,7 @@ class VideoDisasterManager:
         self._telemetry_path = self._base_path / "video_disaster_telemetry.csv"
         self._events_path = self._base_path / "video_disaster_events.csv"
         self._sensors_path = self._base_path / "video_disaster_sensors.csv"
+        self._store = ColumnarTelemetryStore(self._base_path / "video_disaster_telemetry")
 
         self._base_ts_ms: int | None = None
         self._last_rec: OvershootDisasterRecord | None = None
@@ -55,6 +60,7 @@ class VideoDisasterManager:
         self._running = True
 
         self._base_path.mkdir(parents=True, exist_ok=True)
+        self._store.reset()
 
         with open(self._telemetry_path, "w", newline="", encoding="utf-8") as f:
             w = csv.DictWriter(f, fieldnames=TELEMETRY_FIELDS)
@@ -79,7 +85,8 @@ class VideoDisasterManager:
         records: OvershootDisasterRecord | list[OvershootDisasterRecord] | list[dict],
     ) -> dict:
         """
-        Ingest one or more Overshoot JSON records: convert to CSV rows and append.
+        Ingest one or more Overshoot JSON records: convert to rows and append
+        to the columnar store and the telemetry/events CSV.
 
         Accepts OvershootDisasterRecord, list of them, or list of dicts (parsed JSON).
         Returns { "ingested": int, "time_sec": float }.
@@ -97,67 +104,46 @@ class VideoDisasterManager:
         if not parsed:
             return {"ingested": 0, "time_sec": self._current_time_sec}
 
+        telemetry_rows: list[dict] = []
+        store_rows: list[tuple[str, float, float | None, int]] = []
+        event_rows: list[dict] = []
         for rec in parsed:
             if self._base_ts_ms is None:
                 self._base_ts_ms = rec.timestamp_ms
             time_sec = (rec.timestamp_ms - self._base_ts_ms) / 1000.0
 
-            telemetry_rows = overshoot_to_telemetry_rows(rec, time_sec)
-            event_rows = overshoot_to_event_rows(rec, self._last_rec, time_sec)
-
-            with open(self._telemetry_path, "a", newline="", encoding="utf-8") as f:
-                w = csv.DictWriter(f, fieldnames=TELEMETRY_FIELDS)
-                w.writerows(telemetry_rows)
-
-            if event_rows:
-                with open(self._events_path, "a", newline="", encoding="utf-8") as f:
-                    w = csv.DictWriter(f, fieldnames=EVENTS_FIELDS)
-                    w.writerows(event_rows)
+            rows = overshoot_to_telemetry_rows(rec, time_sec)
+            telemetry_rows.extend(rows)
+            store_rows.extend((row["tag_id"], time_sec, row["value"], rec.timestamp_ms) for row in rows)
+            event_rows.extend(overshoot_to_event_rows(rec, self._last_rec, time_sec))
 
             self._last_rec = rec
             self._current_time_sec = time_sec
 
+        self._store.append_rows(store_rows)
+
+        with open(self._telemetry_path, "a", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=TELEMETRY_FIELDS)
+            w.writerows(telemetry_rows)
+
+        if event_rows:
+            with open(self._events_path, "a", newline="", encoding="utf-8") as f:
+                w = csv.DictWriter(f, fieldnames=EVENTS_FIELDS)
+                w.writerows(event_rows)
+
         return {"ingested": len(parsed), "time_sec": self._current_time_sec}
 
     def get_telemetry_at(self, time_sec: float) -> list[TelemetryPoint]:
         """
         Return telemetry at or before time_sec: for each tag_id, the latest row with time_sec <= time_sec.
         """
-        if not self._telemetry_path.exists():
-            return []
-
-        by_tag: dict[str, dict] = {}
-        with open(self._telemetry_path, "r", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                try:
-                    t = float(row.get("time_sec", 0))
-                except (ValueError, TypeError):
-                    continue
-                if t > time_sec:
-                    continue
-                tag = row.get("tag_id", "")
-                if not tag:
-                    continue
-                if tag not in by_tag or t >= float(by_tag[tag].get("time_sec", -1)):
-                    by_tag[tag] = row
-
         out: list[TelemetryPoint] = []
-        for row in by_tag.values():
-            ts = row.get("timestamp", "")
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            except Exception:
-                dt = datetime.now(timezone.utc)
-            try:
-                val = float(row.get("value", 0))
-            except (ValueError, TypeError):
-                val = None
+        for tag_id, (_, value, timestamp_ms) in self._store.latest_at(time_sec).items():
             out.append(
                 TelemetryPoint(
-                    tag_id=row.get("tag_id", ""),
-                    timestamp=dt,
-                    value=val,
+                    tag_id=tag_id,
+                    timestamp=datetime.fromtimestamp(timestamp_ms / 1000.0, tz=timezone.utc),
+                    value=None if math.isnan(value) else value,
                     quality=QualityFlag.GOOD,
                 )
             )
@@ -169,29 +155,16 @@ class VideoDisasterManager:
         end_sec: float,
     ) -> dict[str, list[dict]]:
         """Return { tag_id: [ {timestamp, value, quality}, ... ] } for time_sec in [start_sec, end_sec]."""
-        if not self._telemetry_path.exists():
-            return {}
-
         result: dict[str, list[dict]] = {}
-        with open(self._telemetry_path, "r", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                try:
-                    t = float(row.get("time_sec", 0))
-                except (ValueError, TypeError):
-                    continue
-                if not (start_sec <= t <= end_sec):
-                    continue
-                tag = row.get("tag_id", "")
-                if tag not in result:
-                    result[tag] = []
-                result[tag].append({
-                    "timestamp": row.get("timestamp", ""),
-                    "value": float(row["value"]) if row.get("value") not in ("", None) else None,
-                    "quality": row.get("quality", "Good"),
-                })
-        for tag in result:
-            result[tag].sort(key=lambda x: x["timestamp"])
+        for tag_id, columns in self._store.range(start_sec, end_sec).items():
+            result[tag_id] = [
+                {
+                    "timestamp": ts_to_iso(int(ms)),
+                    "value": None if math.isnan(value) else float(value),
+                    "quality": "Good",
+                }
+                for value, ms in zip(columns["value"], columns["timestamp_ms"])
+            ]
         return result
 
     def get_current_state(self) -> dict | None:
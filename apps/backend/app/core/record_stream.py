@@ -0,0 +1,442 @@
+"""
+Record Stream Module
+
+Incremental reading of large JSON record arrays, with an optional columnar
+binary cache so later loads memory-map instead of reparsing.
+
+iter_json_array() decodes one array element at a time from a buffered
+file, so memory stays proportional to one record plus the read buffer, and
+`where` filters drop records as soon as they are decoded.
+
+The cache is a directory next to the source (.record_cache/<file name>/)
+holding one columns.bin, with every column's arrays at aligned offsets, and
+a columns.json layout:
+  - numbers, booleans and datetimes are stored as typed arrays
+  - repetitive values (run_id, tag_id, reason-code lists) as codes into a
+    table of distinct values
+  - other strings (as UTF-8) and nested values (as JSON) as offsets into
+    a byte heap
+Columns are in order of first appearance; if records list their fields in
+different orders, each record's order is stored as a code too, so records
+come back with their keys as they were written.
+A cache is only used while the source file's size and mtime match the ones
+it was built from; otherwise it is rebuilt. Filtering a cached file compares
+codes for whole columns at once and only builds the matching records.
+"""
+
+import json
+import mmap
+import os
+import shutil
+from collections.abc import Collection, Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+CACHE_DIR_NAME = ".record_cache"
+CACHE_VERSION = 3
+_CACHE_DATA = "columns.bin"
+_CACHE_LAYOUT = "columns.json"
+
+# Column arrays start on this byte boundary in the data file
+_SEGMENT_ALIGN = 64
+
+_READ_CHUNK = 1 << 16
+
+# Store a column as codes into a value table when it has at most this many
+# distinct values (or at most one per this many records)
+_MAX_TABLE_SIZE = 65536
+_TABLE_RATIO = 4
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Missing:
+    """Placeholder for a field a record doesn't have"""
+
+
+_MISSING = _Missing()
+
+
+def _matches(record: dict[str, Any], where: dict[str, Any] | None) -> bool:
+    if not where:
+        return True
+    return all(record.get(key) == value for key, value in where.items())
+
+
+def iter_json_array(
+    path: Path,
+    where: dict[str, Any] | None = None,
+    chunk_size: int = _READ_CHUNK,
+) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    `where` keeps only object elements whose fields equal the given values
+    (e.g. {"run_id": ..., "tag_id": ...}).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        pos, eof = 0, not buffer
+
+        def fill() -> bool:
+            """Read another chunk, dropping what has been consumed"""
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise ValueError(f"{path} is not a JSON array")
+        pos += 1
+
+        skip_whitespace()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+
+        while True:
+            skip_whitespace()
+            while True:
+                try:
+                    element, end = _decoder.raw_decode(buffer, pos)
+                    # A value that runs to the end of the buffer may be cut short
+                    if end < len(buffer) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise ValueError(f"Malformed or truncated JSON array in {path}")
+                fill()
+            pos = end
+            if _matches(element, where):
+                yield element
+
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError(f"Truncated JSON array in {path}")
+            if buffer[pos] == "]":
+                return
+            if buffer[pos] != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {pos} in {path}")
+            pos += 1
+
+
+# =============================================================================
+# Columnar cache
+# =============================================================================
+
+def _source_signature(path: Path) -> dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def cache_dir_for(path: Path) -> Path:
+    return path.parent / CACHE_DIR_NAME / path.name
+
+
+def _column_kind(values: list[Any]) -> str:
+    if values and all(type(v) is datetime and v.tzinfo is None for v in values):
+        return "datetime"
+    if all(type(v) is bool for v in values):
+        return "bool"
+    if all(type(v) is int for v in values) and all(-(1 << 63) <= v < (1 << 63) for v in values):
+        return "int"
+    if all(type(v) is float for v in values):
+        return "float"
+    return "object"
+
+
+class _SegmentWriter:
+    """Appends aligned arrays to one data file, returning where each landed"""
+
+    def __init__(self, f):
+        self._f = f
+        self._pos = 0
+
+    def add(self, array: np.ndarray) -> dict[str, Any]:
+        pad = -self._pos % _SEGMENT_ALIGN
+        self._f.write(b"\0" * pad)
+        self._pos += pad
+        array = np.ascontiguousarray(array)
+        self._f.write(array.tobytes())
+        segment = {"dtype": array.dtype.str, "offset": self._pos, "count": len(array)}
+        self._pos += array.nbytes
+        return segment
+
+
+def _write_column(
+    segments: _SegmentWriter,
+    name: str,
+    values: list[Any],
+    dictionary: bool = False,
+) -> dict[str, Any]:
+    """Write one column, returning its layout entry. dictionary=True always stores a code table."""
+    present = [v is not _MISSING for v in values]
+    layout: dict[str, Any] = {"name": name}
+    if not all(present):
+        layout["present"] = segments.add(np.array(present, dtype=bool))
+        values = [v for v in values if v is not _MISSING]
+
+    kind = _column_kind(values)
+    if kind == "datetime":
+        layout["data"] = segments.add(np.array(values, dtype="datetime64[us]"))
+    elif kind == "bool":
+        layout["data"] = segments.add(np.array(values, dtype=bool))
+    elif kind == "int":
+        layout["data"] = segments.add(np.array(values, dtype=np.int64))
+    elif kind == "float":
+        layout["data"] = segments.add(np.array(values, dtype=np.float64))
+    else:
+        is_text = all(type(v) is str for v in values)
+        encoded = values if is_text else [json.dumps(v, ensure_ascii=False) for v in values]
+        table: dict[str, int] = {}
+        for item in encoded:
+            if item not in table:
+                table[item] = len(table)
+                if len(table) > _MAX_TABLE_SIZE and not dictionary:
+                    break
+        small = len(table) <= _MAX_TABLE_SIZE and len(table) * _TABLE_RATIO <= max(len(encoded), _TABLE_RATIO)
+        if dictionary or small:
+            kind = "table"
+            layout["data"] = segments.add(np.array([table[t] for t in encoded], dtype=np.uint32))
+            layout["table"] = list(table) if is_text else [json.loads(t) for t in table]
+        else:
+            kind = "text" if is_text else "heap"
+            blobs = [t.encode("utf-8") for t in encoded]
+            offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in blobs], out=offsets[1:])
+            layout["data"] = segments.add(offsets)
+            layout["heap"] = segments.add(np.frombuffer(b"".join(blobs), dtype=np.uint8))
+    layout["kind"] = kind
+    return layout
+
+
+def write_columns(
+    data_path: Path,
+    records: Iterable[dict[str, Any]],
+    dictionary: Collection[str] = (),
+) -> dict[str, Any]:
+    """
+    Write records column by column into one data file.
+
+    Fields named in `dictionary` are always stored as codes into a value
+    table. Returns the layout ({"count", "columns"} and "key_orders" when
+    records order their fields differently) RecordColumns opens.
+    """
+    columns: dict[str, list[Any]] = {}
+    orders: dict[tuple[str, ...], int] = {}
+    order_codes: list[int] = []
+    count = 0
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError("Only JSON objects can be stored as columns")
+        for name in record:
+            if name not in columns:
+                columns[name] = [_MISSING] * count
+        for name, values in columns.items():
+            values.append(record.get(name, _MISSING))
+        order_codes.append(orders.setdefault(tuple(record), len(orders)))
+        count += 1
+
+    with open(data_path, "wb") as f:
+        segments = _SegmentWriter(f)
+        layout: dict[str, Any] = {
+            "count": count,
+            "columns": [
+                _write_column(segments, name, values, name in dictionary)
+                for name, values in columns.items()
+            ],
+        }
+        column_order = tuple(columns)
+        if any(_reordered(order, column_order) for order in orders):
+            layout["key_orders"] = {
+                "data": segments.add(np.array(order_codes, dtype=np.uint32)),
+                "table": [list(order) for order in orders],
+            }
+    return layout
+
+
+def _reordered(order: tuple[str, ...], column_order: tuple[str, ...]) -> bool:
+    """Whether rebuilding a record with fields `order` in column order would move its keys"""
+    present = set(order)
+    return order != tuple(name for name in column_order if name in present)
+
+
+def write_record_cache(path: Path) -> Path:
+    """Build the columnar cache for a JSON array of objects, streaming the source. Returns the cache directory."""
+    path = Path(path)
+    signature = _source_signature(path)
+    cache_dir = cache_dir_for(path)
+    staging = cache_dir.with_name(cache_dir.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    layout = write_columns(staging / _CACHE_DATA, iter_json_array(path))
+    (staging / _CACHE_LAYOUT).write_text(json.dumps({
+        "version": CACHE_VERSION,
+        "source": signature,
+        **layout,
+    }))
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    staging.rename(cache_dir)
+    return cache_dir
+
+
+class RecordColumns:
+    """
+    Columns written by write_columns().
+
+    The data file is memory-mapped once and every column is a zero-copy
+    view into it.
+    """
+
+    def __init__(self, data_path: Path, layout: dict[str, Any]):
+        self.count: int = layout["count"]
+        self._layout: list[dict[str, Any]] = layout["columns"]
+        with open(data_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._columns = {column["name"]: column for column in self._layout}
+        self._key_orders: dict[str, Any] | None = layout.get("key_orders")
+        self._ranks: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def select(self, where: dict[str, Any] | None = None) -> np.ndarray:
+        """Positions of records whose fields equal `where`"""
+        mask = np.ones(self.count, dtype=bool)
+        for name, value in (where or {}).items():
+            mask &= self._equals(name, value)
+        return np.flatnonzero(mask)
+
+    def records(self, positions: np.ndarray | None = None) -> Iterator[dict[str, Any]]:
+        """Rebuild records (all, or at the given positions) in file order"""
+        if positions is None:
+            positions = np.arange(self.count)
+        for start in range(0, len(positions), _READ_CHUNK):
+            block = positions[start:start + _READ_CHUNK]
+            names, columns = [], []
+            for column in self._layout:
+                names.append(column["name"])
+                columns.append(self._values(column, block))
+            if self._key_orders is None:
+                for row in zip(*columns):
+                    yield {name: value for name, value in zip(names, row) if value is not _MISSING}
+                continue
+            orders = self._key_orders["table"]
+            codes = self._segment(self._key_orders["data"])[block].tolist()
+            for code, row in zip(codes, zip(*columns)):
+                record = dict(zip(names, row))
+                yield {name: record[name] for name in orders[code]}
+
+    def _segment(self, segment: dict[str, Any]) -> np.ndarray:
+        return np.frombuffer(self._buffer, dtype=segment["dtype"], count=segment["count"], offset=segment["offset"])
+
+    def _equals(self, name: str, value: Any) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            # A missing field reads as None, as in record.get(name)
+            return np.full(self.count, value is None, dtype=bool)
+        data = self._segment(column["data"])
+        if column["kind"] == "table":
+            stored = np.isin(data, [code for code, v in enumerate(column["table"]) if v == value])
+        elif column["kind"] in ("text", "heap"):
+            stored = np.array([v == value for v in self._stored_values(column, None)], dtype=bool)
+        elif type(value) in (bool, int, float, datetime):
+            # Typed columns compare the way Python compares the decoded values
+            stored = data == value
+        else:
+            stored = np.zeros(len(data), dtype=bool)
+        if "present" not in column:
+            return stored
+        mask = np.full(self.count, value is None, dtype=bool)
+        mask[np.flatnonzero(self._segment(column["present"]))] = stored
+        return mask
+
+    def _values(self, column: dict[str, Any], positions: np.ndarray) -> list[Any]:
+        if "present" not in column:
+            return self._stored_values(column, positions)
+        # Map record positions to positions among the records that have the field
+        present = self._segment(column["present"])
+        ranks = self._ranks.get(column["name"])
+        if ranks is None:
+            ranks = self._ranks[column["name"]] = np.cumsum(present) - 1
+        has = present[positions]
+        stored = iter(self._stored_values(column, ranks[positions][has]))
+        return [next(stored) if h else _MISSING for h in has.tolist()]
+
+    def _stored_values(self, column: dict[str, Any], positions: np.ndarray | None) -> list[Any]:
+        data = self._segment(column["data"])
+        kind = column["kind"]
+        if kind in ("text", "heap"):
+            if positions is None:
+                positions = np.arange(len(data) - 1)
+            if not len(positions):
+                return []
+            starts, ends = data[positions].tolist(), data[positions + 1].tolist()
+            # Positions ascend, so one read covers the whole block
+            base = starts[0]
+            blob = self._segment(column["heap"])[base:ends[-1]].tobytes()
+            if kind == "text":
+                return [blob[s - base:e - base].decode("utf-8") for s, e in zip(starts, ends)]
+            return [json.loads(blob[s - base:e - base]) for s, e in zip(starts, ends)]
+        selected = data if positions is None else data[positions]
+        if kind == "table":
+            table = column["table"]
+            return [table[code] for code in selected.tolist()]
+        return selected.tolist()
+
+
+def open_record_cache(path: Path) -> RecordColumns | None:
+    """Columns for `path` if a cache built from its current contents exists"""
+    path = Path(path)
+    cache_dir = cache_dir_for(path)
+    try:
+        meta = json.loads((cache_dir / _CACHE_LAYOUT).read_text())
+        if meta.get("version") != CACHE_VERSION or meta.get("source") != _source_signature(path):
+            return None
+        return RecordColumns(cache_dir / _CACHE_DATA, meta)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def iter_records(
+    path: Path,
+    where: dict[str, Any] | None = None,
+    use_cache: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the objects of a JSON array file, optionally filtered by field values.
+
+    With use_cache, reads the columnar cache when it is current, and builds
+    it on first load (the file is then read from the new cache). If the
+    cache can't be written the file is streamed as usual.
+    """
+    path = Path(path)
+    if use_cache:
+        columns = open_record_cache(path)
+        if columns is None:
+            try:
+                write_record_cache(path)
+                columns = open_record_cache(path)
+            except (OSError, ValueError):
+                columns = None
+        if columns is not None:
+            yield from columns.records(columns.select(where) if where else None)
+            return
+    yield from iter_json_array(path, where)
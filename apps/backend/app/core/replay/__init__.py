@@ -39,6 +39,10 @@ class ReplayEngine:
         """
         return await self.state_reconstructor.reconstruct(timestamp_iso)
     
+    async def get_states_at(self, timestamps_iso: list[str]) -> list[dict]:
+        """Reconstruct the belief state at many timestamps in one pass (scrubber thumbnails)"""
+        return await self.state_reconstructor.reconstruct_many(timestamps_iso)
+    
     async def get_timeline_events(
         self, 
         start_iso: str | None = None, 
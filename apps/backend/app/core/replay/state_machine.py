@@ -5,43 +5,98 @@ Reconstructs system belief state at any point in time.
 """
 
 import json
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from app.core.interval_index import IntervalIndex
 from app.models.events import SystemState, OperationalMode, Contradiction, TrustUpdate
 from app.models.telemetry import TelemetryPoint, TrustState
 from config import config
 
 
+def _parse_timestamp(timestamp_iso: str) -> datetime:
+    return datetime.fromisoformat(timestamp_iso.replace("Z", "+00:00"))
+
+
+def _insert_sorted(times: list[datetime], items: list, timestamp: datetime, item: Any) -> None:
+    """Insert keeping times sorted; after any equal timestamps, so recording order breaks ties"""
+    if not times or timestamp >= times[-1]:
+        times.append(timestamp)
+        items.append(item)
+        return
+    i = bisect_right(times, timestamp)
+    times.insert(i, timestamp)
+    items.insert(i, item)
+
+
 class StateReconstructor:
     """
     Reconstructs the system's belief state at any timestamp.
     
     This is the core of the replay functionality - it proves the system
     understands causality by reconstructing what was known at time t.
+    
+    Telemetry, trust updates and mode transitions are kept time-sorted
+    (per tag where applicable) with a parallel list of timestamps, so an
+    as-of lookup is one bisect. Records arriving out of order are inserted
+    in place; equal timestamps keep recording order.
     """
     
     def __init__(self):
         self._telemetry_cache: dict[str, list[TelemetryPoint]] = {}
+        self._telemetry_times: dict[str, list[datetime]] = {}
         self._trust_updates: list[TrustUpdate] = []
+        self._trust_by_tag: dict[str, list[TrustUpdate]] = {}
+        self._trust_times: dict[str, list[datetime]] = {}
         self._contradictions: list[Contradiction] = []
+        # Unresolved span of each contradiction, keyed by (primary tag, reason code)
+        self._contradiction_windows = IntervalIndex()
         self._mode_transitions: list[dict] = []
+        self._mode_times: list[datetime] = []
         self._data_path = Path(config.data_dir)
     
     def record_telemetry(self, point: TelemetryPoint) -> None:
         """Record a telemetry point for later reconstruction"""
         if point.tag_id not in self._telemetry_cache:
             self._telemetry_cache[point.tag_id] = []
-        self._telemetry_cache[point.tag_id].append(point)
+            self._telemetry_times[point.tag_id] = []
+        _insert_sorted(
+            self._telemetry_times[point.tag_id],
+            self._telemetry_cache[point.tag_id],
+            point.timestamp,
+            point,
+        )
     
     def record_trust_update(self, update: TrustUpdate) -> None:
         """Record a trust update event"""
         self._trust_updates.append(update)
+        if update.tag_id not in self._trust_by_tag:
+            self._trust_by_tag[update.tag_id] = []
+            self._trust_times[update.tag_id] = []
+        _insert_sorted(
+            self._trust_times[update.tag_id],
+            self._trust_by_tag[update.tag_id],
+            update.timestamp,
+            update,
+        )
     
     def record_contradiction(self, contradiction: Contradiction) -> None:
         """Record a contradiction"""
         self._contradictions.append(contradiction)
+        if not contradiction.resolved:
+            end = None
+        elif contradiction.resolved_at:
+            end = contradiction.resolved_at
+        else:
+            return  # Resolved with no time recorded: never counted as unresolved
+        self._contradiction_windows.add(
+            contradiction.timestamp,
+            end,
+            contradiction.contradiction_id,
+            key=(contradiction.primary_tag_id, contradiction.reason_code),
+        )
     
     def record_mode_transition(
         self, 
@@ -50,7 +105,7 @@ class StateReconstructor:
         trigger: str | None = None
     ) -> None:
         """Record a mode transition"""
-        self._mode_transitions.append({
+        _insert_sorted(self._mode_times, self._mode_transitions, timestamp, {
             "timestamp": timestamp,
             "mode": new_mode,
             "trigger": trigger,
@@ -67,7 +122,7 @@ class StateReconstructor:
         - Unresolved contradictions
         - Operational mode
         """
-        target_time = datetime.fromisoformat(timestamp_iso.replace("Z", "+00:00"))
+        target_time = _parse_timestamp(timestamp_iso)
         
         # Get last telemetry for each tag before target time
         telemetry = self._get_last_telemetry_before(target_time)
@@ -93,6 +148,60 @@ class StateReconstructor:
         
         return state.model_dump(mode="json")
     
+    async def reconstruct_many(self, timestamps: list[str]) -> list[dict]:
+        """
+        Reconstruct the system state at many timestamps (e.g. scrubber thumbnails).
+        
+        The requested instants are visited in time order while a cursor per
+        stream only moves forward (each step bisects from the last cursor),
+        so the batch is one merge pass over the recorded data. Results are
+        returned in request order. Raises ValueError if the timestamps
+        mix timezone-aware and naive values, as they cannot be ordered.
+        """
+        targets = [_parse_timestamp(ts) for ts in timestamps]
+        if len({t.tzinfo is None for t in targets}) > 1:
+            raise ValueError("timestamps mix timezone-aware and naive values")
+        order = sorted(range(len(targets)), key=targets.__getitem__)
+        
+        telemetry_cursors = {tag_id: 0 for tag_id in self._telemetry_cache}
+        trust_cursors = {tag_id: 0 for tag_id in self._trust_by_tag}
+        mode_cursor = 0
+        
+        states: list[dict | None] = [None] * len(targets)
+        for i in order:
+            target_time = targets[i]
+            
+            telemetry = {}
+            for tag_id, times in self._telemetry_times.items():
+                cursor = bisect_right(times, target_time, telemetry_cursors[tag_id])
+                telemetry_cursors[tag_id] = cursor
+                telemetry[tag_id] = self._telemetry_cache[tag_id][cursor - 1].value if cursor else None
+            
+            trust_scores: dict[str, float] = {}
+            reason_codes: dict[str, list[str]] = {}
+            for tag_id, times in self._trust_times.items():
+                cursor = bisect_right(times, target_time, trust_cursors[tag_id])
+                trust_cursors[tag_id] = cursor
+                if cursor:
+                    update = self._trust_by_tag[tag_id][cursor - 1]
+                    trust_scores[tag_id] = update.new_score
+                    reason_codes[tag_id] = [rc.value for rc in update.reason_codes]
+            
+            mode_cursor = bisect_right(self._mode_times, target_time, mode_cursor)
+            mode, decision_clock = self._mode_from(mode_cursor)
+            
+            states[i] = SystemState(
+                timestamp=target_time,
+                telemetry=telemetry,
+                trust_scores=trust_scores,
+                active_reason_codes=reason_codes,
+                unresolved_contradictions=self._get_unresolved_contradictions_at(target_time),
+                operational_mode=mode,
+                decision_clock_started=decision_clock,
+            ).model_dump(mode="json")
+        
+        return states
+    
     def _get_last_telemetry_before(
         self, 
         target_time: datetime
@@ -100,14 +209,9 @@ class StateReconstructor:
         """Get the last known value for each sensor before target time"""
         result = {}
         
-        for tag_id, points in self._telemetry_cache.items():
-            last_value = None
-            for point in points:
-                if point.timestamp <= target_time:
-                    last_value = point.value
-                else:
-                    break
-            result[tag_id] = last_value
+        for tag_id, times in self._telemetry_times.items():
+            i = bisect_right(times, target_time)
+            result[tag_id] = self._telemetry_cache[tag_id][i - 1].value if i else None
         
         return result
     
@@ -119,11 +223,13 @@ class StateReconstructor:
         trust_scores: dict[str, float] = {}
         reason_codes: dict[str, list[str]] = {}
         
-        # Group updates by tag and find the latest before target time
-        for update in self._trust_updates:
-            if update.timestamp <= target_time:
-                trust_scores[update.tag_id] = update.new_score
-                reason_codes[update.tag_id] = [rc.value for rc in update.reason_codes]
+        # Latest update per tag at or before target time
+        for tag_id, times in self._trust_times.items():
+            i = bisect_right(times, target_time)
+            if i:
+                update = self._trust_by_tag[tag_id][i - 1]
+                trust_scores[tag_id] = update.new_score
+                reason_codes[tag_id] = [rc.value for rc in update.reason_codes]
         
         return trust_scores, reason_codes
     
@@ -132,37 +238,24 @@ class StateReconstructor:
         target_time: datetime
     ) -> list[str]:
         """Get IDs of contradictions that were unresolved at target time"""
-        unresolved = []
-        
-        for contradiction in self._contradictions:
-            # Was it created before target time?
-            if contradiction.timestamp <= target_time:
-                # Was it still unresolved at target time?
-                if not contradiction.resolved or (
-                    contradiction.resolved_at and 
-                    contradiction.resolved_at > target_time
-                ):
-                    unresolved.append(contradiction.contradiction_id)
-        
-        return unresolved
+        # Created at or before target time and not yet resolved
+        return self._contradiction_windows.stab(target_time, all_keys=True)
     
     def _get_mode_at(
         self, 
         target_time: datetime
     ) -> tuple[OperationalMode, datetime | None]:
         """Get operational mode at target time"""
-        current_mode = OperationalMode.OBSERVE
-        decision_clock_start = None
-        
-        for transition in self._mode_transitions:
-            if transition["timestamp"] <= target_time:
-                current_mode = transition["mode"]
-                if current_mode == OperationalMode.DECISION:
-                    decision_clock_start = transition["timestamp"]
-                else:
-                    decision_clock_start = None
-        
-        return current_mode, decision_clock_start
+        return self._mode_from(bisect_right(self._mode_times, target_time))
+    
+    def _mode_from(self, count: int) -> tuple[OperationalMode, datetime | None]:
+        """Mode and decision clock after the first `count` transitions"""
+        if not count:
+            return OperationalMode.OBSERVE, None
+        transition = self._mode_transitions[count - 1]
+        if transition["mode"] == OperationalMode.DECISION:
+            return transition["mode"], transition["timestamp"]
+        return transition["mode"], None
     
     def get_state_snapshot(self) -> dict:
         """Get a snapshot of current reconstruction state for debugging"""
@@ -177,9 +270,14 @@ class StateReconstructor:
     def clear(self) -> None:
         """Clear all cached state"""
         self._telemetry_cache.clear()
+        self._telemetry_times.clear()
         self._trust_updates.clear()
+        self._trust_by_tag.clear()
+        self._trust_times.clear()
         self._contradictions.clear()
+        self._contradiction_windows.clear()
         self._mode_transitions.clear()
+        self._mode_times.clear()
     
     async def load_from_storage(self) -> None:
         """Load historical data from JSON file storage"""
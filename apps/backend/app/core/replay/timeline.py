@@ -4,7 +4,10 @@ Timeline Indexer Module
 Indexes events by timestamp for the frontend scrubber.
 """
 
+import heapq
 import json
+from bisect import bisect_left
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -59,16 +62,103 @@ class TimelineEvent:
         }
 
 
+# Events per chunk before a chunk is split in two
+_CHUNK_SIZE = 512
+
+# Sort key: (timestamp, -sequence). A new event sorts before earlier-indexed
+# events with the same timestamp, as the original list insert did.
+_Key = tuple[datetime, int]
+
+
+class _SortedEvents:
+    """
+    Chunked sorted list of timeline events.
+    
+    Events live in chunks of at most 2 * _CHUNK_SIZE; a bisect over each
+    chunk's last key finds the chunk, so inserts cost O(log n + chunk)
+    instead of shifting the whole list, and range scans start with a bisect.
+    """
+    
+    __slots__ = ("_keys", "_events", "_maxes", "_len")
+    
+    def __init__(self):
+        self._keys: list[list[_Key]] = []
+        self._events: list[list["TimelineEvent"]] = []
+        self._maxes: list[_Key] = []
+        self._len = 0
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def __iter__(self) -> Iterator["TimelineEvent"]:
+        for chunk in self._events:
+            yield from chunk
+    
+    def first(self) -> "TimelineEvent | None":
+        return self._events[0][0] if self._len else None
+    
+    def last(self) -> "TimelineEvent | None":
+        return self._events[-1][-1] if self._len else None
+    
+    def insert(self, key: _Key, event: "TimelineEvent") -> None:
+        self._len += 1
+        if not self._maxes:
+            self._keys.append([key])
+            self._events.append([event])
+            self._maxes.append(key)
+            return
+        
+        c = bisect_left(self._maxes, key)
+        if c == len(self._maxes):
+            c -= 1
+            self._keys[c].append(key)
+            self._events[c].append(event)
+            self._maxes[c] = key
+        else:
+            keys = self._keys[c]
+            i = bisect_left(keys, key)
+            keys.insert(i, key)
+            self._events[c].insert(i, event)
+        
+        if len(self._keys[c]) > 2 * _CHUNK_SIZE:
+            keys, events = self._keys[c], self._events[c]
+            self._keys[c:c + 1] = [keys[:_CHUNK_SIZE], keys[_CHUNK_SIZE:]]
+            self._events[c:c + 1] = [events[:_CHUNK_SIZE], events[_CHUNK_SIZE:]]
+            self._maxes[c:c + 1] = [keys[_CHUNK_SIZE - 1], keys[-1]]
+    
+    def iter_from(self, start: datetime | None = None) -> Iterator[tuple[_Key, "TimelineEvent"]]:
+        """(key, event) pairs in order, beginning at the first timestamp >= start"""
+        c, i = 0, 0
+        if start is not None:
+            lower = (start, -float("inf"))
+            c = bisect_left(self._maxes, lower)
+            if c < len(self._maxes):
+                i = bisect_left(self._keys[c], lower)
+        for chunk in range(c, len(self._keys)):
+            keys, events = self._keys[chunk], self._events[chunk]
+            for j in range(i, len(keys)):
+                yield keys[j], events[j]
+            i = 0
+
+
 class TimelineIndexer:
     """
     Indexes events by timestamp for the frontend timeline scrubber.
     
     Provides fast access to events within time ranges and filtering
-    by event type.
+    by event type. Besides the main time-ordered list, events are kept
+    in posting lists per event type, severity and related tag (same
+    order), so filtered queries only walk matching events, and an
+    event_id map serves direct lookups.
     """
     
     def __init__(self):
-        self._events: list[TimelineEvent] = []
+        self._events = _SortedEvents()
+        self._by_id: dict[str, tuple[_Key, TimelineEvent]] = {}
+        self._by_type: dict[TimelineEventType, _SortedEvents] = {}
+        self._by_severity: dict[EventSeverity, _SortedEvents] = {}
+        self._by_tag: dict[str, _SortedEvents] = {}
+        self._sequence = 0
         self._event_counter = 0
         self._data_path = Path(config.data_dir) / "events"
     
@@ -112,16 +202,56 @@ class TimelineIndexer:
         return datetime.utcnow()
     
     def _insert_sorted(self, event: TimelineEvent) -> None:
-        """Insert event maintaining chronological order"""
-        # Binary search for insertion point
-        lo, hi = 0, len(self._events)
-        while lo < hi:
-            mid = (lo + hi) // 2
-            if self._events[mid].timestamp < event.timestamp:
-                lo = mid + 1
-            else:
-                hi = mid
-        self._events.insert(lo, event)
+        """Insert event maintaining chronological order, in every index it belongs to"""
+        self._sequence += 1
+        key = (event.timestamp, -self._sequence)
+        
+        self._events.insert(key, event)
+        # A repeated id resolves to its earliest event on the timeline
+        known = self._by_id.get(event.event_id)
+        if known is None or key < known[0]:
+            self._by_id[event.event_id] = (key, event)
+        self._posting(self._by_type, event.event_type).insert(key, event)
+        self._posting(self._by_severity, event.severity).insert(key, event)
+        for tag_id in set(event.related_tags):
+            self._posting(self._by_tag, tag_id).insert(key, event)
+    
+    @staticmethod
+    def _posting(index: dict, value: Any) -> _SortedEvents:
+        postings = index.get(value)
+        if postings is None:
+            postings = index[value] = _SortedEvents()
+        return postings
+    
+    def _candidates(
+        self,
+        start_time: datetime | None,
+        type_filter: set[TimelineEventType] | None,
+        severity: str | None,
+        tag_id: str | None,
+    ) -> Iterator[TimelineEvent]:
+        """
+        Events from start_time on, in timeline order, drawn from the
+        smallest index that covers one of the filters.
+        """
+        sources: list[list[_SortedEvents]] = [[self._events]]
+        if type_filter is not None:
+            sources.append([self._by_type[t] for t in type_filter if t in self._by_type])
+        if severity:
+            try:
+                postings = self._by_severity.get(EventSeverity(severity))
+            except ValueError:
+                postings = None
+            sources.append([postings] if postings is not None else [])
+        if tag_id:
+            postings = self._by_tag.get(tag_id)
+            sources.append([postings] if postings is not None else [])
+        
+        lists = min(sources, key=lambda group: sum(len(p) for p in group))
+        if len(lists) == 1:
+            return (event for _, event in lists[0].iter_from(start_time))
+        merged = heapq.merge(*(p.iter_from(start_time) for p in lists), key=lambda entry: entry[0])
+        return (event for _, event in merged)
     
     async def get_events(
         self,
@@ -157,11 +287,10 @@ class TimelineIndexer:
         if event_types:
             type_filter = set(TimelineEventType(t) for t in event_types)
         
-        # Filter events
-        for event in self._events:
+        # Filter events (the candidate index already satisfies one filter;
+        # the rest are cheap to re-check)
+        for event in self._candidates(start_time, type_filter, severity, tag_id):
             # Time bounds
-            if start_time and event.timestamp < start_time:
-                continue
             if end_time and event.timestamp >= end_time:
                 break  # Events are sorted, so we can stop here
             
@@ -198,9 +327,7 @@ class TimelineIndexer:
         end_time = self._parse_timestamp(end_iso) if end_iso else None
         
         markers = []
-        for event in self._events:
-            if start_time and event.timestamp < start_time:
-                continue
+        for _, event in self._events.iter_from(start_time):
             if end_time and event.timestamp >= end_time:
                 break
             
@@ -214,32 +341,29 @@ class TimelineIndexer:
     
     def get_event_by_id(self, event_id: str) -> dict | None:
         """Get a specific event by ID"""
-        for event in self._events:
-            if event.event_id == event_id:
-                return event.to_dict()
-        return None
+        known = self._by_id.get(event_id)
+        return known[1].to_dict() if known is not None else None
     
     def clear(self) -> None:
         """Clear all indexed events"""
-        self._events.clear()
+        self._events = _SortedEvents()
+        self._by_id.clear()
+        self._by_type.clear()
+        self._by_severity.clear()
+        self._by_tag.clear()
+        self._sequence = 0
         self._event_counter = 0
     
     def get_stats(self) -> dict:
         """Get timeline statistics"""
-        type_counts = {}
-        severity_counts = {}
-        
-        for event in self._events:
-            type_counts[event.event_type.value] = type_counts.get(event.event_type.value, 0) + 1
-            severity_counts[event.severity.value] = severity_counts.get(event.severity.value, 0) + 1
-        
+        first, last = self._events.first(), self._events.last()
         return {
             "total_events": len(self._events),
-            "by_type": type_counts,
-            "by_severity": severity_counts,
+            "by_type": {t.value: len(p) for t, p in self._by_type.items()},
+            "by_severity": {s.value: len(p) for s, p in self._by_severity.items()},
             "time_range": {
-                "start": self._events[0].timestamp.isoformat() if self._events else None,
-                "end": self._events[-1].timestamp.isoformat() if self._events else None,
+                "start": first.timestamp.isoformat() if first else None,
+                "end": last.timestamp.isoformat() if last else None,
             }
         }
     
@@ -9,11 +9,14 @@ CRITICAL: get_state_at() returns ONLY information available at time t.
 
 import csv
 import json
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from bisect import bisect_right
+from typing import Any, List, Dict, Optional, Tuple
+from bisect import bisect_left, bisect_right
 
+from app.core.marker_pyramid import MarkerPyramid
+from app.core.scenario_bundle import ScenarioBundle, open_bundle
 from app.models.temporal import (
     AtTimeState,
     TimelineMarker,
@@ -54,6 +57,42 @@ REASON_CODES: Dict[str, ReasonCode] = {
 }
 
 
+# Number of trust updates folded between per-sensor trust checkpoints.
+# get_state_at() replays at most this many updates past a checkpoint.
+STATE_CHECKPOINT_INTERVAL = 256
+
+# Confidence bands kept per (start, end, resolution), least recently used evicted
+CONFIDENCE_BAND_CACHE_SIZE = 64
+
+
+class _PositionLog:
+    """
+    Append-only log of derived values keyed by event position.
+
+    Positions index into the time-sorted event list, so "everything known
+    after the first n events" is a bisect on the positions.
+    """
+    
+    __slots__ = ("positions", "values")
+    
+    def __init__(self) -> None:
+        self.positions: List[int] = []
+        self.values: List[Any] = []
+    
+    def append(self, position: int, value: Any) -> None:
+        self.positions.append(position)
+        self.values.append(value)
+    
+    def upto(self, count: int) -> List[Any]:
+        """Values recorded within the first `count` events."""
+        return self.values[:bisect_left(self.positions, count)]
+    
+    def latest(self, count: int, default: Any = None) -> Any:
+        """Most recent value recorded within the first `count` events."""
+        i = bisect_left(self.positions, count)
+        return self.values[i - 1] if i else default
+
+
 class ReplayEngine:
     """
     Core replay engine for temporal state reconstruction.
@@ -76,11 +115,22 @@ class ReplayEngine:
         self._action_gates: List[Dict] = []
         self._receipts: List[Dict] = []
         
-
-        
-        # Derived data
-        self._markers: List[TimelineMarker] = []
-        self._sorted_timestamps: List[datetime] = []
+        # Derived data (the pyramid holds the time-sorted markers)
+        self._marker_pyramid = MarkerPyramid()
+        
+        # State index (built by _build_state_index; rebuilt lazily after add_event)
+        self._state_index_stale = False
+        self._event_timestamps: List[datetime] = []
+        self._contradiction_log = _PositionLog()
+        self._operator_log = _PositionLog()
+        self._mode_log = _PositionLog()
+        self._posture_log = _PositionLog()
+        self._claim_event_log = _PositionLog()
+        self._trust_timestamps: List[datetime] = []
+        self._trust_updates: List[SensorTrustSnapshot] = []
+        self._trust_checkpoints: List[Dict[str, SensorTrustSnapshot]] = [{}]
+        self._tables_by_time_sec: Dict[str, Tuple[List[float], List[Dict]]] = {}
+        self._band_cache: "OrderedDict[Tuple[datetime, datetime, int], List[ConfidencePoint]]" = OrderedDict()
         
         # Incident bounds
         self._incident_start: Optional[datetime] = None
@@ -91,9 +141,14 @@ class ReplayEngine:
     # =========================================================================
     
     def load_all(self) -> None:
-        """Load all data from CSV files only."""
-        self.load_from_csv()
+        """Load all data from the scenario bundle if it is current, else from CSV files."""
+        bundle = open_bundle(self.data_dir)
+        if bundle is not None:
+            self.load_from_bundle(bundle)
+        else:
+            self.load_from_csv()
         self._build_markers()
+        self._build_state_index()
     
     def load_from_csv(self) -> None:
         """Load data from CSV files."""
@@ -155,7 +210,21 @@ class ReplayEngine:
                 r["timestamp"] = self._parse_timestamp(r["timestamp"])
                 r["time_sec"] = float(r.get("time_sec", 0))
         
-        # Set incident bounds from events
+        self._set_incident_bounds()
+    
+    def load_from_bundle(self, bundle: ScenarioBundle) -> None:
+        """Load the CSV tables from a scenario bundle (already parsed)."""
+        self._events = bundle.rows("csv/events")
+        self._trust_timeline = bundle.rows("csv/trust_timeline")
+        self._sensors = {s["tag_id"]: s for s in bundle.rows("csv/sensors")}
+        self._claims = bundle.rows("csv/claims")
+        self._zone_states = bundle.rows("csv/zone_states")
+        self._action_gates = bundle.rows("csv/action_gates")
+        self._receipts = bundle.rows("csv/receipts")
+        self._set_incident_bounds()
+    
+    def _set_incident_bounds(self) -> None:
+        """Set incident bounds from events"""
         if self._events:
             timestamps = [e["timestamp"] for e in self._events]
             self._incident_start = min(timestamps)
@@ -189,34 +258,49 @@ class ReplayEngine:
     # =========================================================================
     
     def _build_markers(self) -> None:
-        """Build timeline markers from events."""
-        self._markers = []
-        
-        for i, event in enumerate(self._events):
-            event_type = event.get("event_type", "").lower()
-            severity_str = event.get("severity", "INFO").upper()
-            
-            # Map event type to marker type
-            marker_type = self._event_type_to_marker(event_type)
-            severity = EventSeverity(severity_str.lower()) if severity_str.lower() in ["info", "warning", "alarm", "critical"] else EventSeverity.INFO
-            
-            marker = TimelineMarker(
-                id=f"marker_{i}",
-                timestamp=event["timestamp"],
-                time_sec=event["time_sec"],
-                marker_type=marker_type,
-                severity=severity,
-                label=event.get("event_type", "Event"),
-                description=event.get("description", ""),
-                tag_id=event.get("tag_id"),
-                reason_code=event.get("reason_code"),
-                has_contradiction="contradiction" in event_type.lower(),
-            )
-            self._markers.append(marker)
+        """Build timeline markers into the marker pyramid, sorted by timestamp."""
+        self._marker_pyramid.build(
+            self._make_marker(i, event) for i, event in enumerate(self._events)
+        )
+    
+    def _make_marker(self, i: int, event: Dict) -> TimelineMarker:
+        """Timeline marker for the i-th event."""
+        event_type = event.get("event_type", "").lower()
+        severity_str = event.get("severity", "INFO").upper()
+        
+        # Map event type to marker type
+        marker_type = self._event_type_to_marker(event_type)
+        severity = EventSeverity(severity_str.lower()) if severity_str.lower() in ["info", "warning", "alarm", "critical"] else EventSeverity.INFO
+        
+        return TimelineMarker(
+            id=f"marker_{i}",
+            timestamp=event["timestamp"],
+            time_sec=event["time_sec"],
+            marker_type=marker_type,
+            severity=severity,
+            label=event.get("event_type", "Event"),
+            description=event.get("description", ""),
+            tag_id=event.get("tag_id"),
+            reason_code=event.get("reason_code"),
+            has_contradiction="contradiction" in event_type.lower(),
+        )
+    
+    def add_event(self, event: Dict) -> TimelineMarker:
+        """
+        Record one new event (with parsed "timestamp" and "time_sec") after load.
         
-        # Sort by timestamp
-        self._markers.sort(key=lambda m: m.timestamp)
-        self._sorted_timestamps = [m.timestamp for m in self._markers]
+        Its marker goes straight into the marker pyramid; the state index is
+        rebuilt on the next state or band query.
+        """
+        marker = self._make_marker(len(self._events), event)
+        self._events.append(event)
+        self._marker_pyramid.add(marker)
+        if self._incident_start is None or marker.timestamp < self._incident_start:
+            self._incident_start = marker.timestamp
+        if self._incident_end is None or marker.timestamp > self._incident_end:
+            self._incident_end = marker.timestamp
+        self._state_index_stale = True
+        return marker
     
     def _event_type_to_marker(self, event_type: str) -> MarkerType:
         """Map event type string to MarkerType."""
@@ -232,6 +316,129 @@ class ReplayEngine:
         }
         return mapping.get(event_type.lower(), MarkerType.ALARM)
     
+    # =========================================================================
+    # State Index
+    # =========================================================================
+    
+    def _build_state_index(self) -> None:
+        """
+        Precompute sorted per-table indexes for get_state_at().
+        
+        Every table is sorted once by time so a lookup is a bisect rather
+        than a scan. Event-derived state is folded into position logs, and
+        per-sensor trust is checkpointed every STATE_CHECKPOINT_INTERVAL
+        updates so a lookup only replays forward from the nearest checkpoint.
+        """
+        events = sorted(self._events, key=lambda e: e["timestamp"])
+        self._event_timestamps = [e["timestamp"] for e in events]
+        self._band_cache.clear()
+        self._state_index_stale = False
+        
+        self._contradiction_log = _PositionLog()
+        self._operator_log = _PositionLog()
+        self._mode_log = _PositionLog()
+        self._posture_log = _PositionLog()
+        self._claim_event_log = _PositionLog()
+        seen_contradictions = set()
+        
+        for position, e in enumerate(events):
+            event_type = e.get("event_type")
+            description = e.get("description", "")
+            
+            if event_type == "contradiction_detected":
+                reason_code = e.get("reason_code", "")
+                tag_id = e.get("tag_id", "")
+                if (reason_code, tag_id) not in seen_contradictions:
+                    seen_contradictions.add((reason_code, tag_id))
+                    self._contradiction_log.append(position, Contradiction(
+                        contradiction_id=f"contradiction_{reason_code}_{tag_id}",
+                        timestamp=e["timestamp"],
+                        primary_tag_id=tag_id,
+                        secondary_tag_ids=[],
+                        reason_code=reason_code,
+                        description=description,
+                        values={},
+                        expected_relationship="",
+                        resolved=False,
+                    ))
+            
+            if event_type == "operator_action":
+                self._operator_log.append(position, OperatorAction(
+                    timestamp=e["timestamp"],
+                    action_type=description.split(" - ")[0] if " - " in description else "action",
+                    description=description,
+                ))
+                desc = description.lower()
+                if "defer" in desc:
+                    self._posture_log.append(position, (Posture.DEFER, "Operator deferred pending verification"))
+                elif "escalate" in desc:
+                    self._posture_log.append(position, (Posture.ESCALATE, "Operator escalated"))
+            
+            if event_type == "mode_change":
+                desc = description.lower()
+                for mode in ("decision", "replay", "observe"):
+                    if mode in desc:
+                        self._mode_log.append(position, mode)
+                        break
+            
+            if event_type in ["failure_injection", "contradiction_detected", "mode_change"]:
+                self._claim_event_log.append(
+                    position, e.get("description", "System operating normally")
+                )
+        
+        # Trust: latest snapshot per sensor, checkpointed
+        trust_rows = sorted(self._trust_timeline, key=lambda t: t["timestamp"])
+        self._trust_timestamps = [t["timestamp"] for t in trust_rows]
+        self._trust_updates = []
+        self._trust_checkpoints = [{}]
+        latest: Dict[str, SensorTrustSnapshot] = {}
+        for i, update in enumerate(trust_rows, start=1):
+            reason_codes = update.get("reason_codes", "")
+            if isinstance(reason_codes, str):
+                reason_codes = [r.strip() for r in reason_codes.split(",") if r.strip()]
+            snapshot = SensorTrustSnapshot(
+                tag_id=update["tag_id"],
+                trust_score=update["trust_score"],
+                trust_state=TrustState(update.get("trust_state", "trusted").lower()),
+                reason_codes=reason_codes,
+            )
+            self._trust_updates.append(snapshot)
+            latest[snapshot.tag_id] = snapshot
+            if i % STATE_CHECKPOINT_INTERVAL == 0:
+                self._trust_checkpoints.append(dict(latest))
+        
+        # Tables looked up by "latest row at or before time_sec"
+        self._tables_by_time_sec = {}
+        for name, rows in (
+            ("claims", self._claims),
+            ("zone_states", self._zone_states),
+            ("action_gates", self._action_gates),
+            ("receipts", self._receipts),
+        ):
+            ordered = sorted(rows, key=lambda r: r["time_sec"])
+            self._tables_by_time_sec[name] = ([r["time_sec"] for r in ordered], ordered)
+    
+    def _latest_rows_at(self, table: str, time_sec: float) -> List[Dict]:
+        """
+        Rows of `table` sharing the latest time_sec at or before `time_sec`.
+        
+        Rows keep their file order within a tie, so rows[0] is the row the
+        original max() scan would have picked.
+        """
+        keys, rows = self._tables_by_time_sec.get(table, ([], []))
+        end = bisect_right(keys, time_sec)
+        if not end:
+            return []
+        return rows[bisect_left(keys, keys[end - 1]):end]
+    
+    def _trust_state_at(self, count: int) -> Dict[str, SensorTrustSnapshot]:
+        """Latest trust snapshot per sensor after the first `count` updates."""
+        checkpoint = min(count // STATE_CHECKPOINT_INTERVAL, len(self._trust_checkpoints) - 1)
+        sensor_trust = dict(self._trust_checkpoints[checkpoint])
+        for snapshot in self._trust_updates[checkpoint * STATE_CHECKPOINT_INTERVAL:count]:
+            sensor_trust[snapshot.tag_id] = snapshot
+        return sensor_trust
+    
     # =========================================================================
     # Core: Get State at Time t
     # =========================================================================
@@ -242,32 +449,37 @@ class ReplayEngine:
         
         CRITICAL: Returns ONLY information that was available at time t.
         Future evidence is NOT included.
+        
+        Lookups go through the state index, so cost is a bisect per table
+        plus a bounded trust replay rather than a scan of every table.
         """
         if not self._events:
             self.load_all()
+        if self._state_index_stale:
+            self._build_state_index()
         
         time_sec = self._get_time_sec(timestamp)
         
-        # Get events up to this time
-        events_at_t = [e for e in self._events if e["timestamp"] <= timestamp]
+        # Number of events known at this time
+        event_count = bisect_right(self._event_timestamps, timestamp)
         
         # Get trust state at time t
         trust_snapshot = self._get_trust_at(timestamp)
         
         # Get contradictions active at time t (not resolved)
-        contradictions = self._get_contradictions_at(timestamp)
+        contradictions = self._contradiction_log.upto(event_count)
         
         # Get operator actions up to time t
-        operator_history = self._get_operator_history_at(timestamp)
+        operator_history = self._operator_log.upto(event_count)
         
         # Get receipt status at time t
         receipt_status = self._get_receipt_status_at(timestamp)
         
         # Use CSV data if available, otherwise derive
-        claim, confirmation_status, confidence = self._get_claim_at(time_sec, events_at_t, contradictions)
-        posture, posture_reason = self._get_zone_posture_at(time_sec, events_at_t, contradictions, trust_snapshot)
+        claim, confirmation_status, confidence = self._get_claim_at(time_sec, event_count, contradictions)
+        posture, posture_reason = self._get_zone_posture_at(time_sec, event_count, contradictions, trust_snapshot)
         action_gating, allowed_actions = self._get_action_gating_at(time_sec, posture, confidence)
-        mode = self._derive_mode(events_at_t)
+        mode = self._derive_mode(event_count)
         next_step = self._derive_next_step(posture, contradictions)
         
         # Top reason codes from active contradictions
@@ -301,23 +513,8 @@ class ReplayEngine:
     
     def _get_trust_at(self, timestamp: datetime) -> TrustSnapshot:
         """Get trust state for all sensors at time t."""
-        # Filter trust updates up to timestamp
-        updates_at_t = [t for t in self._trust_timeline if t["timestamp"] <= timestamp]
-        
         # Get latest trust for each sensor
-        sensor_trust: Dict[str, SensorTrustSnapshot] = {}
-        for update in updates_at_t:
-            tag_id = update["tag_id"]
-            reason_codes = update.get("reason_codes", "")
-            if isinstance(reason_codes, str):
-                reason_codes = [r.strip() for r in reason_codes.split(",") if r.strip()]
-            
-            sensor_trust[tag_id] = SensorTrustSnapshot(
-                tag_id=tag_id,
-                trust_score=update["trust_score"],
-                trust_state=TrustState(update.get("trust_state", "trusted").lower()),
-                reason_codes=reason_codes,
-            )
+        sensor_trust = self._trust_state_at(bisect_right(self._trust_timestamps, timestamp))
         
         # Derive zone trust from sensors
         if sensor_trust:
@@ -334,59 +531,14 @@ class ReplayEngine:
             sensors=sensor_trust,
         )
     
-    def _get_contradictions_at(self, timestamp: datetime) -> List[Contradiction]:
-        """Get active contradictions at time t derived from events.csv.
-        
-        Contradictions are detected from 'contradiction_detected' events.
-        """
-        active = []
-        
-        # Find contradiction_detected events up to this timestamp
-        for e in self._events:
-            if e["timestamp"] <= timestamp and e.get("event_type") == "contradiction_detected":
-                reason_code = e.get("reason_code", "")
-                tag_id = e.get("tag_id", "")
-                
-                # Avoid duplicates
-                already_has = any(
-                    existing.reason_code == reason_code and 
-                    existing.primary_tag_id == tag_id
-                    for existing in active
-                )
-                if not already_has:
-                    active.append(Contradiction(
-                        contradiction_id=f"contradiction_{reason_code}_{tag_id}",
-                        timestamp=e["timestamp"],
-                        primary_tag_id=tag_id,
-                        secondary_tag_ids=[],
-                        reason_code=reason_code,
-                        description=e.get("description", ""),
-                        values={},
-                        expected_relationship="",
-                        resolved=False,
-                    ))
-        return active
-    
-    def _get_operator_history_at(self, timestamp: datetime) -> List[OperatorAction]:
-        """Get operator actions that occurred before time t."""
-        actions = []
-        for e in self._events:
-            if e["timestamp"] <= timestamp and e.get("event_type") == "operator_action":
-                actions.append(OperatorAction(
-                    timestamp=e["timestamp"],
-                    action_type=e.get("description", "").split(" - ")[0] if " - " in e.get("description", "") else "action",
-                    description=e.get("description", ""),
-                ))
-        return actions
-    
     def _get_receipt_status_at(self, timestamp: datetime) -> ReceiptStatus:
         """Get receipt status at time t from CSV receipts."""
         time_sec = self._get_time_sec(timestamp)
         
         # Check CSV receipts
-        receipts_at_t = [r for r in self._receipts if r["time_sec"] <= time_sec]
+        receipts_at_t = self._latest_rows_at("receipts", time_sec)
         if receipts_at_t:
-            latest = max(receipts_at_t, key=lambda r: r["time_sec"])
+            latest = receipts_at_t[0]
             status = latest.get("status", "created")
             receipt_ts = self._incident_start + __import__("datetime").timedelta(seconds=latest["time_sec"]) if self._incident_start else timestamp
             return ReceiptStatus(
@@ -405,15 +557,15 @@ class ReplayEngine:
     def _get_claim_at(
         self,
         time_sec: float,
-        events_at_t: List[Dict],
+        event_count: int,
         contradictions: List[Contradiction]
     ) -> Tuple[str, ConfirmationStatus, ConfidenceLevel]:
         """Get claim from claims.csv at time t, or derive if not available."""
         # Find the latest claim at or before time_sec
-        claims_at_t = [c for c in self._claims if c["time_sec"] <= time_sec]
+        claims_at_t = self._latest_rows_at("claims", time_sec)
         
         if claims_at_t:
-            latest = max(claims_at_t, key=lambda c: c["time_sec"])
+            latest = claims_at_t[0]
             claim = latest.get("statement", "System operating normally")
             status_str = latest.get("confirmation_status", "confirmed").lower()
             conf_str = latest.get("confidence", "high").lower()
@@ -424,11 +576,11 @@ class ReplayEngine:
             return claim, status, confidence
         
         # Fallback: derive from events/contradictions
-        return self._derive_claim_fallback(events_at_t, contradictions)
+        return self._derive_claim_fallback(event_count, contradictions)
     
     def _derive_claim_fallback(
         self, 
-        events_at_t: List[Dict], 
+        event_count: int, 
         contradictions: List[Contradiction]
     ) -> Tuple[str, ConfirmationStatus, ConfidenceLevel]:
         """Fallback: derive claim from events."""
@@ -437,11 +589,10 @@ class ReplayEngine:
             claim = latest.description
             status = ConfirmationStatus.CONFLICTING
             confidence = ConfidenceLevel.LOW
-        elif events_at_t:
-            for e in reversed(events_at_t):
-                if e.get("event_type") in ["failure_injection", "contradiction_detected", "mode_change"]:
-                    claim = e.get("description", "System operating normally")
-                    return claim, ConfirmationStatus.UNCONFIRMED, ConfidenceLevel.MEDIUM
+        elif event_count:
+            claim = self._claim_event_log.latest(event_count)
+            if claim is not None:
+                return claim, ConfirmationStatus.UNCONFIRMED, ConfidenceLevel.MEDIUM
             claim = "System operating normally"
             status = ConfirmationStatus.CONFIRMED
             confidence = ConfidenceLevel.HIGH
@@ -455,25 +606,21 @@ class ReplayEngine:
     def _get_zone_posture_at(
         self,
         time_sec: float,
-        events_at_t: List[Dict],
+        event_count: int,
         contradictions: List[Contradiction],
         trust: TrustSnapshot
     ) -> Tuple[Posture, str]:
         """Get posture from zone_states.csv at time t, or derive if not available."""
         # Check for operator actions first (these override)
-        for e in reversed(events_at_t):
-            if e.get("event_type") == "operator_action":
-                desc = e.get("description", "").lower()
-                if "defer" in desc:
-                    return Posture.DEFER, "Operator deferred pending verification"
-                elif "escalate" in desc:
-                    return Posture.ESCALATE, "Operator escalated"
+        override = self._posture_log.latest(event_count)
+        if override is not None:
+            return override
         
         # Find zone state from CSV
-        zone_states_at_t = [z for z in self._zone_states if z["time_sec"] <= time_sec]
+        zone_states_at_t = self._latest_rows_at("zone_states", time_sec)
         
         if zone_states_at_t:
-            latest = max(zone_states_at_t, key=lambda z: z["time_sec"])
+            latest = zone_states_at_t[0]
             posture_str = latest.get("recommended_posture", "monitor").lower()
             rationale = latest.get("posture_rationale", "")
             
@@ -497,14 +644,10 @@ class ReplayEngine:
         confidence: ConfidenceLevel
     ) -> Tuple[ActionGating, List[str]]:
         """Get action gating from action_gates.csv at time t."""
-        # Get action gates at time t
-        gates_at_t = [a for a in self._action_gates if a["time_sec"] <= time_sec]
+        # Get latest set of action gates at time t
+        latest_gates = self._latest_rows_at("action_gates", time_sec)
         
-        if gates_at_t:
-            # Group by time and get latest set
-            latest_time = max(a["time_sec"] for a in gates_at_t)
-            latest_gates = [a for a in gates_at_t if a["time_sec"] == latest_time]
-            
+        if latest_gates:
             # Determine overall gating from individual actions
             blocked_actions = [a["action_name"] for a in latest_gates if a["status"] == "blocked"]
             risky_actions = [a["action_name"] for a in latest_gates if a["status"] == "risky"]
@@ -529,18 +672,9 @@ class ReplayEngine:
         else:
             return ActionGating.ALLOWED, ["Monitor", "Adjust", "Defer", "Escalate"]
     
-    def _derive_mode(self, events_at_t: List[Dict]) -> str:
-        """Derive current mode from events."""
-        for e in reversed(events_at_t):
-            if e.get("event_type") == "mode_change":
-                desc = e.get("description", "").lower()
-                if "decision" in desc:
-                    return "decision"
-                elif "replay" in desc:
-                    return "replay"
-                elif "observe" in desc:
-                    return "observe"
-        return "observe"
+    def _derive_mode(self, event_count: int) -> str:
+        """Derive current mode from the first `event_count` events."""
+        return self._mode_log.latest(event_count, "observe")
     
     def _derive_next_step(
         self, 
@@ -620,18 +754,11 @@ class ReplayEngine:
           2 = 5-10 minute span
           3 = Seconds-level (all markers)
         """
-        if not self._markers:
+        if not len(self._marker_pyramid):
             self.load_all()
         
-        markers = self._markers
-        
         # Filter by time range
-        if start:
-            markers = [m for m in markers if m.timestamp >= start]
-        if end:
-            markers = [m for m in markers if m.timestamp <= end]
-        
-        return markers
+        return self._marker_pyramid.markers(start, end)
     
     def get_clustered_markers(
         self,
@@ -639,10 +766,18 @@ class ReplayEngine:
         end: datetime,
         max_clusters: int = 10,
     ) -> List[MarkerCluster]:
-        """Get clustered markers for zoomed-out view."""
-        markers = self.get_markers(start, end)
+        """
+        Get clustered markers for zoomed-out view.
+        
+        Clusters are the non-empty buckets of the marker pyramid level that
+        splits the range into at most max_clusters windows. They carry
+        summaries only; drill down by requesting markers (or clusters) for
+        a cluster's start_time..end_time.
+        """
+        if not len(self._marker_pyramid):
+            self.load_all()
         
-        if len(markers) <= max_clusters:
+        if self._marker_pyramid.count(start, end) <= max_clusters:
             # No clustering needed
             return [
                 MarkerCluster(
@@ -651,47 +786,17 @@ class ReplayEngine:
                     count=1,
                     dominant_type=m.marker_type,
                     label=m.label,
+                    type_counts={m.marker_type: 1},
+                    has_contradiction=m.has_contradiction,
                     markers=[m],
                 )
-                for m in markers
+                for m in self._marker_pyramid.markers(start, end)
             ]
         
-        # Simple time-based clustering
-        duration = (end - start).total_seconds()
-        cluster_duration = duration / max_clusters
-        
-        clusters: List[MarkerCluster] = []
-        current_cluster: List[TimelineMarker] = []
-        cluster_start = start
-        
-        for marker in markers:
-            if (marker.timestamp - cluster_start).total_seconds() > cluster_duration:
-                if current_cluster:
-                    clusters.append(self._make_cluster(current_cluster))
-                current_cluster = [marker]
-                cluster_start = marker.timestamp
-            else:
-                current_cluster.append(marker)
-        
-        if current_cluster:
-            clusters.append(self._make_cluster(current_cluster))
-        
-        return clusters
-    
-    def _make_cluster(self, markers: List[TimelineMarker]) -> MarkerCluster:
-        """Create a marker cluster from a list of markers."""
-        from collections import Counter
-        types = [m.marker_type for m in markers]
-        dominant = Counter(types).most_common(1)[0][0]
-        
-        return MarkerCluster(
-            start_time=markers[0].timestamp,
-            end_time=markers[-1].timestamp,
-            count=len(markers),
-            dominant_type=dominant,
-            label=f"{len(markers)} {dominant.value.replace('_', ' ').title()}s",
-            markers=markers,
-        )
+        return [
+            summary.to_cluster()
+            for summary in self._marker_pyramid.clusters(start, end, max_clusters)
+        ]
     
     def get_confidence_band(
         self,
@@ -703,6 +808,7 @@ class ReplayEngine:
         Get confidence ribbon data points.
         
         Returns evenly spaced points showing confidence level over time.
+        Bands are computed in one sweep and cached per (start, end, resolution).
         """
         if not self._trust_timeline:
             self.load_all()
@@ -712,25 +818,78 @@ class ReplayEngine:
         
         if not start or not end:
             return []
+        if self._state_index_stale:
+            self._build_state_index()
+        
+        key = (start, end, resolution)
+        points = self._band_cache.get(key)
+        if points is None:
+            points = self._sweep_confidence_band(start, end, resolution)
+            self._band_cache[key] = points
+            if len(self._band_cache) > CONFIDENCE_BAND_CACHE_SIZE:
+                self._band_cache.popitem(last=False)
+        else:
+            self._band_cache.move_to_end(key)
         
+        return list(points)
+    
+    def _sweep_confidence_band(
+        self,
+        start: datetime,
+        end: datetime,
+        resolution: int,
+    ) -> List[ConfidencePoint]:
+        """
+        Sample trust at resolution + 1 evenly spaced instants in one pass.
+        
+        Per-sensor state starts from the nearest checkpoint at `start` and
+        is rolled forward by the updates between consecutive samples (or
+        reloaded from a checkpoint when that is closer); the zone aggregates
+        are recomputed only when something changed. Cost is
+        O(min(updates in window, samples * checkpoint interval) + changed samples * sensors).
+        """
         points = []
         duration = (end - start).total_seconds()
         step = duration / resolution
         
+        count = -1
+        sensor_trust: Dict[str, SensorTrustSnapshot] = {}
+        avg_score, zone_confidence = 1.0, ConfidenceLevel.HIGH
+        
         for i in range(resolution + 1):
-            t = start + __import__("datetime").timedelta(seconds=i * step)
-            trust = self._get_trust_at(t)
+            t = start + timedelta(seconds=i * step)
             
-            # Get average trust score
-            if trust.sensors:
-                avg_score = sum(s.trust_score for s in trust.sensors.values()) / len(trust.sensors)
+            if count < 0 or t < points[-1].timestamp:
+                # First sample (or time went backwards): start from a checkpoint
+                count = bisect_right(self._trust_timestamps, t)
+                sensor_trust = self._trust_state_at(count)
+                changed = True
             else:
-                avg_score = 1.0
+                new_count = bisect_right(self._trust_timestamps, t, count)
+                if new_count - count > STATE_CHECKPOINT_INTERVAL:
+                    # Sparse samples: a checkpoint is closer than the last sample
+                    sensor_trust = self._trust_state_at(new_count)
+                else:
+                    for snapshot in self._trust_updates[count:new_count]:
+                        sensor_trust[snapshot.tag_id] = snapshot
+                changed = new_count != count
+                count = new_count
+            
+            if changed:
+                # Get average trust score
+                if sensor_trust:
+                    avg_score = sum(s.trust_score for s in sensor_trust.values()) / len(sensor_trust)
+                    zone_confidence = self._score_to_confidence(
+                        min(s.trust_score for s in sensor_trust.values())
+                    )
+                else:
+                    avg_score = 1.0
+                    zone_confidence = ConfidenceLevel.HIGH
             
             points.append(ConfidencePoint(
                 timestamp=t,
                 time_sec=i * step,
-                confidence_level=trust.zone_confidence,
+                confidence_level=zone_confidence,
                 trust_score=avg_score,
             ))
         
@@ -746,7 +905,7 @@ class ReplayEngine:
             start_time=self._incident_start or datetime.now(),
             end_time=self._incident_end or datetime.now(),
             duration_sec=(self._incident_end - self._incident_start).total_seconds() if self._incident_start and self._incident_end else 0,
-            markers=self._markers,
+            markers=self._marker_pyramid.markers(),
             confidence_band=self.get_confidence_band(),
             total_events=len(self._events),
             total_contradictions=len(self._contradictions),
@@ -0,0 +1,195 @@
+"""
+Scenario Bundle Module
+
+One versioned, columnar snapshot of a scenario's CSV and generated JSON
+files, so engines can start without csv.DictReader, strptime or json.load.
+
+A bundle is a directory:
+
+    bundle/
+        manifest.json            format, version, source signatures, table layouts
+        csv/events.bin           one data file per source file, columns at
+        generated/telemetry.bin  aligned offsets
+        ...
+
+Tables are named after their source path without the extension
+("csv/events", "generated/trust_updates"). Rows keep the shape the engines
+produce after parsing: `timestamp` is a datetime, CSV `time_sec`, `value`
+and `trust_score` are floats, every other CSV field is the raw string, and
+JSON fields keep their JSON types. Tag ids, reason codes, run ids and other
+enumerations are dictionary-encoded. Each table's data file is
+memory-mapped on first use and its columns are zero-copy NumPy views.
+
+Zero-copy stops at the column layer: the engines load through rows(),
+which builds each row as a dict, because their indexes hold rows and
+models. What a bundle saves them is CSV/JSON decoding and timestamp
+parsing. Code that can work on whole columns reads columns() instead.
+
+The manifest records each source file's size and mtime; open_bundle()
+ignores a bundle that no longer matches its sources, and engines fall back
+to parsing the files.
+"""
+
+import csv
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.record_stream import RecordColumns, iter_json_array, write_columns
+
+BUNDLE_FORMAT = "sator-scenario-bundle"
+BUNDLE_VERSION = 1
+BUNDLE_DIR_NAME = "bundle"
+MANIFEST_NAME = "manifest.json"
+
+SOURCE_PATTERNS = ("csv/*.csv", "generated/*.json")
+
+# Parsed while bundling; other CSV fields stay strings
+TIMESTAMP_FIELDS = {"timestamp"}
+CSV_FLOAT_FIELDS = {"time_sec", "value", "trust_score"}
+
+# Always stored as codes into a value table
+DICTIONARY_FIELDS = {
+    "run_id", "scenario_id", "tag_id", "primary_tag_id", "secondary_tag_ids",
+    "reason_code", "reason_codes", "active_reason_codes",
+    "event_type", "severity", "quality", "unit", "sensor_name", "redundancy_group",
+    "trust_state", "action", "actor", "chain_id", "action_type", "operator_id",
+}
+
+
+def _signature(path: Path) -> Dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _parse_timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.strip())
+    return value
+
+
+def _source_files(data_dir: Path) -> List[Path]:
+    files = []
+    for pattern in SOURCE_PATTERNS:
+        files.extend(sorted(data_dir.glob(pattern)))
+    return files
+
+
+def _table_name(data_dir: Path, path: Path) -> str:
+    return path.relative_to(data_dir).with_suffix("").as_posix()
+
+
+def _csv_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            for field in TIMESTAMP_FIELDS & row.keys():
+                row[field] = _parse_timestamp(row[field])
+            for field in CSV_FLOAT_FIELDS & row.keys():
+                row[field] = float(row[field])
+            yield row
+
+
+def _json_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    for record in iter_json_array(path):
+        for field in TIMESTAMP_FIELDS & record.keys():
+            record[field] = _parse_timestamp(record[field])
+        yield record
+
+
+# =============================================================================
+# Building
+# =============================================================================
+
+def build_bundle(data_dir: Path, out_dir: Optional[Path] = None) -> Path:
+    """
+    Convert a data directory's csv/*.csv and generated/*.json into a bundle.
+
+    Writes to out_dir (default data_dir/bundle), replacing any bundle there.
+    Returns the bundle directory.
+    """
+    data_dir = Path(data_dir)
+    out_dir = Path(out_dir) if out_dir is not None else data_dir / BUNDLE_DIR_NAME
+    staging = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    sources: Dict[str, Dict[str, int]] = {}
+    tables: Dict[str, Dict[str, Any]] = {}
+    for path in _source_files(data_dir):
+        name = _table_name(data_dir, path)
+        sources[path.relative_to(data_dir).as_posix()] = _signature(path)
+        rows = _csv_rows(path) if path.suffix == ".csv" else _json_rows(path)
+        data_path = staging / f"{name}.bin"
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        tables[name] = write_columns(data_path, rows, DICTIONARY_FIELDS)
+
+    staging.mkdir(parents=True, exist_ok=True)
+    (staging / MANIFEST_NAME).write_text(json.dumps({
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "sources": sources,
+        "tables": tables,
+    }, indent=2))
+    shutil.rmtree(out_dir, ignore_errors=True)
+    staging.rename(out_dir)
+    return out_dir
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+class ScenarioBundle:
+    """Read-only view of a bundle; tables are memory-mapped when first used."""
+
+    def __init__(self, path: Path, manifest: Dict[str, Any]):
+        self.path = Path(path)
+        self.manifest = manifest
+        self._tables: Dict[str, RecordColumns] = {}
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self.manifest["tables"])
+
+    def has_table(self, name: str) -> bool:
+        return name in self.manifest["tables"]
+
+    def columns(self, name: str) -> RecordColumns:
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = RecordColumns(self.path / f"{name}.bin", self.manifest["tables"][name])
+        return table
+
+    def rows(self, name: str, where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Rows of a table in source order as dicts (empty if the source didn't exist)"""
+        if not self.has_table(name):
+            return []
+        table = self.columns(name)
+        return list(table.records(table.select(where) if where else None))
+
+
+def open_bundle(data_dir: Path, path: Optional[Path] = None) -> Optional[ScenarioBundle]:
+    """
+    Open the bundle for data_dir if it is current.
+
+    Returns None when there is no bundle, it has another format version, or
+    its source files were added, removed or changed since it was built.
+    """
+    data_dir = Path(data_dir)
+    path = Path(path) if path is not None else data_dir / BUNDLE_DIR_NAME
+    try:
+        manifest = json.loads((path / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != BUNDLE_FORMAT or manifest.get("version") != BUNDLE_VERSION:
+        return None
+
+    current = {
+        source.relative_to(data_dir).as_posix(): _signature(source)
+        for source in _source_files(data_dir)
+    }
+    if current != manifest.get("sources"):
+        return None
+    return ScenarioBundle(path, manifest)
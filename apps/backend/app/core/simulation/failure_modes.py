@@ -5,11 +5,14 @@ Injects controlled failures into sensor signals to trigger Reason Codes.
 Each failure mode maps to a specific RC in the Trust Layer.
 """
 
+import math
+import zlib
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Callable
 from dataclasses import dataclass, field
 
+from app.core.interval_index import IntervalIndex
 from app.models.simulation import FailureModeType, FailureMode
 from app.models.telemetry import TelemetryPoint, QualityFlag
 
@@ -35,6 +38,81 @@ class FailureState:
     missing_until: float | None = None
 
 
+# Codes used by InjectedSignal (-1 = untouched)
+QUALITY_CODES: tuple[QualityFlag, ...] = tuple(QualityFlag)
+FAILURE_LABELS: tuple[str, ...] = tuple(t.value for t in FailureModeType)
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _burst_hash(tag_id: str, time_sec: np.ndarray) -> np.ndarray:
+    """
+    Deterministic 0-99 bucket per (tag, 100 ms slot), stable across processes.
+    
+    SplitMix64 finalizer over the tag's CRC32 and the slot number.
+    """
+    slots = np.trunc(time_sec * 10).astype(np.int64).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        z = (slots + np.uint64(zlib.crc32(tag_id.encode("utf-8")))) * _GOLDEN_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z % np.uint64(100)).astype(np.int64)
+
+
+def _or(values: np.ndarray, default: float) -> np.ndarray:
+    """Elementwise `value or default` (missing samples are NaN)"""
+    return np.where((values == 0) | np.isnan(values), default, values)
+
+
+@dataclass
+class InjectedSignal:
+    """
+    One sensor's samples after failure injection, as arrays.
+    
+    Dropped samples are masked out (keep=False) rather than removed.
+    quality and failure hold indexes into QUALITY_CODES / FAILURE_LABELS,
+    -1 where no failure touched the sample.
+    """
+    time_sec: np.ndarray
+    values: np.ndarray
+    keep: np.ndarray
+    quality: np.ndarray
+    failure: np.ndarray
+    cumulative_drift: np.ndarray | None = None
+    contradiction_type: np.ndarray | None = None
+    
+    @classmethod
+    def clean(cls, time_sec: np.ndarray, values: np.ndarray) -> "InjectedSignal":
+        n = len(values)
+        return cls(
+            time_sec=np.asarray(time_sec, dtype=np.float64),
+            values=np.array(values, dtype=np.float64),
+            keep=np.ones(n, dtype=bool),
+            quality=np.full(n, -1, dtype=np.int8),
+            failure=np.full(n, -1, dtype=np.int8),
+        )
+    
+    def mark(self, idx: np.ndarray, failure_type: FailureModeType, quality: QualityFlag) -> None:
+        self.failure[idx] = FAILURE_LABELS.index(failure_type.value)
+        self.quality[idx] = QUALITY_CODES.index(quality)
+    
+    def quality_at(self, i: int, default: QualityFlag = QualityFlag.GOOD) -> QualityFlag:
+        code = self.quality[i]
+        return default if code < 0 else QUALITY_CODES[code]
+    
+    def metadata_at(self, i: int, base: dict) -> dict:
+        """Sample metadata as the per-point handlers would have built it"""
+        if self.failure[i] < 0:
+            return base
+        metadata = {**base, "failure": FAILURE_LABELS[self.failure[i]]}
+        if self.cumulative_drift is not None and not np.isnan(self.cumulative_drift[i]):
+            metadata["cumulative_drift"] = float(self.cumulative_drift[i])
+        if self.contradiction_type is not None and self.contradiction_type[i] is not None:
+            metadata["type"] = self.contradiction_type[i]
+        return metadata
+
+
 class FailureModeInjector:
     """
     Injects failure modes into sensor signals.
@@ -48,10 +126,16 @@ class FailureModeInjector:
     - RC09: Drift (gradual divergence)
     - RC10: Redundancy Conflict (sensor mismatch)
     - RC11: Physics Contradiction (impossible state)
+    
+    Every handler transforms a whole window of a sensor's samples at once
+    (values plus a keep mask); single points go through the same path as
+    one-sample arrays. Failure windows are kept in an interval index keyed
+    by tag; overlapping failures are applied in scheduling order.
     """
     
     def __init__(self):
         self._active_failures: dict[str, ActiveFailure] = {}
+        self._windows = IntervalIndex()
         self._failure_states: dict[str, FailureState] = {}
         self._failure_counter = 0
         
@@ -70,6 +154,7 @@ class FailureModeInjector:
     def reset(self) -> None:
         """Reset all failure state"""
         self._active_failures.clear()
+        self._windows.clear()
         self._failure_states.clear()
         self._failure_counter = 0
     
@@ -86,12 +171,14 @@ class FailureModeInjector:
         if failure.duration_sec is not None:
             ends_at = failure.start_time_sec + failure.duration_sec
         
-        self._active_failures[failure_id] = ActiveFailure(
+        active = ActiveFailure(
             failure_id=failure_id,
             failure_mode=failure,
             started_at=failure.start_time_sec,
             ends_at=ends_at,
         )
+        self._active_failures[failure_id] = active
+        self._windows.add(active.started_at, active.ends_at, active, key=failure.tag_id)
         
         return failure_id
     
@@ -129,6 +216,50 @@ class FailureModeInjector:
             "ends_at": current_time_sec + duration_sec if duration_sec else None,
         }
     
+    def _failures_overlapping(self, tag_id: str, start_sec: float, end_sec: float) -> list[ActiveFailure]:
+        """Active failures on a tag whose window meets [start_sec, end_sec], in scheduling order"""
+        return [
+            f for f in self._windows.overlapping(start_sec, end_sec, key=tag_id)
+            if f.is_active
+        ]
+    
+    def apply_failures_array(
+        self,
+        tag_id: str,
+        time_sec: np.ndarray,
+        values: np.ndarray,
+    ) -> InjectedSignal:
+        """
+        Apply all active failures to a sensor's samples.
+        
+        Args:
+            tag_id: Sensor the samples belong to
+            time_sec: Simulation time of each sample (ascending)
+            values: Sample values
+            
+        Returns:
+            InjectedSignal with transformed values and a keep mask
+        """
+        signal = InjectedSignal.clean(time_sec, values)
+        if not len(signal.time_sec):
+            return signal
+        
+        failures = self._failures_overlapping(tag_id, signal.time_sec[0], signal.time_sec[-1])
+        for failure in failures:
+            handler = self._handlers.get(failure.failure_mode.type)
+            if handler is None:
+                continue
+            lo = int(np.searchsorted(signal.time_sec, failure.started_at, side="left"))
+            hi = len(signal.time_sec) if failure.ends_at is None else int(
+                np.searchsorted(signal.time_sec, failure.ends_at, side="left")
+            )
+            # Samples already dropped by an earlier failure are not processed further
+            idx = np.flatnonzero(signal.keep[lo:hi]) + lo
+            if len(idx):
+                handler(signal, idx, failure.failure_mode)
+        
+        return signal
+    
     def apply_failures(
         self,
         point: TelemetryPoint,
@@ -139,31 +270,24 @@ class FailureModeInjector:
         
         Returns the modified point (or None if point should be dropped).
         """
-        # Find active failures for this tag
-        active_for_tag = [
-            f for f in self._active_failures.values()
-            if f.failure_mode.tag_id == point.tag_id
-            and f.is_active
-            and f.started_at <= current_time_sec
-            and (f.ends_at is None or current_time_sec < f.ends_at)
-        ]
-        
-        if not active_for_tag:
+        if not self._failures_overlapping(point.tag_id, current_time_sec, current_time_sec):
             return point
         
-        # Apply each failure in order
-        modified_point = point.model_copy()
+        signal = self.apply_failures_array(
+            point.tag_id,
+            np.array([current_time_sec]),
+            np.array([np.nan if point.value is None else point.value]),
+        )
+        if not signal.keep[0]:
+            return None
         
-        for failure in active_for_tag:
-            handler = self._handlers.get(failure.failure_mode.type)
-            if handler:
-                result = handler(modified_point, failure.failure_mode, current_time_sec)
-                if result is None:
-                    # Point should be dropped (missing data)
-                    return None
-                modified_point = result
-        
-        return modified_point
+        return TelemetryPoint(
+            tag_id=point.tag_id,
+            timestamp=point.timestamp,
+            value=None if np.isnan(signal.values[0]) else float(signal.values[0]),
+            quality=signal.quality_at(0, point.quality),
+            metadata=signal.metadata_at(0, point.metadata),
+        )
     
     def update_failure_states(self, current_time_sec: float) -> list[str]:
         """
@@ -176,6 +300,14 @@ class FailureModeInjector:
                 ended.append(failure_id)
         return ended
     
+    def get_failure_windows(self, tag_id: str) -> list[tuple[float, float | None]]:
+        """(started_at, ends_at) of every active failure on a tag; outside these apply_failures is a no-op"""
+        return [
+            (f.started_at, f.ends_at)
+            for f in self._windows.overlapping(-math.inf, math.inf, key=tag_id)
+            if f.is_active
+        ]
+    
     def get_active_failures(self, tag_id: str | None = None) -> list[dict]:
         """Get list of active failures, optionally filtered by tag"""
         result = []
@@ -192,13 +324,15 @@ class FailureModeInjector:
         return result
     
     # === Failure Mode Handlers ===
+    # Each handler transforms signal at the sample indexes idx (all inside
+    # the failure window and not yet dropped).
     
     def _apply_missing_bursts(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint | None:
+    ) -> None:
         """
         RC01: Missing Bursts - create data gaps
         
@@ -208,32 +342,29 @@ class FailureModeInjector:
         """
         gap_prob = failure.params.get("gap_probability", 0.3)
         
-        # Deterministic "randomness" based on time
-        drop_seed = hash((failure.tag_id, int(current_time_sec * 10))) % 100
-        if drop_seed < gap_prob * 100:
-            return None  # Drop this point
-        
-        return point
+        # Deterministic "randomness" based on time (100 ms slots)
+        drop_seed = _burst_hash(failure.tag_id, signal.time_sec[idx])
+        signal.keep[idx[drop_seed < gap_prob * 100]] = False
     
     def _apply_stale_stream(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint | None:
+    ) -> None:
         """
         RC02: Stale Stream - stop sending updates
         
         When active, all points are dropped to simulate no updates.
         """
-        return None  # Drop all points during stale period
+        signal.keep[idx] = False
     
     def _apply_range_violation(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint:
+    ) -> None:
         """
         RC05: Range Violation - push values outside physical limits
         
@@ -246,27 +377,23 @@ class FailureModeInjector:
         magnitude = failure.params.get("magnitude", 1.5)
         violation_value = failure.params.get("violation_value")
         
+        values = signal.values[idx]
         if violation_value is not None:
-            new_value = violation_value
+            new_values = np.full(len(idx), violation_value, dtype=np.float64)
         elif direction == "high":
-            new_value = point.value * magnitude if point.value else 1000.0
+            new_values = np.where((values == 0) | np.isnan(values), 1000.0, values * magnitude)
         else:
-            new_value = -abs(point.value or 100) * magnitude
+            new_values = -np.abs(_or(values, 100.0)) * magnitude
         
-        return TelemetryPoint(
-            tag_id=point.tag_id,
-            timestamp=point.timestamp,
-            value=new_value,
-            quality=QualityFlag.BAD,
-            metadata={**point.metadata, "failure": "range_violation"}
-        )
+        signal.values[idx] = new_values
+        signal.mark(idx, FailureModeType.RANGE_VIOLATION, QualityFlag.BAD)
     
     def _apply_roc_violation(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint:
+    ) -> None:
         """
         RC06: ROC Violation - create sudden spikes
         
@@ -276,23 +403,16 @@ class FailureModeInjector:
         spike_mag = failure.params.get("spike_magnitude", 50.0)
         
         # Alternate spike direction based on time
-        direction = 1 if int(current_time_sec) % 2 == 0 else -1
-        new_value = (point.value or 0) + (spike_mag * direction)
-        
-        return TelemetryPoint(
-            tag_id=point.tag_id,
-            timestamp=point.timestamp,
-            value=new_value,
-            quality=QualityFlag.UNCERTAIN,
-            metadata={**point.metadata, "failure": "roc_violation"}
-        )
+        direction = np.where(np.trunc(signal.time_sec[idx]).astype(np.int64) % 2 == 0, 1, -1)
+        signal.values[idx] = _or(signal.values[idx], 0.0) + spike_mag * direction
+        signal.mark(idx, FailureModeType.ROC_VIOLATION, QualityFlag.UNCERTAIN)
     
     def _apply_flatline(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint:
+    ) -> None:
         """
         RC07: Flatline - sensor stuck at a value
         
@@ -302,29 +422,23 @@ class FailureModeInjector:
         state_key = f"{failure.tag_id}_flatline"
         
         if state_key not in self._failure_states:
-            stuck_value = failure.params.get("stuck_value", point.value)
+            stuck_value = failure.params.get("stuck_value", float(signal.values[idx[0]]))
             self._failure_states[state_key] = FailureState(
                 tag_id=failure.tag_id,
                 failure_type=FailureModeType.FLATLINE,
                 last_value=stuck_value,
             )
         
-        stuck_value = self._failure_states[state_key].last_value
-        
-        return TelemetryPoint(
-            tag_id=point.tag_id,
-            timestamp=point.timestamp,
-            value=stuck_value,
-            quality=QualityFlag.GOOD,  # Flatline often looks "good" at first
-            metadata={**point.metadata, "failure": "flatline"}
-        )
+        signal.values[idx] = self._failure_states[state_key].last_value
+        # Flatline often looks "good" at first
+        signal.mark(idx, FailureModeType.FLATLINE, QualityFlag.GOOD)
     
     def _apply_drift(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint:
+    ) -> None:
         """
         RC09: Drift - gradual divergence from true value
         
@@ -344,28 +458,25 @@ class FailureModeInjector:
                 cumulative_drift=0.0,
             )
         
-        # Calculate time since failure started
-        time_in_failure = current_time_sec - failure.start_time_sec
+        # Drift grows with time since the failure started
+        time_in_failure = signal.time_sec[idx] - failure.start_time_sec
         cumulative_drift = drift_rate * time_in_failure * direction
         
-        self._failure_states[state_key].cumulative_drift = cumulative_drift
-        
-        new_value = (point.value or 0) + cumulative_drift
+        self._failure_states[state_key].cumulative_drift = float(cumulative_drift[-1])
         
-        return TelemetryPoint(
-            tag_id=point.tag_id,
-            timestamp=point.timestamp,
-            value=new_value,
-            quality=QualityFlag.GOOD,  # Drift is subtle at first
-            metadata={**point.metadata, "failure": "drift", "cumulative_drift": cumulative_drift}
-        )
+        if signal.cumulative_drift is None:
+            signal.cumulative_drift = np.full(len(signal.values), np.nan)
+        signal.cumulative_drift[idx] = cumulative_drift
+        signal.values[idx] = _or(signal.values[idx], 0.0) + cumulative_drift
+        # Drift is subtle at first
+        signal.mark(idx, FailureModeType.DRIFT, QualityFlag.GOOD)
     
     def _apply_redundancy_conflict(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint:
+    ) -> None:
         """
         RC10: Redundancy Conflict - diverge from peer sensors
         
@@ -375,22 +486,15 @@ class FailureModeInjector:
         """
         offset = failure.params.get("offset", -60.0)  # Default: show 60 units lower
         
-        new_value = (point.value or 100) + offset
-        
-        return TelemetryPoint(
-            tag_id=point.tag_id,
-            timestamp=point.timestamp,
-            value=new_value,
-            quality=QualityFlag.GOOD,
-            metadata={**point.metadata, "failure": "redundancy_conflict"}
-        )
+        signal.values[idx] = _or(signal.values[idx], 100.0) + offset
+        signal.mark(idx, FailureModeType.REDUNDANCY_CONFLICT, QualityFlag.GOOD)
     
     def _apply_physics_contradiction(
         self,
-        point: TelemetryPoint,
+        signal: InjectedSignal,
+        idx: np.ndarray,
         failure: FailureMode,
-        current_time_sec: float,
-    ) -> TelemetryPoint:
+    ) -> None:
         """
         RC11: Physics Contradiction - impossible physical state
         
@@ -404,19 +508,14 @@ class FailureModeInjector:
         forced_value = failure.params.get("forced_value")
         
         if forced_value is not None:
-            new_value = forced_value
-        else:
-            # For valve_flow: if this is a flow sensor, show flow when valve is "closed"
-            # The actual contradiction logic is handled by the trust layer
-            new_value = point.value
-        
-        return TelemetryPoint(
-            tag_id=point.tag_id,
-            timestamp=point.timestamp,
-            value=new_value,
-            quality=QualityFlag.GOOD,
-            metadata={**point.metadata, "failure": "physics_contradiction", "type": contradiction_type}
-        )
+            signal.values[idx] = forced_value
+        # Otherwise (e.g. flow shown while valve "closed") the value is kept;
+        # the actual contradiction logic is handled by the trust layer
+        
+        if signal.contradiction_type is None:
+            signal.contradiction_type = np.full(len(signal.values), None, dtype=object)
+        signal.contradiction_type[idx] = contradiction_type
+        signal.mark(idx, FailureModeType.PHYSICS_CONTRADICTION, QualityFlag.GOOD)
 
 
 # Convenience functions for creating failure modes
@@ -6,6 +6,7 @@ Uses NumPy for reproducible signal generation.
 """
 
 import numpy as np
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Generator
 
@@ -13,6 +14,48 @@ from app.models.telemetry import TelemetryPoint, QualityFlag
 from app.models.simulation import SensorSpec
 
 
+@dataclass
+class GeneratedSignal:
+    """
+    One sensor's generated samples, kept as arrays.
+    
+    TelemetryPoint objects are only built for the samples a caller asks for.
+    """
+    tag_id: str
+    base_time: datetime
+    time_sec: np.ndarray
+    values: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def point(self, index: int) -> TelemetryPoint:
+        """Materialize the sample at index"""
+        return TelemetryPoint(
+            tag_id=self.tag_id,
+            timestamp=self.base_time + timedelta(seconds=float(self.time_sec[index])),
+            value=float(self.values[index]),
+            quality=QualityFlag.GOOD,
+            metadata={"sample_index": index}
+        )
+    
+    def points(self, start: int = 0, stop: int | None = None) -> list[TelemetryPoint]:
+        """Materialize samples [start, stop) from array slices"""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        times = self.time_sec[start:stop].tolist()
+        values = self.values[start:stop].tolist()
+        return [
+            TelemetryPoint(
+                tag_id=self.tag_id,
+                timestamp=self.base_time + timedelta(seconds=t),
+                value=value,
+                quality=QualityFlag.GOOD,
+                metadata={"sample_index": i}
+            )
+            for i, t, value in zip(range(start, stop), times, values)
+        ]
+
+
 class SignalGenerator:
     """
     Generates deterministic sensor signals for simulation.
@@ -137,16 +180,38 @@ class SignalGenerator:
         t_array, signal_array = self.generate_sensor_signal(
             sensor, duration_sec, sample_rate
         )
+        signal = GeneratedSignal(sensor.tag_id, base_time, t_array, signal_array)
         
-        for i, (t, value) in enumerate(zip(t_array, signal_array)):
-            timestamp = base_time + timedelta(seconds=float(t))
-            yield TelemetryPoint(
-                tag_id=sensor.tag_id,
-                timestamp=timestamp,
-                value=float(value),
-                quality=QualityFlag.GOOD,
-                metadata={"sample_index": i}
+        for i in range(len(signal)):
+            yield signal.point(i)
+    
+    def generate_signal_arrays(
+        self,
+        sensors: list[SensorSpec],
+        duration_sec: float,
+        sample_rate: float,
+        base_time: datetime | None = None,
+    ) -> dict[str, GeneratedSignal]:
+        """
+        Generate signals for multiple sensors without building points.
+        
+        Draws from the RNG in the same order as generate_multiple_sensors,
+        so both produce the same values for the same seed.
+        
+        Returns:
+            Dict mapping tag_id to GeneratedSignal
+        """
+        if base_time is None:
+            base_time = self._base_time or datetime.utcnow()
+        
+        result = {}
+        for sensor in sensors:
+            t_array, signal_array = self.generate_sensor_signal(
+                sensor, duration_sec, sample_rate
             )
+            result[sensor.tag_id] = GeneratedSignal(sensor.tag_id, base_time, t_array, signal_array)
+        
+        return result
     
     def generate_multiple_sensors(
         self,
@@ -167,17 +232,8 @@ class SignalGenerator:
         Returns:
             Dict mapping tag_id to list of TelemetryPoint
         """
-        if base_time is None:
-            base_time = self._base_time or datetime.utcnow()
-        
-        result = {}
-        for sensor in sensors:
-            points = list(self.generate_telemetry_stream(
-                sensor, duration_sec, sample_rate, base_time
-            ))
-            result[sensor.tag_id] = points
-        
-        return result
+        signals = self.generate_signal_arrays(sensors, duration_sec, sample_rate, base_time)
+        return {tag_id: signal.points() for tag_id, signal in signals.items()}
     
     def get_value_at_time(
         self,
@@ -4,6 +4,7 @@ Golden Scenarios Module
 Pre-defined scenarios for demo purposes with deterministic failure timelines.
 """
 
+import numpy as np
 from datetime import datetime, timedelta
 from typing import Generator
 
@@ -11,9 +12,10 @@ from app.models.simulation import (
     ScenarioSpec, SensorSpec, FailureMode, FailureModeType, ScenarioState
 )
 from app.models.telemetry import TelemetryPoint
-from .generator import SignalGenerator
+from .generator import GeneratedSignal, SignalGenerator
 from .failure_modes import (
     FailureModeInjector,
+    InjectedSignal,
     create_redundancy_conflict_failure,
     create_physics_contradiction_failure,
     create_flatline_failure,
@@ -219,7 +221,7 @@ class ScenarioRunner:
         self.injector = injector
         self._active_scenario: ScenarioSpec | None = None
         self._state: ScenarioState | None = None
-        self._generated_data: dict[str, list[TelemetryPoint]] = {}
+        self._generated_data: dict[str, GeneratedSignal] = {}
         self._base_time: datetime | None = None
     
     def start(self, scenario_name: str) -> dict:
@@ -268,9 +270,9 @@ class ScenarioRunner:
     def _generate_scenario_data(
         self, 
         scenario: ScenarioSpec
-    ) -> dict[str, list[TelemetryPoint]]:
-        """Pre-generate all telemetry data for a scenario"""
-        return self.generator.generate_multiple_sensors(
+    ) -> dict[str, GeneratedSignal]:
+        """Pre-generate all telemetry data for a scenario (as arrays)"""
+        return self.generator.generate_signal_arrays(
             sensors=scenario.sensors,
             duration_sec=scenario.duration_sec,
             sample_rate=scenario.sample_rate,
@@ -289,9 +291,9 @@ class ScenarioRunner:
         sample_idx = int(time_sec * self._active_scenario.sample_rate)
         result = []
         
-        for tag_id, points in self._generated_data.items():
-            if sample_idx < len(points):
-                point = points[sample_idx]
+        for tag_id, signal in self._generated_data.items():
+            if sample_idx < len(signal):
+                point = signal.point(sample_idx)
                 # Apply failures
                 modified = self.injector.apply_failures(point, time_sec)
                 if modified is not None:
@@ -302,29 +304,97 @@ class ScenarioRunner:
         
         return result
     
+    def get_telemetry_range_arrays(
+        self,
+        start_sec: float,
+        end_sec: float,
+    ) -> dict[str, tuple[int, InjectedSignal]]:
+        """
+        Get telemetry for a time range without building points.
+        
+        Returns { tag_id: (start_index, InjectedSignal) }; sample i of the
+        signal is generated sample start_index + i.
+        """
+        if not self._active_scenario:
+            return {}
+        
+        result: dict[str, tuple[int, InjectedSignal]] = {}
+        sample_rate = self._active_scenario.sample_rate
+        
+        start_idx = max(0, int(start_sec * sample_rate))
+        end_idx = int(end_sec * sample_rate)
+        
+        for tag_id, signal in self._generated_data.items():
+            stop_idx = max(start_idx, min(end_idx, len(signal)))
+            times = np.arange(start_idx, stop_idx) / sample_rate
+            values = signal.values[start_idx:stop_idx]
+            
+            if self.injector.get_failure_windows(tag_id):
+                result[tag_id] = (start_idx, self.injector.apply_failures_array(tag_id, times, values))
+            else:
+                result[tag_id] = (start_idx, InjectedSignal.clean(times, values))
+        
+        return result
+    
     def get_telemetry_range(
         self, 
         start_sec: float, 
         end_sec: float
     ) -> dict[str, list[TelemetryPoint]]:
-        """Get telemetry for a time range"""
-        if not self._active_scenario:
-            return {}
+        """
+        Get telemetry for a time range.
         
+        Failures are applied to whole array slices; TelemetryPoints are
+        built only for the samples that survive.
+        """
         result: dict[str, list[TelemetryPoint]] = {}
-        sample_rate = self._active_scenario.sample_rate
         
-        start_idx = int(start_sec * sample_rate)
-        end_idx = int(end_sec * sample_rate)
+        for tag_id, (start_idx, injected) in self.get_telemetry_range_arrays(start_sec, end_sec).items():
+            signal = self._generated_data[tag_id]
+            if injected.failure.max(initial=-1) < 0 and injected.keep.all():
+                result[tag_id] = signal.points(start_idx, start_idx + len(injected.values))
+                continue
+            
+            result[tag_id] = [
+                TelemetryPoint(
+                    tag_id=tag_id,
+                    timestamp=signal.base_time + timedelta(seconds=float(signal.time_sec[start_idx + i])),
+                    value=None if np.isnan(injected.values[i]) else float(injected.values[i]),
+                    quality=injected.quality_at(i),
+                    metadata=injected.metadata_at(i, {"sample_index": start_idx + i}),
+                )
+                for i in np.flatnonzero(injected.keep).tolist()
+            ]
         
-        for tag_id, points in self._generated_data.items():
-            result[tag_id] = []
-            for idx in range(start_idx, min(end_idx, len(points))):
-                time_sec = idx / sample_rate
-                point = points[idx]
-                modified = self.injector.apply_failures(point, time_sec)
-                if modified is not None:
-                    result[tag_id].append(modified)
+        return result
+    
+    def get_telemetry_range_points(
+        self,
+        start_sec: float,
+        end_sec: float,
+    ) -> dict[str, list[dict]]:
+        """
+        Get telemetry for a time range as JSON-ready dicts.
+        
+        Returns { tag_id: [{"timestamp", "value", "quality"}, ...] } with
+        the same samples as get_telemetry_range(), read straight from the
+        arrays (dropped samples omitted, NaN values as None).
+        """
+        result: dict[str, list[dict]] = {}
+        
+        for tag_id, (start_idx, injected) in self.get_telemetry_range_arrays(start_sec, end_sec).items():
+            signal = self._generated_data[tag_id]
+            rows = np.flatnonzero(injected.keep)
+            times = signal.time_sec[start_idx + rows].tolist()
+            values = injected.values[rows].tolist()
+            result[tag_id] = [
+                {
+                    "timestamp": (signal.base_time + timedelta(seconds=t)).isoformat(),
+                    "value": None if v != v else v,
+                    "quality": injected.quality_at(i).value,
+                }
+                for i, t, v in zip(rows.tolist(), times, values)
+            ]
         
         return result
     
@@ -12,13 +12,22 @@ both data sources for advanced reasoning and verification.
 """
 
 import csv
-import json
+from bisect import bisect_right, insort
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Iterable, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+from app.core.record_stream import iter_records
+from app.core.scenario_bundle import ScenarioBundle, open_bundle
+from config import config
+
+
+# A contradiction following one of a different reason code within this many
+# seconds counts as a cascade
+CASCADE_WINDOW_SEC = 2.0
+
 
 # =============================================================================
 # Data Models for Temporal Reasoning
@@ -132,6 +141,170 @@ class ContradictionPattern:
     cascading: bool  # Did it trigger other contradictions?
 
 
+@dataclass
+class CascadeEdge:
+    """Contradictions of one reason code attributed to an earlier one of another code."""
+    trigger_code: str
+    triggered_code: str
+    count: int
+    min_lag: float
+    max_lag: float
+    mean_lag: float
+
+
+# =============================================================================
+# Partitioned Indexes
+# =============================================================================
+
+class TimeSlice:
+    """
+    Records of one partition sorted by time_sec, ties kept in load order.
+
+    Built from (load_position, record) pairs; upto(t) bisects to the end of
+    the records at or before t.
+    """
+
+    def __init__(self, records: List[Tuple[int, Any]]):
+        records = sorted(records, key=lambda r: (r[1].time_sec, r[0]))
+        self.positions = [position for position, _ in records]
+        self.items = [record for _, record in records]
+        self.times = [record.time_sec for record in self.items]
+        # count -> for each prefix of items, the indexes of its last `count` records by load position
+        self._last: Dict[int, List[Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def upto(self, time_sec: float) -> int:
+        return bisect_right(self.times, time_sec)
+
+    def upto_in_load_order(self, time_sec: float) -> List[Any]:
+        """Every record at or before time_sec, by load position"""
+        order = sorted(range(self.upto(time_sec)), key=self.positions.__getitem__)
+        return [self.items[i] for i in order]
+
+    def last_in_load_order(self, time_sec: float, count: int) -> List[Any]:
+        """The last `count` records at or before time_sec, by load position"""
+        end = self.upto(time_sec)
+        if not end or count <= 0:
+            return []
+        if count not in self._last:
+            self._last[count] = self._last_by_prefix(count)
+        return [self.items[i] for i in self._last[count][end - 1]]
+
+    def _last_by_prefix(self, count: int) -> List[Tuple[int, ...]]:
+        positions = self.positions
+        prefixes, last = [], []
+        for i, position in enumerate(positions):
+            if len(last) < count or position > positions[last[0]]:
+                insort(last, i, key=positions.__getitem__)
+                del last[:-count]
+            prefixes.append(tuple(last))
+        return prefixes
+
+
+class TrustSeries(TimeSlice):
+    """Time-sorted trust updates with positions precomputed for analysis"""
+
+    def __init__(self, records: List[Tuple[int, TrustUpdate]]):
+        super().__init__(records)
+        self.first_quarantine: Optional[int] = None
+        self.significant_drops: List[int] = []  # delta < -0.2
+        degradations = []  # delta < 0
+        for i, (position, u) in enumerate(zip(self.positions, self.items)):
+            if self.first_quarantine is None and u.trust_state == "quarantined":
+                self.first_quarantine = i
+            if u.delta < -0.2:
+                self.significant_drops.append(i)
+            if u.delta < 0:
+                degradations.append((position, u))
+        self.degradations = TimeSlice(degradations)
+
+    def degradations_upto(self, time_sec: float, limit: int) -> List[TrustUpdate]:
+        """The last `limit` degradations at or before time_sec, by load position"""
+        return self.degradations.last_in_load_order(time_sec, limit)
+
+
+@dataclass
+class RunSummary:
+    """Record counts for one run (or all runs)"""
+    trust_updates: int = 0
+    contradictions: int = 0
+    receipts: int = 0
+    audit_events: int = 0
+    sensors: set = field(default_factory=set)
+    reason_codes: set = field(default_factory=set)
+    chains: set = field(default_factory=set)
+
+
+def _sweep_cascades(
+    records: List[ContradictionRecord],
+) -> Tuple[set, List[CascadeEdge]]:
+    """
+    Cascade detection over time-sorted contradictions in O(n).
+
+    Returns the reason codes that were followed by a different code within
+    CASCADE_WINDOW_SEC, and the cascade graph: each contradiction is
+    attributed to the latest strictly earlier contradiction of a different
+    code inside the window.
+    """
+    n = len(records)
+    codes = [r.reason_code for r in records]
+    times = [r.time_sec for r in records]
+
+    # Bounds of each run of consecutive equal codes
+    run_end = [n] * n
+    for i in range(n - 2, -1, -1):
+        run_end[i] = run_end[i + 1] if codes[i + 1] == codes[i] else i + 1
+    run_start = [0] * n
+    for i in range(1, n):
+        run_start[i] = run_start[i - 1] if codes[i - 1] == codes[i] else i
+
+    cascading = set()
+    edges: Dict[Tuple[str, str], List[float]] = {}  # -> [count, lag sum, min, max]
+    lo = hi = first_at = 0
+    for i in range(n):
+        t, code = times[i], codes[i]
+
+        # Window (t, t + CASCADE_WINDOW_SEC] is records [lo, hi)
+        while lo < n and times[lo] <= t:
+            lo += 1
+        hi = max(hi, lo)
+        while hi < n and times[hi] - t <= CASCADE_WINDOW_SEC:
+            hi += 1
+        if lo < hi and (codes[lo] != code or run_end[lo] < hi):
+            cascading.add(code)
+
+        # Latest earlier record with a different code
+        if times[first_at] != t:
+            first_at = i
+        k = first_at - 1
+        if k >= 0 and codes[k] == code:
+            k = run_start[k] - 1
+        if k >= 0 and t - times[k] <= CASCADE_WINDOW_SEC:
+            lag = t - times[k]
+            stats = edges.get((codes[k], code))
+            if stats is None:
+                edges[(codes[k], code)] = [1, lag, lag, lag]
+            else:
+                stats[0] += 1
+                stats[1] += lag
+                stats[2] = min(stats[2], lag)
+                stats[3] = max(stats[3], lag)
+
+    return cascading, [
+        CascadeEdge(
+            trigger_code=trigger,
+            triggered_code=triggered,
+            count=count,
+            min_lag=min_lag,
+            max_lag=max_lag,
+            mean_lag=lag_sum / count,
+        )
+        for (trigger, triggered), (count, lag_sum, min_lag, max_lag) in edges.items()
+    ]
+
+
 class TemporalReasoningEngine:
     """
     Advanced temporal reasoning using both CSV and JSON data.
@@ -140,10 +313,14 @@ class TemporalReasoningEngine:
     JSON provides granular data for deep analysis (trust_updates, audit_events).
     """
     
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, use_record_cache: Optional[bool] = None):
         if data_dir is None:
             data_dir = Path(__file__).parent.parent / "data"
         self.data_dir = data_dir
+        # Read generated JSON through memory-mapped column caches (see record_stream)
+        if use_record_cache is None:
+            use_record_cache = config.json_record_cache
+        self.use_record_cache = use_record_cache
         
         # CSV data (incident structure)
         self._events: List[Dict] = []
@@ -156,6 +333,13 @@ class TemporalReasoningEngine:
         self._contradictions: List[ContradictionRecord] = []
         self._receipts: List[DecisionReceipt] = []
         
+        # Indexes over the JSON data; None in a key means "all"
+        self._trust_index: Dict[Tuple[Optional[str], Optional[str]], TrustSeries] = {}  # (run_id, tag_id)
+        self._contradictions_by_run: Dict[Optional[str], TimeSlice] = {}
+        self._receipts_by_id: Dict[str, List[DecisionReceipt]] = {}
+        self._receipts_by_time = TimeSlice([])
+        self._run_summaries: Dict[Optional[str], RunSummary] = {}
+        
         self._loaded = False
     
     # =========================================================================
@@ -163,50 +347,47 @@ class TemporalReasoningEngine:
     # =========================================================================
     
     def load_all(self) -> None:
-        """Load all data from CSV and JSON files."""
+        """Load all data from the scenario bundle if it is current, else from CSV and JSON files."""
         if self._loaded:
             return
-        self._load_csv()
-        self._load_json()
+        bundle = open_bundle(self.data_dir)
+        self._load_csv(bundle)
+        self._load_json(bundle)
+        self._build_indexes()
         self._loaded = True
     
-    def _load_csv(self) -> None:
+    def _load_csv(self, bundle: Optional[ScenarioBundle] = None) -> None:
         """Load CSV data for incident structure."""
-        csv_dir = self.data_dir / "csv"
-        
         # Events
-        events_path = csv_dir / "events.csv"
-        if events_path.exists():
-            self._events = self._read_csv(events_path)
+        events = self._csv_rows("events", bundle)
+        if events is not None:
+            self._events = events
             for e in self._events:
                 e["timestamp"] = self._parse_timestamp(e["timestamp"])
                 e["time_sec"] = float(e.get("time_sec", 0))
         
         # Claims
-        claims_path = csv_dir / "claims.csv"
-        if claims_path.exists():
-            self._claims = self._read_csv(claims_path)
+        claims = self._csv_rows("claims", bundle)
+        if claims is not None:
+            self._claims = claims
             for c in self._claims:
                 c["timestamp"] = self._parse_timestamp(c["timestamp"])
                 c["time_sec"] = float(c.get("time_sec", 0))
         
         # Zone States
-        zone_path = csv_dir / "zone_states.csv"
-        if zone_path.exists():
-            self._zone_states = self._read_csv(zone_path)
+        zone_states = self._csv_rows("zone_states", bundle)
+        if zone_states is not None:
+            self._zone_states = zone_states
             for z in self._zone_states:
                 z["timestamp"] = self._parse_timestamp(z["timestamp"])
                 z["time_sec"] = float(z.get("time_sec", 0))
     
-    def _load_json(self) -> None:
+    def _load_json(self, bundle: Optional[ScenarioBundle] = None) -> None:
         """Load JSON data for granular analysis."""
-        gen_dir = self.data_dir / "generated"
         
         # Trust Updates
-        trust_path = gen_dir / "trust_updates.json"
-        if trust_path.exists():
-            with open(trust_path) as f:
-                data = json.load(f)
+        data = self._json_records("trust_updates", bundle)
+        if data is not None:
             self._trust_updates = [
                 TrustUpdate(
                     event_id=d["event_id"],
@@ -224,10 +405,8 @@ class TemporalReasoningEngine:
             ]
         
         # Audit Events
-        audit_path = gen_dir / "audit_events.json"
-        if audit_path.exists():
-            with open(audit_path) as f:
-                data = json.load(f)
+        data = self._json_records("audit_events", bundle)
+        if data is not None:
             self._audit_events = [
                 AuditEvent(
                     event_id=d["event_id"],
@@ -244,10 +423,8 @@ class TemporalReasoningEngine:
             ]
         
         # Contradictions
-        contra_path = gen_dir / "contradictions.json"
-        if contra_path.exists():
-            with open(contra_path) as f:
-                data = json.load(f)
+        data = self._json_records("contradictions", bundle)
+        if data is not None:
             self._contradictions = [
                 ContradictionRecord(
                     contradiction_id=d["contradiction_id"],
@@ -266,10 +443,8 @@ class TemporalReasoningEngine:
             ]
         
         # Decision Receipts
-        receipts_path = gen_dir / "decision_receipts.json"
-        if receipts_path.exists():
-            with open(receipts_path) as f:
-                data = json.load(f)
+        data = self._json_records("decision_receipts", bundle)
+        if data is not None:
             self._receipts = [
                 DecisionReceipt(
                     receipt_id=d["receipt_id"],
@@ -288,11 +463,70 @@ class TemporalReasoningEngine:
                 for d in data
             ]
     
+    def _build_indexes(self) -> None:
+        """Partition the JSON data by run and tag, time-sorted, with per-run counts."""
+        trust_parts: Dict[Tuple[Optional[str], Optional[str]], List[Tuple[int, TrustUpdate]]] = {}
+        for i, u in enumerate(self._trust_updates):
+            for key in ((u.run_id, u.tag_id), (None, u.tag_id), (u.run_id, None)):
+                trust_parts.setdefault(key, []).append((i, u))
+        self._trust_index = {key: TrustSeries(records) for key, records in trust_parts.items()}
+
+        contra_parts: Dict[Optional[str], List[Tuple[int, ContradictionRecord]]] = {}
+        for i, c in enumerate(self._contradictions):
+            contra_parts.setdefault(c.run_id, []).append((i, c))
+            contra_parts.setdefault(None, []).append((i, c))
+        self._contradictions_by_run = {run: TimeSlice(records) for run, records in contra_parts.items()}
+
+        self._receipts_by_id = {}
+        for r in self._receipts:
+            self._receipts_by_id.setdefault(r.receipt_id, []).append(r)
+        self._receipts_by_time = TimeSlice(list(enumerate(self._receipts)))
+
+        summaries: Dict[Optional[str], RunSummary] = {None: RunSummary()}
+
+        def summaries_for(run_id: str) -> Tuple[RunSummary, RunSummary]:
+            if run_id not in summaries:
+                summaries[run_id] = RunSummary()
+            return summaries[None], summaries[run_id]
+
+        for u in self._trust_updates:
+            for summary in summaries_for(u.run_id):
+                summary.trust_updates += 1
+                summary.sensors.add(u.tag_id)
+        for c in self._contradictions:
+            for summary in summaries_for(c.run_id):
+                summary.contradictions += 1
+                summary.reason_codes.add(c.reason_code)
+        for r in self._receipts:
+            for summary in summaries_for(r.run_id):
+                summary.receipts += 1
+        for a in self._audit_events:
+            for summary in summaries_for(a.run_id):
+                summary.audit_events += 1
+                summary.chains.add(a.chain_id)
+        self._run_summaries = summaries
+
+    def _csv_rows(self, name: str, bundle: Optional[ScenarioBundle]) -> Optional[List[Dict]]:
+        """Rows of csv/<name>.csv (from the bundle if given), or None if it doesn't exist."""
+        if bundle is not None:
+            return bundle.rows(f"csv/{name}") if bundle.has_table(f"csv/{name}") else None
+        path = self.data_dir / "csv" / f"{name}.csv"
+        return self._read_csv(path) if path.exists() else None
+    
+    def _json_records(self, name: str, bundle: Optional[ScenarioBundle]) -> Optional[Iterable[Dict]]:
+        """Records of generated/<name>.json (from the bundle if given), or None if it doesn't exist."""
+        if bundle is not None:
+            return bundle.rows(f"generated/{name}") if bundle.has_table(f"generated/{name}") else None
+        path = self.data_dir / "generated" / f"{name}.json"
+        return iter_records(path, use_cache=self.use_record_cache) if path.exists() else None
+    
     def _read_csv(self, path: Path) -> List[Dict]:
         with open(path, newline='', encoding='utf-8-sig') as f:
             return list(csv.DictReader(f))
     
     def _parse_timestamp(self, ts: str) -> datetime:
+        if isinstance(ts, datetime):
+            return ts  # Parsed when the bundle was built
         formats = ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"]
         for fmt in formats:
             try:
@@ -317,12 +551,9 @@ class TemporalReasoningEngine:
         """
         self.load_all()
         
-        # Filter updates for this sensor
-        updates = [u for u in self._trust_updates if u.tag_id == tag_id]
-        if run_id:
-            updates = [u for u in updates if u.run_id == run_id]
+        series = self._trust_index.get((run_id or None, tag_id))
         
-        if not updates:
+        if series is None:
             return TrustEvolutionAnalysis(
                 tag_id=tag_id,
                 start_score=1.0,
@@ -334,47 +565,25 @@ class TemporalReasoningEngine:
                 evolution_curve=[],
             )
         
-        # Sort by time
-        updates.sort(key=lambda u: u.time_sec)
-        
+        updates = series.items
         start_score = updates[0].previous_score
         end_score = updates[-1].new_score
         total_degradation = start_score - end_score
         
-        # Find time to quarantine
+        # Time to quarantine
         time_to_quarantine = None
-        for u in updates:
-            if u.trust_state == "quarantined":
-                time_to_quarantine = u.time_sec - updates[0].time_sec
-                break
+        if series.first_quarantine is not None:
+            time_to_quarantine = updates[series.first_quarantine].time_sec - updates[0].time_sec
         
         # Calculate degradation rate
         duration = updates[-1].time_sec - updates[0].time_sec
         degradation_rate = total_degradation / duration if duration > 0 else 0
         
-        # Find significant drops (delta < -0.2)
-        significant_drops = [
-            TrustEvolutionPoint(
-                time_sec=u.time_sec,
-                trust_score=u.new_score,
-                trust_state=u.trust_state,
-                reason_codes=u.reason_codes,
-                delta=u.delta,
-            )
-            for u in updates
-            if u.delta < -0.2
-        ]
+        # Significant drops (delta < -0.2)
+        significant_drops = [self._evolution_point(updates[i]) for i in series.significant_drops]
         
         # Build evolution curve (sample every 5 seconds)
-        curve = []
-        for u in updates[::5]:  # Sample
-            curve.append(TrustEvolutionPoint(
-                time_sec=u.time_sec,
-                trust_score=u.new_score,
-                trust_state=u.trust_state,
-                reason_codes=u.reason_codes,
-                delta=u.delta,
-            ))
+        curve = [self._evolution_point(u) for u in updates[::5]]
         
         return TrustEvolutionAnalysis(
             tag_id=tag_id,
@@ -387,6 +596,15 @@ class TemporalReasoningEngine:
             evolution_curve=curve,
         )
     
+    def _evolution_point(self, u: TrustUpdate) -> TrustEvolutionPoint:
+        return TrustEvolutionPoint(
+            time_sec=u.time_sec,
+            trust_score=u.new_score,
+            trust_state=u.trust_state,
+            reason_codes=u.reason_codes,
+            delta=u.delta,
+        )
+    
     # =========================================================================
     # Audit Chain Verification
     # =========================================================================
@@ -453,23 +671,20 @@ class TemporalReasoningEngine:
         """
         self.load_all()
         
-        contradictions = self._contradictions
-        if run_id:
-            contradictions = [c for c in contradictions if c.run_id == run_id]
+        contradictions = self._contradictions_by_run.get(run_id or None)
+        records_by_time = contradictions.items if contradictions else []
         
-        # Group by reason_code
+        # Group by reason_code, in order of first occurrence
         by_code: Dict[str, List[ContradictionRecord]] = {}
-        for c in contradictions:
+        for c in records_by_time:
             if c.reason_code not in by_code:
                 by_code[c.reason_code] = []
             by_code[c.reason_code].append(c)
         
-        patterns = []
-        sorted_codes = sorted(by_code.items(), key=lambda x: x[1][0].time_sec)
+        cascading_codes, _ = _sweep_cascades(records_by_time)
         
-        for code, records in sorted_codes:
-            records.sort(key=lambda c: c.time_sec)
-            
+        patterns = []
+        for code, records in by_code.items():
             # Calculate average gap between occurrences
             gaps = []
             for i in range(1, len(records)):
@@ -482,28 +697,36 @@ class TemporalReasoningEngine:
                 sensors.add(r.primary_tag_id)
                 sensors.update(r.secondary_tag_ids)
             
-            # Check for cascading (another code appeared within 2 seconds)
-            cascading = False
-            for other_code, other_records in by_code.items():
-                if other_code == code:
-                    continue
-                for other in other_records:
-                    for rec in records:
-                        if 0 < (other.time_sec - rec.time_sec) <= 2:
-                            cascading = True
-                            break
-            
             patterns.append(ContradictionPattern(
                 reason_code=code,
                 count=len(records),
                 first_occurrence=records[0].time_sec,
                 affected_sensors=list(sensors),
                 average_gap=avg_gap,
-                cascading=cascading,
+                cascading=code in cascading_codes,
             ))
         
         return patterns
     
+    def analyze_contradiction_cascades(
+        self,
+        run_id: Optional[str] = None,
+    ) -> List[CascadeEdge]:
+        """
+        Build the contradiction cascade graph.
+        
+        Each contradiction that follows one of a different reason code within
+        CASCADE_WINDOW_SEC is attributed to the latest such contradiction;
+        edges aggregate those links per (trigger, triggered) code pair with
+        lag statistics, most frequent first.
+        """
+        self.load_all()
+        
+        contradictions = self._contradictions_by_run.get(run_id or None)
+        _, edges = _sweep_cascades(contradictions.items if contradictions else [])
+        edges.sort(key=lambda e: e.count, reverse=True)
+        return edges
+    
     # =========================================================================
     # Decision Provenance
     # =========================================================================
@@ -517,29 +740,34 @@ class TemporalReasoningEngine:
         Get decision provenance - what led to a decision.
         
         Returns the evidence chain: contradictions → trust degradation → decision.
+        For each receipt, "contradictions" and "trust_degradation" are the last
+        3 contradictions and last 5 trust degradations of its run at or before
+        the receipt's time_sec, "last" meaning file order in both lists.
         """
         self.load_all()
         
-        # Find the receipt
-        receipts = self._receipts
+        # Find the receipts, in load order
         if receipt_id:
-            receipts = [r for r in receipts if r.receipt_id == receipt_id]
-        if time_sec:
-            receipts = [r for r in receipts if r.time_sec <= time_sec]
+            receipts = self._receipts_by_id.get(receipt_id, [])
+            if time_sec:
+                receipts = [r for r in receipts if r.time_sec <= time_sec]
+        elif time_sec:
+            receipts = self._receipts_by_time.upto_in_load_order(time_sec)
+        else:
+            receipts = self._receipts
         
         provenance = []
         for receipt in receipts:
-            # Find related contradictions
-            related_contradictions = [
-                c for c in self._contradictions
-                if c.time_sec <= receipt.time_sec and c.run_id == receipt.run_id
-            ]
+            # Contradictions raised in this run up to the decision
+            contradictions = self._contradictions_by_run.get(receipt.run_id)
+            related_contradictions = (
+                contradictions.last_in_load_order(receipt.time_sec, 3)
+                if contradictions else []
+            )
             
-            # Find trust updates that led to this
-            related_trust = [
-                u for u in self._trust_updates
-                if u.time_sec <= receipt.time_sec and u.run_id == receipt.run_id
-            ]
+            # Trust degradations in this run that led to it
+            trust = self._trust_index.get((receipt.run_id, None))
+            related_trust = trust.degradations_upto(receipt.time_sec, 5) if trust else []
             
             provenance.append({
                 "receipt": {
@@ -556,7 +784,7 @@ class TemporalReasoningEngine:
                         "reason_code": c.reason_code,
                         "description": c.description,
                     }
-                    for c in related_contradictions[-3:]  # Last 3
+                    for c in related_contradictions
                 ],
                 "trust_degradation": [
                     {
@@ -566,8 +794,7 @@ class TemporalReasoningEngine:
                         "delta": u.delta,
                     }
                     for u in related_trust
-                    if u.delta < 0  # Only degradations
-                ][-5:],  # Last 5
+                ],
             })
         
         return provenance
@@ -580,25 +807,16 @@ class TemporalReasoningEngine:
         """Get summary statistics for temporal reasoning data."""
         self.load_all()
         
-        trust_updates = self._trust_updates
-        contradictions = self._contradictions
-        receipts = self._receipts
-        audit_events = self._audit_events
-        
-        if run_id:
-            trust_updates = [u for u in trust_updates if u.run_id == run_id]
-            contradictions = [c for c in contradictions if c.run_id == run_id]
-            receipts = [r for r in receipts if r.run_id == run_id]
-            audit_events = [a for a in audit_events if a.run_id == run_id]
+        summary = self._run_summaries.get(run_id or None, RunSummary())
         
         return {
-            "total_trust_updates": len(trust_updates),
-            "total_contradictions": len(contradictions),
-            "total_receipts": len(receipts),
-            "total_audit_events": len(audit_events),
-            "unique_sensors": len(set(u.tag_id for u in trust_updates)),
-            "unique_reason_codes": len(set(c.reason_code for c in contradictions)),
-            "unique_chains": len(set(a.chain_id for a in audit_events)),
+            "total_trust_updates": summary.trust_updates,
+            "total_contradictions": summary.contradictions,
+            "total_receipts": summary.receipts,
+            "total_audit_events": summary.audit_events,
+            "unique_sensors": len(summary.sensors),
+            "unique_reason_codes": len(summary.reason_codes),
+            "unique_chains": len(summary.chains),
             "csv_events": len(self._events),
             "csv_claims": len(self._claims),
             "csv_zone_states": len(self._zone_states),
@@ -5,6 +5,8 @@ MongoDB Atlas connection and data management.
 """
 
 from .connection import MongoDBConnection, get_db
+from .write_behind import WriteBehindBuffer, get_write_behind
+from .pagination import Page
 from .repository import (
     TelemetryRepository,
     AuditRepository,
@@ -18,6 +20,9 @@ from .repository import (
 __all__ = [
     "MongoDBConnection",
     "get_db",
+    "WriteBehindBuffer",
+    "get_write_behind",
+    "Page",
     "TelemetryRepository",
     "AuditRepository",
     "IncidentRepository",
@@ -0,0 +1,130 @@
+"""
+Keyset Pagination
+
+Pages are read by position in a (sort_field, _id) ordering rather than by
+skip/offset, so fetching page N costs the same as page 1 and documents
+inserted meanwhile never shift a page. The position is handed to clients as
+an opaque `next_cursor` token: the last document's sort key as JSON
+(datetimes and ObjectIds tagged so they round-trip exactly), base64url
+wrapped.
+
+The sort field should be present, and of one BSON type, in every matched
+document; MongoDB only compares values of the same type with $gt/$lt.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+@dataclass
+class Page:
+    """One page of results and the token for the next (None on the last page)"""
+    items: list[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    raise TypeError(f"Cannot use {type(value).__name__} in a pagination cursor")
+
+
+def _decode_value(obj: dict) -> Any:
+    if obj.keys() == {"$date"}:
+        return datetime.fromisoformat(obj["$date"])
+    if obj.keys() == {"$oid"}:
+        return ObjectId(obj["$oid"])
+    return obj
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    token = json.dumps(list(values), default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> list[Any]:
+    """Sort key from a next_cursor token; ValueError if it isn't one"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw, object_hook=_decode_value)
+    except (binascii.Error, ValueError, TypeError, InvalidId):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def sort_spec(sort_field: str, descending: bool = False) -> list[tuple[str, int]]:
+    direction = -1 if descending else 1
+    if sort_field == "_id":
+        return [("_id", direction)]
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def cursor_values(document: dict, sort_field: str) -> list[Any]:
+    if sort_field == "_id":
+        return [document["_id"]]
+    return [document.get(sort_field), document["_id"]]
+
+
+def keyset_filter(query: dict, sort_field: str, after: list[Any], descending: bool = False) -> dict:
+    """`query` restricted to documents strictly after the `after` sort key"""
+    op = "$lt" if descending else "$gt"
+    if sort_field == "_id":
+        position = {"_id": {op: after[0]}}
+    else:
+        if len(after) != 2:
+            raise ValueError("Invalid pagination cursor")
+        value, last_id = after
+        position = {"$or": [
+            {sort_field: {op: value}},
+            {sort_field: value, "_id": {op: last_id}},
+        ]}
+    return {"$and": [query, position]} if query else position
+
+
+def page_projection(projection: Optional[dict], sort_field: str) -> Optional[dict]:
+    """Projection that still returns the fields the cursor is built from"""
+    if not projection:
+        return projection
+    projection = {k: v for k, v in projection.items() if not (k in (sort_field, "_id") and not v)}
+    if any(projection.values()):
+        # Inclusion projection: _id is included unless excluded, add the sort field
+        projection[sort_field] = 1
+    return projection
+
+
+def page_in_memory(
+    items: Sequence[Any],
+    key: Callable[[Any], tuple],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Page:
+    """
+    The same paging over an in-memory collection (fallback when MongoDB is
+    disabled). `key` must give each item a unique, comparable sort key.
+    """
+    ordered = sorted(items, key=key, reverse=descending)
+    if cursor:
+        after = tuple(decode_cursor(cursor))
+        try:
+            ordered = [
+                item for item in ordered
+                if (key(item) < after if descending else key(item) > after)
+            ]
+        except TypeError:
+            raise ValueError("Invalid pagination cursor")
+    page = ordered[:limit]
+    next_cursor = encode_cursor(key(page[-1])) if len(ordered) > limit else None
+    return Page(items=page, next_cursor=next_cursor)
@@ -4,11 +4,23 @@ Repository Classes for MongoDB
 Provides data access patterns for each entity type.
 """
 
+import asyncio
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime
 from typing import Any, Optional
 from bson import ObjectId
+from pymongo.errors import OperationFailure
+import logging
 
 from .connection import get_db
+from .pagination import Page, cursor_values, decode_cursor, encode_cursor, keyset_filter, page_projection, sort_spec
+from .write_behind import get_write_behind
+
+logger = logging.getLogger(__name__)
+
+# Telemetry rollup levels (name, bucket size in ms), finest first; each
+# level is built from the one before it, the first from raw points
+TELEMETRY_ROLLUP_LEVELS = (("1s", 1000), ("1m", 60_000), ("1h", 3_600_000))
 
 
 class BaseRepository:
@@ -49,9 +61,66 @@ class BaseRepository:
         """Find a single document"""
         return self._get_collection().find_one(query)
     
-    def find_many(self, query: dict, limit: int = 100) -> list[dict]:
-        """Find multiple documents"""
-        return list(self._get_collection().find(query).limit(limit))
+    def find_many(self, query: dict, limit: int = 100, projection: Optional[dict] = None) -> list[dict]:
+        """Find multiple documents (at most `limit`; use find_page or iter_find for more)"""
+        return list(self._get_collection().find(query, projection).limit(limit))
+    
+    def iter_find(
+        self,
+        query: dict,
+        projection: Optional[dict] = None,
+        sort: Optional[list[tuple[str, int]]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Stream every matching document, fetching batch_size per round trip"""
+        cursor = self._get_collection().find(query, projection, batch_size=batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+        with cursor:
+            yield from cursor
+    
+    def find_page(
+        self,
+        query: dict,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None,
+        sort_field: str = "timestamp",
+        descending: bool = False,
+    ) -> Page:
+        """
+        One page of documents in (sort_field, _id) order, starting after the
+        position in `cursor` (a previous page's next_cursor). Raises
+        ValueError for a malformed cursor.
+        """
+        filter_, projection = self._page_query(query, cursor, projection, sort_field, descending)
+        docs = list(
+            self._get_collection()
+            .find(filter_, projection)
+            .sort(sort_spec(sort_field, descending))
+            .limit(limit + 1)
+        )
+        return self._page(docs, limit, sort_field)
+    
+    @staticmethod
+    def _page_query(
+        query: dict,
+        cursor: Optional[str],
+        projection: Optional[dict],
+        sort_field: str,
+        descending: bool,
+    ) -> tuple[dict, Optional[dict]]:
+        if cursor:
+            query = keyset_filter(query, sort_field, decode_cursor(cursor), descending)
+        return query, page_projection(projection, sort_field)
+    
+    @staticmethod
+    def _page(docs: list[dict], limit: int, sort_field: str) -> Page:
+        """Page from up to limit + 1 documents (the extra one only signals more)"""
+        if len(docs) <= limit:
+            return Page(items=docs)
+        docs = docs[:limit]
+        return Page(items=docs, next_cursor=encode_cursor(cursor_values(docs[-1], sort_field)))
     
     async def async_insert_one(self, document: dict) -> str:
         """Insert a single document (async)"""
@@ -68,6 +137,55 @@ class BaseRepository:
         collection = await self._get_async_collection()
         result = await collection.insert_many(documents)
         return [str(id) for id in result.inserted_ids]
+    
+    async def async_iter_find(
+        self,
+        query: dict,
+        projection: Optional[dict] = None,
+        sort: Optional[list[tuple[str, int]]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[dict]:
+        """Stream every matching document (async), holding one batch in memory at a time"""
+        collection = await self._get_async_collection()
+        cursor = collection.find(query, projection, batch_size=batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            async for doc in cursor:
+                yield doc
+        finally:
+            await cursor.close()
+    
+    async def async_find_page(
+        self,
+        query: dict,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None,
+        sort_field: str = "timestamp",
+        descending: bool = False,
+    ) -> Page:
+        """find_page (async)"""
+        filter_, projection = self._page_query(query, cursor, projection, sort_field, descending)
+        collection = await self._get_async_collection()
+        docs = await (
+            collection.find(filter_, projection)
+            .sort(sort_spec(sort_field, descending))
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+        return self._page(docs, limit, sort_field)
+    
+    def queue_upsert(self, key_field: str, document: dict) -> bool:
+        """Queue an upsert keyed on document[key_field] for the write-behind flusher"""
+        return get_write_behind().upsert(self.collection_name, key_field, document[key_field], document)
+    
+    def queue_insert(self, document: dict) -> Optional[asyncio.Future]:
+        """
+        Queue an ordered, durable insert for the write-behind flusher;
+        await the returned future for the acknowledgement.
+        """
+        return get_write_behind().append(self.collection_name, document)
 
 
 class TelemetryRepository(BaseRepository):
@@ -112,6 +230,261 @@ class TelemetryRepository(BaseRepository):
             .limit(limit)
         )
     
+    async def async_insert_telemetry_batch(self, points: list[dict]) -> int:
+        """Insert a batch of telemetry points (async, unordered); returns the count"""
+        collection = await self._get_async_collection()
+        result = await collection.insert_many(points, ordered=False)
+        return len(result.inserted_ids)
+    
+    @staticmethod
+    def range_filter(
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        sources: Optional[list[str]] = None,
+        metrics: Optional[list[str]] = None,
+        time_field: str = "timestamp",
+        end_inclusive: bool = True,
+    ) -> dict:
+        """Query for points from start_time to end_time from the given sources and metrics"""
+        query: dict[str, Any] = {}
+        if start_time or end_time:
+            query[time_field] = {}
+            if start_time:
+                query[time_field]["$gte"] = start_time
+            if end_time:
+                query[time_field]["$lte" if end_inclusive else "$lt"] = end_time
+        if sources and metrics:
+            # Hits the (tag_id, time) indexes
+            query["tag_id"] = {"$in": [f"{s}/{m}" for s in sources for m in metrics]}
+        elif sources:
+            query["source"] = {"$in": sources}
+        elif metrics:
+            query["metric"] = {"$in": metrics}
+        return query
+    
+    async def async_find(self, query: dict, limit: int = 10000) -> list[dict]:
+        """Find telemetry matching query in time order (async)"""
+        collection = await self._get_async_collection()
+        cursor = collection.find(query, {"_id": 0}).sort("timestamp", 1).limit(limit)
+        return await cursor.to_list(length=limit)
+    
+    async def async_bucket_stats(
+        self,
+        query: dict,
+        interval_ms: int,
+        rollup: Optional[str] = None,
+        limit: int = 10000,
+    ) -> list[dict]:
+        """
+        count, sum, min and max per source, metric and interval_ms bucket,
+        in bucket order (async), from raw points or from a rollup level.
+        Rows are {"_id": {"source", "metric", "bucket"}, "count", "sum",
+        "min", "max", "unit"}.
+        """
+        time_field = "bucket" if rollup else "timestamp"
+        millis = {"$toLong": f"${time_field}"}
+        bucket = {"$toDate": {"$subtract": [millis, {"$mod": [millis, interval_ms]}]}}
+        if rollup:
+            stats = {
+                "count": {"$sum": "$count"},
+                "sum": {"$sum": "$sum"},
+                "min": {"$min": "$min"},
+                "max": {"$max": "$max"},
+            }
+        else:
+            stats = {
+                "count": {"$sum": 1},
+                "sum": {"$sum": "$value"},
+                "min": {"$min": "$value"},
+                "max": {"$max": "$value"},
+            }
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": {"source": "$source", "metric": "$metric", "bucket": bucket},
+                **stats,
+                "unit": {"$last": "$unit"},
+            }},
+            {"$sort": {"_id.bucket": 1, "_id.source": 1, "_id.metric": 1}},
+            {"$limit": limit},
+        ]
+        db = get_db().get_async_db()
+        if db is None:
+            raise RuntimeError("MongoDB not configured")
+        source = db[self.rollup_collection_name(rollup)] if rollup else db[self.collection_name]
+        return await source.aggregate(pipeline, allowDiskUse=True).to_list(length=limit)
+    
+    # ------------------------------------------------------------------
+    # Layout, retention and rollups
+    # ------------------------------------------------------------------
+    
+    def rollup_collection_name(self, level: str) -> str:
+        return f"{self.collection_name}_rollup_{level}"
+    
+    async def async_ensure_layout(
+        self,
+        timeseries: bool = False,
+        granularity: str = "seconds",
+        raw_retention_sec: Optional[int] = None,
+        rollup_retention_sec: Optional[dict[str, Optional[int]]] = None,
+    ) -> str:
+        """
+        Create the raw collection (as a time-series collection with tag_id
+        as metaField if `timeseries`), its indexes and TTL retention, and
+        the rollup collections. Returns the raw layout in use:
+        "timeseries" or "documents". An existing plain collection is not
+        converted.
+        """
+        db = get_db().get_async_db()
+        if db is None:
+            raise RuntimeError("MongoDB not configured")
+        info = None
+        async for found in await db.list_collections(filter={"name": self.collection_name}):
+            info = found
+        
+        if info is None and timeseries:
+            options: dict[str, Any] = {}
+            if raw_retention_sec:
+                options["expireAfterSeconds"] = raw_retention_sec
+            await db.create_collection(
+                self.collection_name,
+                timeseries={"timeField": "timestamp", "metaField": "tag_id", "granularity": granularity},
+                **options,
+            )
+            layout = "timeseries"
+        elif info is not None and info.get("type") == "timeseries":
+            if raw_retention_sec:
+                await db.command({"collMod": self.collection_name, "expireAfterSeconds": raw_retention_sec})
+            layout = "timeseries"
+        else:
+            if timeseries:
+                logger.warning(
+                    f"Collection '{self.collection_name}' already exists as a plain collection; "
+                    "keeping one document per point"
+                )
+            layout = "documents"
+        
+        raw = db[self.collection_name]
+        await raw.create_index([("tag_id", 1), ("timestamp", 1)])
+        if layout == "documents":
+            await raw.create_index([("source", 1), ("timestamp", 1)])
+            await raw.create_index([("metric", 1), ("timestamp", 1)])
+            if raw_retention_sec:
+                await self._ensure_ttl_index(db, self.collection_name, "timestamp", raw_retention_sec)
+        
+        for level, _ in TELEMETRY_ROLLUP_LEVELS:
+            name = self.rollup_collection_name(level)
+            target = db[name]
+            await target.create_index([("tag_id", 1), ("bucket", 1)], unique=True)
+            await target.create_index([("source", 1), ("bucket", 1)])
+            await target.create_index([("metric", 1), ("bucket", 1)])
+            retention = (rollup_retention_sec or {}).get(level)
+            if retention:
+                await self._ensure_ttl_index(db, name, "bucket", retention)
+        return layout
+    
+    @staticmethod
+    async def _ensure_ttl_index(db, collection_name: str, field: str, expire_after_sec: int):
+        """TTL index on `field`, updating the expiry if the index already exists"""
+        try:
+            await db[collection_name].create_index([(field, 1)], expireAfterSeconds=expire_after_sec)
+        except OperationFailure:
+            # Same key with other options (e.g. an old expiry)
+            await db.command({
+                "collMod": collection_name,
+                "index": {"keyPattern": {field: 1}, "expireAfterSeconds": expire_after_sec},
+            })
+    
+    async def async_rollup_watermarks(self) -> dict[str, datetime]:
+        """Level -> time up to which (exclusive) that rollup is complete"""
+        db = get_db().get_async_db()
+        if db is None:
+            raise RuntimeError("MongoDB not configured")
+        state = db[f"{self.collection_name}_rollup_state"]
+        return {doc["_id"]: doc["watermark"] async for doc in state.find({})}
+    
+    async def async_set_rollup_watermark(self, level: str, watermark: datetime):
+        db = get_db().get_async_db()
+        if db is None:
+            raise RuntimeError("MongoDB not configured")
+        await db[f"{self.collection_name}_rollup_state"].update_one(
+            {"_id": level}, {"$set": {"watermark": watermark}}, upsert=True
+        )
+    
+    async def async_extent(self, level_index: Optional[int] = None) -> Optional[tuple[datetime, datetime]]:
+        """
+        (earliest, latest) time in the raw collection (None) or a rollup
+        level, or None if it is empty
+        """
+        db = get_db().get_async_db()
+        if db is None:
+            raise RuntimeError("MongoDB not configured")
+        if level_index is None:
+            source, time_field = db[self.collection_name], "timestamp"
+        else:
+            source, time_field = db[self.rollup_collection_name(TELEMETRY_ROLLUP_LEVELS[level_index][0])], "bucket"
+        first = await source.find_one({}, {time_field: 1}, sort=[(time_field, 1)])
+        if first is None:
+            return None
+        last = await source.find_one({}, {time_field: 1}, sort=[(time_field, -1)])
+        return first[time_field], last[time_field]
+    
+    async def async_build_rollup(self, level_index: int, start: datetime, end: datetime):
+        """
+        (Re)compute rollup level `level_index` for buckets in [start, end),
+        from raw points for the finest level and from the level below
+        otherwise. Buckets are replaced whole, so rebuilding is idempotent.
+        """
+        db = get_db().get_async_db()
+        if db is None:
+            raise RuntimeError("MongoDB not configured")
+        level, resolution_ms = TELEMETRY_ROLLUP_LEVELS[level_index]
+        if level_index == 0:
+            source, time_field = db[self.collection_name], "timestamp"
+            stats = {
+                "count": {"$sum": 1},
+                "sum": {"$sum": "$value"},
+                "min": {"$min": "$value"},
+                "max": {"$max": "$value"},
+            }
+        else:
+            source = db[self.rollup_collection_name(TELEMETRY_ROLLUP_LEVELS[level_index - 1][0])]
+            time_field = "bucket"
+            stats = {
+                "count": {"$sum": "$count"},
+                "sum": {"$sum": "$sum"},
+                "min": {"$min": "$min"},
+                "max": {"$max": "$max"},
+            }
+        millis = {"$toLong": f"${time_field}"}
+        pipeline = [
+            {"$match": {time_field: {"$gte": start, "$lt": end}}},
+            {"$group": {
+                "_id": {
+                    "tag_id": "$tag_id",
+                    "bucket": {"$toDate": {"$subtract": [millis, {"$mod": [millis, resolution_ms]}]}},
+                },
+                "source": {"$first": "$source"},
+                "metric": {"$first": "$metric"},
+                "unit": {"$last": "$unit"},
+                **stats,
+            }},
+            {"$project": {
+                "_id": 0,
+                "tag_id": "$_id.tag_id",
+                "bucket": "$_id.bucket",
+                "source": 1, "metric": 1, "unit": 1,
+                "count": 1, "sum": 1, "min": 1, "max": 1,
+            }},
+            {"$merge": {
+                "into": self.rollup_collection_name(level),
+                "on": ["tag_id", "bucket"],
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }},
+        ]
+        await source.aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+    
     def create_indexes(self):
         """Create indexes for optimal query performance"""
         collection = self._get_collection()
@@ -130,14 +503,29 @@ class AuditRepository(BaseRepository):
         """Insert an audit event"""
         return self.insert_one(event)
     
-    def find_by_chain_id(self, chain_id: str) -> list[dict]:
-        """Find all events in a chain"""
+    def find_by_chain_id(self, chain_id: str, limit: int = 1000) -> list[dict]:
+        """Find the first `limit` events in a chain (see iter_chain to read all of it)"""
         return list(
             self._get_collection()
             .find({"chain_id": chain_id})
-            .sort("timestamp", 1)
+            .sort(sort_spec("timestamp"))
+            .limit(limit)
         )
     
+    def iter_chain(self, chain_id: str, projection: Optional[dict] = None, batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Stream a whole chain in timestamp order (async)"""
+        return self.async_iter_find({"chain_id": chain_id}, projection, sort_spec("timestamp"), batch_size)
+    
+    async def find_chain_page(
+        self,
+        chain_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None,
+    ) -> Page:
+        """One page of a chain in timestamp order (async)"""
+        return await self.async_find_page({"chain_id": chain_id}, limit, cursor, projection, sort_field="timestamp")
+    
     def find_latest_chain(self) -> Optional[dict]:
         """Find the most recent chain"""
         return self._get_collection().find_one(
@@ -167,9 +555,20 @@ class IncidentRepository(BaseRepository):
         """Find incident by ID"""
         return self.find_one({"incident_id": incident_id})
     
-    def find_by_scenario(self, scenario_id: str) -> list[dict]:
-        """Find all incidents for a scenario"""
-        return self.find_many({"scenario_id": scenario_id}, limit=1000)
+    def find_by_scenario(self, scenario_id: str, limit: int = 1000) -> list[dict]:
+        """Find the first `limit` incidents for a scenario, oldest first (page on with find_page_by_scenario)"""
+        return self.find_page({"scenario_id": scenario_id}, limit, sort_field="created_at").items
+    
+    async def find_page_by_scenario(
+        self,
+        scenario_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None,
+    ) -> Page:
+        """One page of incidents (all, or for a scenario), oldest first (async)"""
+        query = {"scenario_id": scenario_id} if scenario_id else {}
+        return await self.async_find_page(query, limit, cursor, projection, sort_field="created_at")
     
     def find_active(self, scenario_id: Optional[str] = None) -> list[dict]:
         """Find all active (non-closed) incidents"""
@@ -215,6 +614,7 @@ class IncidentRepository(BaseRepository):
         collection = self._get_collection()
         collection.create_index([("incident_id", 1)], unique=True)
         collection.create_index([("scenario_id", 1), ("state", 1)])
+        collection.create_index([("scenario_id", 1), ("created_at", 1), ("_id", 1)])
         collection.create_index([("state", 1)])
         collection.create_index([("created_at", -1)])
 
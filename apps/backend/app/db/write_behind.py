@@ -0,0 +1,437 @@
+"""
+Write-Behind Persistence for MongoDB
+
+Request handlers queue writes here instead of calling pymongo inline; one
+asyncio task flushes them through the motor client in bulk.
+
+Two kinds of writes:
+  - upserts, keyed by (collection, key field, key). A document that is
+    written again before the flush is merged into the queued one, so a
+    burst of state transitions costs one UpdateOne. Flushed with unordered
+    bulk_write.
+  - appends (audit events). Never merged; flushed per collection in queue
+    order with ordered insert_many under a majority, journaled write
+    concern. A failed batch stays at the head of its queue and is retried,
+    so later events are never written before earlier ones. Documents keep
+    the _id assigned on the first attempt, so a retry of a batch that was
+    written but not acknowledged skips the duplicates. append() returns a
+    future that resolves to True once the document's batch is acknowledged
+    (False if it was dropped); an append is only durable after that, so
+    callers that must not lose an event await it.
+
+A flush runs once `mongodb_write_batch_size` writes are pending or
+`mongodb_write_flush_interval_ms` after the first one was queued, whichever
+comes first. Failed writes are re-queued and retried with exponential
+backoff. At most `mongodb_write_max_pending` writes are held: beyond that
+new upserts and appends are dropped (counted in the metrics; an append's
+future resolves to False), so an unreachable MongoDB can't grow the queue without bound. Async
+callers can wait_for_room() first to apply backpressure instead. Outside a
+running event loop (scripts, tests) writes go straight through the sync
+client.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Generator, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+
+from config import config
+from .connection import get_db
+
+logger = logging.getLogger(__name__)
+
+# Audit appends are acknowledged only once on a majority and in the journal
+DURABLE_WRITE_CONCERN = WriteConcern(w="majority", j=True)
+
+_DUPLICATE_KEY = 11000
+
+# (collection, key field, key)
+_UpsertKey = tuple[str, str, Any]
+
+# (document, acknowledgement future or None outside an event loop)
+_Append = tuple[dict, Optional[asyncio.Future]]
+
+
+def _upsert_op(key_field: str, key: Any, document: dict) -> UpdateOne:
+    now = datetime.utcnow()
+    update: dict[str, Any] = {"$set": {**document, "updated_at": now}}
+    if "created_at" not in document:
+        update["$setOnInsert"] = {"created_at": now}
+    return UpdateOne({key_field: key}, update, upsert=True)
+
+
+def _failed_indexes(error: BulkWriteError) -> list[int]:
+    return [e["index"] for e in error.details.get("writeErrors", [])]
+
+
+class WriteBehindBuffer:
+    """Queue of pending MongoDB writes with a background bulk flusher"""
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval_sec: float = 0.25,
+        max_backoff_sec: float = 30.0,
+        max_pending: int = 100000,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_sec = flush_interval_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.max_pending = max(self.batch_size, max_pending)
+
+        self._upserts: dict[_UpsertKey, dict] = {}
+        self._appends: dict[str, deque[_Append]] = {}
+        self._wake = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._failures_in_row = 0
+
+        # Metrics
+        self._queued = 0
+        self._coalesced = 0
+        self._written = 0
+        self._dropped = 0
+        self._backpressure_waits = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._last_error: Optional[str] = None
+        self._last_flush = 0.0
+        self._max_flush = 0.0
+        self._total_flush = 0.0
+        self._last_batch = 0
+
+    # =========================================================================
+    # Queueing
+    # =========================================================================
+
+    def upsert(self, collection: str, key_field: str, key: Any, document: dict) -> bool:
+        """
+        Queue an insert-or-$set of `document` on the document where
+        key_field == key; False if the queue is full and it was dropped.
+        """
+        queue_key = (collection, key_field, key)
+        pending = self._upserts.get(queue_key)
+        if pending is None:
+            if self.pending >= self.max_pending:
+                self._drop(f"upsert to {collection}")
+                return False
+            self._upserts[queue_key] = document
+        else:
+            # Successive $sets of the same document compose into one
+            pending.update(document)
+            self._coalesced += 1
+        self._queued += 1
+        self._schedule()
+        return True
+
+    def append(self, collection: str, document: dict) -> Optional[asyncio.Future]:
+        """
+        Queue an insert that must reach MongoDB after every earlier append
+        to `collection`.
+
+        Returns a future that resolves to True once MongoDB has acknowledged
+        the document under the durable write concern, or to False if it
+        was dropped (queue full, or unflushed at shutdown). Outside an
+        event loop the write is attempted before returning and None is
+        returned.
+        """
+        document.setdefault("created_at", datetime.utcnow())
+        try:
+            ack: Optional[asyncio.Future] = asyncio.get_running_loop().create_future()
+        except RuntimeError:
+            ack = None
+        if self.pending >= self.max_pending:
+            self._drop(f"append to {collection}")
+            if ack is not None:
+                ack.set_result(False)
+            return ack
+        queue = self._appends.get(collection)
+        if queue is None:
+            queue = self._appends[collection] = deque()
+        queue.append((document, ack))
+        self._queued += 1
+        self._schedule()
+        return ack
+
+    async def wait_for_room(self) -> None:
+        """Backpressure for async callers: wait until the queue is below max_pending"""
+        while self.pending >= self.max_pending:
+            self._backpressure_waits += 1
+            self._drained.clear()
+            self._wake.set()
+            await self._drained.wait()
+
+    @property
+    def pending(self) -> int:
+        return len(self._upserts) + sum(len(q) for q in self._appends.values())
+
+    def _drop(self, what: str) -> None:
+        self._dropped += 1
+        logger.warning(f"MongoDB write-behind queue full ({self.pending} pending), dropped {what}")
+
+    def _schedule(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_sync()
+            return
+        if self.pending >= self.batch_size:
+            self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    # =========================================================================
+    # Flushing
+    # =========================================================================
+
+    async def flush(self) -> int:
+        """
+        Write everything queued so far; returns how many writes are still
+        pending (non-zero only if MongoDB rejected or could not be reached).
+        """
+        while self.pending:
+            if not await self._flush_once():
+                break
+        return self.pending
+
+    async def close(self) -> int:
+        """Stop the background flusher and drain the queue"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        remaining = await self.flush()
+        if remaining:
+            logger.warning(f"{remaining} MongoDB writes could not be flushed on shutdown")
+            for queue in self._appends.values():
+                for _, ack in queue:
+                    if ack is not None and not ack.done():
+                        ack.set_result(False)
+        return remaining
+
+    async def _run(self) -> None:
+        while self.pending:
+            if self._failures_in_row:
+                await asyncio.sleep(min(
+                    self.max_backoff_sec,
+                    self.flush_interval_sec * 2 ** self._failures_in_row,
+                ))
+            elif self.pending < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.flush_interval_sec)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            await self._flush_once()
+        # Idle: the next queued write restarts the task
+
+    async def _flush_once(self) -> bool:
+        """One pass over the queues; returns False if any write failed"""
+        db = get_db().get_async_db()
+        if db is None:
+            return self._record_failure("MongoDB not configured")
+        async with self._lock:
+            start = time.perf_counter()
+            steps = self._flush_steps(db)
+            outcome, failure = None, None
+            while True:
+                try:
+                    call, args, kwargs = steps.throw(failure) if failure else steps.send(outcome)
+                except StopIteration as done:
+                    written, error = done.value
+                    break
+                try:
+                    outcome, failure = await call(*args, **kwargs), None
+                except Exception as e:
+                    outcome, failure = None, e
+            return self._record_flush(start, written, error)
+
+    def _flush_sync(self) -> bool:
+        """_flush_once() through the sync client, for callers without an event loop"""
+        db = get_db().get_sync_db()
+        if db is None:
+            return self._record_failure("MongoDB not configured")
+        start = time.perf_counter()
+        steps = self._flush_steps(db)
+        outcome, failure = None, None
+        while True:
+            try:
+                call, args, kwargs = steps.throw(failure) if failure else steps.send(outcome)
+            except StopIteration as done:
+                written, error = done.value
+                break
+            try:
+                outcome, failure = call(*args, **kwargs), None
+            except Exception as e:
+                outcome, failure = None, e
+        return self._record_flush(start, written, error)
+
+    def _flush_steps(self, db) -> Generator[tuple[Callable, tuple, dict], Any, tuple[int, Optional[str]]]:
+        """
+        One flush pass, independent of the driver: yields each (method,
+        args, kwargs) to call against `db` (motor or pymongo), receives the
+        result or has the call's exception thrown in, and returns
+        (documents written, last error or None).
+        """
+        written, error = 0, None
+
+        for collection, ops, items in self._take_upserts():
+            try:
+                yield db[collection].bulk_write, (ops,), {"ordered": False}
+                written += len(ops)
+            except BulkWriteError as e:
+                failed = _failed_indexes(e)
+                written += len(ops) - len(failed)
+                self._requeue_upserts(items, failed)
+                error = str(e)
+            except Exception as e:
+                self._requeue_upserts(items, range(len(items)))
+                error = str(e)
+
+        for collection in list(self._appends):
+            target = db[collection].with_options(write_concern=DURABLE_WRITE_CONCERN)
+            while self._appends.get(collection):
+                batch = self._head(collection)
+                try:
+                    yield target.insert_many, (batch,), {"ordered": True}
+                    count, failure = len(batch), None
+                except BulkWriteError as e:
+                    count, failure = self._settle_append_error(e)
+                except Exception as e:
+                    count, failure = 0, str(e)
+                self._pop_head(collection, count)
+                written += count
+                if failure:
+                    # Later events in this collection wait for the next pass
+                    error = failure
+                    break
+
+        return written, error
+
+    # =========================================================================
+    # Queue bookkeeping
+    # =========================================================================
+
+    def _take_upserts(self) -> list[tuple[str, list[UpdateOne], list[tuple[_UpsertKey, dict]]]]:
+        """Remove all queued upserts, as (collection, ops, [(key, document)]) batches"""
+        pending, self._upserts = self._upserts, {}
+        by_collection: dict[str, list[tuple[_UpsertKey, dict]]] = {}
+        for queue_key, document in pending.items():
+            by_collection.setdefault(queue_key[0], []).append((queue_key, document))
+
+        batches = []
+        for collection, items in by_collection.items():
+            for start in range(0, len(items), self.batch_size):
+                chunk = items[start:start + self.batch_size]
+                ops = [_upsert_op(key[1], key[2], document) for key, document in chunk]
+                batches.append((collection, ops, chunk))
+        return batches
+
+    def _requeue_upserts(self, items: list[tuple[_UpsertKey, dict]], indexes) -> None:
+        """Put failed upserts back, under any newer write to the same document"""
+        for i in indexes:
+            queue_key, document = items[i]
+            newer = self._upserts.get(queue_key)
+            self._upserts[queue_key] = document if newer is None else {**document, **newer}
+
+    def _head(self, collection: str) -> list[dict]:
+        queue = self._appends[collection]
+        return [queue[i][0] for i in range(min(self.batch_size, len(queue)))]
+
+    def _pop_head(self, collection: str, count: int) -> None:
+        """Remove `count` stored documents and acknowledge them"""
+        queue = self._appends[collection]
+        for _ in range(count):
+            _, ack = queue.popleft()
+            if ack is not None and not ack.done():
+                ack.set_result(True)
+        if not queue:
+            del self._appends[collection]
+
+    @staticmethod
+    def _settle_append_error(error: BulkWriteError) -> tuple[int, Optional[str]]:
+        """
+        (documents now known to be stored, error or None) for an ordered
+        insert_many that stopped at its first write error.
+        """
+        inserted = error.details.get("nInserted", 0)
+        write_errors = error.details.get("writeErrors", [])
+        if write_errors and write_errors[0].get("code") == _DUPLICATE_KEY:
+            # Stored by an earlier attempt whose acknowledgement was lost;
+            # the rest of the batch is retried on the next pass
+            return inserted + 1, None
+        return inserted, str(error)
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def _record_flush(self, start: float, written: int, error: Optional[str]) -> bool:
+        elapsed = time.perf_counter() - start
+        self._flushes += 1
+        self._written += written
+        self._last_batch = written
+        self._last_flush = elapsed
+        self._max_flush = max(self._max_flush, elapsed)
+        self._total_flush += elapsed
+        if self.pending < self.max_pending:
+            self._drained.set()
+        if error is not None:
+            return self._record_failure(error)
+        self._failures_in_row = 0
+        return True
+
+    def _record_failure(self, error: str) -> bool:
+        self._failed_flushes += 1
+        self._failures_in_row += 1
+        self._last_error = error
+        logger.warning(f"MongoDB write-behind flush failed ({self.pending} pending): {error}")
+        return False
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Queue depth, coalescing and flush latency (ms)."""
+        return {
+            "queue_depth": self.pending,
+            "pending_upserts": len(self._upserts),
+            "pending_appends": {name: len(queue) for name, queue in self._appends.items()},
+            "queued": self._queued,
+            "coalesced": self._coalesced,
+            "written": self._written,
+            "dropped": self._dropped,
+            "backpressure_waits": self._backpressure_waits,
+            "max_pending": self.max_pending,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "last_error": self._last_error,
+            "last_batch_size": self._last_batch,
+            "last_flush_ms": round(self._last_flush * 1000, 3),
+            "max_flush_ms": round(self._max_flush * 1000, 3),
+            "avg_flush_ms": round(self._total_flush / self._flushes * 1000, 3) if self._flushes else 0.0,
+        }
+
+
+# Global write-behind buffer
+_write_behind: Optional[WriteBehindBuffer] = None
+
+
+def get_write_behind() -> WriteBehindBuffer:
+    """Get the global write-behind buffer"""
+    global _write_behind
+    if _write_behind is None:
+        _write_behind = WriteBehindBuffer(
+            batch_size=config.mongodb_write_batch_size,
+            flush_interval_sec=config.mongodb_write_flush_interval_ms / 1000,
+            max_backoff_sec=config.mongodb_write_max_backoff_sec,
+            max_pending=config.mongodb_write_max_pending,
+        )
+    return _write_behind
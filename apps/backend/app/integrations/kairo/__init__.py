@@ -18,6 +18,8 @@ from .anchor import (
     sha256_hash,
     canonicalize,
 )
+from .rpc import SolanaRpc, LocalSolanaRpc, SolanaRpcError
+from .submitter import AnchorSubmitter
 from .client import (
     KairoClient,
     ContractAnalysis,
@@ -37,6 +39,10 @@ __all__ = [
     "compute_artifact_hashes",
     "sha256_hash",
     "canonicalize",
+    "AnchorSubmitter",
+    "SolanaRpc",
+    "LocalSolanaRpc",
+    "SolanaRpcError",
     "KairoClient",
     "ContractAnalysis",
     "KairoDecision",
@@ -19,10 +19,12 @@ from enum import IntEnum
 
 from config import config
 from app.db import get_db, BlockchainAnchorRepository, BlockchainArtifactRepository
+from app.db.pagination import Page, page_in_memory
 
 logger = logging.getLogger(__name__)
 
 from .client import KairoClient, KairoDecision, get_kairo_client
+from .submitter import AnchorSubmitter, solders_available
 
 
 # ============================================================================
@@ -78,11 +80,14 @@ class AnchorRecord(BaseModel):
     pda_address: Optional[str] = None
     tx_hash: Optional[str] = None
     block_slot: Optional[int] = None
+    last_valid_block_height: Optional[int] = None  # Blockhash expiry of the submitted tx
     
     # Status
-    status: str = "pending"  # pending, pending_approval, confirmed, failed
+    status: str = "pending"  # queued, submitted, pending_approval, confirmed, failed
     created_at: datetime = Field(default_factory=datetime.utcnow)
     confirmed_at: Optional[datetime] = None
+    submit_attempts: int = 0
+    error: Optional[str] = None
     
     # URIs
     packet_uri: str = ""  # MongoDB doc ID or IPFS CID
@@ -269,6 +274,28 @@ class KairoAnchorService:
         
         # Initialize MongoDB if enabled
         self._init_mongodb()
+        
+        # Transactions are sent in the background, several anchors per memo
+        self.submitter = self._create_submitter()
+    
+    def _create_submitter(self) -> AnchorSubmitter:
+        """Anchor submitter from the global settings"""
+        simulate = config.solana_use_simulation or not solders_available()
+        if simulate and not config.solana_use_simulation:
+            logger.warning("solders not installed, anchoring with simulated transactions")
+        return AnchorSubmitter(
+            persist=self._persist_anchor,
+            load_unsettled=self._load_unsettled_anchors,
+            rpc_url=config.solana_rpc_url,
+            private_key=config.solana_private_key,
+            simulate=simulate,
+            batch_size=config.kairo_anchor_batch_size,
+            linger_sec=config.kairo_anchor_batch_linger_ms / 1000,
+            max_memo_bytes=config.kairo_anchor_max_memo_bytes,
+            poll_interval_sec=config.kairo_anchor_poll_interval_ms / 1000,
+            max_attempts=config.kairo_anchor_max_attempts,
+            blockhash_max_age_sec=config.solana_blockhash_max_age_sec,
+        )
     
     def _init_mongodb(self):
         """Initialize MongoDB repositories if enabled."""
@@ -301,8 +328,8 @@ class KairoAnchorService:
         1. Validate anchor program security with Kairo (if enabled)
         2. Compute all section hashes
         3. Store full artifact in MongoDB
-        4. Write hashes to Solana
-        5. Return anchor record
+        4. Queue the hashes for Solana
+        5. Return the queued anchor record (tx_hash is set once submitted)
         """
         kairo_analysis = None
         
@@ -386,11 +413,8 @@ class KairoAnchorService:
                 kairo_analysis=kairo_analysis,  # Store Kairo analysis results
             )
             
-            # Simulate Solana transaction (in production, use actual SDK)
-            anchor_record = self._submit_to_solana(anchor_record)
-            
-            # Persist anchor record to MongoDB (or in-memory fallback)
-            self._persist_anchor(anchor_record)
+            # Queue for the next memo transaction (persists the record)
+            anchor_record = self.submitter.submit(anchor_record)
             
             return AnchorResult(
                 success=True,
@@ -450,195 +474,12 @@ class KairoAnchorService:
             # Fallback to in-memory storage
             self._anchors[anchor_record.anchor_id] = anchor_record
     
-    def _load_anchor_from_db(self, anchor_id: str) -> Optional[AnchorRecord]:
-        """Load anchor record from MongoDB."""
-        if self._mongodb_enabled and self._anchor_repo:
-            try:
-                doc = self._anchor_repo.find_by_anchor_id(anchor_id)
-                if doc:
-                    return self._dict_to_anchor_record(doc)
-            except Exception as e:
-                logger.warning(f"Failed to load anchor from MongoDB: {e}")
-        return None
-    
-    def _dict_to_anchor_record(self, doc: Dict[str, Any]) -> AnchorRecord:
-        """Convert MongoDB document to AnchorRecord."""
-        # Reconstruct ArtifactHashes
-        hashes_data = doc.get("hashes", {})
-        hashes = ArtifactHashes(**hashes_data)
-        
-        # Parse datetime fields
-        created_at = doc.get("created_at")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
-        elif created_at is None:
-            created_at = datetime.utcnow()
-            
-        confirmed_at = doc.get("confirmed_at")
-        if isinstance(confirmed_at, str):
-            confirmed_at = datetime.fromisoformat(confirmed_at)
-            
-        approval_timestamp = doc.get("approval_timestamp")
-        if isinstance(approval_timestamp, str):
-            approval_timestamp = datetime.fromisoformat(approval_timestamp)
-        
-        return AnchorRecord(
-            anchor_id=doc.get("anchor_id", ""),
-            artifact_id=doc.get("artifact_id", ""),
-            incident_id=doc.get("incident_id", ""),
-            scenario_id=doc.get("scenario_id", ""),
-            hashes=hashes,
-            operator_id=doc.get("operator_id", ""),
-            operator_role=OperatorRole(doc.get("operator_role", 0)),
-            operator_pubkey=doc.get("operator_pubkey"),
-            supervisor_pubkey=doc.get("supervisor_pubkey"),
-            requires_approval=doc.get("requires_approval", False),
-            approval_timestamp=approval_timestamp,
-            chain=doc.get("chain", "solana"),
-            network=doc.get("network", "devnet"),
-            program_id=doc.get("program_id", self.PROGRAM_ID),
-            pda_address=doc.get("pda_address"),
-            tx_hash=doc.get("tx_hash"),
-            block_slot=doc.get("block_slot"),
-            status=doc.get("status", "pending"),
-            created_at=created_at,
-            confirmed_at=confirmed_at,
-            packet_uri=doc.get("packet_uri", ""),
-            verification_url=doc.get("verification_url"),
-            explorer_url=doc.get("explorer_url"),
-        )
-    
-    def anchor_artifact(self, request: AnchorRequest) -> AnchorResult:
-        """
-        Anchor an artifact on-chain (synchronous wrapper).
-        
-        For async Kairo checks, this runs in a new event loop.
-        """
-        import asyncio
-        
-        try:
-            # Try to get existing event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is running, we can't use run_until_complete
-                # Fall back to sync version without Kairo check
-                return self._anchor_artifact_sync(request)
-            else:
-                # Run async version
-                return loop.run_until_complete(self.anchor_artifact_async(request))
-        except RuntimeError:
-            # No event loop, create one
-            return asyncio.run(self.anchor_artifact_async(request))
-        except Exception as e:
-            # Fallback to sync version on error
-            print(f"Warning: Async anchoring failed, using sync: {e}")
-            return self._anchor_artifact_sync(request)
-    
-    def _anchor_artifact_sync(self, request: AnchorRequest) -> AnchorResult:
-        """
-        Synchronous anchor without Kairo async checks.
-        Used as fallback when async is not available.
-        """
-        try:
-            # Compute hashes
-            hashes = compute_artifact_hashes(request.artifact_data)
-            
-            # Generate incident ID
-            incident_id = self._next_incident_id
-            self._next_incident_id += 1
-            
-            # Derive PDA
-            pda_address = derive_pda_address(incident_id, self.PROGRAM_ID)
-            
-            # Store artifact
-            mongo_doc_id = f"mongo_{request.artifact_id}"
-            self._artifacts_db[mongo_doc_id] = {
-                "artifact": request.artifact_data,
-                "stored_at": datetime.utcnow().isoformat(),
-            }
-            
-            # Determine if approval is needed
-            requires_approval = request.operator_role == OperatorRole.EMPLOYEE
-            
-            # Create anchor record (without Kairo analysis in sync mode)
-            anchor_record = AnchorRecord(
-                anchor_id=f"anchor_{request.artifact_id}",
-                artifact_id=request.artifact_id,
-                incident_id=request.incident_id,
-                scenario_id=request.scenario_id,
-                hashes=hashes,
-                operator_id=request.operator_id,
-                operator_role=request.operator_role,
-                operator_pubkey=request.operator_pubkey,
-                requires_approval=requires_approval,
-                pda_address=pda_address,
-                packet_uri=mongo_doc_id,
-                status="pending_approval" if requires_approval else "pending",
-            )
-            
-            # Simulate Solana transaction
-            anchor_record = self._submit_to_solana(anchor_record)
-            
-            # Persist anchor record to MongoDB (or in-memory fallback)
-            self._persist_anchor(anchor_record)
-            
-            return AnchorResult(
-                success=True,
-                anchor_record=anchor_record,
-                tx_hash=anchor_record.tx_hash,
-                verification_url=anchor_record.verification_url,
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to anchor artifact: {e}")
-            return AnchorResult(
-                success=False,
-                error=str(e),
-            )
-    
-    def _store_artifact(self, artifact_id: str, artifact_data: Dict[str, Any]) -> str:
-        """Store artifact in MongoDB or in-memory fallback."""
-        if self._mongodb_enabled and self._artifact_repo:
-            try:
-                mongo_doc_id = self._artifact_repo.store_artifact(artifact_id, artifact_data)
-                logger.info(f"Artifact {artifact_id} stored in MongoDB: {mongo_doc_id}")
-                return mongo_doc_id
-            except Exception as e:
-                logger.warning(f"Failed to store artifact in MongoDB: {e}, using in-memory")
-        
-        # Fallback to in-memory storage
-        mongo_doc_id = f"mongo_{artifact_id}"
-        self._artifacts_db[mongo_doc_id] = {
-            "artifact": artifact_data,
-            "stored_at": datetime.utcnow().isoformat(),
-        }
-        return mongo_doc_id
-    
-    def _persist_anchor(self, anchor_record: AnchorRecord):
-        """Persist anchor record to MongoDB or in-memory fallback."""
-        if self._mongodb_enabled and self._anchor_repo:
-            try:
-                # Convert to dict for MongoDB storage
-                anchor_dict = anchor_record.model_dump()
-                # Convert nested models and enums to serializable format
-                anchor_dict["hashes"] = anchor_record.hashes.model_dump()
-                anchor_dict["operator_role"] = int(anchor_record.operator_role)
-                # Convert datetime objects to ISO strings for MongoDB
-                if anchor_dict.get("created_at"):
-                    anchor_dict["created_at"] = anchor_record.created_at.isoformat()
-                if anchor_dict.get("confirmed_at") and anchor_record.confirmed_at:
-                    anchor_dict["confirmed_at"] = anchor_record.confirmed_at.isoformat()
-                if anchor_dict.get("approval_timestamp") and anchor_record.approval_timestamp:
-                    anchor_dict["approval_timestamp"] = anchor_record.approval_timestamp.isoformat()
-                
-                self._anchor_repo.upsert_anchor(anchor_dict)
-                logger.info(f"Anchor {anchor_record.anchor_id} persisted to MongoDB")
-            except Exception as e:
-                logger.warning(f"Failed to persist anchor to MongoDB: {e}, using in-memory")
-                self._anchors[anchor_record.anchor_id] = anchor_record
-        else:
-            # Fallback to in-memory storage
-            self._anchors[anchor_record.anchor_id] = anchor_record
+    def _load_unsettled_anchors(self) -> List[AnchorRecord]:
+        """Anchors queued or submitted but not yet confirmed (MongoDB only)"""
+        if not (self._mongodb_enabled and self._anchor_repo):
+            return []
+        docs = self._anchor_repo.find_by_status("queued") + self._anchor_repo.find_by_status("submitted")
+        return [self._dict_to_anchor_record(doc) for doc in docs]
     
     def _load_anchor_from_db(self, anchor_id: str) -> Optional[AnchorRecord]:
         """Load anchor record from MongoDB."""
@@ -690,9 +531,12 @@ class KairoAnchorService:
             pda_address=doc.get("pda_address"),
             tx_hash=doc.get("tx_hash"),
             block_slot=doc.get("block_slot"),
+            last_valid_block_height=doc.get("last_valid_block_height"),
             status=doc.get("status", "pending"),
             created_at=created_at,
             confirmed_at=confirmed_at,
+            submit_attempts=doc.get("submit_attempts", 0),
+            error=doc.get("error"),
             packet_uri=doc.get("packet_uri", ""),
             verification_url=doc.get("verification_url"),
             explorer_url=doc.get("explorer_url"),
@@ -702,7 +546,9 @@ class KairoAnchorService:
         """
         Anchor an artifact on-chain (synchronous wrapper).
         
-        For async Kairo checks, this runs in a new event loop.
+        Inside a running event loop the anchor is queued and returned at
+        once. Otherwise this runs in a new event loop and waits until the
+        anchor is confirmed or failed.
         """
         import asyncio
         
@@ -715,15 +561,24 @@ class KairoAnchorService:
                 return self._anchor_artifact_sync(request)
             else:
                 # Run async version
-                return loop.run_until_complete(self.anchor_artifact_async(request))
+                return loop.run_until_complete(self._anchor_and_settle(request))
         except RuntimeError:
             # No event loop, create one
-            return asyncio.run(self.anchor_artifact_async(request))
+            return asyncio.run(self._anchor_and_settle(request))
         except Exception as e:
             # Fallback to sync version on error
             print(f"Warning: Async anchoring failed, using sync: {e}")
             return self._anchor_artifact_sync(request)
     
+    async def _anchor_and_settle(self, request: AnchorRequest) -> AnchorResult:
+        """anchor_artifact_async, then wait for the submitter before the loop goes away"""
+        result = await self.anchor_artifact_async(request)
+        await self.submitter.close()
+        if result.anchor_record is not None:
+            result.tx_hash = result.anchor_record.tx_hash
+            result.verification_url = result.anchor_record.verification_url
+        return result
+    
     def _anchor_artifact_sync(self, request: AnchorRequest) -> AnchorResult:
         """
         Synchronous anchor without Kairo async checks.
@@ -766,11 +621,8 @@ class KairoAnchorService:
                 status="pending_approval" if requires_approval else "pending",
             )
             
-            # Simulate Solana transaction
-            anchor_record = self._submit_to_solana(anchor_record)
-            
-            # Store record
-            self._anchors[anchor_record.anchor_id] = anchor_record
+            # Queue for the next memo transaction (persists the record)
+            anchor_record = self.submitter.submit(anchor_record)
             
             return AnchorResult(
                 success=True,
@@ -785,205 +637,6 @@ class KairoAnchorService:
                 error=str(e),
             )
     
-    def _submit_to_solana(self, record: AnchorRecord) -> AnchorRecord:
-        """
-        Submit anchor to Solana Devnet using the Memo program.
-        
-        This creates a real transaction on Solana Devnet that contains
-        the artifact hash data, which can be verified on Solana Explorer.
-        
-        If real transaction fails, falls back to simulation mode with a
-        deterministic hash that can still be used for verification.
-        """
-        is_real_transaction = False
-        
-        try:
-            # Try to submit a real transaction to Solana Devnet
-            tx_hash = self._submit_real_transaction(record)
-            if tx_hash:
-                record.tx_hash = tx_hash
-                record.status = "confirmed" if not record.requires_approval else "pending_approval"
-                record.confirmed_at = datetime.utcnow()
-                record.explorer_url = f"https://explorer.solana.com/tx/{tx_hash}?cluster=devnet"
-                record.verification_url = f"https://solscan.io/tx/{tx_hash}?cluster=devnet"
-                is_real_transaction = True
-                logger.info(f"✅ Anchor {record.anchor_id} submitted to Solana devnet: {tx_hash}")
-                return record
-        except Exception as e:
-            logger.warning(f"Real Solana transaction failed: {e}, falling back to simulation")
-        
-        # Fallback: Generate simulated transaction signature
-        # Use deterministic hash based on artifact data for consistent verification
-        logger.info("📝 Using simulated transaction (devnet airdrop unavailable)")
-        tx_data = f"{record.artifact_id}:{record.hashes.bundle_root_hash}:{record.created_at.isoformat()}"
-        tx_hash = sha256_hash(tx_data)
-        
-        record.tx_hash = f"sim_{tx_hash[:60]}"  # Prefix with 'sim_' to indicate simulation
-        record.block_slot = 250000000 + hash(record.anchor_id) % 1000000
-        
-        if not record.requires_approval:
-            record.status = "confirmed"
-            record.confirmed_at = datetime.utcnow()
-        
-        # Note: These URLs won't resolve for simulated transactions
-        # but maintain the same format for UI consistency
-        record.explorer_url = None  # No explorer URL for simulated transactions
-        record.verification_url = None
-        
-        logger.info(f"📝 Anchor {record.anchor_id} created with simulated tx: {record.tx_hash}")
-        logger.info("💡 Tip: Set SATOR_SOLANA_PRIVATE_KEY for real devnet transactions")
-        
-        return record
-    
-    def _submit_real_transaction(self, record: AnchorRecord) -> Optional[str]:
-        """
-        Submit a real transaction to Solana Devnet using the Memo program.
-        
-        Returns the transaction signature if successful, None otherwise.
-        
-        Supports three modes:
-        1. Pre-funded wallet: If SATOR_SOLANA_PRIVATE_KEY is set, uses that wallet
-        2. Airdrop mode: Requests devnet airdrop (rate-limited, may fail)
-        3. Simulation mode: If SATOR_SOLANA_USE_SIMULATION is true, skips real tx
-        """
-        # Check if simulation mode is enabled
-        if config.solana_use_simulation:
-            logger.info("Solana simulation mode enabled, skipping real transaction")
-            return None
-        
-        try:
-            from solana.rpc.api import Client
-            from solders.keypair import Keypair
-            from solders.pubkey import Pubkey
-            from solders.instruction import Instruction, AccountMeta
-            from solders.message import Message
-            from solders.transaction import Transaction
-            import base58
-            import time
-            
-            # Use configured RPC URL or default
-            rpc_url = config.solana_rpc_url or "https://api.devnet.solana.com"
-            
-            # Try to get pre-funded wallet from config
-            payer = None
-            if config.solana_private_key:
-                try:
-                    # Decode base58 private key
-                    private_key_bytes = base58.b58decode(config.solana_private_key)
-                    payer = Keypair.from_bytes(private_key_bytes)
-                    logger.info(f"🔑 Using pre-funded wallet: {payer.pubkey()}")
-                except Exception as e:
-                    logger.warning(f"Failed to load pre-funded wallet: {e}")
-                    payer = None
-            
-            # Try multiple RPC endpoints
-            rpc_endpoints = [
-                rpc_url,
-                "https://api.devnet.solana.com",
-            ]
-            # Remove duplicates while preserving order
-            rpc_endpoints = list(dict.fromkeys(rpc_endpoints))
-            
-            for rpc_endpoint in rpc_endpoints:
-                try:
-                    logger.info(f"🔗 Trying RPC: {rpc_endpoint[:50]}...")
-                    client = Client(rpc_endpoint)
-                    
-                    # If no pre-funded wallet, create new keypair and request airdrop
-                    if payer is None:
-                        payer = Keypair()
-                        logger.info(f"🔑 Created new keypair: {payer.pubkey()}")
-                        
-                        # Request airdrop of 0.001 SOL (1M lamports) for transaction fees
-                        logger.info("💰 Requesting airdrop (may be rate-limited)...")
-                        try:
-                            airdrop_resp = client.request_airdrop(payer.pubkey(), 1_000_000)
-                            
-                            if airdrop_resp.value:
-                                logger.info(f"📝 Airdrop signature: {airdrop_resp.value}")
-                                
-                                # Wait for airdrop confirmation (max 10 seconds)
-                                for i in range(10):
-                                    time.sleep(1)
-                                    try:
-                                        balance_resp = client.get_balance(payer.pubkey())
-                                        if balance_resp.value and balance_resp.value > 0:
-                                            logger.info(f"✅ Airdrop confirmed, balance: {balance_resp.value} lamports")
-                                            break
-                                    except:
-                                        pass
-                                    if i == 9:
-                                        logger.warning("⚠️ Airdrop timeout, trying next RPC")
-                                        payer = None  # Reset for next attempt
-                                        continue
-                        except Exception as e:
-                            logger.warning(f"⚠️ Airdrop failed (rate-limited): {e}")
-                            payer = None  # Reset for next attempt
-                            continue
-                    
-                    # Check balance
-                    if payer is not None:
-                        balance_resp = client.get_balance(payer.pubkey())
-                        if not balance_resp.value or balance_resp.value < 5000:
-                            logger.warning("⚠️ Insufficient balance for transaction")
-                            if not config.solana_private_key:
-                                payer = None  # Reset for next attempt with airdrop
-                            continue
-                    else:
-                        continue
-                    
-                    # Create memo data with artifact hash
-                    memo_data = f"SATOR|{record.artifact_id}|{record.hashes.bundle_root_hash[:32]}"
-                    
-                    # Memo program ID
-                    MEMO_PROGRAM_ID = Pubkey.from_string("MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr")
-                    
-                    # Create memo instruction
-                    memo_instruction = Instruction(
-                        program_id=MEMO_PROGRAM_ID,
-                        accounts=[AccountMeta(payer.pubkey(), is_signer=True, is_writable=True)],
-                        data=memo_data.encode('utf-8')
-                    )
-                    
-                    # Get recent blockhash
-                    blockhash_resp = client.get_latest_blockhash()
-                    recent_blockhash = blockhash_resp.value.blockhash
-                    logger.info(f"📦 Recent blockhash: {recent_blockhash}")
-                    
-                    # Build message and transaction
-                    message = Message.new_with_blockhash(
-                        [memo_instruction],
-                        payer.pubkey(),
-                        recent_blockhash
-                    )
-                    txn = Transaction.new_unsigned(message)
-                    txn.sign([payer], recent_blockhash)
-                    
-                    # Send transaction
-                    logger.info("🚀 Sending transaction...")
-                    result = client.send_transaction(txn)
-                    
-                    if result.value:
-                        tx_signature = str(result.value)
-                        logger.info(f"✅ Real Solana transaction submitted: {tx_signature}")
-                        return tx_signature
-                        
-                except Exception as e:
-                    logger.warning(f"⚠️ RPC {rpc_endpoint[:30]} failed: {e}")
-                    if not config.solana_private_key:
-                        payer = None  # Reset for next attempt
-                    continue
-            
-            logger.warning("❌ All RPC endpoints failed, falling back to simulation")
-            return None
-            
-        except ImportError as e:
-            logger.warning(f"❌ Solana libraries not available: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"❌ Solana transaction error: {e}")
-            return None
-    
     def approve_anchor(self, anchor_id: str, supervisor_pubkey: str) -> AnchorResult:
         """Supervisor approves an anchor."""
         anchor = self.get_anchor(anchor_id)
@@ -996,8 +649,10 @@ class KairoAnchorService:
         anchor.supervisor_pubkey = supervisor_pubkey
         anchor.requires_approval = False
         anchor.approval_timestamp = datetime.utcnow()
-        anchor.status = "confirmed"
-        anchor.confirmed_at = datetime.utcnow()
+        # Still on its way to the chain: confirmed when the transaction is
+        if anchor.status not in ("queued", "submitted"):
+            anchor.status = "confirmed"
+            anchor.confirmed_at = datetime.utcnow()
         
         # Persist updated anchor
         self._persist_anchor(anchor)
@@ -1132,6 +787,28 @@ class KairoAnchorService:
             anchors = [a for a in anchors if a.status == status]
         return anchors
     
+    async def page_anchors(
+        self,
+        status: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """
+        Anchors newest first, one page of AnchorRecords at a time.
+        Raises ValueError for a malformed cursor.
+        """
+        if self._mongodb_enabled and self._anchor_repo:
+            query = {"status": status} if status else {}
+            # _id follows insertion order; created_at is not stored with one type
+            page = await self._anchor_repo.async_find_page(query, limit, cursor, sort_field="_id", descending=True)
+            page.items = [self._dict_to_anchor_record(doc) for doc in page.items]
+            return page
+        
+        anchors = list(self._anchors.values())
+        if status:
+            anchors = [a for a in anchors if a.status == status]
+        return page_in_memory(anchors, key=lambda a: (a.created_at, a.anchor_id), limit=limit, cursor=cursor, descending=True)
+    
     def get_anchor_status(self, artifact_id: str) -> str:
         """Get anchor status for an artifact."""
         anchor = self.get_anchor_by_artifact(artifact_id)
@@ -0,0 +1,273 @@
+"""
+Solana RPC - Async JSON-RPC client and a local stand-in.
+
+SolanaRpc keeps one pooled httpx.AsyncClient for the life of the anchor
+submitter and moves on to the next endpoint when one fails. LocalSolanaRpc
+answers the same calls in-process (block height advancing with wall time,
+blockhashes expiring, signatures confirming a few blocks after they are
+sent) for tests and offline demos; select it with SATOR_SOLANA_RPC_URL=local.
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEVNET_RPC = "https://api.devnet.solana.com"
+LOCAL_RPC = "local"
+
+# A blockhash stays usable for this many blocks after it was produced
+BLOCKHASH_VALID_BLOCKS = 150
+# Without searchTransactionHistory, statuses come from a cache of about this many recent blocks
+STATUS_CACHE_BLOCKS = 300
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = _B58_ALPHABET[remainder] + encoded
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + encoded
+
+
+def b58decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        number = number * 58 + _B58_ALPHABET.index(char)
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\0" * (len(text) - len(text.lstrip("1"))) + body
+
+
+class SolanaRpcError(Exception):
+    """An RPC call was rejected (`code` is the JSON-RPC error code, if any)"""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+    @property
+    def blockhash_expired(self) -> bool:
+        return "blockhash not found" in str(self).lower()
+
+
+# ============================================================================
+# JSON-RPC client
+# ============================================================================
+
+class SolanaRpc:
+    """Solana JSON-RPC over one reused connection pool, with endpoint fallback"""
+
+    def __init__(self, endpoints: List[str], timeout_sec: float = 10.0, commitment: str = "confirmed"):
+        self.endpoints = list(dict.fromkeys(endpoints))
+        self.timeout_sec = timeout_sec
+        self.commitment = commitment
+        self._endpoint = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._request_id = 0
+
+    @property
+    def endpoint(self) -> str:
+        return self.endpoints[self._endpoint]
+
+    async def _call(self, method: str, params: List[Any]) -> Any:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout_sec)
+        last_error: Optional[Exception] = None
+        for _ in range(len(self.endpoints)):
+            self._request_id += 1
+            payload = {"jsonrpc": "2.0", "id": self._request_id, "method": method, "params": params}
+            try:
+                response = await self._client.post(self.endpoint, json=payload)
+                response.raise_for_status()
+                body = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                # Unreachable, rate-limited or garbled: try the next endpoint
+                logger.warning(f"Solana RPC {self.endpoint[:50]} failed on {method}: {e}")
+                last_error = e
+                self._endpoint = (self._endpoint + 1) % len(self.endpoints)
+                continue
+            if "error" in body:
+                error = body["error"]
+                raise SolanaRpcError(error.get("message", str(error)), error.get("code"))
+            return body.get("result")
+        raise SolanaRpcError(f"All Solana RPC endpoints failed: {last_error}")
+
+    async def get_latest_blockhash(self) -> Tuple[str, int]:
+        """(blockhash, last block height at which it is valid)"""
+        result = await self._call("getLatestBlockhash", [{"commitment": self.commitment}])
+        value = result["value"]
+        return value["blockhash"], value["lastValidBlockHeight"]
+
+    async def get_block_height(self) -> int:
+        return await self._call("getBlockHeight", [{"commitment": self.commitment}])
+
+    async def get_balance(self, pubkey: str) -> int:
+        result = await self._call("getBalance", [pubkey, {"commitment": self.commitment}])
+        return result["value"]
+
+    async def request_airdrop(self, pubkey: str, lamports: int) -> str:
+        return await self._call("requestAirdrop", [pubkey, lamports])
+
+    async def send_transaction(self, transaction: bytes) -> str:
+        """Submit a signed transaction; returns its signature"""
+        return await self._call("sendTransaction", [
+            base64.b64encode(transaction).decode(),
+            {"encoding": "base64", "preflightCommitment": self.commitment},
+        ])
+
+    async def get_signature_statuses(
+        self, signatures: List[str], search_history: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Status per signature (None if not found). Only recent transactions
+        are found unless `search_history` is set.
+        """
+        params: List[Any] = [signatures]
+        if search_history:
+            params.append({"searchTransactionHistory": True})
+        result = await self._call("getSignatureStatuses", params)
+        return result["value"]
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# ============================================================================
+# Local stand-in
+# ============================================================================
+
+class LocalSolanaRpc:
+    """
+    In-process stand-in for SolanaRpc. Accepts legacy transactions, checks
+    their blockhash and charges the fee payer, and reports a signature as
+    confirmed once `confirm_blocks` blocks have passed. Like a real node it
+    forgets statuses older than `status_cache_blocks` unless asked to search
+    transaction history.
+    """
+
+    FEE_LAMPORTS = 5000
+
+    def __init__(
+        self,
+        block_time_sec: float = 0.4,
+        confirm_blocks: int = 1,
+        valid_blocks: int = BLOCKHASH_VALID_BLOCKS,
+        status_cache_blocks: int = STATUS_CACHE_BLOCKS,
+    ):
+        self.block_time_sec = block_time_sec
+        self.confirm_blocks = confirm_blocks
+        self.valid_blocks = valid_blocks
+        self.status_cache_blocks = status_cache_blocks
+        self._started = time.monotonic()
+        self._balances: Dict[str, int] = {}
+        # Signature -> (block height it landed in, fee payer)
+        self._transactions: Dict[str, Tuple[int, str]] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _height(self) -> int:
+        return int((time.monotonic() - self._started) / self.block_time_sec)
+
+    def _blockhash_at(self, height: int) -> str:
+        return b58encode(hashlib.sha256(f"sator-local:{height}".encode()).digest())
+
+    async def get_latest_blockhash(self) -> Tuple[str, int]:
+        self._count("getLatestBlockhash")
+        height = self._height()
+        return self._blockhash_at(height), height + self.valid_blocks
+
+    async def get_block_height(self) -> int:
+        self._count("getBlockHeight")
+        return self._height()
+
+    async def get_balance(self, pubkey: str) -> int:
+        self._count("getBalance")
+        return self._balances.get(pubkey, 0)
+
+    async def request_airdrop(self, pubkey: str, lamports: int) -> str:
+        self._count("requestAirdrop")
+        self._balances[pubkey] = self._balances.get(pubkey, 0) + lamports
+        return b58encode(hashlib.sha512(f"airdrop:{pubkey}:{time.monotonic()}".encode()).digest())
+
+    async def send_transaction(self, transaction: bytes) -> str:
+        self._count("sendTransaction")
+        # Let concurrent callers interleave as they would over the network
+        await asyncio.sleep(0)
+        signature, payer, blockhash = self._parse(transaction)
+        height = self._height()
+        if not any(
+            self._blockhash_at(h) == blockhash
+            for h in range(max(0, height - self.valid_blocks), height + 1)
+        ):
+            raise SolanaRpcError("Transaction simulation failed: Blockhash not found", -32002)
+        if self._balances.get(payer, 0) < self.FEE_LAMPORTS:
+            raise SolanaRpcError(
+                "Transaction simulation failed: Attempt to debit an account but found no record of a prior credit.",
+                -32002,
+            )
+        if signature not in self._transactions:
+            self._balances[payer] -= self.FEE_LAMPORTS
+            self._transactions[signature] = (height, payer)
+        return signature
+
+    async def get_signature_statuses(
+        self, signatures: List[str], search_history: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        self._count("getSignatureStatuses")
+        height = self._height()
+        statuses: List[Optional[Dict[str, Any]]] = []
+        for signature in signatures:
+            landed = self._transactions.get(signature)
+            if landed is None or (not search_history and height - landed[0] > self.status_cache_blocks):
+                statuses.append(None)
+                continue
+            confirmations = height - landed[0]
+            statuses.append({
+                "slot": landed[0],
+                "confirmations": confirmations,
+                "err": None,
+                "confirmationStatus": "confirmed" if confirmations >= self.confirm_blocks else "processed",
+            })
+        return statuses
+
+    async def close(self) -> None:
+        pass
+
+    @staticmethod
+    def _parse(transaction: bytes) -> Tuple[str, str, str]:
+        """(first signature, fee payer, blockhash) of a serialized legacy transaction"""
+        try:
+            signature_count = transaction[0]
+            offset = 1 + 64 * signature_count
+            signature = transaction[1:65]
+            # Message header (3 bytes), then the account keys
+            key_count = transaction[offset + 3]
+            keys_start = offset + 4
+            payer = transaction[keys_start:keys_start + 32]
+            blockhash_start = keys_start + 32 * key_count
+            blockhash = transaction[blockhash_start:blockhash_start + 32]
+        except IndexError:
+            raise SolanaRpcError("failed to deserialize transaction", -32602)
+        if signature_count == 0 or len(blockhash) != 32:
+            raise SolanaRpcError("failed to deserialize transaction", -32602)
+        return b58encode(signature), b58encode(payer), b58encode(blockhash)
+
+
+def create_rpc(rpc_url: str) -> Any:
+    """SolanaRpc for `rpc_url` (falling back to devnet), or the stand-in for 'local'"""
+    if rpc_url == LOCAL_RPC:
+        return LocalSolanaRpc()
+    return SolanaRpc([rpc_url or DEVNET_RPC, DEVNET_RPC])
@@ -0,0 +1,548 @@
+"""
+Kairo Anchor Submitter - Batched, asynchronous anchoring on Solana.
+
+Anchoring an artifact only queues its AnchorRecord (status "queued") and
+returns, so the caller has the anchor_id at once; it can poll
+GET /api/artifacts/blockchain/anchors/{anchor_id} or wait for the
+`artifact_anchored` WebSocket event.
+
+One background task drains the queue:
+  - Up to `kairo_anchor_batch_size` queued anchors (waiting at most
+    `kairo_anchor_batch_linger_ms` for a batch to fill) go into one Memo
+    program transaction, "SATOR2|<artifact_id>:<bundle_root>|...", kept
+    within `kairo_anchor_max_memo_bytes`.
+  - Every transaction is paid by the same fee payer (SATOR_SOLANA_PRIVATE_KEY,
+    or a keypair funded by one devnet airdrop) and signed against a cached
+    blockhash, refetched after `solana_blockhash_max_age_sec` or when the
+    cluster reports it expired. RPC calls share one async client.
+  - Signatures in flight are polled together with getSignatureStatuses.
+    Once confirmed, each anchor in the transaction becomes "confirmed" (or
+    "pending_approval") and listeners are called. A transaction that expires
+    without being found, even in the transaction history, is sent again;
+    anchors that fail `kairo_anchor_max_attempts` sends become "failed".
+
+Status changes are persisted as they happen, so queued and submitted anchors
+left behind by a restart are resumed from MongoDB. With
+SATOR_SOLANA_USE_SIMULATION (or without the solders package) anchors get
+deterministic "sim_" signatures through the same queue.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .rpc import SolanaRpcError, create_rpc
+
+logger = logging.getLogger(__name__)
+
+MEMO_PROGRAM_ID = "MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr"
+MEMO_PREFIX = "SATOR2"
+
+# Fee for a one-signature transaction
+_MIN_BALANCE_LAMPORTS = 5000
+_AIRDROP_LAMPORTS = 1_000_000
+_AIRDROP_TIMEOUT_SEC = 10.0
+# getSignatureStatuses accepts at most this many signatures per call
+_MAX_STATUS_BATCH = 256
+
+
+# ============================================================================
+# Fee payer
+# ============================================================================
+
+class MemoSigner:
+    """Fee payer keypair that signs Memo program transactions"""
+
+    def __init__(self, keypair: Any, prefunded: bool = False):
+        self._keypair = keypair
+        self.prefunded = prefunded
+
+    @classmethod
+    def load(cls, private_key: Optional[str] = None) -> "MemoSigner":
+        """The configured base58 keypair, or a new one to be funded by airdrop"""
+        from solders.keypair import Keypair
+
+        if private_key:
+            return cls(Keypair.from_base58_string(private_key), prefunded=True)
+        return cls(Keypair())
+
+    @property
+    def pubkey(self) -> str:
+        return str(self._keypair.pubkey())
+
+    def build(self, memo: bytes, blockhash: str) -> bytes:
+        """Serialized, signed transaction carrying `memo`"""
+        from solders.hash import Hash
+        from solders.instruction import AccountMeta, Instruction
+        from solders.message import Message
+        from solders.pubkey import Pubkey
+        from solders.transaction import Transaction
+
+        payer = self._keypair.pubkey()
+        instruction = Instruction(
+            program_id=Pubkey.from_string(MEMO_PROGRAM_ID),
+            accounts=[AccountMeta(payer, is_signer=True, is_writable=True)],
+            data=memo,
+        )
+        recent_blockhash = Hash.from_string(blockhash)
+        transaction = Transaction.new_unsigned(Message.new_with_blockhash([instruction], payer, recent_blockhash))
+        transaction.sign([self._keypair], recent_blockhash)
+        return bytes(transaction)
+
+
+def solders_available() -> bool:
+    try:
+        import solders  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ============================================================================
+# Submitter
+# ============================================================================
+
+class AnchorSubmitter:
+    """Queue of AnchorRecords with a background batching Solana submitter"""
+
+    def __init__(
+        self,
+        persist: Callable[[Any], None],
+        load_unsettled: Callable[[], List[Any]],
+        rpc_url: str = "https://api.devnet.solana.com",
+        private_key: Optional[str] = None,
+        simulate: bool = False,
+        batch_size: int = 8,
+        linger_sec: float = 0.2,
+        max_memo_bytes: int = 900,
+        poll_interval_sec: float = 0.5,
+        max_attempts: int = 5,
+        blockhash_max_age_sec: float = 30.0,
+        rpc_factory: Callable[[str], Any] = create_rpc,
+        signer_factory: Optional[Callable[[], MemoSigner]] = None,
+    ):
+        self._persist = persist
+        self._load_unsettled = load_unsettled
+        self.rpc_url = rpc_url
+        self.simulate = simulate
+        self.batch_size = max(1, batch_size)
+        self.linger_sec = linger_sec
+        self.max_memo_bytes = max_memo_bytes
+        self.poll_interval_sec = poll_interval_sec
+        self.max_attempts = max(1, max_attempts)
+        self.blockhash_max_age_sec = blockhash_max_age_sec
+        self._rpc_factory = rpc_factory
+        self._signer_factory = signer_factory or (lambda: MemoSigner.load(private_key))
+
+        self._queue: Deque[Any] = deque()
+        # Signature -> anchors in that transaction
+        self._in_flight: Dict[str, List[Any]] = {}
+        self._listeners: List[Callable] = []
+        self._recovered = False
+
+        # Bound to the event loop the worker runs on
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._rpc: Any = None
+
+        self._signer: Optional[MemoSigner] = None
+        self._signer_funded = False
+        # (blockhash, last valid block height, fetched at)
+        self._blockhash: Optional[Tuple[str, int, float]] = None
+        self._failures_in_row = 0
+
+        # Metrics
+        self._submitted = 0
+        self._transactions = 0
+        self._anchors_sent = 0
+        self._confirmed_transactions = 0
+        self._confirmed = 0
+        self._failed = 0
+        self._resent = 0
+        self._blockhash_fetches = 0
+        self._blockhash_reuses = 0
+        self._last_error: Optional[str] = None
+        self._total_confirm = 0.0
+        self._max_confirm = 0.0
+        # Signatures sent by this process (recovered ones are not in here)
+        self._sent_at: Dict[str, float] = {}
+
+    # ========================================================================
+    # Queueing
+    # ========================================================================
+
+    def add_listener(self, callback: Callable) -> None:
+        """Call `callback(record)` (sync or async) when an anchor is confirmed or fails"""
+        self._listeners.append(callback)
+
+    def submit(self, record: Any) -> Any:
+        """Queue an anchor for the chain; returns the queued (or already unsettled) record"""
+        unsettled = self._find(record.anchor_id)
+        if unsettled is not None:
+            self.start()
+            return unsettled
+        record.status = "queued"
+        record.tx_hash = None
+        record.error = None
+        self._persist(record)
+        self._queue.append(record)
+        self._submitted += 1
+        self.start()
+        return record
+
+    def _find(self, anchor_id: str) -> Optional[Any]:
+        for record in self._queue:
+            if record.anchor_id == anchor_id:
+                return record
+        for records in self._in_flight.values():
+            for record in records:
+                if record.anchor_id == anchor_id:
+                    return record
+        return None
+
+    @property
+    def pending(self) -> int:
+        """Anchors queued or waiting for confirmation"""
+        return len(self._queue) + sum(len(records) for records in self._in_flight.values())
+
+    def start(self) -> None:
+        """Run the worker on the current event loop, if there is one"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Drained by drain()/close() under asyncio.run
+            return
+        if loop is not self._loop:
+            # Loop-bound state from an earlier asyncio.run is unusable
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._task = None
+            self._rpc = None
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def drain(self, timeout_sec: Optional[float] = None) -> int:
+        """Wait until every anchor is settled; returns how many are still pending"""
+        self.start()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout_sec)
+            except asyncio.TimeoutError:
+                pass
+        return self.pending
+
+    async def close(self, timeout_sec: Optional[float] = 30.0) -> int:
+        """Drain (up to `timeout_sec`), stop the worker and release the RPC client"""
+        remaining = await self.drain(timeout_sec)
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._rpc is not None:
+            await self._rpc.close()
+            self._rpc = None
+        if remaining:
+            logger.warning(f"{remaining} anchors still unsettled on shutdown; they resume on restart")
+        return remaining
+
+    # ========================================================================
+    # Worker
+    # ========================================================================
+
+    async def _run(self) -> None:
+        if not self._recovered:
+            self._recovered = True
+            await self._recover()
+        while self._queue or self._in_flight:
+            if self._failures_in_row:
+                await asyncio.sleep(min(30.0, self.poll_interval_sec * 2 ** self._failures_in_row))
+            if self._queue:
+                if len(self._queue) < self.batch_size and not self._in_flight:
+                    # Let a batch fill up
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), self.linger_sec)
+                    except asyncio.TimeoutError:
+                        pass
+                self._wake.clear()
+                await self._submit_next()
+            if self._in_flight:
+                await self._poll_confirmations()
+                if self._in_flight and not self._queue:
+                    await asyncio.sleep(self.poll_interval_sec)
+        # Idle: the next submit() restarts the task
+
+    async def _recover(self) -> None:
+        """Pick up anchors left queued or unconfirmed by an earlier process"""
+        try:
+            records = await asyncio.to_thread(self._load_unsettled)
+        except Exception as e:
+            logger.warning(f"Could not load unsettled anchors: {e}")
+            return
+        known = {record.anchor_id for record in self._queue}
+        known.update(record.anchor_id for records in self._in_flight.values() for record in records)
+        for record in records:
+            if record.anchor_id in known:
+                continue
+            if record.status == "submitted" and record.tx_hash:
+                self._in_flight.setdefault(record.tx_hash, []).append(record)
+            else:
+                self._queue.append(record)
+        if records:
+            logger.info(f"Resuming {len(records)} unsettled anchors")
+
+    def _take_batch(self) -> Tuple[List[Any], bytes]:
+        """Pop the anchors for the next transaction and build its memo"""
+        records: List[Any] = []
+        memo = MEMO_PREFIX
+        while self._queue and len(records) < self.batch_size:
+            record = self._queue[0]
+            entry = f"|{record.artifact_id}:{record.hashes.bundle_root_hash}"
+            if records and len((memo + entry).encode()) > self.max_memo_bytes:
+                break
+            memo += entry
+            records.append(self._queue.popleft())
+        return records, memo.encode()
+
+    async def _submit_next(self) -> None:
+        records, memo = self._take_batch()
+        if self.simulate:
+            for record in records:
+                self._simulate(record)
+                await self._settle(record)
+            return
+
+        try:
+            rpc = self._get_rpc()
+            signer = await self._ensure_signer(rpc)
+            signature, last_valid = await self._send(rpc, signer, memo)
+        except Exception as e:
+            await self._send_failed(records, e)
+            return
+
+        self._failures_in_row = 0
+        self._transactions += 1
+        self._anchors_sent += len(records)
+        self._sent_at[signature] = time.perf_counter()
+        for record in records:
+            record.status = "submitted"
+            record.tx_hash = signature
+            record.last_valid_block_height = last_valid
+            record.submit_attempts += 1
+            record.error = None
+            record.explorer_url = f"https://explorer.solana.com/tx/{signature}?cluster=devnet"
+            record.verification_url = f"https://solscan.io/tx/{signature}?cluster=devnet"
+            await asyncio.to_thread(self._persist, record)
+        self._in_flight[signature] = records
+        logger.info(f"Anchored {len(records)} artifacts in one memo transaction: {signature}")
+
+    async def _send(self, rpc: Any, signer: MemoSigner, memo: bytes) -> Tuple[str, int]:
+        """Sign and send against the cached blockhash, refreshing it once if expired"""
+        blockhash, last_valid = await self._get_blockhash(rpc)
+        try:
+            return await rpc.send_transaction(signer.build(memo, blockhash)), last_valid
+        except SolanaRpcError as e:
+            if not e.blockhash_expired:
+                raise
+        blockhash, last_valid = await self._get_blockhash(rpc, refresh=True)
+        return await rpc.send_transaction(signer.build(memo, blockhash)), last_valid
+
+    async def _send_failed(self, records: List[Any], error: Exception) -> None:
+        self._failures_in_row += 1
+        self._last_error = str(error)
+        if "debit" in str(error).lower() or "insufficient" in str(error).lower():
+            self._signer_funded = False
+        logger.warning(f"Anchor transaction for {len(records)} artifacts failed: {error}")
+        retry = []
+        for record in records:
+            record.submit_attempts += 1
+            record.error = str(error)
+            if record.submit_attempts >= self.max_attempts:
+                record.status = "failed"
+                await self._settle(record)
+            else:
+                retry.append(record)
+        self._queue.extendleft(reversed(retry))
+
+    async def _poll_confirmations(self) -> None:
+        rpc = self._get_rpc()
+        signatures = list(self._in_flight)[:_MAX_STATUS_BATCH]
+        try:
+            # Signatures recovered from an earlier process may have landed
+            # long ago, past the node's recent status cache
+            recent = [signature for signature in signatures if signature in self._sent_at]
+            recovered = [signature for signature in signatures if signature not in self._sent_at]
+            statuses: Dict[str, Optional[Dict[str, Any]]] = {}
+            if recent:
+                statuses.update(zip(recent, await rpc.get_signature_statuses(recent)))
+            if recovered:
+                statuses.update(zip(recovered, await rpc.get_signature_statuses(recovered, search_history=True)))
+            self._failures_in_row = 0
+
+            unseen = [signature for signature, status in statuses.items() if status is None]
+            if unseen:
+                block_height = await rpc.get_block_height()
+                expired = [
+                    signature for signature in unseen
+                    if block_height > (self._in_flight[signature][0].last_valid_block_height or 0)
+                ]
+                # Before sending again, make sure an expired transaction did not
+                # land and age out of the status cache while we weren't polling
+                check = [signature for signature in expired if signature in recent]
+                if check:
+                    statuses.update(zip(check, await rpc.get_signature_statuses(check, search_history=True)))
+                for signature in expired:
+                    if statuses[signature] is None:
+                        # Never landed; its blockhash can no longer be used
+                        await self._resend(signature)
+
+            for signature, status in statuses.items():
+                if status is not None and signature in self._in_flight:
+                    await self._apply_status(signature, status)
+        except Exception as e:
+            self._failures_in_row += 1
+            self._last_error = str(e)
+            logger.warning(f"Polling anchor confirmations failed: {e}")
+
+    async def _apply_status(self, signature: str, status: Dict[str, Any]) -> None:
+        if status.get("err"):
+            self._sent_at.pop(signature, None)
+            for record in self._in_flight.pop(signature):
+                record.status = "failed"
+                record.error = str(status["err"])
+                await self._settle(record)
+        elif status.get("confirmationStatus") in ("confirmed", "finalized"):
+            sent_at = self._sent_at.pop(signature, None)
+            self._confirmed_transactions += 1
+            if sent_at is not None:
+                elapsed = time.perf_counter() - sent_at
+                self._total_confirm += elapsed
+                self._max_confirm = max(self._max_confirm, elapsed)
+            for record in self._in_flight.pop(signature):
+                self._confirm(record, status.get("slot"))
+                await self._settle(record)
+
+    async def _resend(self, signature: str) -> None:
+        """Queue the anchors of an expired transaction again, or fail those out of attempts"""
+        self._sent_at.pop(signature, None)
+        retry = []
+        for record in self._in_flight.pop(signature):
+            if record.submit_attempts >= self.max_attempts:
+                record.status = "failed"
+                record.error = f"Transaction expired without landing ({record.submit_attempts} attempts)"
+                await self._settle(record)
+            else:
+                record.status = "queued"
+                record.tx_hash = None
+                retry.append(record)
+        self._resent += len(retry)
+        self._queue.extendleft(reversed(retry))
+        self._blockhash = None
+
+    # ========================================================================
+    # RPC state
+    # ========================================================================
+
+    def _get_rpc(self) -> Any:
+        if self._rpc is None:
+            self._rpc = self._rpc_factory(self.rpc_url)
+        return self._rpc
+
+    async def _get_blockhash(self, rpc: Any, refresh: bool = False) -> Tuple[str, int]:
+        cached = self._blockhash
+        if cached is not None and not refresh and time.monotonic() - cached[2] < self.blockhash_max_age_sec:
+            self._blockhash_reuses += 1
+            return cached[0], cached[1]
+        blockhash, last_valid = await rpc.get_latest_blockhash()
+        self._blockhash = (blockhash, last_valid, time.monotonic())
+        self._blockhash_fetches += 1
+        return blockhash, last_valid
+
+    async def _ensure_signer(self, rpc: Any) -> MemoSigner:
+        """The fee payer, airdropping to it first if it cannot pay"""
+        if self._signer is None:
+            self._signer = self._signer_factory()
+            self._signer_funded = False
+            logger.info(f"Anchoring with fee payer {self._signer.pubkey}")
+        if self._signer_funded:
+            return self._signer
+        if await rpc.get_balance(self._signer.pubkey) < _MIN_BALANCE_LAMPORTS:
+            if self._signer.prefunded:
+                raise SolanaRpcError(f"Fee payer {self._signer.pubkey} cannot pay for transactions")
+            await rpc.request_airdrop(self._signer.pubkey, _AIRDROP_LAMPORTS)
+            deadline = time.monotonic() + _AIRDROP_TIMEOUT_SEC
+            while await rpc.get_balance(self._signer.pubkey) < _MIN_BALANCE_LAMPORTS:
+                if time.monotonic() > deadline:
+                    raise SolanaRpcError("Airdrop to the fee payer was not confirmed (devnet rate limit?)")
+                await asyncio.sleep(self.poll_interval_sec)
+        self._signer_funded = True
+        return self._signer
+
+    # ========================================================================
+    # Settling
+    # ========================================================================
+
+    @staticmethod
+    def _confirm(record: Any, slot: Optional[int]) -> None:
+        record.block_slot = slot
+        record.status = "pending_approval" if record.requires_approval else "confirmed"
+        record.confirmed_at = datetime.utcnow()
+
+    def _simulate(self, record: Any) -> None:
+        """Deterministic signature for simulation mode; no explorer links"""
+        tx_data = f"{record.artifact_id}:{record.hashes.bundle_root_hash}:{record.created_at.isoformat()}"
+        record.tx_hash = f"sim_{hashlib.sha256(tx_data.encode()).hexdigest()[:60]}"
+        record.explorer_url = None
+        record.verification_url = None
+        self._confirm(record, 250000000 + hash(record.anchor_id) % 1000000)
+
+    async def _settle(self, record: Any) -> None:
+        """Persist a confirmed or failed anchor and tell the listeners"""
+        if record.status == "failed":
+            self._failed += 1
+        else:
+            self._confirmed += 1
+        await asyncio.to_thread(self._persist, record)
+        for callback in self._listeners:
+            try:
+                result = callback(record)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Anchor listener failed: {e}")
+
+    # ========================================================================
+    # Metrics
+    # ========================================================================
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, batching, blockhash reuse and confirmation latency (ms)."""
+        return {
+            "mode": "simulation" if self.simulate else self.rpc_url,
+            "queued": len(self._queue),
+            "in_flight_transactions": len(self._in_flight),
+            "in_flight_anchors": sum(len(records) for records in self._in_flight.values()),
+            "submitted": self._submitted,
+            "transactions": self._transactions,
+            "confirmed": self._confirmed,
+            "failed": self._failed,
+            "resent": self._resent,
+            "avg_anchors_per_transaction": round(self._anchors_sent / self._transactions, 2) if self._transactions else 0.0,
+            "blockhash_fetches": self._blockhash_fetches,
+            "blockhash_reuses": self._blockhash_reuses,
+            "last_error": self._last_error,
+            "max_confirm_ms": round(self._max_confirm * 1000, 3),
+            "avg_confirm_ms": (
+                round(self._total_confirm / self._confirmed_transactions * 1000, 3) if self._confirmed_transactions else 0.0
+            ),
+        }
@@ -167,12 +167,19 @@ class TimelineMarker(BaseModel):
 
 
 class MarkerCluster(BaseModel):
-    """Clustered markers when zoomed out"""
+    """
+    Clustered markers when zoomed out.
+    
+    Multi-marker clusters are summaries: `markers` is left empty and the
+    markers are fetched on drill-down by querying start_time..end_time.
+    """
     start_time: datetime
     end_time: datetime
     count: int
     dominant_type: MarkerType
     label: str  # e.g., "6 Trust Updates"
+    type_counts: Dict[MarkerType, int] = Field(default_factory=dict)
+    has_contradiction: bool = False
     markers: List[TimelineMarker] = Field(default_factory=list)
 
 
@@ -122,6 +122,7 @@ class ArtifactBuilderService:
     def __init__(self):
         self._artifacts: Dict[str, ArtifactPacket] = {}
         self._trust_receipts: Dict[str, List[TrustReceipt]] = {}  # incident_id -> receipts
+        self._anchor_listener_added = False
     
     # ========================================================================
     # Trust Receipt Generation
@@ -350,13 +351,18 @@ class ArtifactBuilderService:
             artifact_id: The artifact ID to anchor
             
         Returns:
-            AnchorRecord if successful, None otherwise
+            AnchorRecord if successful (queued when called inside a running
+            event loop; on_chain_anchor is updated once it settles), None
+            otherwise
         """
         artifact = self._artifacts.get(artifact_id)
         if not artifact:
             return None
         
         anchor_service = get_anchor_service()
+        if not self._anchor_listener_added:
+            anchor_service.submitter.add_listener(self._on_anchor_settled)
+            self._anchor_listener_added = True
         
         request = AnchorRequest(
             artifact_id=artifact_id,
@@ -371,25 +377,37 @@ class ArtifactBuilderService:
         
         if result.success and result.anchor_record:
             # Update artifact with anchor info
-            anchor_data = result.anchor_record.model_dump()
-            # Include Kairo analysis in anchor data
-            if result.anchor_record.kairo_analysis:
-                anchor_data["kairo_analysis"] = result.anchor_record.kairo_analysis
-            artifact.on_chain_anchor = anchor_data
-            
-            # Log anchoring
-            audit_logger = get_audit_logger()
-            audit_logger.log_artifact_anchored(
-                incident_id=artifact.incident_id,
-                scenario_id=artifact.scenario_id,
-                artifact_id=artifact_id,
-                tx_hash=result.anchor_record.tx_hash or ""
-            )
-            
+            artifact.on_chain_anchor = self._anchor_data(result.anchor_record)
             return result.anchor_record
         
         return None
     
+    @staticmethod
+    def _anchor_data(anchor_record: AnchorRecord) -> Dict[str, Any]:
+        anchor_data = anchor_record.model_dump()
+        # Include Kairo analysis in anchor data
+        if anchor_record.kairo_analysis:
+            anchor_data["kairo_analysis"] = anchor_record.kairo_analysis
+        return anchor_data
+    
+    def _on_anchor_settled(self, anchor_record: AnchorRecord):
+        """Record the transaction of a confirmed (or failed) anchor on its artifact"""
+        artifact = self._artifacts.get(anchor_record.artifact_id)
+        if not artifact:
+            return
+        artifact.on_chain_anchor = self._anchor_data(anchor_record)
+        if anchor_record.status == "failed":
+            return
+        
+        # Log anchoring
+        audit_logger = get_audit_logger()
+        audit_logger.log_artifact_anchored(
+            incident_id=artifact.incident_id,
+            scenario_id=artifact.scenario_id,
+            artifact_id=anchor_record.artifact_id,
+            tx_hash=anchor_record.tx_hash or ""
+        )
+    
     # ========================================================================
     # Queries
     # ========================================================================
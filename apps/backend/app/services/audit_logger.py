@@ -4,15 +4,20 @@ Audit Logger - Tamper-evident audit trail for all system events.
 Creates append-only JSON event logs with hash chaining for integrity verification.
 """
 
+import asyncio
 import json
 import hashlib
+import os
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field
 
+from ..core.audit.hasher import run_chunked
 from ..db import AuditRepository, get_db
+from config import config
 
 
 # ============================================================================
@@ -110,6 +115,11 @@ class AuditLogEvent(BaseModel):
         return hashlib.sha256(content_str.encode()).hexdigest()
 
 
+def _content_hash_mismatches(chunk: List[tuple]) -> List[int]:
+    """Indices in chunk whose content_hash doesn't match (process pool worker)."""
+    return [i for i, event in chunk if event.content_hash != event.compute_hash()]
+
+
 # ============================================================================
 # Audit Logger
 # ============================================================================
@@ -123,6 +133,10 @@ class AuditLogger:
     - SHA256 hash chaining for integrity
     - JSON export for verification
     - Event filtering and queries
+    
+    log() returns once the event is chained in memory (and written to
+    log_dir if set); its MongoDB write is queued behind it. Callers that
+    must not lose an event to a crash await wait_persisted() afterwards.
     """
     
     GENESIS_HASH = "0" * 64  # Genesis block hash
@@ -138,6 +152,14 @@ class AuditLogger:
         self._sequence_counter = 0
         self._latest_hash = self.GENESIS_HASH
         
+        # Prefix of _events already verified by verify_chain()
+        self._verified_count = 0
+        self._last_verification: Dict[str, Any] = {}
+        
+        # Acknowledgement of the most recent MongoDB write (appends are
+        # flushed in order, so it covers every earlier event too)
+        self._last_db_ack: Optional[asyncio.Future] = None
+        
         if log_dir:
             self.log_dir = Path(log_dir)
             self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -218,16 +240,38 @@ class AuditLogger:
             f.write(event.model_dump_json() + "\n")
     
     def _persist_event_to_db(self, event: AuditLogEvent):
-        """Persist event to MongoDB if enabled"""
+        """Queue event for ordered, durable write-behind persistence to MongoDB if enabled"""
         if self._repo:
             try:
                 event_dict = event.model_dump()
                 # Convert datetime to ISO string for MongoDB
                 event_dict["timestamp"] = event.timestamp.isoformat()
-                self._repo.insert_audit_event(event_dict)
+                self._last_db_ack = self._repo.queue_insert(event_dict)
             except Exception as e:
                 print(f"Warning: Failed to persist audit event to MongoDB: {e}")
     
+    async def wait_persisted(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event logged so far is acknowledged by MongoDB
+        under the durable write concern. True once stored (or when MongoDB
+        persistence is off); False if the write failed, was dropped, or
+        did not complete within `timeout` (default
+        `mongodb_audit_ack_timeout_sec`).
+        """
+        ack = self._last_db_ack
+        if ack is None:
+            return True
+        if timeout is None:
+            timeout = config.mongodb_audit_ack_timeout_sec
+        try:
+            stored = await asyncio.wait_for(asyncio.shield(ack), timeout)
+        except asyncio.TimeoutError:
+            print(f"Warning: Audit events not acknowledged by MongoDB within {timeout}s")
+            return False
+        if not stored:
+            print("Warning: Audit events dropped before reaching MongoDB")
+        return stored
+    
     # ========================================================================
     # Convenience Methods
     # ========================================================================
@@ -529,26 +573,54 @@ class AuditLogger:
     # Integrity Verification
     # ========================================================================
     
-    def verify_chain(self) -> bool:
-        """Verify the integrity of the audit chain."""
+    def verify_chain(self, full: bool = False) -> bool:
+        """
+        Verify the integrity of the audit chain.
+        
+        Events are append-only, so only those logged since the last
+        successful check are verified unless full=True; the stats report
+        how many were trusted without rehashing. Long re-checks recompute
+        content hashes in a process pool.
+        """
         if not self._events:
             return True
         
-        expected_hash = self.GENESIS_HASH
+        started = time.perf_counter()
+        start = 0 if full else self._verified_count
+        expected_hash = self.GENESIS_HASH if start == 0 else self._events[start - 1].content_hash
         
-        for event in self._events:
-            # Verify previous hash
-            if event.previous_hash != expected_hash:
-                return False
-            
-            # Verify content hash
-            computed_hash = event.compute_hash()
-            if event.content_hash != computed_hash:
-                return False
-            
+        tail = list(enumerate(self._events[start:], start))
+        workers = 1
+        if len(tail) >= config.audit_verify_parallel_min_events:
+            workers = config.audit_verify_workers or os.cpu_count() or 1
+        mismatches = set(run_chunked(_content_hash_mismatches, tail, workers))
+        
+        is_valid = True
+        for i, event in tail:
+            # Verify previous hash, then content hash
+            if event.previous_hash != expected_hash or i in mismatches:
+                is_valid = False
+                break
             expected_hash = event.content_hash
         
-        return True
+        if is_valid:
+            self._verified_count = len(self._events)
+        
+        elapsed = time.perf_counter() - started
+        self._last_verification = {
+            "is_valid": is_valid,
+            "events_checked": len(self._events),
+            "events_rehashed": len(tail),
+            "events_trusted": start,
+            "workers": workers,
+            "elapsed_sec": elapsed,
+            "events_per_sec": len(tail) / elapsed if elapsed > 0 else 0.0,
+        }
+        return is_valid
+    
+    def get_verification_stats(self) -> Dict[str, Any]:
+        """Counts and throughput of the most recent verify_chain() call."""
+        return dict(self._last_verification)
     
     def export_chain(self, scenario_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Export audit chain as JSON-serializable list."""
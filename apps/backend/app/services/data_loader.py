@@ -7,12 +7,19 @@ and other scenario data for both fixed and live scenarios.
 
 import csv
 import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 
+from app.core.interval_index import IntervalIndex
+from app.core.record_stream import iter_records
+from app.core.scenario_bundle import open_bundle
+from config import config
+
 
 # ============================================================================
 # Data Models
@@ -118,6 +125,94 @@ class ScenarioData(BaseModel):
     sensors: List[SensorConfig] = Field(default_factory=list)
 
 
+# ============================================================================
+# Scenario Cache
+# ============================================================================
+
+class TelemetryIndex:
+    """
+    Per-tag, time-sorted index over a telemetry list for as-of lookups.
+    
+    Built once per cached scenario so get_telemetry_at_time() is a bisect
+    per tag instead of a scan of every reading.
+    """
+    
+    def __init__(self, telemetry: List[TelemetryReading]):
+        by_tag: Dict[str, List[Tuple[float, int]]] = {}
+        for position, reading in enumerate(telemetry):
+            by_tag.setdefault(reading.tag_id, []).append((reading.time_sec, position))
+        
+        # tag_id -> (sorted times, readings, earliest list position so far)
+        self._tags: Dict[str, Tuple[List[float], List[TelemetryReading], List[int]]] = {}
+        for tag_id, entries in by_tag.items():
+            entries.sort(key=lambda e: e[0])  # stable: list order kept within a tie
+            first_positions: List[int] = []
+            first = len(telemetry)
+            for _, position in entries:
+                first = min(first, position)
+                first_positions.append(first)
+            self._tags[tag_id] = (
+                [t for t, _ in entries],
+                [telemetry[position] for _, position in entries],
+                first_positions,
+            )
+    
+    def at(self, time_sec: float) -> Dict[str, TelemetryReading]:
+        """Latest reading per tag at or before time_sec (same result as a full scan)."""
+        found: List[Tuple[int, str, TelemetryReading]] = []
+        for tag_id, (times, readings, first_positions) in self._tags.items():
+            end = bisect_right(times, time_sec)
+            if not end:
+                continue
+            # Earliest reading among those sharing the latest time
+            found.append((
+                first_positions[end - 1],
+                tag_id,
+                readings[bisect_left(times, times[end - 1])],
+            ))
+        # Tags ordered by their first qualifying reading, as the scan would
+        found.sort(key=lambda f: f[0])
+        return {tag_id: reading for _, tag_id, reading in found}
+
+
+def _contradiction_index(contradictions: List[Contradiction]) -> IntervalIndex:
+    """Unresolved contradictions as open intervals from time_sec, keyed by (primary tag, reason code)."""
+    index = IntervalIndex()
+    index.extend(
+        (c.time_sec, None, c, (c.primary_tag_id, c.reason_code))
+        for c in contradictions
+        if not c.resolved
+    )
+    return index
+
+
+@dataclass
+class _CachedScenario:
+    """A loaded scenario plus the file signatures it was built from."""
+    signature: Tuple[Tuple[str, int, int], ...]
+    scenario: ScenarioData
+    telemetry_index: TelemetryIndex
+    contradiction_index: IntervalIndex
+
+
+# Process-wide cache of loaded scenarios, keyed by (data_dir, scenario_id)
+_scenario_cache: Dict[Tuple[str, str], _CachedScenario] = {}
+
+# Bundle tables the fixed scenario is read from
+_FIXED_SCENARIO_TABLES = (
+    "csv/telemetry",
+    "csv/events",
+    "csv/sensors",
+    "generated/contradictions",
+    "generated/decision_receipts",
+)
+
+
+def _as_datetime(value: Any) -> datetime:
+    """Timestamps from files are ISO strings; bundle rows are already parsed."""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
 # ============================================================================
 # Data Loader
 # ============================================================================
@@ -155,68 +250,65 @@ class DataLoader:
         if filepath is None:
             filepath = self.csv_dir / "telemetry.csv"
         
-        readings = []
         with open(filepath, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                readings.append(TelemetryReading(
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
-                    tag_id=row["tag_id"],
-                    sensor_name=row["sensor_name"],
-                    value=float(row["value"]),
-                    unit=row["unit"],
-                    quality=SensorQuality(row.get("quality", "Good")),
-                    time_sec=float(row["time_sec"]),
-                    redundancy_group=row.get("redundancy_group") or None
-                ))
-        return readings
+            return [self._telemetry_reading(row) for row in csv.DictReader(f)]
+    
+    def _telemetry_reading(self, row: Dict[str, Any]) -> TelemetryReading:
+        return TelemetryReading(
+            timestamp=_as_datetime(row["timestamp"]),
+            tag_id=row["tag_id"],
+            sensor_name=row["sensor_name"],
+            value=float(row["value"]),
+            unit=row["unit"],
+            quality=SensorQuality(row.get("quality", "Good")),
+            time_sec=float(row["time_sec"]),
+            redundancy_group=row.get("redundancy_group") or None
+        )
     
     def load_events(self, filepath: Optional[Path] = None) -> List[ScenarioEvent]:
         """Load scenario events from CSV file."""
         if filepath is None:
             filepath = self.csv_dir / "events.csv"
         
-        events = []
         with open(filepath, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                events.append(ScenarioEvent(
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
-                    time_sec=float(row["time_sec"]),
-                    event_type=row["event_type"],
-                    severity=EventSeverity(row["severity"]),
-                    tag_id=row.get("tag_id") or None,
-                    reason_code=row.get("reason_code") or None,
-                    description=row["description"],
-                    action_required=row.get("action_required", "").lower() == "true"
-                ))
-        return events
+            return [self._scenario_event(row) for row in csv.DictReader(f)]
+    
+    def _scenario_event(self, row: Dict[str, Any]) -> ScenarioEvent:
+        return ScenarioEvent(
+            timestamp=_as_datetime(row["timestamp"]),
+            time_sec=float(row["time_sec"]),
+            event_type=row["event_type"],
+            severity=EventSeverity(row["severity"]),
+            tag_id=row.get("tag_id") or None,
+            reason_code=row.get("reason_code") or None,
+            description=row["description"],
+            action_required=row.get("action_required", "").lower() == "true"
+        )
     
     def load_sensors(self, filepath: Optional[Path] = None) -> List[SensorConfig]:
         """Load sensor configuration from CSV file."""
         if filepath is None:
             filepath = self.csv_dir / "sensors.csv"
         
-        sensors = []
         with open(filepath, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Handle different column name conventions
-                sensor_name = row.get("sensor_name") or row.get("name", row["tag_id"])
-                normal_min = row.get("normal_min") or row.get("min_value", "0")
-                normal_max = row.get("normal_max") or row.get("max_value", "100")
-                
-                sensors.append(SensorConfig(
-                    tag_id=row["tag_id"],
-                    sensor_name=sensor_name,
-                    unit=row["unit"],
-                    normal_min=float(normal_min),
-                    normal_max=float(normal_max),
-                    alarm_low=float(row["alarm_low"]) if row.get("alarm_low") else None,
-                    alarm_high=float(row["alarm_high"]) if row.get("alarm_high") else None,
-                    redundancy_group=row.get("redundancy_group") or None
-                ))
-        return sensors
+            return [self._sensor_config(row) for row in csv.DictReader(f)]
+    
+    def _sensor_config(self, row: Dict[str, Any]) -> SensorConfig:
+        # Handle different column name conventions
+        sensor_name = row.get("sensor_name") or row.get("name", row["tag_id"])
+        normal_min = row.get("normal_min") or row.get("min_value", "0")
+        normal_max = row.get("normal_max") or row.get("max_value", "100")
+        
+        return SensorConfig(
+            tag_id=row["tag_id"],
+            sensor_name=sensor_name,
+            unit=row["unit"],
+            normal_min=float(normal_min),
+            normal_max=float(normal_max),
+            alarm_low=float(row["alarm_low"]) if row.get("alarm_low") else None,
+            alarm_high=float(row["alarm_high"]) if row.get("alarm_high") else None,
+            redundancy_group=row.get("redundancy_group") or None
+        )
     
     # ========================================================================
     # JSON Loaders
@@ -228,24 +320,22 @@ class DataLoader:
             filepath = self.generated_dir / "contradictions.json"
         
         with open(filepath, "r") as f:
-            data = json.load(f)
-        
-        contradictions = []
-        for item in data:
-            contradictions.append(Contradiction(
-                contradiction_id=item["contradiction_id"],
-                run_id=item["run_id"],
-                timestamp=datetime.fromisoformat(item["timestamp"]),
-                time_sec=item["time_sec"],
-                primary_tag_id=item["primary_tag_id"],
-                secondary_tag_ids=item["secondary_tag_ids"],
-                reason_code=item["reason_code"],
-                description=item["description"],
-                values=item["values"],
-                expected_relationship=item["expected_relationship"],
-                resolved=item.get("resolved", False)
-            ))
-        return contradictions
+            return [self._contradiction(item) for item in json.load(f)]
+    
+    def _contradiction(self, item: Dict[str, Any]) -> Contradiction:
+        return Contradiction(
+            contradiction_id=item["contradiction_id"],
+            run_id=item["run_id"],
+            timestamp=_as_datetime(item["timestamp"]),
+            time_sec=item["time_sec"],
+            primary_tag_id=item["primary_tag_id"],
+            secondary_tag_ids=item["secondary_tag_ids"],
+            reason_code=item["reason_code"],
+            description=item["description"],
+            values=item["values"],
+            expected_relationship=item["expected_relationship"],
+            resolved=item.get("resolved", False)
+        )
     
     def load_decision_receipts(self, filepath: Optional[Path] = None) -> List[DecisionReceipt]:
         """Load decision receipts from JSON file."""
@@ -253,54 +343,123 @@ class DataLoader:
             filepath = self.generated_dir / "decision_receipts.json"
         
         with open(filepath, "r") as f:
-            data = json.load(f)
-        
-        receipts = []
-        for item in data:
-            receipts.append(DecisionReceipt(
-                receipt_id=item["receipt_id"],
-                run_id=item["run_id"],
-                timestamp=datetime.fromisoformat(item["timestamp"]),
-                operator_id=item["operator_id"],
-                action_type=item["action_type"],
-                action_description=item["action_description"],
-                rationale=item["rationale"],
-                uncertainty_snapshot=item["uncertainty_snapshot"],
-                active_contradictions=item["active_contradictions"],
-                evidence_refs=item["evidence_refs"],
-                content_hash=item["content_hash"]
-            ))
-        return receipts
+            return [self._decision_receipt(item) for item in json.load(f)]
     
-    def load_json_telemetry(self, filepath: Optional[Path] = None) -> List[Dict[str, Any]]:
-        """Load telemetry from JSON file (generated format)."""
+    def _decision_receipt(self, item: Dict[str, Any]) -> DecisionReceipt:
+        return DecisionReceipt(
+            receipt_id=item["receipt_id"],
+            run_id=item["run_id"],
+            timestamp=_as_datetime(item["timestamp"]),
+            operator_id=item["operator_id"],
+            action_type=item["action_type"],
+            action_description=item["action_description"],
+            rationale=item["rationale"],
+            uncertainty_snapshot=item["uncertainty_snapshot"],
+            active_contradictions=item["active_contradictions"],
+            evidence_refs=item["evidence_refs"],
+            content_hash=item["content_hash"]
+        )
+    
+    def iter_json_telemetry(
+        self,
+        filepath: Optional[Path] = None,
+        run_id: Optional[str] = None,
+        tag_id: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream telemetry records from JSON file (generated format).
+        
+        Records are yielded as they are parsed (or read from the column
+        cache), keeping only those matching run_id / tag_id when given.
+        """
         if filepath is None:
             filepath = self.generated_dir / "telemetry.json"
         
-        with open(filepath, "r") as f:
-            return json.load(f)
+        where = {}
+        if run_id is not None:
+            where["run_id"] = run_id
+        if tag_id is not None:
+            where["tag_id"] = tag_id
+        return iter_records(filepath, where, use_cache=config.json_record_cache)
+    
+    def load_json_telemetry(
+        self,
+        filepath: Optional[Path] = None,
+        run_id: Optional[str] = None,
+        tag_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Load telemetry from JSON file (generated format)."""
+        return list(self.iter_json_telemetry(filepath, run_id, tag_id))
     
     # ========================================================================
     # Scenario Loaders
     # ========================================================================
     
-    def load_fixed_scenario(self) -> ScenarioData:
+    def _file_signature(self, paths: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+        """(path, mtime_ns, size) for each source file; missing files sign as (-1, -1)."""
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((str(path), -1, -1))
+        return tuple(signature)
+    
+    def _fixed_scenario_sources(self) -> List[Path]:
+        return [
+            self.csv_dir / "telemetry.csv",
+            self.csv_dir / "events.csv",
+            self.csv_dir / "sensors.csv",
+            self.generated_dir / "contradictions.json",
+            self.generated_dir / "decision_receipts.json",
+        ]
+    
+    def load_fixed_scenario(self, use_cache: bool = True) -> ScenarioData:
         """
         Load the fixed case scenario with predefined data.
         
         This scenario demonstrates "The Mismatched Valve Incident" where
         pressure sensors disagree and the valve position contradicts flow readings.
+        
+        The result is cached process-wide and reused until one of the source
+        files changes (mtime or size). Treat the returned data as read-only.
         """
-        telemetry = self.load_telemetry()
-        events = self.load_events()
-        contradictions = self.load_contradictions()
-        receipts = self.load_decision_receipts()
+        key = (str(self.data_dir.resolve()), "fixed-valve-incident")
+        signature = self._file_signature(self._fixed_scenario_sources())
+        cached = _scenario_cache.get(key)
+        if use_cache and cached is not None and cached.signature == signature:
+            return cached.scenario
         
-        # Try to load sensors, use empty list if not available
-        try:
-            sensors = self.load_sensors()
-        except FileNotFoundError:
-            sensors = []
+        scenario = self._read_fixed_scenario()
+        _scenario_cache[key] = _CachedScenario(
+            signature=signature,
+            scenario=scenario,
+            telemetry_index=TelemetryIndex(scenario.telemetry),
+            contradiction_index=_contradiction_index(scenario.contradictions),
+        )
+        return scenario
+    
+    def _read_fixed_scenario(self) -> ScenarioData:
+        """Read the fixed case scenario from the scenario bundle if current, else from disk."""
+        bundle = open_bundle(self.data_dir)
+        if bundle is not None and all(bundle.has_table(t) for t in _FIXED_SCENARIO_TABLES):
+            telemetry = [self._telemetry_reading(row) for row in bundle.rows("csv/telemetry")]
+            events = [self._scenario_event(row) for row in bundle.rows("csv/events")]
+            contradictions = [self._contradiction(item) for item in bundle.rows("generated/contradictions")]
+            receipts = [self._decision_receipt(item) for item in bundle.rows("generated/decision_receipts")]
+            sensors = [self._sensor_config(row) for row in bundle.rows("csv/sensors")]
+        else:
+            telemetry = self.load_telemetry()
+            events = self.load_events()
+            contradictions = self.load_contradictions()
+            receipts = self.load_decision_receipts()
+            
+            # Try to load sensors, use empty list if not available
+            try:
+                sensors = self.load_sensors()
+            except FileNotFoundError:
+                sensors = []
         
         metadata = ScenarioMetadata(
             scenario_id="fixed-valve-incident",
@@ -344,6 +503,11 @@ class DataLoader:
         Returns:
             Dictionary mapping tag_id to the latest reading at that time
         """
+        # Telemetry from a cached scenario has a prebuilt per-tag index
+        for cached in _scenario_cache.values():
+            if cached.scenario.telemetry is telemetry:
+                return cached.telemetry_index.at(time_sec)
+        
         latest: Dict[str, TelemetryReading] = {}
         for reading in telemetry:
             if reading.time_sec <= time_sec:
@@ -366,6 +530,10 @@ class DataLoader:
         time_sec: float
     ) -> List[Contradiction]:
         """Get contradictions that are active at a specific time."""
+        for cached in _scenario_cache.values():
+            if cached.scenario.contradictions is contradictions:
+                return cached.contradiction_index.stab(time_sec, all_keys=True)
+        
         return [
             c for c in contradictions 
             if c.time_sec <= time_sec and not c.resolved
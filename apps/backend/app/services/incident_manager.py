@@ -11,7 +11,8 @@ from typing import List, Optional, Dict, Any, Callable
 from enum import Enum
 from pydantic import BaseModel, Field
 
-from ..db import IncidentRepository, get_db
+from ..db import IncidentRepository, get_db, get_write_behind
+from ..db.pagination import Page, page_in_memory
 
 
 # ============================================================================
@@ -143,7 +144,7 @@ class IncidentManager:
                 print(f"Warning: Could not initialize IncidentRepository: {e}")
     
     def _persist_incident(self, incident: Incident):
-        """Persist incident to MongoDB if enabled"""
+        """Queue incident for write-behind persistence to MongoDB if enabled"""
         if self._repo:
             try:
                 incident_dict = incident.model_dump()
@@ -159,7 +160,7 @@ class IncidentManager:
                     }
                     for t in incident.state_transitions
                 ]
-                self._repo.upsert_incident(incident_dict)
+                self._repo.queue_upsert("incident_id", incident_dict)
             except Exception as e:
                 print(f"Warning: Failed to persist incident to MongoDB: {e}")
     
@@ -370,6 +371,41 @@ class IncidentManager:
         incident_ids = self._scenario_incidents.get(scenario_id, [])
         return [self._incidents[iid] for iid in incident_ids if iid in self._incidents]
     
+    async def page_incident_history(
+        self,
+        scenario_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Page:
+        """
+        Incidents oldest first, one page at a time, as plain dicts with only
+        `fields` if given. Reads MongoDB when enabled (after flushing queued
+        writes), otherwise the incidents held in memory.
+        Raises ValueError for a malformed cursor.
+        """
+        if self._repo:
+            await get_write_behind().flush()
+            projection = {name: 1 for name in fields} if fields else None
+            page = await self._repo.find_page_by_scenario(scenario_id, limit, cursor, projection)
+            for doc in page.items:
+                doc.pop("_id", None)
+                if fields:
+                    for name in set(doc) - set(fields):
+                        del doc[name]
+            return page
+        
+        if scenario_id:
+            incidents = self.get_incidents_for_scenario(scenario_id)
+        else:
+            incidents = list(self._incidents.values())
+        page = page_in_memory(incidents, key=lambda i: (i.created_at, i.incident_id), limit=limit, cursor=cursor)
+        page.items = [
+            incident.model_dump(mode="json", include=set(fields) if fields else None)
+            for incident in page.items
+        ]
+        return page
+    
     def get_open_incidents(self, scenario_id: Optional[str] = None) -> List[Incident]:
         """Get all open (non-closed) incidents."""
         incidents = self._incidents.values()
@@ -9,13 +9,19 @@ This service handles:
 """
 
 import asyncio
-import random
 from datetime import datetime
 from typing import Dict, List, Optional, Callable, Any
 from enum import Enum
+import numpy as np
 from pydantic import BaseModel
 from dataclasses import dataclass, field
 
+from .tick_scheduler import TickScheduler
+from config import config
+
+# Simulated seconds per update (each simulator advances this much per step)
+UPDATE_INTERVAL_SEC = 0.75
+
 
 class EventSeverity(str, Enum):
     INFO = "info"
@@ -412,16 +418,22 @@ SCENARIO_4_EVENTS: List[ScenarioEvent] = [
 ]
 
 
-@dataclass
+@dataclass(eq=False)
 class ScenarioSimulator:
-    """Manages scenario simulation with real-time updates."""
+    """
+    Manages scenario simulation with real-time updates.
+    
+    Running simulators are stepped by the shared tick scheduler rather than
+    a loop of their own; all simulators due on a tick get their telemetry
+    generated together.
+    """
     
     scenario_id: str
     events: List[ScenarioEvent]
     duration_sec: float = 20.0
     state: ScenarioState = field(default=None)
     _running: bool = False
-    _task: Optional[asyncio.Task] = None
+    _event_index: int = 0
     _event_callbacks: List[Callable] = field(default_factory=list)
     _telemetry_callbacks: List[Callable] = field(default_factory=list)
     _decision_callbacks: List[Callable] = field(default_factory=list)
@@ -464,18 +476,15 @@ class ScenarioSimulator:
         self.state.decisions_made = 0
         self.state.trust_score = 0.95
         self.state.phase = "monitoring"
+        self._event_index = 0
         
-        self._task = asyncio.create_task(self._run_simulation())
+        # First step runs on the next tick
+        _scheduler.schedule(self)
     
     async def stop(self):
         """Stop the scenario simulation."""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        _scheduler.cancel(self)
         self.state.status = "stopped"
     
     async def submit_decision(self, decision_id: str, response: str) -> bool:
@@ -505,41 +514,40 @@ class ScenarioSimulator:
         """Get all pending decision requests."""
         return list(self._pending_decisions.values())
     
-    async def _run_simulation(self):
-        """Main simulation loop."""
-        update_interval = 0.75  # Update every 0.75 seconds for fast updates
-        event_index = 0
+    async def _trigger_due_events(self):
+        """Trigger every event whose time has been reached."""
+        while (self._event_index < len(self.events) and 
+               self.events[self._event_index].time_sec <= self.state.current_time_sec):
+            event = self.events[self._event_index]
+            await self._trigger_event(event)
+            self._event_index += 1
+    
+    async def _finish_step(self, telemetry: "TelemetryUpdate"):
+        """Publish a step's telemetry, expire decisions and advance the clock."""
+        for callback in self._telemetry_callbacks:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(telemetry)
+                else:
+                    callback(telemetry)
+            except Exception as e:
+                print(f"Telemetry callback error: {e}")
         
-        while self._running and self.state.current_time_sec < self.duration_sec:
-            # Check for events to trigger
-            while (event_index < len(self.events) and 
-                   self.events[event_index].time_sec <= self.state.current_time_sec):
-                event = self.events[event_index]
-                await self._trigger_event(event)
-                event_index += 1
-            
-            # Generate telemetry update
-            telemetry = self._generate_telemetry()
-            for callback in self._telemetry_callbacks:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(telemetry)
-                    else:
-                        callback(telemetry)
-                except Exception as e:
-                    print(f"Telemetry callback error: {e}")
-            
-            # Check for expired decisions
-            await self._check_decision_timeouts()
-            
-            # Wait for next update
-            await asyncio.sleep(update_interval)
-            self.state.current_time_sec += update_interval
+        # Check for expired decisions
+        await self._check_decision_timeouts()
         
-        # Scenario complete
-        self._running = False
-        self.state.status = "completed"
-        self.state.phase = "resolution"
+        if not self._running:
+            return
+        
+        # Advance to the next update
+        self.state.current_time_sec += UPDATE_INTERVAL_SEC
+        if self.state.current_time_sec < self.duration_sec:
+            _scheduler.schedule(self, UPDATE_INTERVAL_SEC)
+        else:
+            # Scenario complete
+            self._running = False
+            self.state.status = "completed"
+            self.state.phase = "resolution"
     
     async def _trigger_event(self, event: ScenarioEvent):
         """Trigger a scenario event."""
@@ -618,132 +626,174 @@ class ScenarioSimulator:
     
     def _generate_telemetry(self) -> TelemetryUpdate:
         """Generate telemetry data for current time with scenario-specific anomalies."""
-        t = self.state.current_time_sec
-        anomalies = []
-        
-        # Detect which scenario we're running
-        is_scenario2 = self.scenario_id.startswith("scenario2")
-        is_scenario3 = self.scenario_id.startswith("scenario3")
-        is_scenario4 = self.scenario_id.startswith("scenario4")
-        is_vision_scenario = is_scenario2 or is_scenario3 or is_scenario4
-        
-        # Progress factor (0 to 1) - how far into the scenario we are
-        progress = min(1.0, t / 20.0)
-        
-        # After 5 seconds (when video appears), start degrading sensors
-        video_shown = t >= 5.0
-        degradation_factor = max(0, (t - 5) / 15.0) if video_shown else 0  # 0 to 1 over remaining 15 seconds
-        
-        # Base values - start normal, then degrade
-        if is_vision_scenario and video_shown:
-            # Temperature rises dramatically
-            base_temp = 72.0 + (degradation_factor * 15) + random.uniform(-0.5, 0.5)
-            # Pressure drops
-            base_pressure = 14.5 - (degradation_factor * 4) + random.uniform(-0.3, 0.3)
-            # Flow rates diverge
-            base_flow_a = 230 - (degradation_factor * 50) + random.uniform(-5, 5)
-            base_flow_b = 245 + (degradation_factor * 20) + random.uniform(-3, 3)
-            # Vibration increases
-            base_vibration = 0.3 + (degradation_factor * 1.5) + random.uniform(0, 0.3)
-            # Power fluctuates wildly for scenario 4
-            if is_scenario4:
-                base_power = 850 + (degradation_factor * 400) * random.uniform(0.5, 1.5) + random.uniform(-50, 50)
-            else:
-                base_power = 850 - (degradation_factor * 100) + random.uniform(-20, 20)
-            # Humidity changes
-            base_humidity = 43 + (degradation_factor * 25 if is_scenario3 else degradation_factor * 10) + random.uniform(-3, 3)
-        else:
-            # Normal baseline values
-            base_temp = 72.0 + random.uniform(-0.5, 0.5)
-            base_pressure = 14.5 + random.uniform(-0.3, 0.3)
-            base_flow_a = 230 + random.uniform(-2, 2)
-            base_flow_b = 245 + random.uniform(-2, 2)
-            base_vibration = 0.3 + random.uniform(0, 0.1)
-            base_power = 850 + random.uniform(-10, 10)
-            base_humidity = 43 + random.uniform(-2, 2)
-        
-        # Determine status based on thresholds
-        def get_status(value, warning_threshold, critical_threshold, higher_is_worse=True):
-            if higher_is_worse:
-                if value >= critical_threshold:
-                    return "critical"
-                elif value >= warning_threshold:
-                    return "warning"
-            else:
-                if value <= critical_threshold:
-                    return "critical"
-                elif value <= warning_threshold:
-                    return "warning"
-            return "normal"
-        
-        # Build channels with dynamic status
-        temp_status = get_status(base_temp, 78, 85, higher_is_worse=True)
-        pressure_status = get_status(base_pressure, 12, 10, higher_is_worse=False)
-        flow_divergence = abs(base_flow_a - base_flow_b)
-        flow_a_status = get_status(flow_divergence, 20, 40, higher_is_worse=True)
-        vibration_status = get_status(base_vibration, 1.0, 1.5, higher_is_worse=True)
-        power_status = get_status(abs(base_power - 850), 100, 200, higher_is_worse=True)
-        humidity_status = get_status(base_humidity, 55, 65, higher_is_worse=True) if is_scenario3 else "normal"
+        return generate_telemetry_batch([self])[0]
+
+
+# ============================================================================
+# Batched telemetry generation
+# ============================================================================
+
+_rng = np.random.default_rng()
+
+
+def _status(values: np.ndarray, warning_threshold: float, critical_threshold: float, higher_is_worse: bool = True) -> np.ndarray:
+    """Vectorized normal/warning/critical classification."""
+    if higher_is_worse:
+        return np.where(values >= critical_threshold, "critical",
+                        np.where(values >= warning_threshold, "warning", "normal"))
+    return np.where(values <= critical_threshold, "critical",
+                    np.where(values <= warning_threshold, "warning", "normal"))
+
+
+def generate_telemetry_batch(simulators: List[ScenarioSimulator]) -> List[TelemetryUpdate]:
+    """
+    Generate one telemetry update per simulator, computing every channel
+    for the whole batch with array operations.
+    
+    Sensors start normal and, in the vision scenarios (2-4), degrade once the
+    video appears at t=5s, reaching full degradation at t=20s.
+    """
+    n = len(simulators)
+    if n == 0:
+        return []
+    
+    t = np.array([sim.state.current_time_sec for sim in simulators], dtype=float)
+    ids = [sim.scenario_id for sim in simulators]
+    is_scenario2 = np.array([i.startswith("scenario2") for i in ids])
+    is_scenario3 = np.array([i.startswith("scenario3") for i in ids])
+    is_scenario4 = np.array([i.startswith("scenario4") for i in ids])
+    is_vision_scenario = is_scenario2 | is_scenario3 | is_scenario4
+    
+    # After 5 seconds (when video appears), start degrading sensors
+    video_shown = t >= 5.0
+    degradation = np.where(video_shown, np.maximum(0.0, (t - 5) / 15.0), 0.0)
+    degrading = is_vision_scenario & video_shown
+    
+    noise = _rng.random((n, 11))
+    
+    def uniform(column: int, low, high) -> np.ndarray:
+        return low + noise[:, column] * (high - low)
+    
+    d = np.where(degrading, degradation, 0.0)
+    temp = 72.0 + d * 15 + uniform(0, -0.5, 0.5)
+    pressure = 14.5 - d * 4 + uniform(1, -0.3, 0.3)
+    flow_a = 230 - d * 50 + np.where(degrading, uniform(2, -5, 5), uniform(2, -2, 2))
+    flow_b = 245 + d * 20 + np.where(degrading, uniform(3, -3, 3), uniform(3, -2, 2))
+    vibration = 0.3 + d * 1.5 + np.where(degrading, uniform(4, 0, 0.3), uniform(4, 0, 0.1))
+    power = np.select(
+        [degrading & is_scenario4, degrading],
+        [
+            850 + d * 400 * uniform(5, 0.5, 1.5) + uniform(6, -50, 50),
+            850 - d * 100 + uniform(6, -20, 20),
+        ],
+        850 + uniform(6, -10, 10),
+    )
+    humidity = (
+        43 + d * np.where(is_scenario3, 25, 10)
+        + np.where(degrading, uniform(7, -3, 3), uniform(7, -2, 2))
+    )
+    
+    temp_status = _status(temp, 78, 85)
+    pressure_status = _status(pressure, 12, 10, higher_is_worse=False)
+    flow_a_status = _status(np.abs(flow_a - flow_b), 20, 40)
+    vibration_status = _status(vibration, 1.0, 1.5)
+    power_status = _status(np.abs(power - 850), 100, 200)
+    humidity_status = np.where(is_scenario3, _status(humidity, 55, 65), "normal")
+    
+    # Data center (scenario 4) electrical channels
+    electrical_load = np.where(video_shown, 75 + degradation * 25 + uniform(8, -5, 5), 75 + uniform(8, -2, 2))
+    bus_temp = np.where(video_shown, 45 + degradation * 35 + uniform(9, -2, 2), 45 + uniform(9, -1, 1))
+    arc_risk = np.where(video_shown, np.minimum(100, degradation * 100 + uniform(10, -5, 5)), uniform(10, 0, 5))
+    electrical_status = _status(electrical_load, 85, 95)
+    bus_status = _status(bus_temp, 65, 75)
+    arc_status = _status(arc_risk, 50, 75)
+    
+    columns = {
+        name: array.tolist() for name, array in {
+            "t": t, "temp": temp, "pressure": pressure, "flow_a": flow_a, "flow_b": flow_b,
+            "vibration": vibration, "power": power, "humidity": humidity,
+            "temp_status": temp_status, "pressure_status": pressure_status,
+            "flow_a_status": flow_a_status, "vibration_status": vibration_status,
+            "power_status": power_status, "humidity_status": humidity_status,
+            "electrical_load": electrical_load, "bus_temp": bus_temp, "arc_risk": arc_risk,
+            "electrical_status": electrical_status, "bus_status": bus_status, "arc_status": arc_status,
+        }.items()
+    }
+    scenario4 = is_scenario4.tolist()
+    
+    updates = []
+    for i, sim in enumerate(simulators):
+        c = {name: values[i] for name, values in columns.items()}
         
         # Track anomalies
-        if temp_status != "normal":
-            anomalies.append("temperature_spike")
-        if pressure_status != "normal":
-            anomalies.append("pressure_drop")
-        if flow_a_status != "normal":
-            anomalies.append("flow_divergence")
-        if vibration_status != "normal":
-            anomalies.append("vibration_alert")
-        if power_status != "normal":
-            anomalies.append("power_fluctuation")
-        if humidity_status != "normal":
-            anomalies.append("humidity_alert")
+        anomalies = [
+            anomaly for anomaly, status in (
+                ("temperature_spike", c["temp_status"]),
+                ("pressure_drop", c["pressure_status"]),
+                ("flow_divergence", c["flow_a_status"]),
+                ("vibration_alert", c["vibration_status"]),
+                ("power_fluctuation", c["power_status"]),
+                ("humidity_alert", c["humidity_status"]),
+            ) if status != "normal"
+        ]
         
         channels = {
-            "core_temp": {"value": round(base_temp, 1), "unit": "°C", "status": temp_status},
-            "pressure": {"value": round(max(8, base_pressure), 1), "unit": "PSI", "status": pressure_status},
-            "flow_a": {"value": round(max(150, base_flow_a), 1), "unit": "L/min", "status": flow_a_status},
-            "flow_b": {"value": round(base_flow_b, 1), "unit": "L/min", "status": "normal"},
-            "vibration": {"value": round(base_vibration, 2), "unit": "mm/s", "status": vibration_status},
-            "power": {"value": round(base_power, 1), "unit": "kW", "status": power_status},
-            "humidity": {"value": round(base_humidity, 1), "unit": "%", "status": humidity_status},
+            "core_temp": {"value": round(c["temp"], 1), "unit": "°C", "status": c["temp_status"]},
+            "pressure": {"value": round(max(8, c["pressure"]), 1), "unit": "PSI", "status": c["pressure_status"]},
+            "flow_a": {"value": round(max(150, c["flow_a"]), 1), "unit": "L/min", "status": c["flow_a_status"]},
+            "flow_b": {"value": round(c["flow_b"], 1), "unit": "L/min", "status": "normal"},
+            "vibration": {"value": round(c["vibration"], 2), "unit": "mm/s", "status": c["vibration_status"]},
+            "power": {"value": round(c["power"], 1), "unit": "kW", "status": c["power_status"]},
+            "humidity": {"value": round(c["humidity"], 1), "unit": "%", "status": c["humidity_status"]},
         }
         
-        # For Scenario 4 (Data Center), add electrical-specific channels
-        if is_scenario4:
-            electrical_load = 75 + (degradation_factor * 25) + random.uniform(-5, 5) if video_shown else 75 + random.uniform(-2, 2)
-            bus_temp = 45 + (degradation_factor * 35) + random.uniform(-2, 2) if video_shown else 45 + random.uniform(-1, 1)
-            arc_risk = min(100, degradation_factor * 100 + random.uniform(-5, 5)) if video_shown else random.uniform(0, 5)
-            
+        if scenario4[i]:
             channels["electrical_load"] = {
-                "value": round(min(100, electrical_load), 1),
-                "unit": "%",
-                "status": get_status(electrical_load, 85, 95, higher_is_worse=True)
-            }
-            channels["bus_bar_temp"] = {
-                "value": round(bus_temp, 1),
-                "unit": "°C",
-                "status": get_status(bus_temp, 65, 75, higher_is_worse=True)
-            }
-            channels["arc_flash_risk"] = {
-                "value": round(arc_risk, 1),
+                "value": round(min(100, c["electrical_load"]), 1),
                 "unit": "%",
-                "status": get_status(arc_risk, 50, 75, higher_is_worse=True)
+                "status": c["electrical_status"]
             }
+            channels["bus_bar_temp"] = {"value": round(c["bus_temp"], 1), "unit": "°C", "status": c["bus_status"]}
+            channels["arc_flash_risk"] = {"value": round(c["arc_risk"], 1), "unit": "%", "status": c["arc_status"]}
             
-            if channels["electrical_load"]["status"] != "normal":
+            if c["electrical_status"] != "normal":
                 anomalies.append("electrical_overload")
-            if channels["bus_bar_temp"]["status"] != "normal":
+            if c["bus_status"] != "normal":
                 anomalies.append("thermal_buildup")
-            if channels["arc_flash_risk"]["status"] != "normal":
+            if c["arc_status"] != "normal":
                 anomalies.append("arc_flash_warning")
         
-        return TelemetryUpdate(
-            time_sec=t,
+        updates.append(TelemetryUpdate(
+            time_sec=c["t"],
             channels=channels,
             anomalies=anomalies,
-            trust_score=self.state.trust_score
-        )
+            trust_score=sim.state.trust_score
+        ))
+    return updates
+
+
+# ============================================================================
+# Shared tick scheduler
+# ============================================================================
+
+async def _step_simulators(due: List[ScenarioSimulator]):
+    """Advance every simulator due on this tick by one update."""
+    running = [sim for sim in due if sim._running]
+    
+    # Events first: they move trust_score, which the telemetry reports
+    await asyncio.gather(*(sim._trigger_due_events() for sim in running))
+    running = [sim for sim in running if sim._running]
+    
+    telemetry = generate_telemetry_batch(running)
+    await asyncio.gather(*(sim._finish_step(update) for sim, update in zip(running, telemetry)))
+
+
+_scheduler = TickScheduler(_step_simulators, tick_sec=config.simulation_tick_sec)
+
+
+def get_scheduler_metrics() -> Dict[str, Any]:
+    """Lag and batch metrics for the shared simulation tick loop."""
+    return _scheduler.get_metrics()
 
 
 # Global simulator instances
@@ -0,0 +1,972 @@
+"""
+Telemetry Store Service - Batched ingest and downsampled range queries.
+
+POST /api/telemetry/ingest hands points to TelemetryIngestPipeline, which
+keeps them as columns in a bounded buffer and writes them in bulk once
+`telemetry_ingest_batch_size` points are waiting or
+`telemetry_ingest_flush_interval_ms` has passed. A request that would
+overflow `telemetry_ingest_max_buffered` waits for the buffer to drain
+first, so memory stays bounded under sustained load.
+
+Points go to one of two stores:
+  - MongoTelemetryStore: the `telemetry` collection via TelemetryRepository,
+    unordered insert_many. With `telemetry_timeseries` it is created as a
+    MongoDB time-series collection with `tag_id` as metaField, otherwise one
+    plain document per point; raw points expire after
+    `telemetry_raw_retention_sec` either way. A background worker rolls
+    them up into count/sum/min/max per 1s, 1m and 1h bucket
+    (`telemetry_rollup_<level>` collections, each with its own retention).
+    Late points rebuild the buckets they land in, unless the points those
+    buckets were built from have already expired.
+  - LocalTelemetryStore (MongoDB disabled): append-only NumPy segment files
+    under data_dir/telemetry_store. Each flush is one segment; a new
+    segment is merged with the newest ones while they are no larger and
+    the result stays within `telemetry_segment_max_points`, so a merge
+    rewrites a bounded amount of data and a query opens O(log n) files per
+    full-size segment it overlaps.
+
+Queries flush the buffer first, so they see every accepted point. With an
+`aggregation` of "<min|max|avg>:<interval>" (e.g. "avg:1m", "max:500ms")
+points are downsampled server-side to one per series and interval bucket;
+on MongoDB whole buckets are read from the coarsest rollup whose
+resolution divides the interval, and only the edges of the range and the
+points not rolled up yet from raw.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from config import config
+from ..db import TelemetryRepository, get_db
+from ..db.repository import TELEMETRY_ROLLUP_LEVELS
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+_INTERVAL_UNITS_US = {"us": 1, "ms": 1_000, "s": 1_000_000, "m": 60_000_000, "h": 3_600_000_000, "d": 86_400_000_000}
+_AGGREGATION_RE = re.compile(r"^(min|max|avg):(\d+)(us|ms|s|m|h|d)$")
+
+
+def _to_us(timestamp: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes are taken as UTC"""
+    if timestamp.tzinfo is None:
+        return (timestamp - _EPOCH) // _US
+    return (timestamp - _EPOCH_UTC) // _US
+
+
+def _from_us(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=us)
+
+
+@dataclass(frozen=True)
+class Aggregation:
+    """Downsampling to one `function` value per series per `interval_us` bucket"""
+    function: str
+    interval_us: int
+
+
+def parse_aggregation(spec: Optional[str]) -> Optional[Aggregation]:
+    """Parse "<min|max|avg>:<n><us|ms|s|m|h|d>"; None or "" means raw points."""
+    if not spec:
+        return None
+    match = _AGGREGATION_RE.match(spec.strip().lower())
+    if match is None or int(match.group(2)) == 0:
+        raise ValueError(
+            f"Invalid aggregation '{spec}': expected <min|max|avg>:<interval>, e.g. 'avg:1m' or 'max:500ms'"
+        )
+    return Aggregation(match.group(1), int(match.group(2)) * _INTERVAL_UNITS_US[match.group(3)])
+
+
+@dataclass
+class TelemetryRange:
+    """Filters of a telemetry query (bounds inclusive, None = unbounded)"""
+    sources: Optional[list[str]] = None
+    metrics: Optional[list[str]] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    limit: int = 10000
+
+    def series_matches(self, source: str, metric: str) -> bool:
+        return (not self.sources or source in self.sources) and (not self.metrics or metric in self.metrics)
+
+
+# =============================================================================
+# Column batches
+# =============================================================================
+
+@dataclass
+class TelemetryColumns:
+    """Points as columns; a series is (source, metric, unit)"""
+    series: list[tuple[str, str, Optional[str]]] = field(default_factory=list)
+    codes: list[int] = field(default_factory=list)
+    times_us: list[int] = field(default_factory=list)
+    values: list[float] = field(default_factory=list)
+    # Point index -> tags, for the few points that carry any
+    tags: dict[int, dict] = field(default_factory=dict)
+    _series_codes: dict[tuple[str, str, Optional[str]], int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def extend(self, points: Iterable[Any]) -> int:
+        """Append objects with source, metric, value, timestamp, unit and tags attributes"""
+        codes, times, values = self.codes, self.times_us, self.values
+        series_codes = self._series_codes
+        start = len(codes)
+        for point in points:
+            key = (point.source, point.metric, point.unit)
+            code = series_codes.get(key)
+            if code is None:
+                code = self._code(key)
+            if point.tags:
+                self.tags[len(codes)] = point.tags
+            codes.append(code)
+            times.append(_to_us(point.timestamp))
+            values.append(point.value)
+        return len(codes) - start
+
+    def merged(self, newer: "TelemetryColumns") -> "TelemetryColumns":
+        """These points followed by `newer`'s"""
+        merged = TelemetryColumns()
+        for batch in (self, newer):
+            offset = len(merged)
+            remap = [merged._code(key) for key in batch.series]
+            merged.codes.extend(remap[c] for c in batch.codes)
+            merged.times_us.extend(batch.times_us)
+            merged.values.extend(batch.values)
+            merged.tags.update({offset + i: t for i, t in batch.tags.items()})
+        return merged
+
+    def _code(self, key: tuple[str, str, Optional[str]]) -> int:
+        code = self._series_codes.get(key)
+        if code is None:
+            code = self._series_codes[key] = len(self.series)
+            self.series.append(key)
+        return code
+
+    def documents(self) -> list[dict]:
+        """One MongoDB document per point"""
+        docs = []
+        for i, (code, us, value) in enumerate(zip(self.codes, self.times_us, self.values)):
+            source, metric, unit = self.series[code]
+            doc = {
+                "tag_id": f"{source}/{metric}",
+                "source": source,
+                "metric": metric,
+                "timestamp": _from_us(us),
+                "value": value,
+                "unit": unit,
+            }
+            if i in self.tags:
+                doc["tags"] = self.tags[i]
+            docs.append(doc)
+        return docs
+
+
+# =============================================================================
+# Local file-backed store
+# =============================================================================
+
+@dataclass
+class _Segment:
+    path: Path
+    count: int
+    start_us: int
+    end_us: int
+    series: list[tuple[str, str, Optional[str]]]
+
+
+class LocalTelemetryStore:
+    """
+    Append-only segment files, one .npz per segment holding `codes` (uint32
+    into the segment's series table), `times` (int64 µs) and `values`
+    (float64), plus a JSON `meta` entry with the series table, time range and
+    sparse per-point tags. Segments that reach `max_segment_points` are not
+    merged any further.
+    """
+
+    def __init__(self, directory: Path, max_segment_points: Optional[int] = None):
+        self.directory = Path(directory)
+        self.max_segment_points = max_segment_points or config.telemetry_segment_max_points
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segments: list[_Segment] = []
+        self._next_seq = 0
+        # Writes and queries run in worker threads
+        self._lock = threading.Lock()
+        metas = {}
+        for path in sorted(self.directory.glob("segment-*.npz")):
+            with np.load(path) as data:
+                metas[path] = json.loads(str(data["meta"]))
+            self._next_seq = max(self._next_seq, int(path.stem.split("-")[1]) + 1)
+        # A merge that was interrupted before removing its inputs leaves them behind
+        replaced = {name for meta in metas.values() for name in meta.get("merged", [])}
+        for path, meta in metas.items():
+            if path.name in replaced:
+                path.unlink(missing_ok=True)
+            else:
+                self._segments.append(self._describe(path, meta))
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    async def write(self, batch: TelemetryColumns) -> None:
+        await asyncio.to_thread(self.write_sync, batch)
+
+    def write_sync(self, batch: TelemetryColumns) -> None:
+        if not len(batch):
+            return
+        with self._lock:
+            self._append(batch)
+
+    def _append(self, batch: TelemetryColumns) -> None:
+        codes = np.array(batch.codes, dtype=np.uint32)
+        times = np.array(batch.times_us, dtype=np.int64)
+        values = np.array(batch.values, dtype=np.float64)
+        series = [list(key) for key in batch.series]
+        tags = {str(i): t for i, t in batch.tags.items()}
+
+        # Merge with the newest segments while they are no larger, up to the size cap
+        merged: list[_Segment] = []
+        total = len(codes)
+        while (
+            self._segments
+            and self._segments[-1].count <= total
+            and total + self._segments[-1].count <= self.max_segment_points
+        ):
+            segment = self._segments.pop()
+            merged.insert(0, segment)
+            total += segment.count
+        if merged:
+            parts = [self._load(segment) for segment in merged]
+            parts.append((codes, times, values, series, tags))
+            codes, times, values, series, tags = self._concat(parts)
+
+        self._segments.append(self._save(codes, times, values, series, tags, [s.path.name for s in merged]))
+        for segment in merged:
+            segment.path.unlink(missing_ok=True)
+
+    async def query(self, query: TelemetryRange, aggregation: Optional[Aggregation]) -> list[dict]:
+        return await asyncio.to_thread(self.query_sync, query, aggregation)
+
+    def query_sync(self, query: TelemetryRange, aggregation: Optional[Aggregation]) -> list[dict]:
+        with self._lock:
+            return self._query(query, aggregation)
+
+    async def close(self) -> None:
+        # Every write is already on disk
+        pass
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "segments": self.segment_count,
+            "sealed_segments": sum(1 for s in self._segments if s.count * 2 > self.max_segment_points),
+        }
+
+    def _query(self, query: TelemetryRange, aggregation: Optional[Aggregation]) -> list[dict]:
+        start_us = _to_us(query.start) if query.start else None
+        end_us = _to_us(query.end) if query.end else None
+
+        # Global series table across segments, and the matching points of each
+        series: list[tuple[str, str, Optional[str]]] = []
+        series_codes: dict[tuple, int] = {}
+        all_codes, all_times, all_values, all_tags = [], [], [], []
+        for segment in self._segments:
+            if (start_us is not None and segment.end_us < start_us) or (end_us is not None and segment.start_us > end_us):
+                continue
+            wanted = [i for i, (source, metric, _) in enumerate(segment.series) if query.series_matches(source, metric)]
+            if not wanted:
+                continue
+            codes, times, values, segment_series, tags = self._load(segment)
+            mask = np.isin(codes, wanted)
+            if start_us is not None:
+                mask &= times >= start_us
+            if end_us is not None:
+                mask &= times <= end_us
+            positions = np.flatnonzero(mask)
+            remap = np.array([
+                series_codes.setdefault(tuple(key), len(series_codes)) for key in segment_series
+            ], dtype=np.uint32)
+            all_codes.append(remap[codes[positions]])
+            all_times.append(times[positions])
+            all_values.append(values[positions])
+            all_tags.append((positions, tags))
+
+        if not all_codes:
+            return []
+        series = list(series_codes)
+        codes = np.concatenate(all_codes)
+        times = np.concatenate(all_times)
+        values = np.concatenate(all_values)
+        if not len(times):
+            return []
+
+        if aggregation is not None:
+            return self._downsample(codes, times, values, series, aggregation, query.limit)
+
+        order = np.argsort(times, kind="stable")[:query.limit]
+        tags_at = self._tags_at(all_tags)
+        points = []
+        for i, code, us, value in zip(order.tolist(), codes[order].tolist(), times[order].tolist(), values[order].tolist()):
+            source, metric, unit = series[code]
+            points.append({
+                "source": source,
+                "metric": metric,
+                "value": value,
+                "timestamp": _from_us(us),
+                "unit": unit,
+                "tags": tags_at.get(i),
+            })
+        return points
+
+    @staticmethod
+    def _downsample(
+        codes: np.ndarray,
+        times: np.ndarray,
+        values: np.ndarray,
+        series: list[tuple[str, str, Optional[str]]],
+        aggregation: Aggregation,
+        limit: int,
+    ) -> list[dict]:
+        buckets = times - times % aggregation.interval_us
+        order = np.lexsort((codes, buckets))
+        buckets, codes, values = buckets[order], codes[order], values[order]
+        starts = np.flatnonzero(np.r_[True, (buckets[1:] != buckets[:-1]) | (codes[1:] != codes[:-1])])
+        # reduceat runs each segment up to the next start, so trim only afterwards
+        counts = np.diff(np.r_[starts, len(values)])
+        if aggregation.function == "min":
+            result = np.minimum.reduceat(values, starts)
+        elif aggregation.function == "max":
+            result = np.maximum.reduceat(values, starts)
+        else:
+            result = np.add.reduceat(values, starts) / counts
+        starts, counts, result = starts[:limit], counts[:limit], result[:limit]
+        points = []
+        for code, us, value, count in zip(codes[starts].tolist(), buckets[starts].tolist(), result.tolist(), counts.tolist()):
+            source, metric, unit = series[code]
+            points.append({
+                "source": source,
+                "metric": metric,
+                "value": value,
+                "timestamp": _from_us(us),
+                "unit": unit,
+                "tags": {"aggregation": aggregation.function, "count": count},
+            })
+        return points
+
+    @staticmethod
+    def _tags_at(parts: list[tuple[np.ndarray, dict[str, dict]]]) -> dict[int, dict]:
+        """Tags by position in the concatenated query result"""
+        found, offset = {}, 0
+        for positions, tags in parts:
+            if tags:
+                for rank, position in enumerate(positions.tolist()):
+                    t = tags.get(str(position))
+                    if t is not None:
+                        found[offset + rank] = t
+            offset += len(positions)
+        return found
+
+    # -------------------------------------------------------------------------
+    # Segment files
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _describe(path: Path, meta: dict) -> _Segment:
+        return _Segment(
+            path=path,
+            count=meta["count"],
+            start_us=meta["start_us"],
+            end_us=meta["end_us"],
+            series=[tuple(key) for key in meta["series"]],
+        )
+
+    def _save(self, codes, times, values, series, tags, merged: list[str]) -> _Segment:
+        meta = {
+            "count": len(codes),
+            "start_us": int(times.min()),
+            "end_us": int(times.max()),
+            "series": series,
+            "tags": tags,
+            "merged": merged,
+        }
+        path = self.directory / f"segment-{self._next_seq:08d}.npz"
+        self._next_seq += 1
+        staging = path.with_name(path.name + ".tmp")
+        with open(staging, "wb") as f:
+            np.savez(f, codes=codes, times=times, values=values, meta=np.array(json.dumps(meta)))
+        os.replace(staging, path)
+        return self._describe(path, meta)
+
+    @staticmethod
+    def _load(segment: _Segment):
+        with np.load(segment.path) as data:
+            meta = json.loads(str(data["meta"]))
+            return data["codes"], data["times"], data["values"], meta["series"], meta["tags"]
+
+    @staticmethod
+    def _concat(parts):
+        series: dict[tuple, int] = {}
+        codes, tags, offset = [], {}, 0
+        for part_codes, _, _, part_series, part_tags in parts:
+            remap = np.array([series.setdefault(tuple(key), len(series)) for key in part_series], dtype=np.uint32)
+            codes.append(remap[part_codes])
+            tags.update({str(offset + int(i)): t for i, t in part_tags.items()})
+            offset += len(part_codes)
+        return (
+            np.concatenate(codes),
+            np.concatenate([part[1] for part in parts]),
+            np.concatenate([part[2] for part in parts]),
+            [list(key) for key in series],
+            tags,
+        )
+
+
+# =============================================================================
+# Rollups
+# =============================================================================
+
+def _floor_us(us: int, step: int) -> int:
+    return us - us % step
+
+
+def _ceil_us(us: int, step: int) -> int:
+    return -(-us // step) * step
+
+
+def cover_range(
+    start_us: Optional[int],
+    end_us: Optional[int],
+    levels: list[tuple[str, int, int]],
+) -> list[tuple[Optional[str], Optional[int], Optional[int]]]:
+    """
+    Split [start_us, end_us) into parts read from the coarsest rollup
+    possible: (level, lo, hi) for whole buckets of a level below its
+    watermark, (None, lo, hi) for raw points. `levels` are (level,
+    resolution_us, watermark_us), coarsest first; None bounds are open.
+    """
+    if not levels:
+        return [(None, start_us, end_us)]
+    (level, resolution, watermark), finer = levels[0], levels[1:]
+    lo = _ceil_us(start_us, resolution) if start_us is not None else None
+    hi = watermark if end_us is None else min(_floor_us(end_us, resolution), watermark)
+    if lo is not None and lo >= hi:
+        return cover_range(start_us, end_us, finer)
+    parts = []
+    if lo is not None and start_us < lo:
+        parts += cover_range(start_us, lo, finer)
+    parts.append((level, lo, hi))
+    if end_us is None or hi < end_us:
+        parts += cover_range(hi, end_us, finer)
+    return parts
+
+
+class TelemetryRollupWorker:
+    """
+    Background task keeping the 1s, 1m and 1h rollup collections up to
+    date. Each level has a watermark: every bucket before it is complete.
+    The 1s level is built from raw points up to the newest point (but no
+    later than `lag_sec` ago), each coarser level from the level below up
+    to that level's watermark. Writes of points older than a watermark
+    move it back, so the affected buckets are rebuilt. Buckets are rebuilt
+    whole from their source, so a watermark never moves back past the
+    retention of the level's source (`source_retention_sec`, level ->
+    seconds, None = kept): a late point that old is left out of the
+    rollups rather than replacing a bucket whose other points expired.
+    """
+
+    def __init__(
+        self,
+        repo: TelemetryRepository,
+        interval_sec: float = 10.0,
+        lag_sec: float = 5.0,
+        source_retention_sec: Optional[dict[str, Optional[int]]] = None,
+    ):
+        self._repo = repo
+        self.interval_sec = interval_sec
+        self.lag_sec = lag_sec
+        self.source_retention_sec = source_retention_sec or {}
+        self._dirty_from: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self._passes = 0
+        self._chunks_built = 0
+        self._failed_passes = 0
+        self._skipped_rewinds = 0
+        self._last_error: Optional[str] = None
+        self._last_pass = 0.0
+        self._watermarks: dict[str, int] = {}
+        self._caught_up = False
+
+    def mark_written(self, earliest_us: int) -> None:
+        """Points from `earliest_us` on were written; roll them up"""
+        if self._dirty_from is None or earliest_us < self._dirty_from:
+            self._dirty_from = earliest_us
+        self.start()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def watermarks(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """Level -> watermark (µs), excluding buckets with unrolled writes"""
+        stored = await self._repo.async_rollup_watermarks()
+        watermarks = {level: _to_us(mark) for level, mark in stored.items()}
+        if self._dirty_from is not None:
+            watermarks.update(self._rewound(watermarks, self._dirty_from, now or datetime.utcnow()))
+        self._watermarks = watermarks
+        return watermarks
+
+    def _rewound(self, watermarks: dict[str, int], dirty: int, now: datetime) -> dict[str, int]:
+        """
+        Levels whose watermark moves back for points written from `dirty`
+        on, and where to. A level goes no further back than its source
+        still holds whole buckets, nor further than the level below it.
+        """
+        rewound = {}
+        now_us = _to_us(now)
+        for level, resolution_ms in TELEMETRY_ROLLUP_LEVELS:
+            resolution = resolution_ms * 1000
+            retention = self.source_retention_sec.get(level)
+            if retention:
+                dirty = max(dirty, _ceil_us(now_us - retention * 1_000_000, resolution))
+            mark = _floor_us(dirty, resolution)
+            if level in watermarks and mark < watermarks[level]:
+                rewound[level] = mark
+            dirty = mark
+        return rewound
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Bring every level up to date; returns how many chunks were (re)built"""
+        async with self._lock:
+            start = time.perf_counter()
+            dirty, self._dirty_from = self._dirty_from, None
+            try:
+                built = await self._build(dirty, now or datetime.utcnow())
+            except Exception:
+                if dirty is not None:
+                    self.mark_written(dirty)
+                raise
+            finally:
+                self._last_pass = time.perf_counter() - start
+            self._passes += 1
+            self._chunks_built += built
+            return built
+
+    async def _build(self, dirty: Optional[int], now: datetime) -> int:
+        stored = await self._repo.async_rollup_watermarks()
+        watermarks = {level: _to_us(mark) for level, mark in stored.items()}
+        if dirty is not None:
+            # Late points: rebuild from the bucket they landed in
+            finest, resolution_ms = TELEMETRY_ROLLUP_LEVELS[0]
+            retention = self.source_retention_sec.get(finest)
+            if (
+                retention
+                and finest in watermarks
+                and _floor_us(dirty, resolution_ms * 1000) < watermarks[finest]
+                and dirty < _ceil_us(_to_us(now) - retention * 1_000_000, resolution_ms * 1000)
+            ):
+                self._skipped_rewinds += 1
+                logger.warning(
+                    f"Telemetry written at {_from_us(dirty).isoformat()} is older than the raw retention; "
+                    "it is not rolled up"
+                )
+            for level, mark in self._rewound(watermarks, dirty, now).items():
+                watermarks[level] = mark
+                await self._repo.async_set_rollup_watermark(level, _from_us(mark))
+
+        extent = await self._repo.async_extent()
+        if extent is None:
+            self._watermarks, self._caught_up = watermarks, True
+            return 0
+        earliest, latest = _to_us(extent[0]), _to_us(extent[1])
+        settled = _to_us(now) - int(self.lag_sec * 1_000_000)
+
+        built = 0
+        for index, (level, resolution_ms) in enumerate(TELEMETRY_ROLLUP_LEVELS):
+            resolution = resolution_ms * 1000
+            if index == 0:
+                # Through the bucket holding the newest point, unless it may still fill up
+                limit = min(_ceil_us(latest + 1, resolution), _floor_us(settled, resolution))
+            else:
+                finer = watermarks.get(TELEMETRY_ROLLUP_LEVELS[index - 1][0])
+                if finer is None:
+                    break
+                limit = _floor_us(finer, resolution)
+            position = watermarks.get(level, _floor_us(earliest, resolution))
+            # Bound the rows one aggregation reads
+            chunk = resolution * 3600
+            while position < limit:
+                end = min(limit, position + chunk)
+                await self._repo.async_build_rollup(index, _from_us(position), _from_us(end))
+                await self._repo.async_set_rollup_watermark(level, _from_us(end))
+                watermarks[level] = position = end
+                built += 1
+        self._watermarks = watermarks
+        self._caught_up = watermarks.get(TELEMETRY_ROLLUP_LEVELS[0][0], earliest) > latest
+        return built
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                built = await self.run_once()
+                failed = False
+            except Exception as e:
+                self._failed_passes += 1
+                self._last_error = str(e)
+                logger.warning(f"Telemetry rollup pass failed: {e}")
+                failed = True
+            if not failed and not built and self._caught_up and self._dirty_from is None:
+                break
+            await asyncio.sleep(self.interval_sec)
+        # Idle: the next write restarts the task
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Rollup progress and pass latency (ms)."""
+        return {
+            "passes": self._passes,
+            "chunks_built": self._chunks_built,
+            "failed_passes": self._failed_passes,
+            "skipped_rewinds": self._skipped_rewinds,
+            "last_error": self._last_error,
+            "last_pass_ms": round(self._last_pass * 1000, 3),
+            "watermarks": {level: _from_us(us).isoformat() for level, us in self._watermarks.items()},
+        }
+
+
+# =============================================================================
+# MongoDB store
+# =============================================================================
+
+class MongoTelemetryStore:
+    """
+    Points in the `telemetry` collection (a time-series collection with
+    `telemetry_timeseries`), rolled up into 1s/1m/1h collections
+    """
+
+    def __init__(
+        self,
+        repo: Optional[TelemetryRepository] = None,
+        timeseries: bool = False,
+        granularity: str = "seconds",
+        raw_retention_sec: Optional[int] = None,
+        rollup_retention_sec: Optional[dict[str, Optional[int]]] = None,
+        rollups: bool = True,
+        rollup_interval_sec: float = 10.0,
+        rollup_lag_sec: float = 5.0,
+    ):
+        self._repo = repo or TelemetryRepository()
+        self._layout_options = {
+            "timeseries": timeseries,
+            "granularity": granularity,
+            "raw_retention_sec": raw_retention_sec,
+            "rollup_retention_sec": rollup_retention_sec,
+        }
+        self.layout: Optional[str] = None
+        self._layout_lock = asyncio.Lock()
+        # Each level is rebuilt from the one below it, raw points for the finest
+        sources = [raw_retention_sec] + [(rollup_retention_sec or {}).get(level) for level, _ in TELEMETRY_ROLLUP_LEVELS]
+        self.rollups = TelemetryRollupWorker(
+            self._repo,
+            rollup_interval_sec,
+            rollup_lag_sec,
+            source_retention_sec={level: sources[i] for i, (level, _) in enumerate(TELEMETRY_ROLLUP_LEVELS)},
+        ) if rollups else None
+
+    async def _ensure_layout(self) -> None:
+        """Create collections and indexes once, before the first write creates a plain collection"""
+        if self.layout is not None:
+            return
+        async with self._layout_lock:
+            if self.layout is not None:
+                return
+            try:
+                self.layout = await self._repo.async_ensure_layout(**self._layout_options)
+            except Exception as e:
+                logger.warning(f"Could not set up the telemetry collections: {e}")
+                self.layout = "documents"
+            if self.rollups is not None:
+                # Catch up on points written before a restart
+                self.rollups.start()
+
+    async def write(self, batch: TelemetryColumns) -> None:
+        if len(batch):
+            await self._ensure_layout()
+            await self._repo.async_insert_telemetry_batch(batch.documents())
+            if self.rollups is not None:
+                self.rollups.mark_written(min(batch.times_us))
+
+    async def query(self, query: TelemetryRange, aggregation: Optional[Aggregation]) -> list[dict]:
+        await self._ensure_layout()
+        if aggregation is None:
+            match = TelemetryRepository.range_filter(query.start, query.end, query.sources, query.metrics)
+            docs = await self._repo.async_find(match, limit=query.limit)
+            return [
+                {
+                    "source": doc["source"],
+                    "metric": doc["metric"],
+                    "value": doc["value"],
+                    "timestamp": doc["timestamp"],
+                    "unit": doc.get("unit"),
+                    "tags": doc.get("tags"),
+                }
+                for doc in docs
+            ]
+
+        # Whole buckets from the coarsest rollup the interval is a multiple
+        # of, raw points for the edges and anything not rolled up yet
+        levels = await self._rollup_levels(aggregation.interval_us)
+        end_us = _to_us(query.end) + 1 if query.end is not None else None
+        start_us = _to_us(query.start) if query.start is not None else None
+        interval_ms = aggregation.interval_us // 1000 or 1
+        partials: dict[tuple[str, str, datetime], list] = {}
+        for level, lo, hi in cover_range(start_us, end_us, levels):
+            if level is None and hi == end_us:
+                # The requested end, inclusive
+                match = TelemetryRepository.range_filter(
+                    _from_us(lo) if lo is not None else None, query.end, query.sources, query.metrics,
+                )
+            else:
+                match = TelemetryRepository.range_filter(
+                    _from_us(lo) if lo is not None else None,
+                    _from_us(hi) if hi is not None else None,
+                    query.sources,
+                    query.metrics,
+                    time_field="bucket" if level else "timestamp",
+                    end_inclusive=False,
+                )
+            rows = await self._repo.async_bucket_stats(match, interval_ms, rollup=level, limit=query.limit)
+            for row in rows:
+                key = (row["_id"]["source"], row["_id"]["metric"], row["_id"]["bucket"])
+                stats = partials.get(key)
+                if stats is None:
+                    partials[key] = [row["count"], row["sum"], row["min"], row["max"], row.get("unit")]
+                else:
+                    stats[0] += row["count"]
+                    stats[1] += row["sum"]
+                    stats[2] = min(stats[2], row["min"])
+                    stats[3] = max(stats[3], row["max"])
+                    stats[4] = row.get("unit") if row.get("unit") is not None else stats[4]
+
+        results = []
+        for (source, metric, bucket) in sorted(partials, key=lambda k: (k[2], k[0], k[1]))[:query.limit]:
+            count, total, low, high, unit = partials[(source, metric, bucket)]
+            value = {"min": low, "max": high, "avg": total / count if count else None}[aggregation.function]
+            results.append({
+                "source": source,
+                "metric": metric,
+                "value": value,
+                "timestamp": bucket,
+                "unit": unit,
+                "tags": {"aggregation": aggregation.function, "count": count},
+            })
+        return results
+
+    async def _rollup_levels(self, interval_us: int) -> list[tuple[str, int, int]]:
+        """(level, resolution_us, watermark_us) usable for `interval_us` buckets, coarsest first"""
+        if self.rollups is None:
+            return []
+        watermarks = await self.rollups.watermarks()
+        levels = []
+        for level, resolution_ms in TELEMETRY_ROLLUP_LEVELS:
+            resolution = resolution_ms * 1000
+            # Coarser levels are built from finer ones, so stop at the first gap
+            if interval_us % resolution or level not in watermarks:
+                break
+            levels.append((level, resolution, watermarks[level]))
+        return levels[::-1]
+
+    async def close(self) -> None:
+        if self.rollups is not None:
+            await self.rollups.close()
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "layout": self.layout,
+            "rollups": self.rollups.get_metrics() if self.rollups is not None else None,
+        }
+
+
+# =============================================================================
+# Ingest pipeline
+# =============================================================================
+
+class TelemetryIngestPipeline:
+    """Bounded columnar buffer in front of a telemetry store"""
+
+    def __init__(
+        self,
+        store: Any,
+        batch_size: int = 50000,
+        flush_interval_sec: float = 1.0,
+        max_buffered: int = 500000,
+    ):
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_sec = flush_interval_sec
+        self.max_buffered = max(self.batch_size, max_buffered)
+
+        self._buffer = TelemetryColumns()
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._accepted = 0
+        self._written = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._backpressure_waits = 0
+        self._last_error: Optional[str] = None
+        self._last_flush = 0.0
+        self._max_flush = 0.0
+        self._total_flush = 0.0
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    async def ingest(self, points: Iterable[Any]) -> int:
+        """Buffer points for writing; returns how many were accepted"""
+        points = list(points)
+        if self.buffered and self.buffered + len(points) > self.max_buffered:
+            # Backpressure: drain before taking more
+            self._backpressure_waits += 1
+            await self.flush()
+        count = self._buffer.extend(points)
+        self._accepted += count
+        if self.buffered >= self.batch_size:
+            self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return count
+
+    async def query(self, query: TelemetryRange, aggregation: Optional[Aggregation] = None) -> list[dict]:
+        await self.flush()
+        return await self.store.query(query, aggregation)
+
+    async def flush(self) -> bool:
+        """Write everything buffered; False if the store rejected the batch"""
+        async with self._lock:
+            if not self.buffered:
+                return True
+            batch, self._buffer = self._buffer, TelemetryColumns()
+            start = time.perf_counter()
+            try:
+                await self.store.write(batch)
+            except Exception as e:
+                self._failed_flushes += 1
+                self._last_error = str(e)
+                if len(batch) + self.buffered <= self.max_buffered:
+                    self._buffer = batch.merged(self._buffer)
+                else:
+                    self._dropped += len(batch)
+                logger.warning(f"Telemetry flush of {len(batch)} points failed: {e}")
+                return False
+            elapsed = time.perf_counter() - start
+            self._flushes += 1
+            self._written += len(batch)
+            self._last_flush = elapsed
+            self._max_flush = max(self._max_flush, elapsed)
+            self._total_flush += elapsed
+            return True
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+        await self.store.close()
+
+    async def _run(self) -> None:
+        while self.buffered:
+            if self.buffered < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.flush_interval_sec)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            if not await self.flush():
+                await asyncio.sleep(self.flush_interval_sec)
+        # Idle: the next ingest restarts the task
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Buffer depth, throughput counters and flush latency (ms)."""
+        return {
+            "store": type(self.store).__name__,
+            **self.store.get_metrics(),
+            "buffered": self.buffered,
+            "accepted": self._accepted,
+            "written": self._written,
+            "dropped": self._dropped,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "backpressure_waits": self._backpressure_waits,
+            "last_error": self._last_error,
+            "last_flush_ms": round(self._last_flush * 1000, 3),
+            "max_flush_ms": round(self._max_flush * 1000, 3),
+            "avg_flush_ms": round(self._total_flush / self._flushes * 1000, 3) if self._flushes else 0.0,
+        }
+
+
+# Singleton instance
+_pipeline: Optional[TelemetryIngestPipeline] = None
+
+
+def get_telemetry_pipeline() -> TelemetryIngestPipeline:
+    """Get the singleton TelemetryIngestPipeline (MongoDB store if enabled, local files otherwise)."""
+    global _pipeline
+    if _pipeline is None:
+        if get_db().enabled:
+            store = MongoTelemetryStore(
+                timeseries=config.telemetry_timeseries,
+                granularity=config.telemetry_timeseries_granularity,
+                raw_retention_sec=config.telemetry_raw_retention_sec,
+                rollup_retention_sec={
+                    "1s": config.telemetry_rollup_1s_retention_sec,
+                    "1m": config.telemetry_rollup_1m_retention_sec,
+                    "1h": config.telemetry_rollup_1h_retention_sec,
+                },
+                rollups=config.telemetry_rollups,
+                rollup_interval_sec=config.telemetry_rollup_interval_sec,
+                rollup_lag_sec=config.telemetry_rollup_lag_sec,
+            )
+        else:
+            store = LocalTelemetryStore(config.get_data_path("telemetry_store"))
+        _pipeline = TelemetryIngestPipeline(
+            store,
+            batch_size=config.telemetry_ingest_batch_size,
+            flush_interval_sec=config.telemetry_ingest_flush_interval_ms / 1000,
+            max_buffered=config.telemetry_ingest_max_buffered,
+        )
+    return _pipeline
@@ -0,0 +1,180 @@
+"""
+Tick Scheduler Service - One asyncio task driving many periodic jobs.
+
+Jobs are parked on a hierarchical timer wheel and handed to a batch handler
+once per tick, so hundreds of simulations share a single timer instead of
+each running its own sleep loop. Ticks are scheduled against absolute loop
+time; if the loop falls behind, the missed ticks are processed in one batch
+rather than drifting, and the lag is recorded.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel over integer ticks.
+
+    Level L has `slots` buckets each spanning slots**L ticks. Items sit in
+    the coarsest level that still separates them from the current tick and
+    cascade down as the wheel turns, so scheduling and expiry are O(1)
+    amortised per item. Deadlines beyond the top level wait in an overflow
+    list until the top level wraps.
+    """
+
+    def __init__(self, slots: int = 64, levels: int = 3):
+        self.slots = slots
+        self.levels = levels
+        self.current = 0
+        self._wheels: List[List[List[Tuple[int, Any]]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: List[Tuple[int, Any]] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, item: Any, at_tick: int):
+        """Add item to expire at at_tick (at least one tick from now)."""
+        self._place(max(at_tick, self.current + 1), item)
+        self._size += 1
+
+    def advance(self, to_tick: int) -> List[Tuple[int, Any]]:
+        """Turn the wheel up to to_tick and return expired (tick, item) pairs."""
+        expired: List[Tuple[int, Any]] = []
+        while self.current < to_tick:
+            self.current += 1
+            self._cascade()
+            bucket = self._wheels[0][self.current % self.slots]
+            if bucket:
+                self._wheels[0][self.current % self.slots] = []
+                expired.extend(bucket)
+        self._size -= len(expired)
+        return expired
+
+    def _place(self, at: int, item: Any):
+        for level in range(self.levels):
+            span = self.slots ** (level + 1)
+            if at // span == self.current // span:
+                bucket = (at // self.slots ** level) % self.slots
+                self._wheels[level][bucket].append((at, item))
+                return
+        self._overflow.append((at, item))
+
+    def _cascade(self):
+        """Move items down from higher levels whose bucket has come up."""
+        t = self.current
+        if t % self.slots ** self.levels == 0 and self._overflow:
+            pending, self._overflow = self._overflow, []
+            for at, item in pending:
+                self._place(at, item)
+        for level in range(self.levels - 1, 0, -1):
+            width = self.slots ** level
+            if t % width:
+                continue
+            bucket = (t // width) % self.slots
+            pending = self._wheels[level][bucket]
+            if pending:
+                self._wheels[level][bucket] = []
+                for at, item in pending:
+                    self._place(at, item)
+
+
+class TickScheduler:
+    """
+    Shared tick loop for periodic jobs.
+
+    schedule(job, delay_sec) parks a job; on each tick every due job is
+    passed to `handler` as one list. Handlers re-schedule jobs that should
+    run again. The loop task starts on demand and exits when idle.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Hashable]], Awaitable[None]],
+        tick_sec: float = 0.05,
+        slots: int = 64,
+        levels: int = 3,
+    ):
+        self.tick_sec = tick_sec
+        self._handler = handler
+        self._wheel = TimerWheel(slots, levels)
+        self._deadlines: Dict[Hashable, int] = {}  # job -> live deadline tick
+        self._task: Optional[asyncio.Task] = None
+        self._origin: Optional[float] = None  # Loop time of tick 0
+
+        # Lag metrics
+        self._ticks = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._total_lag = 0.0
+        self._last_batch = 0
+
+    def schedule(self, job: Hashable, delay_sec: float = 0.0):
+        """Run job on the first tick at least delay_sec after the current one."""
+        loop = asyncio.get_running_loop()
+        if self._origin is None:
+            self._origin = loop.time() - self._wheel.current * self.tick_sec
+        at = self._wheel.current + max(1, round(delay_sec / self.tick_sec))
+        self._deadlines[job] = at
+        self._wheel.schedule(job, at)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    def cancel(self, job: Hashable):
+        """Drop a scheduled job (its wheel entry is discarded when it expires)."""
+        self._deadlines.pop(job, None)
+
+    def is_scheduled(self, job: Hashable) -> bool:
+        return job in self._deadlines
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Tick count, scheduling lag (ms) and batch size."""
+        return {
+            "tick_sec": self.tick_sec,
+            "scheduled_jobs": len(self._deadlines),
+            "ticks": self._ticks,
+            "last_lag_ms": round(self._last_lag * 1000, 3),
+            "max_lag_ms": round(self._max_lag * 1000, 3),
+            "avg_lag_ms": round(self._total_lag / self._ticks * 1000, 3) if self._ticks else 0.0,
+            "last_batch_size": self._last_batch,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._deadlines:
+            target = self._origin + (self._wheel.current + 1) * self.tick_sec
+            delay = target - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Catch up on every tick that has elapsed, in one batch
+            now = loop.time()
+            lag = now - target
+            to_tick = max(self._wheel.current + 1, int((now - self._origin) / self.tick_sec))
+            due = [
+                job for at, job in self._wheel.advance(to_tick)
+                if self._deadlines.get(job) == at
+            ]
+            for job in due:
+                del self._deadlines[job]
+
+            self._ticks += 1
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            self._total_lag += lag
+            self._last_batch = len(due)
+
+            if due:
+                try:
+                    await self._handler(due)
+                except Exception:
+                    logger.exception(f"Tick handler failed on a batch of {len(due)} jobs")
+
+        # Idle: the next schedule() restarts the loop from a fresh origin
+        self._origin = None
@@ -29,16 +29,42 @@ class SATORConfig(BaseSettings):
     # Core settings
     data_dir: str = Field(default="./app/data", description="Directory for JSON file persistence")
     simulation_seed: int = Field(default=42, description="Seed for deterministic simulations")
+    json_record_cache: bool = Field(default=True, description="Cache generated JSON record files as memory-mapped columns in .record_cache/ next to the source")
     
     # Simulation settings
     default_sample_rate: float = Field(default=1.0, description="Samples per second")
     default_duration_sec: int = Field(default=300, description="Default scenario duration in seconds")
+    simulation_tick_sec: float = Field(default=0.05, description="Resolution of the shared scenario simulator tick loop")
+    
+    # Telemetry ingest settings
+    telemetry_ingest_batch_size: int = Field(default=50000, description="Write buffered telemetry as soon as this many points are waiting")
+    telemetry_ingest_flush_interval_ms: int = Field(default=1000, description="Write buffered telemetry at most this long after it was accepted")
+    telemetry_ingest_max_buffered: int = Field(default=500000, description="Ingest requests wait for a flush rather than buffer more than this many points")
+    telemetry_segment_max_points: int = Field(default=4_000_000, description="Local telemetry store: stop merging segments once they hold this many points")
+    telemetry_timeseries: bool = Field(default=False, description="Create the MongoDB telemetry collection as a time-series collection (tag_id as metaField); an existing plain collection is kept")
+    telemetry_timeseries_granularity: str = Field(default="seconds", description="Time-series bucket granularity: seconds, minutes or hours")
+    telemetry_raw_retention_sec: int | None = Field(default=7 * 86400, description="Expire raw telemetry points after this many seconds (None = keep)")
+    telemetry_rollups: bool = Field(default=True, description="Maintain 1s/1m/1h telemetry rollups in MongoDB and answer aggregated queries from them")
+    telemetry_rollup_interval_sec: float = Field(default=10.0, description="Seconds between telemetry rollup passes")
+    telemetry_rollup_lag_sec: float = Field(default=5.0, description="Roll up a 1s bucket only once it ended this many seconds ago")
+    telemetry_rollup_1s_retention_sec: int | None = Field(default=30 * 86400, description="Expire 1s telemetry rollups after this many seconds (None = keep)")
+    telemetry_rollup_1m_retention_sec: int | None = Field(default=365 * 86400, description="Expire 1m telemetry rollups after this many seconds (None = keep)")
+    telemetry_rollup_1h_retention_sec: int | None = Field(default=None, description="Expire 1h telemetry rollups after this many seconds (None = keep)")
     
     # Trust layer thresholds
     trust_degraded_threshold: float = Field(default=0.7, description="Score below which sensor is 'Degraded'")
     trust_untrusted_threshold: float = Field(default=0.4, description="Score below which sensor is 'Untrusted'")
     trust_quarantine_threshold: float = Field(default=0.2, description="Score below which sensor is 'Quarantined'")
     
+    # Audit ledger settings
+    audit_merkle_checkpoint_interval: int = Field(default=1000, description="Record a Merkle root checkpoint every N audit events")
+    audit_anchor_batch_size: int | None = Field(default=None, description="Anchor one Merkle root per N events instead of one per event (batched mode)")
+    audit_anchor_batch_interval_sec: float | None = Field(default=None, description="Anchor a pending Merkle root after T seconds (batched mode)")
+    audit_anchor_retry_base_sec: float = Field(default=1.0, description="Wait before retrying a failed batched root anchor (doubles per consecutive failure)")
+    audit_anchor_retry_max_sec: float = Field(default=300.0, description="Longest wait between batched root anchor retries")
+    audit_verify_workers: int | None = Field(default=None, description="Processes for full audit chain re-verification (None = CPU count)")
+    audit_verify_parallel_min_events: int = Field(default=20000, description="Re-hash in a process pool only when at least this many events need checking")
+    
     # Sponsor integration flags (all optional)
     enable_leanmcp: bool = Field(default=True, description="Enable LeanMCP tool registry (Primary sponsor)")
     enable_kairo: bool = Field(default=True, description="Enable Kairo on-chain anchoring (Primary sponsor)")
@@ -55,11 +81,21 @@ class SATORConfig(BaseSettings):
     vision_queue_batch_size: int = Field(default=5, description="Number of frames to batch before processing")
     vision_timeline_sync: bool = Field(default=True, description="Sync vision frames to timeline events")
     
+    # WebSocket fan-out settings
+    ws_send_queue_size: int = Field(default=256, description="Max messages buffered per WebSocket connection")
+    ws_backpressure_policy: str = Field(default="drop_oldest", description="When a connection's queue is full: drop_oldest, coalesce, or disconnect")
+    
     # Kairo settings (only used if enable_kairo=True)
     kairo_api_key: str | None = Field(default=None, description="Kairo API key for Solana anchoring")
-    solana_rpc_url: str = Field(default="https://api.devnet.solana.com", description="Solana RPC endpoint")
+    solana_rpc_url: str = Field(default="https://api.devnet.solana.com", description="Solana RPC endpoint ('local' for the in-process stand-in)")
     solana_private_key: str | None = Field(default=None, description="Base58 encoded private key for pre-funded Solana wallet (optional)")
     solana_use_simulation: bool = Field(default=False, description="Use simulated transactions instead of real Solana devnet")
+    solana_blockhash_max_age_sec: float = Field(default=30.0, description="Reuse a fetched blockhash for this long across anchor transactions")
+    kairo_anchor_batch_size: int = Field(default=8, description="Most artifact bundle roots packed into one memo transaction")
+    kairo_anchor_batch_linger_ms: int = Field(default=200, description="Wait this long for more anchors before sending a partial batch")
+    kairo_anchor_max_memo_bytes: int = Field(default=900, description="Largest memo to pack bundle roots into (transactions are capped at 1232 bytes)")
+    kairo_anchor_poll_interval_ms: int = Field(default=500, description="Interval between confirmation polls for submitted anchor transactions")
+    kairo_anchor_max_attempts: int = Field(default=5, description="Mark an anchor failed after this many failed sends")
     
     # Arize settings (only used if enable_arize=True)
     arize_api_key: str | None = Field(default=None, description="Arize API key")
@@ -72,6 +108,11 @@ class SATORConfig(BaseSettings):
     mongodb_uri: str | None = Field(default=None, description="MongoDB Atlas connection URI")
     mongodb_database: str = Field(default="sator_ops", description="MongoDB database name")
     enable_mongodb: bool = Field(default=False, description="Enable MongoDB persistence")
+    mongodb_write_batch_size: int = Field(default=500, description="Flush buffered MongoDB writes as soon as this many are pending")
+    mongodb_write_flush_interval_ms: int = Field(default=250, description="Flush buffered MongoDB writes at most this long after they are queued")
+    mongodb_write_max_backoff_sec: float = Field(default=30.0, description="Longest wait between retries of a failed MongoDB flush")
+    mongodb_write_max_pending: int = Field(default=100000, description="Drop new buffered MongoDB writes beyond this many pending")
+    mongodb_audit_ack_timeout_sec: float = Field(default=5.0, description="How long operator actions wait for their audit events to be acknowledged by MongoDB")
     
     model_config = {
         "env_prefix": "SATOR_",
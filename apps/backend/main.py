@@ -14,12 +14,20 @@ from app.api.routes import replay as replay_v1
 from app.api.routes import artifacts as artifacts_original
 from app.api.routes import kairo_contracts
 from app.api.routes import leanmcp_tools
-from app.api.websocket import router as websocket_router
+from app.api.websocket import emit_artifact_anchored, router as websocket_router
+from app.db import get_write_behind
+from app.integrations.kairo.anchor import get_anchor_service
+from app.services.telemetry_store import get_telemetry_pipeline
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan - initialize vision processing queue with LeanMCP."""
+    # Push anchor confirmations to WebSocket clients; resume unsettled anchors
+    anchor_submitter = get_anchor_service().submitter
+    anchor_submitter.add_listener(lambda record: emit_artifact_anchored(record.model_dump(mode="json")))
+    anchor_submitter.start()
+    
     try:
         import asyncio
         from app.services.vision_processor import get_vision_queue
@@ -50,10 +58,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except asyncio.CancelledError:
             pass
         print("Vision processing queue stopped")
+        
+        # Drain queued anchors, the pending audit root, buffered telemetry and MongoDB writes
+        await anchor_submitter.close()
+        await audit.get_ledger().close()
+        await get_telemetry_pipeline().close()
+        await get_write_behind().close()
     except ImportError:
         # Fallback if vision service dependencies missing
         print("⚠️ Vision processor not available, starting without it")
         yield
+        await anchor_submitter.close()
+        await audit.get_ledger().close()
+        await get_telemetry_pipeline().close()
+        await get_write_behind().close()
 
 
 app = FastAPI(
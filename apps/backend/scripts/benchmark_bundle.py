@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark engine cold start from CSV/JSON source files vs a scenario bundle.
+
+Copies the data directory (optionally repeating every row --scale times),
+then times ReplayEngine.load_all(), TemporalReasoningEngine.load_all() and
+DataLoader.load_fixed_scenario() in a fresh interpreter per run, first
+against the source files and then against a bundle built from them.
+
+Usage:
+    python scripts/benchmark_bundle.py
+    python scripts/benchmark_bundle.py --scale 50 --runs 5
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.scenario_bundle import build_bundle
+
+
+BACKEND_DIR = Path(__file__).parent.parent
+DEFAULT_DATA_DIR = BACKEND_DIR / "app" / "data"
+
+# Timed in a child process so every run starts cold (imports excluded)
+CHILD = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, {backend!r})
+from app.core.replay_engine import ReplayEngine
+from app.core.temporal_reasoning import TemporalReasoningEngine
+from app.services.data_loader import DataLoader
+
+data_dir = Path({data_dir!r})
+timings = []
+start = time.perf_counter()
+ReplayEngine(data_dir).load_all()
+timings.append(time.perf_counter() - start)
+start = time.perf_counter()
+TemporalReasoningEngine(data_dir, use_record_cache=False).load_all()
+timings.append(time.perf_counter() - start)
+start = time.perf_counter()
+DataLoader(data_dir).load_fixed_scenario(use_cache=False)
+timings.append(time.perf_counter() - start)
+print(*timings)
+"""
+
+ENGINES = ["ReplayEngine", "TemporalReasoningEngine", "DataLoader (fixed)"]
+
+
+def copy_data(src: Path, dst: Path, scale: int) -> None:
+    """Copy csv/ and generated/, repeating every row `scale` times."""
+    for sub, pattern in (("csv", "*.csv"), ("generated", "*.json")):
+        (dst / sub).mkdir(parents=True)
+        for path in sorted((src / sub).glob(pattern)):
+            target = dst / sub / path.name
+            if scale == 1:
+                shutil.copy2(path, target)
+            elif path.suffix == ".csv":
+                with open(path, newline="", encoding="utf-8-sig") as f:
+                    rows = list(csv.reader(f))
+                with open(target, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(rows[0])
+                    for _ in range(scale):
+                        writer.writerows(rows[1:])
+            else:
+                data = json.loads(path.read_text())
+                target.write_text(json.dumps(data * scale if isinstance(data, list) else data))
+
+
+def time_cold_start(data_dir: Path, runs: int) -> list[float]:
+    """Median per-engine load time over `runs` fresh processes."""
+    code = CHILD.format(backend=str(BACKEND_DIR), data_dir=str(data_dir))
+    samples: list[list[float]] = [[] for _ in ENGINES]
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        for i, value in enumerate(out.stdout.split()):
+            samples[i].append(float(value))
+    return [statistics.median(s) for s in samples]
+
+
+def run(data_dir: Path, scale: int, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp) / "data"
+        copy_data(data_dir, work, scale)
+
+        from_sources = time_cold_start(work, runs)
+
+        start = time.perf_counter()
+        build_bundle(work)
+        build_time = time.perf_counter() - start
+
+        from_bundle = time_cold_start(work, runs)
+
+    print(f"scale x{scale}, bundle built in {build_time:.2f}s, median of {runs} cold starts")
+    print(f"{'engine':<26} {'sources (ms)':>13} {'bundle (ms)':>12} {'speedup':>8}")
+    for name, a, b in zip(ENGINES, from_sources, from_bundle):
+        print(f"{name:<26} {a * 1000:>13.1f} {b * 1000:>12.1f} {a / b:>7.1f}x")
+    total_a, total_b = sum(from_sources), sum(from_bundle)
+    print(f"{'total':<26} {total_a * 1000:>13.1f} {total_b * 1000:>12.1f} {total_a / total_b:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--scale", type=int, default=1, help="Repeat every row this many times")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    run(args.data_dir, args.scale, args.runs)
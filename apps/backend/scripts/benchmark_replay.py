@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark ReplayEngine.get_state_at() as the incident grows.
+
+Builds synthetic incidents from 1k to 1M events (plus one trust update per
+event), then times index construction and random state-at lookups.
+
+Usage:
+    python scripts/benchmark_replay.py
+    python scripts/benchmark_replay.py --sizes 1000 100000 --queries 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.replay_engine import ReplayEngine
+
+
+INCIDENT_START = datetime(2026, 1, 14, 10, 0, 0)
+TAGS = [f"sensor_{i:03d}" for i in range(50)]
+
+
+def build_engine(n_events: int, seed: int = 7) -> ReplayEngine:
+    """Populate a ReplayEngine with a synthetic incident of n_events."""
+    rng = random.Random(seed)
+    engine = ReplayEngine()
+
+    events, trust = [], []
+    for i in range(n_events):
+        ts = INCIDENT_START + timedelta(milliseconds=100 * i)
+        time_sec = i * 0.1
+        tag = rng.choice(TAGS)
+        roll = rng.random()
+        if roll < 0.001:
+            event_type, desc = "operator_action", "Operator selected DEFER - pending inspection"
+        elif roll < 0.002:
+            event_type, desc = "mode_change", "System entered DECISION MODE"
+        elif roll < 0.01:
+            event_type, desc = "contradiction_detected", f"Conflict on {tag}"
+        elif roll < 0.05:
+            event_type, desc = "failure_injection", f"Failure injected on {tag}"
+        else:
+            event_type, desc = "trust_update", f"Trust update for {tag}"
+        events.append({
+            "timestamp": ts,
+            "time_sec": time_sec,
+            "event_type": event_type,
+            "severity": "INFO",
+            "tag_id": tag,
+            "reason_code": rng.choice(["RC10", "RC11"]),
+            "description": desc,
+        })
+        score = round(rng.random(), 3)
+        trust.append({
+            "timestamp": ts,
+            "time_sec": time_sec,
+            "tag_id": tag,
+            "trust_score": score,
+            "trust_state": "trusted" if score >= 0.8 else "degraded",
+            "reason_codes": "",
+        })
+
+    engine._events = events
+    engine._trust_timeline = trust
+    engine._incident_start = events[0]["timestamp"]
+    engine._incident_end = events[-1]["timestamp"]
+    return engine
+
+
+def run(sizes: list[int], queries: int) -> None:
+    print(f"{'events':>10} {'index (s)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'max (ms)':>10}")
+    for n in sizes:
+        engine = build_engine(n)
+
+        start = time.perf_counter()
+        engine._build_state_index()
+        build_time = time.perf_counter() - start
+
+        span = (engine._incident_end - engine._incident_start).total_seconds()
+        rng = random.Random(n)
+        samples = []
+        for _ in range(queries):
+            t = engine._incident_start + timedelta(seconds=rng.uniform(0, span))
+            start = time.perf_counter()
+            engine.get_state_at(t)
+            samples.append((time.perf_counter() - start) * 1000)
+
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(
+            f"{n:>10} {build_time:>10.2f} {statistics.median(samples):>10.3f} "
+            f"{p95:>10.3f} {samples[-1]:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
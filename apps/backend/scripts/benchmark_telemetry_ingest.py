@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Load test for POST /api/telemetry/ingest and /api/telemetry/query.
+
+Sends --requests batches of --batch points from --clients concurrent
+clients through the telemetry router in-process (ASGI, no network), waits
+for everything to be written, and reports sustained points/sec. Then times
+a raw and a downsampled query over the ingested range. Uses the local
+file-backed store in a temporary directory unless --mongodb is given.
+
+Usage:
+    python scripts/benchmark_telemetry_ingest.py
+    python scripts/benchmark_telemetry_ingest.py --requests 100 --batch 10000 --clients 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def make_body(request: int, batch: int, series: int, start: datetime) -> bytes:
+    points = []
+    for i in range(batch):
+        n = request * batch + i
+        points.append({
+            "source": f"plant-{n % series % 4}",
+            "metric": f"sensor-{n % series}",
+            "value": (n % 1000) * 0.1,
+            "timestamp": (start + timedelta(milliseconds=n)).isoformat() + "Z",
+            "unit": "C",
+        })
+    return json.dumps({"points": points}).encode()
+
+
+async def run(args) -> None:
+    import httpx
+    from fastapi import FastAPI
+    from app.api.routes import telemetry
+    from app.services.telemetry_store import get_telemetry_pipeline
+
+    app = FastAPI()
+    app.include_router(telemetry.router, prefix="/api/telemetry")
+    pipeline = get_telemetry_pipeline()
+    start_time = datetime(2026, 1, 1)
+
+    print(f"Store: {type(pipeline.store).__name__}")
+    print(f"Building {args.requests} request bodies of {args.batch} points...")
+    bodies = [make_body(r, args.batch, args.series, start_time) for r in range(args.requests)]
+    total = args.requests * args.batch
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = list(range(args.requests))
+
+        async def worker():
+            while queue:
+                body = bodies[queue.pop()]
+                response = await client.post(
+                    "/api/telemetry/ingest", content=body, headers={"content-type": "application/json"}
+                )
+                response.raise_for_status()
+                # In-process requests never block on I/O; let the flusher run as it would between network reads
+                await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        accepted = time.perf_counter() - started
+        await pipeline.flush()
+        written = time.perf_counter() - started
+
+        print(f"Accepted {total:,} points in {accepted:.2f}s: {total / accepted:,.0f} points/sec")
+        print(f"Written  {total:,} points in {written:.2f}s: {total / written:,.0f} points/sec")
+
+        end_time = start_time + timedelta(milliseconds=total)
+        for label, aggregation in (("raw (limit 10000)", None), ("avg:1m", "avg:1m"), ("max:1s", "max:1s")):
+            query = {
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+                "metrics": ["sensor-1", "sensor-2"],
+                "aggregation": aggregation,
+            }
+            started = time.perf_counter()
+            response = await client.post("/api/telemetry/query", json=query)
+            response.raise_for_status()
+            elapsed = time.perf_counter() - started
+            print(f"Query {label:18s} {len(response.json()):6d} rows in {elapsed * 1000:8.1f} ms")
+
+    print(json.dumps(pipeline.get_metrics(), indent=2))
+    await pipeline.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="Ingest requests to send")
+    parser.add_argument("--batch", type=int, default=10000, help="Points per request")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients")
+    parser.add_argument("--series", type=int, default=100, help="Distinct (source, metric) series")
+    parser.add_argument("--mongodb", action="store_true", help="Use the configured MongoDB instead of a temporary local store")
+    args = parser.parse_args()
+
+    data_dir = None
+    if not args.mongodb:
+        data_dir = tempfile.mkdtemp(prefix="sator-telemetry-bench-")
+        os.environ["SATOR_DATA_DIR"] = data_dir
+        os.environ["SATOR_ENABLE_MONGODB"] = "false"
+    try:
+        asyncio.run(run(args))
+    finally:
+        if data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
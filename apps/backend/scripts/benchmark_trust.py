@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark TrustCalculator.score_batch() against the scalar calculate_trust() path.
+
+The scalar path is O(n^3), so it is only timed for small sets; score_batch
+is timed up to 10k evidence items and checked for identical results where
+both run.
+
+Usage:
+    python scripts/benchmark_trust.py
+    python scripts/benchmark_trust.py --sizes 100 1000 10000 --scalar-max 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.trust_calculator import EvidenceInput, TrustCalculator
+
+
+SOURCES = [
+    "primary_sensor_array",
+    "backup_telemetry",
+    "external_feed_alpha",
+    "external_feed_beta",
+    "legacy_system_link",
+    "operator_manual",
+]
+
+
+def make_evidence(n: int, now: datetime, seed: int = 11) -> list[EvidenceInput]:
+    """Readings clustered around a nominal value with some outliers."""
+    rng = random.Random(seed)
+    evidence = []
+    for i in range(n):
+        value = rng.gauss(100.0, 8.0) if rng.random() > 0.05 else rng.uniform(0.0, 300.0)
+        evidence.append(EvidenceInput(
+            id=f"ev_{i:05d}",
+            source=rng.choice(SOURCES),
+            value=round(value, 2),
+            timestamp=now - timedelta(minutes=rng.uniform(0, 120)),
+        ))
+    return evidence
+
+
+def run(sizes: list[int], scalar_max: int) -> None:
+    calculator = TrustCalculator()
+    now = datetime.utcnow()
+    print(f"{'items':>8} {'batch (s)':>10} {'scalar (s)':>11} {'identical':>10}")
+    for n in sizes:
+        evidence = make_evidence(n, now)
+
+        start = time.perf_counter()
+        batch = calculator.score_batch(evidence, now)
+        batch_time = time.perf_counter() - start
+
+        scalar_time, identical = "-", "-"
+        if n <= scalar_max:
+            start = time.perf_counter()
+            scalar = [calculator.calculate_trust(e, evidence, now) for e in evidence]
+            scalar_time = f"{time.perf_counter() - start:.3f}"
+            identical = str(scalar == batch)
+
+        print(f"{n:>8} {batch_time:>10.3f} {scalar_time:>11} {identical:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 1_000, 10_000])
+    parser.add_argument("--scalar-max", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.scalar_max)
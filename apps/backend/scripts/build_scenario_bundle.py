@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Convert a data directory's CSV and generated JSON files into a scenario bundle.
+
+Engines load the bundle instead of the source files while it matches them
+(see app/core/scenario_bundle.py); rerun after the data changes.
+
+Usage:
+    python scripts/build_scenario_bundle.py
+    python scripts/build_scenario_bundle.py --data-dir app/data --out /tmp/bundle
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.scenario_bundle import build_bundle, open_bundle
+
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "app" / "data"
+
+
+def main(data_dir: Path, out: Path | None) -> None:
+    start = time.perf_counter()
+    path = build_bundle(data_dir, out)
+    elapsed = time.perf_counter() - start
+
+    bundle = open_bundle(data_dir, path)
+    manifest = bundle.manifest if bundle else {}
+    print(f"Wrote {path} in {elapsed:.2f}s")
+    for name, table in manifest.get("tables", {}).items():
+        kinds = ", ".join(f"{c['name']}:{c['kind']}" for c in table["columns"])
+        print(f"  {name:<32} {table['count']:>8} rows  {kinds}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", type=Path, default=None, help="Bundle directory (default: <data-dir>/bundle)")
+    args = parser.parse_args()
+    main(args.data_dir, args.out)
@@ -0,0 +1,253 @@
+"""
+Anchor Submitter Tests - Batched anchoring against the local Solana stand-in.
+
+Run with: python -m pytest tests/test_anchor_submitter.py -v
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.integrations.kairo.anchor import AnchorRecord, compute_artifact_hashes
+from app.integrations.kairo.rpc import LocalSolanaRpc, SolanaRpcError, b58decode, b58encode
+from app.integrations.kairo.submitter import AnchorSubmitter
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+class LegacyTransactionSigner:
+    """
+    Builds transactions in the legacy wire layout LocalSolanaRpc reads
+    (the solders-backed MemoSigner needs the optional solders package).
+    """
+
+    prefunded = False
+
+    def __init__(self):
+        self._key = os.urandom(32)
+        self.pubkey = b58encode(self._key)
+
+    def build(self, memo: bytes, blockhash: str) -> bytes:
+        signature = hashlib.sha512(self._key + memo + blockhash.encode()).digest()
+        # One signature, message header, two account keys, blockhash, memo
+        return (
+            bytes([1]) + signature + bytes([1, 0, 1, 2]) + self._key + b"M" * 32
+            + b58decode(blockhash) + memo
+        )
+
+
+def make_record(i: int, requires_approval: bool = False) -> AnchorRecord:
+    return AnchorRecord(
+        anchor_id=f"anchor_ART-{i:04d}",
+        artifact_id=f"ART-{i:04d}",
+        incident_id="INC-1",
+        scenario_id="fixed-valve-incident",
+        hashes=compute_artifact_hashes({"artifact": i}),
+        operator_id="operator-1",
+        requires_approval=requires_approval,
+    )
+
+
+def make_submitter(rpc, signer=None, stored=None, unsettled=(), **options) -> AnchorSubmitter:
+    stored = {} if stored is None else stored
+    signer = signer or LegacyTransactionSigner()
+    settings = dict(batch_size=8, linger_sec=0.02, poll_interval_sec=0.01)
+    settings.update(options)
+    return AnchorSubmitter(
+        persist=lambda record: stored.__setitem__(record.anchor_id, record.status),
+        load_unsettled=lambda: list(unsettled),
+        rpc_url="local",
+        rpc_factory=lambda url: rpc,
+        signer_factory=lambda: signer,
+        **settings,
+    )
+
+
+# ============================================================================
+# Batching
+# ============================================================================
+
+def test_batches_anchors_into_few_transactions():
+    async def scenario():
+        rpc = LocalSolanaRpc(block_time_sec=0.01)
+        stored, settled = {}, []
+        submitter = make_submitter(rpc, stored=stored)
+        submitter.add_listener(lambda record: settled.append(record.anchor_id))
+
+        records = [submitter.submit(make_record(i, requires_approval=(i == 3))) for i in range(20)]
+        assert {record.status for record in records} == {"queued"}
+        assert submitter.submit(make_record(0)) is records[0]
+
+        assert await submitter.close(timeout_sec=10) == 0
+        return rpc, stored, settled, records, submitter.get_metrics()
+
+    rpc, stored, settled, records, metrics = asyncio.run(scenario())
+
+    assert len({record.tx_hash for record in records}) == 3
+    assert rpc.calls["sendTransaction"] == 3
+    assert rpc.calls["getLatestBlockhash"] == 1
+    assert metrics["blockhash_reuses"] == 2
+    assert records[3].status == "pending_approval"
+    assert all(record.status == "confirmed" for i, record in enumerate(records) if i != 3)
+    assert sorted(settled) == sorted(record.anchor_id for record in records)
+    assert stored["anchor_ART-0005"] == "confirmed"
+
+
+# ============================================================================
+# Expiry and failure
+# ============================================================================
+
+def test_resends_transaction_dropped_before_its_blockhash_expired():
+    async def scenario():
+        rpc = LocalSolanaRpc(block_time_sec=0.01, valid_blocks=3)
+        send = rpc.send_transaction
+        dropped = []
+
+        async def drop_first(transaction):
+            signature = await send(transaction)
+            if not dropped:
+                dropped.append(signature)
+                rpc._transactions.pop(signature)
+            return signature
+
+        rpc.send_transaction = drop_first
+        submitter = make_submitter(rpc)
+        records = [submitter.submit(make_record(i)) for i in range(3)]
+        await submitter.close(timeout_sec=10)
+        return rpc, records, dropped, submitter.get_metrics()
+
+    rpc, records, dropped, metrics = asyncio.run(scenario())
+
+    assert metrics["resent"] == 3
+    assert rpc.calls["sendTransaction"] == 2
+    assert all(record.status == "confirmed" for record in records)
+    assert all(record.tx_hash != dropped[0] for record in records)
+    assert all(record.submit_attempts == 2 for record in records)
+
+
+def test_refreshes_expired_cached_blockhash_once():
+    async def scenario():
+        rpc = LocalSolanaRpc(block_time_sec=0.01, valid_blocks=3)
+        submitter = make_submitter(rpc, blockhash_max_age_sec=60)
+        first = submitter.submit(make_record(1))
+        await submitter.drain(10)
+        # The cached blockhash outlives its validity window
+        await asyncio.sleep(0.1)
+        second = submitter.submit(make_record(2))
+        await submitter.close(timeout_sec=10)
+        return rpc, first, second
+
+    rpc, first, second = asyncio.run(scenario())
+
+    assert first.status == second.status == "confirmed"
+    assert rpc.calls["getLatestBlockhash"] == 2
+    assert rpc.calls["sendTransaction"] == 3
+
+
+def test_fails_after_max_attempts():
+    async def scenario():
+        rpc = LocalSolanaRpc(block_time_sec=0.01)
+
+        async def unavailable(transaction):
+            raise SolanaRpcError("Node is behind by 120 slots", -32005)
+
+        rpc.send_transaction = unavailable
+        settled = []
+        submitter = make_submitter(rpc, max_attempts=3)
+        submitter.add_listener(lambda record: settled.append(record.status))
+        record = submitter.submit(make_record(1))
+        await submitter.close(timeout_sec=10)
+        return record, settled
+
+    record, settled = asyncio.run(scenario())
+
+    assert record.status == "failed"
+    assert record.submit_attempts == 3
+    assert "Node is behind" in record.error
+    assert settled == ["failed"]
+
+
+def test_fails_when_every_send_is_dropped():
+    async def scenario():
+        rpc = LocalSolanaRpc(block_time_sec=0.01, valid_blocks=3)
+        send = rpc.send_transaction
+
+        async def drop(transaction):
+            signature = await send(transaction)
+            rpc._transactions.pop(signature)
+            return signature
+
+        rpc.send_transaction = drop
+        settled = []
+        submitter = make_submitter(rpc, max_attempts=3)
+        submitter.add_listener(lambda record: settled.append(record.status))
+        records = [submitter.submit(make_record(i)) for i in range(2)]
+        assert await submitter.close(timeout_sec=10) == 0
+        return rpc, records, settled, submitter.get_metrics()
+
+    rpc, records, settled, metrics = asyncio.run(scenario())
+
+    assert rpc.calls["sendTransaction"] == 3
+    assert all(record.status == "failed" for record in records)
+    assert all(record.submit_attempts == 3 for record in records)
+    assert all("expired without landing" in record.error for record in records)
+    assert settled == ["failed", "failed"]
+    assert metrics["resent"] == 4
+    assert metrics["failed"] == 2
+
+
+# ============================================================================
+# Restart recovery
+# ============================================================================
+
+def test_recovered_anchor_confirmed_long_ago_is_not_sent_again():
+    async def scenario():
+        rpc = LocalSolanaRpc(block_time_sec=0.01, valid_blocks=3, status_cache_blocks=2)
+        signer = LegacyTransactionSigner()
+
+        # An earlier process sent this one, then stopped before confirming it
+        landed = make_record(1)
+        await rpc.request_airdrop(signer.pubkey, 1_000_000)
+        blockhash, last_valid = await rpc.get_latest_blockhash()
+        landed.tx_hash = await rpc.send_transaction(signer.build(b"SATOR2|earlier", blockhash))
+        landed.status = "submitted"
+        landed.last_valid_block_height = last_valid
+        landed.submit_attempts = 1
+
+        # ...sent this one too, but it never landed
+        lost = make_record(2)
+        lost.tx_hash = b58encode(hashlib.sha512(b"lost").digest())
+        lost.status = "submitted"
+        lost.last_valid_block_height = last_valid
+        lost.submit_attempts = 1
+
+        # ...and had this one queued
+        queued = make_record(3)
+        queued.status = "queued"
+
+        # Both signatures are now past their blockhash and the status cache
+        await asyncio.sleep(0.1)
+        sends = rpc.calls["sendTransaction"]
+        landed_signature = landed.tx_hash
+        submitter = make_submitter(rpc, signer=signer, unsettled=[landed, lost, queued])
+        assert await submitter.drain(10) == 0
+        await submitter.close()
+        return rpc.calls["sendTransaction"] - sends, landed_signature, landed, lost, queued
+
+    sends, landed_signature, landed, lost, queued = asyncio.run(scenario())
+
+    assert landed.status == "confirmed"
+    assert landed.tx_hash == landed_signature
+    assert landed.submit_attempts == 1
+    assert lost.status == queued.status == "confirmed"
+    assert lost.submit_attempts == 2
+    # New transactions for the queued and the lost anchor only
+    assert sends == 2
+    assert landed_signature not in (lost.tx_hash, queued.tx_hash)
@@ -0,0 +1,234 @@
+"""
+Audit Chain Tests - Chain store reopening, verifier state across reloads
+and batched root anchoring.
+
+Run with: python -m pytest tests/test_audit_chain.py -v
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api import audit as audit_api
+from app.core.audit import AuditLedger
+from app.core.audit.chain_store import ChainStore
+from app.core.audit.verifier import ChainVerifier, VerificationStatus
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def make_ledger(data_path: Path, events: int = 0) -> AuditLedger:
+    """A ledger writing under data_path, with `events` events logged"""
+    ledger = AuditLedger(anchor_batch_size=0, anchor_batch_interval_sec=0)
+    ledger._data_path = data_path
+    for i in range(events):
+        asyncio.run(ledger.log_event(
+            action="trust_updated",
+            actor="system",
+            payload={"tag_id": f"TAG-{i}", "new_score": i / 10},
+        ))
+    return ledger
+
+
+def rewrite_line(chain_file: Path, index: int, edit) -> None:
+    """Replace the index-th JSONL record with edit(record)"""
+    lines = chain_file.read_text().splitlines(keepends=True)
+    record = json.loads(lines[index])
+    edit(record)
+    lines[index] = json.dumps(record) + "\n"
+    chain_file.write_text("".join(lines))
+
+
+# ============================================================================
+# Chain store
+# ============================================================================
+
+def test_reopen_after_middle_record_edit_rebuilds_index(tmp_path):
+    """An edit that shifts later lines must not resume indexing mid-line"""
+    ledger = make_ledger(tmp_path, events=10)
+    chain_file = ledger.events.path
+    original_ids = [event.event_id for event in ledger.events]
+    ledger.events.close()
+
+    # Longer payload in a middle record: the file grows, so the stored end
+    # offset of the last indexed record is still within it
+    rewrite_line(chain_file, 4, lambda r: r["payload"].update(note="x" * 40))
+
+    reloaded = AuditLedger()
+    reloaded._data_path = tmp_path
+    assert asyncio.run(reloaded.load_from_storage(ledger.chain_id))
+
+    events = reloaded.events
+    assert len(events) == 10
+    assert [event.event_id for event in events] == original_ids
+    assert events.position_of(original_ids[-1]) == 9
+
+    result = ChainVerifier().verify_chain(events)
+    assert not result.is_valid
+    assert result.first_failure_index == 4
+
+
+def test_reopen_resumes_intact_index(tmp_path):
+    ledger = make_ledger(tmp_path, events=5)
+    chain_file = ledger.events.path
+    ledger.events.close()
+    index_size = chain_file.with_suffix(".idx").stat().st_size
+
+    store = ChainStore(chain_file)
+    assert len(store) == 5
+    assert chain_file.with_suffix(".idx").stat().st_size == index_size
+    assert store[-1].current_hash == ledger.latest_hash
+    store.close()
+
+
+# ============================================================================
+# Verifier
+# ============================================================================
+
+def test_shared_verifier_rechecks_reloaded_chain(tmp_path):
+    """A verified prefix must not carry over to a chain reloaded from disk"""
+    ledger = make_ledger(tmp_path, events=8)
+    verifier = ChainVerifier()
+    assert verifier.verify_chain(ledger.events).status == VerificationStatus.PASS
+
+    # Tamper with an earlier payload; line lengths are unchanged
+    rewrite_line(ledger.events.path, 2, lambda r: r["payload"].update(tag_id="TAG-X"))
+    assert asyncio.run(ledger.load_from_storage(ledger.chain_id))
+
+    result = verifier.verify_chain(ledger.events)
+    assert result.status == VerificationStatus.PARTIAL
+    assert result.first_failure_index == 2
+    assert not result.incremental
+
+
+def test_verifier_is_incremental_on_grown_chain(tmp_path):
+    ledger = make_ledger(tmp_path, events=6)
+    verifier = ChainVerifier()
+    assert verifier.verify_chain(ledger.events).is_valid
+
+    asyncio.run(ledger.log_event(action="trust_updated", actor="system", payload={"tag_id": "TAG-6"}))
+    result = verifier.verify_chain(ledger.events)
+    assert result.is_valid
+    assert result.incremental
+    assert result.events_rehashed == 1
+
+
+def test_verify_route_full_catches_edit_to_verified_event(tmp_path, monkeypatch):
+    """An in-place edit behind the verified prefix is only caught by full=true"""
+    ledger = make_ledger(tmp_path, events=8)
+    monkeypatch.setattr(audit_api, "_ledger", ledger)
+    monkeypatch.setattr(audit_api, "get_chain_verifier", lambda verifier=ChainVerifier(): verifier)
+    assert asyncio.run(audit_api.verify_chain(full=False)).is_valid
+
+    # Same-length edit to an already verified event; drop the read cache so
+    # the record is read back from disk
+    path = ledger.events.path
+    path.write_bytes(path.read_bytes().replace(b'"TAG-2"', b'"TAG-X"'))
+    ledger.events._cache.clear()
+
+    trusted = asyncio.run(audit_api.verify_chain(full=False))
+    assert trusted.incremental
+    assert trusted.events_trusted > 2
+    assert "trusted" in trusted.message
+
+    result = asyncio.run(audit_api.verify_chain(full=True))
+    assert not result.is_valid
+    assert not result.incremental
+    assert result.events_trusted == 0
+    assert result.message.startswith("Chain Verified: FAIL - Event 2")
+
+
+# ============================================================================
+# Batched anchoring
+# ============================================================================
+
+class FlakyAnchor:
+    """AuditAnchor double that fails the first `failures` calls"""
+
+    def __init__(self, failures: int = 0, empty_receipts: int = 0):
+        self.failures = failures
+        self.empty_receipts = empty_receipts
+        self.roots: list[str] = []
+        self.attempts = 0
+
+    async def anchor_hash(self, hash_value: str, metadata: dict):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("RPC unavailable")
+        if self.attempts <= self.failures + self.empty_receipts:
+            return None
+        self.roots.append(hash_value)
+        return type("Receipt", (), {"tx_signature": f"sig-{len(self.roots)}"})()
+
+
+def test_pending_batch_is_anchored_at_deadline_without_new_events(tmp_path):
+    async def scenario():
+        anchor = FlakyAnchor()
+        ledger = AuditLedger(anchor=anchor, anchor_batch_interval_sec=0.05)
+        ledger._data_path = tmp_path
+        await ledger.log_event("operator_action", "user", {"n": 1}, anchor_on_chain=True)
+        assert anchor.roots == []
+        await asyncio.sleep(0.15)
+        return anchor, ledger
+
+    anchor, ledger = asyncio.run(scenario())
+    assert anchor.roots == [ledger.merkle_root]
+    assert ledger.get_checkpoints()[-1].anchor_tx_sig == "sig-1"
+
+
+def test_failed_root_anchor_backs_off(tmp_path):
+    async def scenario():
+        anchor = FlakyAnchor(failures=1)
+        ledger = AuditLedger(anchor=anchor, anchor_batch_size=1)
+        ledger._data_path = tmp_path
+        ledger._anchor_retry_base_sec = 0.1
+        await ledger.log_event("operator_action", "user", {"n": 1}, anchor_on_chain=True)
+        assert anchor.attempts == 1
+        # Within the backoff window new events don't retry
+        for n in range(2, 5):
+            await ledger.log_event("operator_action", "user", {"n": n}, anchor_on_chain=True)
+        assert anchor.attempts == 1
+        # The retry timer anchors without further events
+        await asyncio.sleep(0.25)
+        return anchor, ledger
+
+    anchor, ledger = asyncio.run(scenario())
+    assert anchor.attempts == 2
+    assert anchor.roots == [ledger.merkle_root]
+
+
+def test_empty_anchor_receipt_keeps_batch_pending(tmp_path):
+    async def scenario():
+        anchor = FlakyAnchor(empty_receipts=1)
+        ledger = AuditLedger(anchor=anchor, anchor_batch_size=1)
+        ledger._data_path = tmp_path
+        ledger._anchor_retry_base_sec = 0.1
+        await ledger.log_event("operator_action", "user", {"n": 1}, anchor_on_chain=True)
+        assert anchor.attempts == 1
+        assert ledger._anchored_size == 0
+        assert ledger.get_checkpoints()[-1].anchor_tx_sig is None
+        await asyncio.sleep(0.25)
+        return anchor, ledger
+
+    anchor, ledger = asyncio.run(scenario())
+    assert anchor.attempts == 2
+    assert ledger._anchored_size == ledger.event_count
+    assert ledger.get_checkpoints()[-1].anchor_tx_sig == "sig-1"
+
+
+def test_close_anchors_pending_batch(tmp_path):
+    async def scenario():
+        anchor = FlakyAnchor()
+        ledger = AuditLedger(anchor=anchor, anchor_batch_interval_sec=3600)
+        ledger._data_path = tmp_path
+        await ledger.log_event("operator_action", "user", {"n": 1}, anchor_on_chain=True)
+        await ledger.close()
+        return anchor
+
+    assert len(asyncio.run(scenario()).roots) == 1
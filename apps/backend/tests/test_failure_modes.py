@@ -0,0 +1,235 @@
+"""
+Failure Mode Tests - Array injection against per-point injection and the
+per-point handlers it replaced.
+
+Run with: python -m pytest tests/test_failure_modes.py -v
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.simulation.failure_modes import FailureModeInjector, _burst_hash
+from app.models.simulation import FailureMode, FailureModeType
+from app.models.telemetry import QualityFlag, TelemetryPoint
+
+TAG = "FT-101"
+BASE = datetime(2026, 1, 1)
+
+# One spec per type, with the params that take each handler down its other branches
+SPECS = {
+    FailureModeType.MISSING_BURSTS: [{}, {"gap_probability": 0.7}],
+    FailureModeType.STALE_STREAM: [{}],
+    FailureModeType.RANGE_VIOLATION: [{}, {"direction": "low", "magnitude": 2.0}, {"violation_value": 999.0}],
+    FailureModeType.ROC_VIOLATION: [{}, {"spike_magnitude": 7.5}],
+    FailureModeType.FLATLINE: [{}, {"stuck_value": 42.0}],
+    FailureModeType.DRIFT: [{}, {"drift_rate": 0.5, "direction": -1}],
+    FailureModeType.REDUNDANCY_CONFLICT: [{}, {"offset": 12.0}],
+    FailureModeType.PHYSICS_CONTRADICTION: [{}, {"forced_value": 3.0, "contradiction_type": "pump_pressure"}],
+}
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+class PerPointReference:
+    """
+    The per-point handlers as they were before injection went columnar.
+
+    Only the missing-bursts drop decision differs: it used the process-salted
+    built-in hash(), so it reads _burst_hash here.
+    """
+
+    def __init__(self, failures: list[FailureMode]):
+        self.failures = failures
+        self.stuck: dict[str, float | None] = {}
+
+    def apply(self, point: TelemetryPoint, t: float) -> TelemetryPoint | None:
+        for failure in self.failures:
+            ends_at = None if failure.duration_sec is None else failure.start_time_sec + failure.duration_sec
+            if failure.tag_id != point.tag_id or t < failure.start_time_sec or (ends_at is not None and t >= ends_at):
+                continue
+            point = self.handle(point, failure, t)
+            if point is None:
+                return None
+        return point
+
+    def handle(self, point: TelemetryPoint, failure: FailureMode, t: float) -> TelemetryPoint | None:
+        params, value = failure.params, point.value
+        kind, quality, extra = failure.type, QualityFlag.GOOD, {}
+        if kind == FailureModeType.MISSING_BURSTS:
+            if _burst_hash(failure.tag_id, np.array([t]))[0] < params.get("gap_probability", 0.3) * 100:
+                return None
+            return point
+        if kind == FailureModeType.STALE_STREAM:
+            return None
+        if kind == FailureModeType.RANGE_VIOLATION:
+            if params.get("violation_value") is not None:
+                value = params["violation_value"]
+            elif params.get("direction", "high") == "high":
+                value = value * params.get("magnitude", 1.5) if value else 1000.0
+            else:
+                value = -abs(value or 100) * params.get("magnitude", 1.5)
+            quality = QualityFlag.BAD
+        elif kind == FailureModeType.ROC_VIOLATION:
+            value = (value or 0) + params.get("spike_magnitude", 50.0) * (1 if int(t) % 2 == 0 else -1)
+            quality = QualityFlag.UNCERTAIN
+        elif kind == FailureModeType.FLATLINE:
+            value = self.stuck.setdefault(failure.tag_id, params.get("stuck_value", value))
+        elif kind == FailureModeType.DRIFT:
+            drift = params.get("drift_rate", 0.1) * (t - failure.start_time_sec) * params.get("direction", 1)
+            value = (value or 0) + drift
+            extra = {"cumulative_drift": drift}
+        elif kind == FailureModeType.REDUNDANCY_CONFLICT:
+            value = (value or 100) + params.get("offset", -60.0)
+        elif kind == FailureModeType.PHYSICS_CONTRADICTION:
+            if params.get("forced_value") is not None:
+                value = params["forced_value"]
+            extra = {"type": params.get("contradiction_type", "valve_flow")}
+        return TelemetryPoint(
+            tag_id=point.tag_id,
+            timestamp=point.timestamp,
+            value=value,
+            quality=quality,
+            metadata={**point.metadata, "failure": kind.value, **extra},
+        )
+
+
+def random_samples(rng: random.Random, count: int = 400) -> tuple[np.ndarray, list]:
+    """Ascending times (some repeated) and values with zeros and gaps"""
+    times = np.array(sorted(round(rng.uniform(0, 100), 2) for _ in range(count)))
+    values = [
+        None if roll < 0.05 else 0.0 if roll < 0.1 else round(rng.uniform(-50, 150), 3)
+        for roll in (rng.random() for _ in range(count))
+    ]
+    return times, values
+
+
+def random_failure(rng: random.Random, failure_type: FailureModeType, tag_id: str = TAG) -> FailureMode:
+    return FailureMode(
+        type=failure_type,
+        tag_id=tag_id,
+        start_time_sec=round(rng.uniform(0, 70), 2),
+        duration_sec=rng.choice([None, round(rng.uniform(1, 40), 2)]),
+        params=dict(rng.choice(SPECS[failure_type])),
+    )
+
+
+def injector_for(failures: list[FailureMode]) -> FailureModeInjector:
+    injector = FailureModeInjector()
+    for failure in failures:
+        injector.schedule_failure(failure)
+    return injector
+
+
+def point_at(t: float, value, n: int) -> TelemetryPoint:
+    return TelemetryPoint(
+        tag_id=TAG,
+        timestamp=BASE + timedelta(seconds=float(t)),
+        value=value,
+        quality=QualityFlag.UNCERTAIN if n % 7 == 0 else QualityFlag.GOOD,
+        metadata={"sample": n},
+    )
+
+
+def observed(point: TelemetryPoint | None):
+    if point is None:
+        return None
+    return point.value, point.quality, point.metadata
+
+
+def run_per_point(failures: list[FailureMode], times: np.ndarray, values: list) -> list:
+    injector = injector_for(failures)
+    return [observed(injector.apply_failures(point_at(t, v, n), float(t))) for n, (t, v) in enumerate(zip(times, values))]
+
+
+def run_reference(failures: list[FailureMode], times: np.ndarray, values: list) -> list:
+    reference = PerPointReference(failures)
+    return [observed(reference.apply(point_at(t, v, n), float(t))) for n, (t, v) in enumerate(zip(times, values))]
+
+
+def run_array(failures: list[FailureMode], times: np.ndarray, values: list, chunks: list[int]) -> list:
+    """apply_failures_array over consecutive windows of the samples, split at chunks"""
+    injector = injector_for(failures)
+    result = []
+    edges = [0, *chunks, len(times)]
+    for lo, hi in zip(edges, edges[1:]):
+        raw = np.array([np.nan if v is None else v for v in values[lo:hi]], dtype=np.float64)
+        signal = injector.apply_failures_array(TAG, times[lo:hi], raw)
+        for i in range(hi - lo):
+            point = point_at(times[lo + i], values[lo + i], lo + i)
+            if not signal.keep[i]:
+                result.append(None)
+                continue
+            value = None if np.isnan(signal.values[i]) else float(signal.values[i])
+            result.append((value, signal.quality_at(i, point.quality), signal.metadata_at(i, point.metadata)))
+    return result
+
+
+def assert_paths_agree(failures: list[FailureMode], rng: random.Random) -> list:
+    times, values = random_samples(rng)
+    expected = run_reference(failures, times, values)
+    assert run_per_point(failures, times, values) == expected
+    assert run_array(failures, times, values, []) == expected
+    chunks = sorted(rng.sample(range(1, len(times)), 5))
+    assert run_array(failures, times, values, chunks) == expected
+    return expected
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+def test_burst_hash_is_pinned():
+    times = np.array([0.0, 0.05, 0.1, 0.25, 1.0, 12.34, 99.9, 3600.0])
+    assert _burst_hash("FT-101", times).tolist() == [81, 81, 14, 43, 67, 90, 81, 86]
+    assert _burst_hash("PT-201", times).tolist() == [18, 18, 4, 93, 73, 32, 76, 24]
+
+
+@pytest.mark.parametrize("failure_type", list(FailureModeType))
+def test_each_failure_type_matches_per_point(failure_type):
+    rng = random.Random(failure_type.value)
+    for params in SPECS[failure_type]:
+        failure = FailureMode(type=failure_type, tag_id=TAG, start_time_sec=20.0, duration_sec=50.0, params=params)
+        expected = assert_paths_agree([failure], rng)
+        assert any(p is None or "failure" in p[2] for p in expected)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_overlapping_failures_match_per_point(seed):
+    rng = random.Random(seed)
+    types = list(FailureModeType)
+    # Mostly value-changing failures so that drops do not hide the later ones
+    weights = [1 if t in (FailureModeType.MISSING_BURSTS, FailureModeType.STALE_STREAM) else 4 for t in types]
+    failures = [random_failure(rng, t) for t in rng.choices(types, weights, k=rng.randint(2, 5))]
+    # Failures on another tag never touch these samples
+    failures.insert(rng.randint(0, len(failures)), random_failure(rng, rng.choice(types), tag_id="PT-201"))
+    assert_paths_agree(failures, rng)
+
+
+def test_metadata_carries_through_overlaps():
+    failures = [
+        FailureMode(type=FailureModeType.DRIFT, tag_id=TAG, start_time_sec=0.0, params={"drift_rate": 1.0}),
+        FailureMode(type=FailureModeType.PHYSICS_CONTRADICTION, tag_id=TAG, start_time_sec=5.0, duration_sec=5.0),
+        FailureMode(type=FailureModeType.RANGE_VIOLATION, tag_id=TAG, start_time_sec=8.0, duration_sec=4.0),
+    ]
+    times = np.array([2.0, 6.0, 9.0, 11.0])
+    values = [10.0, 10.0, 10.0, 10.0]
+    expected = [
+        (12.0, QualityFlag.GOOD, {"sample": 0, "failure": "drift", "cumulative_drift": 2.0}),
+        (16.0, QualityFlag.GOOD, {"sample": 1, "failure": "physics_contradiction", "cumulative_drift": 6.0, "type": "valve_flow"}),
+        (28.5, QualityFlag.BAD, {"sample": 2, "failure": "range_violation", "cumulative_drift": 9.0, "type": "valve_flow"}),
+        (31.5, QualityFlag.BAD, {"sample": 3, "failure": "range_violation", "cumulative_drift": 11.0}),
+    ]
+    assert run_reference(failures, times, values) == expected
+    assert run_per_point(failures, times, values) == expected
+    assert run_array(failures, times, values, []) == expected
+    assert run_array(failures, times, values, [1, 3]) == expected
@@ -0,0 +1,128 @@
+"""
+Interval Index Tests - Stabbing and overlap queries against a brute-force scan.
+
+Run with: python -m pytest tests/test_interval_index.py -v
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.interval_index import IntervalIndex
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_interval(rng: random.Random, span: int = 200) -> tuple:
+    start = rng.randint(0, span)
+    roll = rng.random()
+    if roll < 0.15:
+        end = None  # Still open
+    elif roll < 0.25:
+        end = start - rng.randint(0, 3)  # Empty
+    else:
+        end = start + rng.randint(1, rng.choice([2, 10, 60]))
+    return start, end
+
+
+def active(records: list, t, key=None, all_keys=False) -> list:
+    return [
+        value for start, end, value, k in records
+        if (all_keys or k == key) and (end is None or start < end) and start <= t and (end is None or t < end)
+    ]
+
+
+def meeting(records: list, lo, hi, key=None, all_keys=False) -> list:
+    return [
+        value for start, end, value, k in records
+        if (all_keys or k == key) and (end is None or start < end) and start <= hi and (end is None or end > lo)
+    ]
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(4))
+def test_queries_match_brute_force(seed):
+    rng = random.Random(seed)
+    index = IntervalIndex()
+    records = []
+    keys = ["FT-101", "PT-201", ("TT-301", "RC1"), None]
+
+    for step in range(30):
+        # Single adds and bulk extends, with queries in between so both
+        # unfrozen and merged blocks are read
+        batch = []
+        for _ in range(rng.choice([1, 5, 40, 150])):
+            start, end = random_interval(rng)
+            batch.append((start, end, f"v{len(records) + len(batch)}", rng.choice(keys)))
+        if rng.random() < 0.5:
+            index.extend(batch)
+        else:
+            for start, end, value, key in batch:
+                index.add(start, end, value, key)
+        records.extend(batch)
+
+        for _ in range(20):
+            key = rng.choice(keys)
+            t = rng.randint(-5, 270)
+            # Endpoints themselves, to pin the half-open ends
+            if rng.random() < 0.5:
+                start, end, _, _ = rng.choice(records)
+                t = end if end is not None and rng.random() < 0.5 else start
+            assert index.stab(t, key) == active(records, t, key), (step, t, key)
+            assert index.stab(t, all_keys=True) == active(records, t, all_keys=True)
+
+            lo = rng.randint(-5, 270)
+            hi = lo + rng.choice([0, 1, 5, 50])
+            assert index.overlapping(lo, hi, key) == meeting(records, lo, hi, key), (step, lo, hi, key)
+            assert index.overlapping(lo, hi, all_keys=True) == meeting(records, lo, hi, all_keys=True)
+
+    assert len(index) == sum(1 for start, end, _, _ in records if end is None or start < end)
+    assert set(index.keys()) == {key for _, _, _, key in records}
+
+
+def test_half_open_and_open_ended_intervals():
+    index = IntervalIndex()
+    index.add(10, 20, "closed")
+    index.add(15, None, "open")
+    index.add(12, 12, "empty")
+    index.add(30, 25, "reversed")
+
+    assert index.stab(9) == []
+    assert index.stab(10) == ["closed"]
+    assert index.stab(15) == ["closed", "open"]
+    assert index.stab(20) == ["open"]
+    assert index.stab(10 ** 9) == ["open"]
+    assert index.stab(12) == ["closed"]
+    # Overlap is inclusive of hi and exclusive of an interval's end
+    assert index.overlapping(0, 10) == ["closed"]
+    assert index.overlapping(20, 20) == ["open"]
+    assert index.overlapping(0, 14) == ["closed"]
+    assert index.overlapping(0, 15) == ["closed", "open"]
+    assert len(index) == 2
+
+    index.clear()
+    assert len(index) == 0 and index.stab(15) == []
+
+
+def test_datetimes_and_insertion_order():
+    base = datetime(2026, 1, 1)
+    index = IntervalIndex()
+    # Later inserts start earlier, so time order and insertion order differ
+    for n in range(100):
+        start = base + timedelta(seconds=100 - n)
+        index.add(start, start + timedelta(seconds=50), n, key="tag")
+    at = base + timedelta(seconds=75)
+    assert index.stab(at, "tag") == [n for n in range(100) if 100 - n <= 75 < 150 - n]
+    assert index.stab(at, "other") == []
+    assert index.overlapping(base, base + timedelta(seconds=10), "tag") == list(range(90, 100))
@@ -0,0 +1,193 @@
+"""
+Marker Pyramid Tests - Cluster summaries against brute-force bucketing,
+drill-down, and markers arriving after load.
+
+Run with: python -m pytest tests/test_marker_pyramid.py -v
+"""
+
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta
+from math import floor
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.marker_pyramid import MarkerPyramid
+from app.core.replay_engine import ReplayEngine
+from app.models.temporal import EventSeverity, MarkerType, TimelineMarker
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "data"
+BASE = datetime(2026, 1, 1)
+TYPES = [MarkerType.ALARM, MarkerType.TRUST_CHANGE, MarkerType.CONTRADICTION_APPEARED, MarkerType.OPERATOR_ACTION]
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_markers(rng: random.Random, count: int, span_sec: int = 3600) -> list:
+    markers = []
+    for i in range(count):
+        marker_type = rng.choice(TYPES)
+        offset = rng.randrange(0, span_sec * 4) / 4
+        markers.append(TimelineMarker(
+            id=f"marker_{i}",
+            timestamp=BASE + timedelta(seconds=offset),
+            time_sec=offset,
+            marker_type=marker_type,
+            severity=EventSeverity.INFO,
+            label=marker_type.value,
+            description="",
+            has_contradiction=marker_type == MarkerType.CONTRADICTION_APPEARED,
+        ))
+    return markers
+
+
+def brute_clusters(pyramid: MarkerPyramid, markers: list, start: datetime, end: datetime, max_clusters: int) -> list:
+    """Markers in [start, end] grouped by bucket of the level the pyramid picks"""
+    width = pyramid._width(pyramid.level_for(start, end, max_clusters))
+    buckets: dict = {}
+    for m in sorted(markers, key=lambda m: m.timestamp):
+        if start <= m.timestamp <= end:
+            buckets.setdefault(floor(pyramid._offset(m.timestamp) / width), []).append(m)
+    clusters = []
+    for bucket in sorted(buckets):
+        members = buckets[bucket]
+        type_counts: dict = {}
+        for m in members:
+            type_counts[m.marker_type] = type_counts.get(m.marker_type, 0) + 1
+        clusters.append((
+            len(members),
+            members[0].timestamp,
+            members[-1].timestamp,
+            type_counts,
+            any(m.has_contradiction for m in members),
+        ))
+    return clusters
+
+
+def summaries(pyramid: MarkerPyramid, start: datetime, end: datetime, max_clusters: int) -> list:
+    return [
+        (s.count, s.first, s.last, s.type_counts, s.contradictions > 0)
+        for s in pyramid.clusters(start, end, max_clusters)
+    ]
+
+
+def random_range(rng: random.Random, span_sec: int = 3600):
+    a, b = sorted(rng.uniform(-60, span_sec + 60) for _ in range(2))
+    return BASE + timedelta(seconds=a), BASE + timedelta(seconds=b)
+
+
+# ============================================================================
+# Pyramid
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(3))
+def test_clusters_match_brute_force(seed):
+    rng = random.Random(seed)
+    markers = random_markers(rng, 2000)
+    pyramid = MarkerPyramid()
+    pyramid.build(markers)
+
+    for _ in range(200):
+        start, end = random_range(rng)
+        max_clusters = rng.choice([1, 5, 10, 50, 500])
+        assert summaries(pyramid, start, end, max_clusters) == brute_clusters(pyramid, markers, start, end, max_clusters)
+        assert pyramid.count(start, end) == sum(1 for m in markers if start <= m.timestamp <= end)
+
+
+def test_cluster_drill_down_returns_its_markers():
+    rng = random.Random(4)
+    markers = random_markers(rng, 1000)
+    pyramid = MarkerPyramid()
+    pyramid.build(markers)
+
+    for _ in range(50):
+        start, end = random_range(rng)
+        for summary in pyramid.clusters(start, end, 8):
+            members = pyramid.markers(summary.first, summary.last)
+            assert len(members) == summary.count
+            # A finer view of the cluster holds the same markers
+            finer = pyramid.clusters(summary.first, summary.last, 4)
+            assert sum(s.count for s in finer) == summary.count
+
+
+def test_markers_added_in_time_order_match_a_build():
+    rng = random.Random(5)
+    markers = sorted(random_markers(rng, 800), key=lambda m: m.timestamp)
+    built, grown = MarkerPyramid(), MarkerPyramid()
+    built.build(markers)
+    for marker in markers:
+        grown.add(marker)
+
+    assert grown.markers() == built.markers()
+    for _ in range(100):
+        start, end = random_range(rng)
+        assert summaries(grown, start, end, 10) == summaries(built, start, end, 10)
+
+
+def test_markers_added_out_of_order_match_brute_force():
+    rng = random.Random(6)
+    markers = random_markers(rng, 800)
+    pyramid = MarkerPyramid()
+    for marker in markers:
+        pyramid.add(marker)
+
+    # Equal timestamps keep arrival order
+    assert pyramid.markers() == sorted(markers, key=lambda m: m.timestamp)
+    for _ in range(100):
+        start, end = random_range(rng)
+        max_clusters = rng.choice([3, 10, 40])
+        assert summaries(pyramid, start, end, max_clusters) == brute_clusters(pyramid, markers, start, end, max_clusters)
+
+
+# ============================================================================
+# Replay engine
+# ============================================================================
+
+def test_add_event_matches_loading_the_events(tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR / "csv", data_dir / "csv", ignore=shutil.ignore_patterns(".record_cache"))
+    live = ReplayEngine(data_dir)
+    live.load_all()
+    start, end = live._incident_start, live._incident_end
+
+    # Copies of earlier events, some before the incident start and some after its end
+    rng = random.Random(7)
+    arrivals = []
+    for event in rng.choices(live._events, k=20):
+        shifted = dict(event)
+        delta = rng.uniform(-120, (end - start).total_seconds() + 120)
+        shifted["timestamp"] = start + timedelta(seconds=delta)
+        shifted["time_sec"] = delta
+        arrivals.append(shifted)
+
+    before = live.get_state_at(end).model_dump()
+    for event in arrivals:
+        live.add_event(dict(event))
+
+    loaded = ReplayEngine(data_dir)
+    loaded.load_all()
+    for event in arrivals:
+        loaded._events.append(dict(event))
+    loaded._set_incident_bounds()
+    loaded._build_markers()
+    loaded._build_state_index()
+
+    assert (live._incident_start, live._incident_end) == (loaded._incident_start, loaded._incident_end)
+    assert live.get_markers() == loaded.get_markers()
+    start, end = loaded._incident_start, loaded._incident_end
+    # Bucket edges stay relative to the first marker seen, so only totals match a fresh build
+    assert sum(c.count for c in live.get_clustered_markers(start, end, 6)) == len(loaded.get_markers())
+    assert live.get_clustered_markers(start, end, 100) == loaded.get_clustered_markers(start, end, 100)
+    t = start
+    while t <= end:
+        assert live.get_state_at(t) == loaded.get_state_at(t), t
+        t += timedelta(seconds=15)
+    assert live.get_confidence_band() == loaded.get_confidence_band()
+    assert live.get_state_at(end).model_dump() != before
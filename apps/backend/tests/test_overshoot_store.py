@@ -0,0 +1,133 @@
+"""
+Video Disaster Telemetry Tests - Columnar store lookups against the
+telemetry CSV scan they replaced.
+
+Run with: python -m pytest tests/test_overshoot_store.py -v
+"""
+
+import csv
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.overshoot import VideoDisasterManager
+from app.models.overshoot import OvershootDisasterRecord
+from app.models.telemetry import QualityFlag, TelemetryPoint
+
+BASE_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_records(rng: random.Random, count: int) -> list[OvershootDisasterRecord]:
+    records = []
+    ms = BASE_MS
+    for _ in range(count):
+        # Mostly forward in time, with repeats and late windows
+        ms += rng.choice([0, 250, 500, 1000, 1000, 1337, -700, -3000])
+        records.append(OvershootDisasterRecord(
+            timestamp_ms=ms,
+            person_count=rng.randint(0, 12),
+            water_level=round(rng.uniform(0, 100), 3),
+            fire_detected=rng.random() < 0.3,
+            smoke_level=rng.choice(["none", "light", "medium", "dense"]),
+            structural_damage=rng.choice(["none", "moderate", "severe"]),
+            injured_detected=rng.random() < 0.2,
+        ))
+    return records
+
+
+def read_csv(path: Path) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def scan_telemetry_at(path: Path, time_sec: float) -> list[TelemetryPoint]:
+    """The CSV scan get_telemetry_at used before the columnar store"""
+    by_tag: dict[str, dict] = {}
+    for row in read_csv(path):
+        t = float(row["time_sec"])
+        if t > time_sec or not row["tag_id"]:
+            continue
+        if row["tag_id"] not in by_tag or t >= float(by_tag[row["tag_id"]]["time_sec"]):
+            by_tag[row["tag_id"]] = row
+    return [
+        TelemetryPoint(
+            tag_id=row["tag_id"],
+            timestamp=datetime.fromisoformat(row["timestamp"].replace("Z", "+00:00")),
+            value=float(row["value"]),
+            quality=QualityFlag.GOOD,
+        )
+        for row in by_tag.values()
+    ]
+
+
+def scan_telemetry_range(path: Path, start_sec: float, end_sec: float) -> dict[str, list[dict]]:
+    """The CSV scan get_telemetry_range used before the columnar store"""
+    result: dict[str, list[dict]] = {}
+    for row in read_csv(path):
+        if not (start_sec <= float(row["time_sec"]) <= end_sec):
+            continue
+        result.setdefault(row["tag_id"], []).append({
+            "timestamp": row["timestamp"],
+            "value": float(row["value"]) if row["value"] else None,
+            "quality": row["quality"],
+        })
+    for rows in result.values():
+        rows.sort(key=lambda x: x["timestamp"])
+    return result
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(3))
+def test_store_lookups_match_csv_scan(tmp_path, seed):
+    rng = random.Random(seed)
+    manager = VideoDisasterManager(tmp_path)
+    manager.start()
+    records = random_records(rng, 300)
+    while records:
+        size = rng.randint(1, 40)
+        batch, records = records[:size], records[size:]
+        manager.ingest([r.model_dump() for r in batch] if rng.random() < 0.5 else batch)
+
+    path = tmp_path / "video_disaster_telemetry.csv"
+    times = sorted({float(row["time_sec"]) for row in read_csv(path)})
+    # A second manager reopens the column files written by the first
+    reopened = VideoDisasterManager(tmp_path)
+    for _ in range(60):
+        t = rng.choice([rng.choice(times), rng.uniform(times[0] - 5, times[-1] + 5)])
+        expected = scan_telemetry_at(path, t)
+        assert manager.get_telemetry_at(t) == expected, t
+        assert reopened.get_telemetry_at(t) == expected, t
+
+        start = rng.choice([rng.choice(times), rng.uniform(times[0] - 5, times[-1] + 5)])
+        end = start + rng.choice([0.0, 0.5, 5.0, 60.0, 1000.0])
+        expected = scan_telemetry_range(path, start, end)
+        assert manager.get_telemetry_range(start, end) == expected, (start, end)
+        assert reopened.get_telemetry_range(start, end) == expected, (start, end)
+
+
+def test_restart_clears_the_store(tmp_path):
+    manager = VideoDisasterManager(tmp_path)
+    manager.start()
+    manager.ingest(random_records(random.Random(9), 10))
+    assert manager.get_telemetry_at(1e9)
+
+    manager.start()
+    assert manager.get_telemetry_at(1e9) == []
+    assert manager.get_telemetry_range(-1e9, 1e9) == {}
+    manager.ingest([OvershootDisasterRecord(timestamp_ms=BASE_MS, person_count=3)])
+    (point,) = [p for p in manager.get_telemetry_at(0.0) if p.tag_id == "video_person_count"]
+    assert point.value == 3.0
+    assert point.timestamp == datetime(2026, 1, 1, tzinfo=timezone.utc)
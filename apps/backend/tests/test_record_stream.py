@@ -0,0 +1,163 @@
+"""
+Record Stream Tests - Streaming JSON arrays and the columnar record cache.
+
+Run with: python -m pytest tests/test_record_stream.py -v
+"""
+
+import json
+import os
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.record_stream import (
+    RecordColumns,
+    cache_dir_for,
+    iter_json_array,
+    iter_records,
+    open_record_cache,
+    write_columns,
+    write_record_cache,
+)
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_records(count: int, seed: int = 0) -> list[dict]:
+    """Records with mixed int/float values, missing fields and nested values"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {
+            "run_id": f"run_{i % 3}",
+            "tag_id": rng.choice(["FT-101", "PT-201", "TT-301", "LT-401"]),
+            "time_sec": i,
+            "score": rng.choice([1, 0.5, rng.random(), 2]),
+        }
+        if rng.random() < 0.5:
+            record["reason_codes"] = rng.sample(["RC1", "RC2", "RC3"], rng.randint(0, 2))
+        if rng.random() < 0.3:
+            record["meta"] = {"window": [rng.randint(0, 9), None], "note": f"n{i}"}
+        if rng.random() < 0.2:
+            record["description"] = f"free text {rng.random()}"
+        if rng.random() < 0.1:
+            record["flag"] = rng.random() < 0.5
+        if rng.random() < 0.2:
+            # Same fields, different order
+            record = dict(reversed(list(record.items())))
+        records.append(record)
+    return records
+
+
+def write_json(path: Path, records: list) -> Path:
+    path.write_text(json.dumps(records, indent=1))
+    return path
+
+
+def assert_same_records(actual: list[dict], expected: list[dict]) -> None:
+    assert actual == expected
+    for got, want in zip(actual, expected):
+        assert list(got) == list(want)
+        for key in want:
+            assert type(got[key]) is type(want[key]), key
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+def test_iter_json_array_across_small_chunks(tmp_path):
+    records = random_records(200)
+    path = write_json(tmp_path / "records.json", records)
+    assert list(iter_json_array(path, chunk_size=7)) == records
+
+
+def test_iter_json_array_filters_while_parsing(tmp_path):
+    records = random_records(200)
+    path = write_json(tmp_path / "records.json", records)
+    where = {"run_id": "run_1", "tag_id": "PT-201"}
+    expected = [r for r in records if r["run_id"] == "run_1" and r["tag_id"] == "PT-201"]
+    assert list(iter_json_array(path, where, chunk_size=13)) == expected
+
+
+# ============================================================================
+# Columnar cache
+# ============================================================================
+
+def test_cache_round_trip_matches_parse(tmp_path):
+    records = random_records(500)
+    path = write_json(tmp_path / "records.json", records)
+
+    first = list(iter_records(path, use_cache=True))
+    assert open_record_cache(path) is not None
+    cached = list(iter_records(path, use_cache=True))
+
+    assert_same_records(first, records)
+    assert_same_records(cached, records)
+
+
+def test_columns_keep_datetimes_and_key_order(tmp_path):
+    records = [
+        {"timestamp": datetime(2026, 1, 1, 12, 0, 0, 250000), "a": 1, "b": "x"},
+        {"b": "y", "timestamp": datetime(2026, 1, 1, 12, 0, 1), "a": 2.5},
+        {"a": None, "c": {"nested": [1, 2.0, "3"]}},
+    ]
+    layout = write_columns(tmp_path / "columns.bin", records)
+    columns = RecordColumns(tmp_path / "columns.bin", layout)
+    assert_same_records(list(columns.records()), records)
+
+
+def test_cached_selection_matches_filtered_parse(tmp_path):
+    records = random_records(400, seed=3)
+    path = write_json(tmp_path / "records.json", records)
+    write_record_cache(path)
+    columns = open_record_cache(path)
+
+    for where in (
+        {"run_id": "run_2"},
+        {"run_id": "run_0", "tag_id": "FT-101"},
+        {"time_sec": 17},
+        {"score": 0.5},
+        {"flag": True},
+        # Missing fields read as None
+        {"description": None},
+        {"tag_id": "no-such-tag"},
+    ):
+        expected = [r for r in records if all(r.get(k) == v for k, v in where.items())]
+        assert list(columns.records(columns.select(where))) == expected, where
+        assert list(iter_records(path, where, use_cache=True)) == expected, where
+
+
+def test_cache_is_rebuilt_when_source_changes(tmp_path):
+    path = write_json(tmp_path / "records.json", random_records(50))
+    list(iter_records(path, use_cache=True))
+    assert open_record_cache(path) is not None
+
+    # Same size, newer mtime
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert open_record_cache(path) is None
+
+    # New contents (different size)
+    records = random_records(60, seed=1)
+    write_json(path, records)
+    assert open_record_cache(path) is None
+    assert list(iter_records(path, use_cache=True)) == records
+    assert open_record_cache(path) is not None
+
+
+def test_cache_build_replaces_staging_directory(tmp_path):
+    path = write_json(tmp_path / "records.json", random_records(20))
+    staging = cache_dir_for(path).with_name(path.name + ".tmp")
+    staging.mkdir(parents=True)
+    (staging / "leftover").write_text("partial build")
+
+    write_record_cache(path)
+    assert not staging.exists()
+    assert open_record_cache(path) is not None
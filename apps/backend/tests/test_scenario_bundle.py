@@ -0,0 +1,101 @@
+"""
+Scenario Bundle Tests - Engines loaded from a bundle match engines that
+parse the CSV and JSON files.
+
+Run with: python -m pytest tests/test_scenario_bundle.py -v
+"""
+
+import os
+import shutil
+import sys
+from dataclasses import asdict
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.replay_engine import ReplayEngine
+from app.core.scenario_bundle import BUNDLE_DIR_NAME, build_bundle, open_bundle
+from app.core.temporal_reasoning import TemporalReasoningEngine
+from app.services.data_loader import DataLoader
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "data"
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A copy of the bundled sources (csv/ and generated/) without a bundle"""
+    target = tmp_path / "data"
+    for name in ("csv", "generated"):
+        shutil.copytree(DATA_DIR / name, target / name, ignore=shutil.ignore_patterns(".record_cache"))
+    return target
+
+
+def replay_snapshot(engine: ReplayEngine) -> list:
+    engine.load_all()
+    start, end = engine._incident_start, engine._incident_end
+    states = []
+    t = start
+    while t <= end:
+        states.append(engine.get_state_at(t).model_dump())
+        t += timedelta(seconds=5)
+    return [
+        states,
+        [m.model_dump() for m in engine.get_markers()],
+        [c.model_dump() for c in engine.get_clustered_markers(start, end, 5)],
+        [p.model_dump() for p in engine.get_confidence_band(start, end)],
+    ]
+
+
+def temporal_snapshot(engine: TemporalReasoningEngine) -> list:
+    engine.load_all()
+    return [
+        engine._events,
+        engine._claims,
+        engine._zone_states,
+        [asdict(u) for u in engine._trust_updates],
+        [asdict(a) for a in engine._audit_events],
+        [asdict(c) for c in engine._contradictions],
+        [asdict(r) for r in engine._receipts],
+    ]
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+def test_bundle_is_used_only_while_sources_match(data_dir):
+    assert open_bundle(data_dir) is None
+    build_bundle(data_dir)
+    assert open_bundle(data_dir) is not None
+
+    source = data_dir / "csv" / "events.csv"
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert open_bundle(data_dir) is None
+
+
+def test_replay_engine_matches_parsed_files(data_dir):
+    parsed = replay_snapshot(ReplayEngine(data_dir))
+    build_bundle(data_dir)
+    assert replay_snapshot(ReplayEngine(data_dir)) == parsed
+
+
+def test_temporal_reasoning_matches_parsed_files(data_dir):
+    parsed = temporal_snapshot(TemporalReasoningEngine(data_dir, use_record_cache=False))
+    build_bundle(data_dir)
+    assert temporal_snapshot(TemporalReasoningEngine(data_dir, use_record_cache=False)) == parsed
+
+
+def test_data_loader_matches_parsed_files(data_dir):
+    parsed = DataLoader(data_dir).load_fixed_scenario(use_cache=False).model_dump()
+    build_bundle(data_dir)
+    assert (data_dir / BUNDLE_DIR_NAME).is_dir()
+    assert DataLoader(data_dir).load_fixed_scenario(use_cache=False).model_dump() == parsed
@@ -0,0 +1,178 @@
+"""
+State Reconstructor Tests - As-of lookups over out-of-order recordings
+against a brute-force scan, and batch reconstruction.
+
+Run with: python -m pytest tests/test_state_machine.py -v
+"""
+
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api import replay as replay_api
+from app.core.replay import ReplayEngine, StateReconstructor
+from app.models.events import Contradiction, OperationalMode, ReasonCode, SystemState, TrustUpdate
+from app.models.telemetry import TelemetryPoint
+
+BASE = datetime(2026, 1, 1)
+TAGS = ["FT-101", "PT-201", "TT-301"]
+SPAN_SEC = 60
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def at(seconds: float) -> datetime:
+    return BASE + timedelta(seconds=seconds)
+
+
+def random_history(seed: int) -> tuple[StateReconstructor, dict]:
+    """A reconstructor fed in shuffled order, and the same records in recording order"""
+    rng = random.Random(seed)
+    records = []
+    for n in range(300):
+        # Whole seconds, so many records share a timestamp
+        records.append(("telemetry", TelemetryPoint(
+            tag_id=rng.choice(TAGS), timestamp=at(rng.randrange(SPAN_SEC)), value=float(n),
+        )))
+    for n in range(80):
+        new = rng.random()
+        records.append(("trust", TrustUpdate(
+            event_id=f"tu-{n}", tag_id=rng.choice(TAGS), timestamp=at(rng.randrange(SPAN_SEC)),
+            previous_score=0.5, new_score=new, delta=new - 0.5,
+            reason_codes=rng.sample(list(ReasonCode), rng.randint(0, 2)),
+        )))
+    for n in range(20):
+        records.append(("mode", (at(rng.randrange(SPAN_SEC)), rng.choice(list(OperationalMode)), f"trigger-{n}")))
+    for n in range(25):
+        start = rng.randrange(SPAN_SEC)
+        resolved = rng.random() < 0.6
+        records.append(("contradiction", Contradiction(
+            contradiction_id=f"c-{n}", timestamp=at(start), primary_tag_id=rng.choice(TAGS),
+            reason_code=rng.choice([ReasonCode.RC10, ReasonCode.RC11]), description="", values={},
+            expected_relationship="", resolved=resolved,
+            resolved_at=at(start + rng.randint(0, 20)) if resolved and rng.random() < 0.8 else None,
+        )))
+    rng.shuffle(records)
+
+    reconstructor = StateReconstructor()
+    recorded: dict = {"telemetry": [], "trust": [], "mode": [], "contradiction": []}
+    for kind, record in records:
+        if kind == "telemetry":
+            reconstructor.record_telemetry(record)
+        elif kind == "trust":
+            reconstructor.record_trust_update(record)
+        elif kind == "mode":
+            reconstructor.record_mode_transition(*record)
+        else:
+            reconstructor.record_contradiction(record)
+        recorded[kind].append(record)
+    return reconstructor, recorded
+
+
+def latest(records: list, t: datetime, when=lambda r: r.timestamp):
+    """Last record at or before t; among equal timestamps, the last recorded"""
+    best = None
+    for record in records:
+        if when(record) <= t and (best is None or when(record) >= when(best)):
+            best = record
+    return best
+
+
+def scan_state(recorded: dict, t: datetime) -> dict:
+    telemetry, trust_scores, reason_codes = {}, {}, {}
+    for tag_id in dict.fromkeys(p.tag_id for p in recorded["telemetry"]):
+        point = latest([p for p in recorded["telemetry"] if p.tag_id == tag_id], t)
+        telemetry[tag_id] = point.value if point else None
+    for tag_id in dict.fromkeys(u.tag_id for u in recorded["trust"]):
+        update = latest([u for u in recorded["trust"] if u.tag_id == tag_id], t)
+        if update:
+            trust_scores[tag_id] = update.new_score
+            reason_codes[tag_id] = [rc.value for rc in update.reason_codes]
+    transition = latest(recorded["mode"], t, when=lambda m: m[0])
+    mode = transition[1] if transition else OperationalMode.OBSERVE
+    unresolved = [
+        c.contradiction_id for c in recorded["contradiction"]
+        if c.timestamp <= t and (not c.resolved or (c.resolved_at and t < c.resolved_at))
+    ]
+    return SystemState(
+        timestamp=t,
+        telemetry=telemetry,
+        trust_scores=trust_scores,
+        active_reason_codes=reason_codes,
+        unresolved_contradictions=unresolved,
+        operational_mode=mode,
+        decision_clock_started=transition[0] if mode == OperationalMode.DECISION else None,
+    ).model_dump(mode="json")
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(4))
+def test_out_of_order_recording_matches_scan(seed):
+    reconstructor, recorded = random_history(seed)
+
+    for tag_id, points in reconstructor._telemetry_cache.items():
+        # Sorted by time, equal timestamps in recording order
+        in_order = sorted((p for p in recorded["telemetry"] if p.tag_id == tag_id), key=lambda p: p.timestamp)
+        assert points == in_order
+        assert reconstructor._telemetry_times[tag_id] == [p.timestamp for p in in_order]
+
+    for step in range(-2, 2 * SPAN_SEC + 4):
+        t = at(step / 2)
+        assert asyncio.run(reconstructor.reconstruct(t.isoformat())) == scan_state(recorded, t), t
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_reconstruct_many_matches_reconstruct(seed):
+    reconstructor, _ = random_history(seed)
+    rng = random.Random(seed)
+    # Repeats, exact record times and points outside the recorded span, unsorted
+    timestamps = [at(rng.choice([rng.randrange(-5, SPAN_SEC + 5), rng.uniform(-5, SPAN_SEC + 5)])).isoformat() for _ in range(150)]
+    timestamps += rng.choices(timestamps, k=20)
+    rng.shuffle(timestamps)
+
+    many = asyncio.run(reconstructor.reconstruct_many(timestamps))
+    assert many == [asyncio.run(reconstructor.reconstruct(ts)) for ts in timestamps]
+    assert asyncio.run(reconstructor.reconstruct_many([])) == []
+
+
+def test_equal_timestamps_resolve_to_the_last_recorded():
+    reconstructor = StateReconstructor()
+    for value in (1.0, 2.0, 3.0):
+        reconstructor.record_telemetry(TelemetryPoint(tag_id="FT-101", timestamp=at(10), value=value))
+    reconstructor.record_telemetry(TelemetryPoint(tag_id="FT-101", timestamp=at(5), value=0.0))
+    reconstructor.record_mode_transition(at(10), OperationalMode.DECISION, "alarm")
+    reconstructor.record_mode_transition(at(10), OperationalMode.OBSERVE, "cleared")
+
+    assert [p.value for p in reconstructor._telemetry_cache["FT-101"]] == [0.0, 1.0, 2.0, 3.0]
+    states = asyncio.run(reconstructor.reconstruct_many([at(9).isoformat(), at(10).isoformat()]))
+    assert [s["telemetry"]["FT-101"] for s in states] == [0.0, 3.0]
+    assert [s["operational_mode"] for s in states] == ["observe", "observe"]
+    assert states[1]["decision_clock_started"] is None
+
+
+def test_states_route_rejects_mixed_timezones(monkeypatch):
+    engine = ReplayEngine()
+    engine.state_reconstructor.record_telemetry(TelemetryPoint(tag_id="FT-101", timestamp=at(10), value=1.0))
+    monkeypatch.setattr(replay_api, "_replay_engine", engine)
+
+    request = replay_api.StatesAtTimesRequest(timestamps=[at(20).isoformat(), "2026-01-01T00:00:05Z"])
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(replay_api.get_states_at_times(request))
+    assert excinfo.value.status_code == 400
+
+    request = replay_api.StatesAtTimesRequest(timestamps=[at(20).isoformat(), at(5).isoformat()])
+    states = asyncio.run(replay_api.get_states_at_times(request))
+    assert [s.telemetry["FT-101"] for s in states] == [1.0, None]
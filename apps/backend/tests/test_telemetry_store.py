@@ -0,0 +1,387 @@
+"""
+Telemetry Store Tests - Local segment store against brute-force results,
+rollup range stitching and aggregation specs.
+
+Run with: python -m pytest tests/test_telemetry_store.py -v
+"""
+
+import asyncio
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.routes import telemetry as telemetry_api
+from app.db.repository import TELEMETRY_ROLLUP_LEVELS
+from app.services.telemetry_store import (
+    Aggregation,
+    LocalTelemetryStore,
+    TelemetryColumns,
+    TelemetryIngestPipeline,
+    TelemetryRange,
+    TelemetryRollupWorker,
+    cover_range,
+    parse_aggregation,
+)
+
+BASE = datetime(2026, 1, 1)
+SERIES = [
+    ("pump-1", "flow", "L/s"),
+    ("pump-1", "pressure", "kPa"),
+    ("pump-2", "flow", "L/s"),
+    ("pump-2", "flow", None),
+    ("tank-1", "level", "m"),
+]
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_points(rng: random.Random, count: int) -> list[SimpleNamespace]:
+    """Points over ~10 minutes with duplicate timestamps and a few tags"""
+    points = []
+    for _ in range(count):
+        source, metric, unit = rng.choice(SERIES)
+        points.append(SimpleNamespace(
+            source=source,
+            metric=metric,
+            unit=unit,
+            # Quarters keep sums exact, so averages compare equal
+            value=rng.randint(-400, 400) / 4,
+            timestamp=BASE + timedelta(microseconds=rng.randrange(0, 600_000_000, 250_000)),
+            tags={"quality": rng.choice(["good", "bad"])} if rng.random() < 0.1 else None,
+        ))
+    return points
+
+
+def columns(points) -> TelemetryColumns:
+    batch = TelemetryColumns()
+    batch.extend(points)
+    return batch
+
+
+def matching(points, query: TelemetryRange) -> list:
+    return [
+        p for p in points
+        if query.series_matches(p.source, p.metric)
+        and (query.start is None or p.timestamp >= query.start)
+        and (query.end is None or p.timestamp <= query.end)
+    ]
+
+
+def brute_raw(points, query: TelemetryRange) -> list[dict]:
+    selected = sorted(matching(points, query), key=lambda p: p.timestamp)[:query.limit]
+    return [
+        {"source": p.source, "metric": p.metric, "value": p.value, "timestamp": p.timestamp, "unit": p.unit, "tags": p.tags}
+        for p in selected
+    ]
+
+
+def brute_aggregate(points, query: TelemetryRange, aggregation: Aggregation) -> list[dict]:
+    buckets: dict[tuple, list[float]] = {}
+    for p in matching(points, query):
+        us = (p.timestamp - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+        bucket = datetime(1970, 1, 1) + timedelta(microseconds=us - us % aggregation.interval_us)
+        buckets.setdefault((bucket, p.source, p.metric, p.unit), []).append(p.value)
+    reduce = {"min": min, "max": max, "avg": lambda v: sum(v) / len(v)}[aggregation.function]
+    return [
+        {
+            "source": source,
+            "metric": metric,
+            "value": reduce(values),
+            "timestamp": bucket,
+            "unit": unit,
+            "tags": {"aggregation": aggregation.function, "count": len(values)},
+        }
+        for (bucket, source, metric, unit), values in buckets.items()
+    ]
+
+
+def bucket_order(point: dict) -> tuple:
+    return (point["timestamp"], point["source"], point["metric"], point["unit"] or "")
+
+
+def random_query(rng: random.Random) -> TelemetryRange:
+    start = BASE + timedelta(seconds=rng.randint(-30, 400)) if rng.random() < 0.7 else None
+    end = BASE + timedelta(seconds=rng.randint(200, 700)) if rng.random() < 0.7 else None
+    return TelemetryRange(
+        sources=rng.sample(["pump-1", "pump-2", "tank-1"], rng.randint(1, 2)) if rng.random() < 0.5 else None,
+        metrics=rng.sample(["flow", "pressure", "level"], rng.randint(1, 2)) if rng.random() < 0.5 else None,
+        start=start,
+        end=end,
+        limit=rng.choice([5, 100, 100000]),
+    )
+
+
+def assert_matches_brute_force(store: LocalTelemetryStore, points, rng: random.Random, queries: int = 30) -> None:
+    for _ in range(queries):
+        query = random_query(rng)
+        assert store.query_sync(query, None) == brute_raw(points, query), query
+
+        query.limit = 100000
+        for spec in ("min:1s", "max:30s", "avg:1m", "avg:750ms"):
+            aggregation = parse_aggregation(spec)
+            actual = store.query_sync(query, aggregation)
+            expected = brute_aggregate(points, query, aggregation)
+            assert sorted(actual, key=bucket_order) == sorted(expected, key=bucket_order), (query, spec)
+            # Buckets come out in time order
+            assert [p["timestamp"] for p in actual] == sorted(p["timestamp"] for p in actual)
+
+
+# ============================================================================
+# Local store
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(4))
+def test_local_store_matches_brute_force(tmp_path, seed):
+    rng = random.Random(seed)
+    store = LocalTelemetryStore(tmp_path, max_segment_points=400)
+    points = []
+    for _ in range(25):
+        batch = random_points(rng, rng.choice([1, 10, 60, 150]))
+        store.write_sync(columns(batch))
+        points.extend(batch)
+    # Merges keep the file count well below one per flush
+    assert store.segment_count < 25
+    assert_matches_brute_force(store, points, rng)
+
+    # Segments read back after a restart
+    reopened = LocalTelemetryStore(tmp_path, max_segment_points=400)
+    assert reopened.segment_count == store.segment_count
+    assert_matches_brute_force(reopened, points, rng, queries=5)
+
+
+def test_segments_stop_merging_at_the_size_cap(tmp_path):
+    rng = random.Random(7)
+    store = LocalTelemetryStore(tmp_path, max_segment_points=100)
+    for _ in range(20):
+        store.write_sync(columns(random_points(rng, 30)))
+    assert all(segment.count <= 100 for segment in store._segments)
+    assert sum(segment.count for segment in store._segments) == 600
+    assert store.get_metrics()["sealed_segments"] >= 5
+
+
+def test_interrupted_merge_is_finished_on_open(tmp_path):
+    rng = random.Random(11)
+    store = LocalTelemetryStore(tmp_path, max_segment_points=1000)
+    first = random_points(rng, 20)
+    store.write_sync(columns(first))
+    (older,) = store._segments
+    kept = tmp_path / "kept.npz"
+    shutil.copy(older.path, kept)
+
+    second = random_points(rng, 20)
+    store.write_sync(columns(second))
+    assert store.segment_count == 1
+
+    # The merge output is on disk but its input was never removed
+    shutil.copy(kept, older.path)
+    kept.unlink()
+    reopened = LocalTelemetryStore(tmp_path, max_segment_points=1000)
+    assert reopened.segment_count == 1
+    assert not older.path.exists()
+    query = TelemetryRange(limit=100000)
+    assert reopened.query_sync(query, None) == brute_raw(first + second, query)
+
+
+def test_pipeline_applies_backpressure_and_queries_see_every_point(tmp_path):
+    rng = random.Random(5)
+    points = random_points(rng, 300)
+
+    async def scenario():
+        pipeline = TelemetryIngestPipeline(
+            LocalTelemetryStore(tmp_path), batch_size=50, flush_interval_sec=10, max_buffered=100,
+        )
+        for start in range(0, len(points), 40):
+            await pipeline.ingest(points[start:start + 40])
+            assert pipeline.buffered <= pipeline.max_buffered
+        result = await pipeline.query(TelemetryRange(limit=100000))
+        metrics = pipeline.get_metrics()
+        await pipeline.close()
+        return result, metrics
+
+    result, metrics = asyncio.run(scenario())
+    assert result == brute_raw(points, TelemetryRange(limit=100000))
+    assert metrics["backpressure_waits"] > 0
+    assert metrics["written"] == metrics["accepted"] == 300
+
+
+# ============================================================================
+# Rollup worker
+# ============================================================================
+
+class FakeRollupRepository:
+    """In-memory raw points and rollups, with TTL expiry on demand"""
+
+    def __init__(self):
+        self.raw: list[dict] = []
+        self.rollups: dict[str, dict[tuple, dict]] = {level: {} for level, _ in TELEMETRY_ROLLUP_LEVELS}
+        self.state: dict[str, datetime] = {}
+
+    def add(self, timestamp: datetime, value: float) -> None:
+        self.raw.append({"tag_id": "pump-1/flow", "source": "pump-1", "metric": "flow", "unit": "L/s",
+                         "timestamp": timestamp, "value": value})
+
+    def expire_raw(self, before: datetime) -> None:
+        self.raw = [doc for doc in self.raw if doc["timestamp"] >= before]
+
+    async def async_rollup_watermarks(self):
+        return dict(self.state)
+
+    async def async_set_rollup_watermark(self, level, watermark):
+        self.state[level] = watermark
+
+    async def async_extent(self, level_index=None):
+        times = [doc["timestamp"] for doc in self.raw]
+        return (min(times), max(times)) if times else None
+
+    async def async_build_rollup(self, level_index, start, end):
+        level, resolution_ms = TELEMETRY_ROLLUP_LEVELS[level_index]
+        resolution = timedelta(milliseconds=resolution_ms)
+        if level_index == 0:
+            rows = [(doc["tag_id"], doc["timestamp"], 1, doc["value"], doc["value"], doc["value"]) for doc in self.raw]
+        else:
+            finer = self.rollups[TELEMETRY_ROLLUP_LEVELS[level_index - 1][0]].values()
+            rows = [(r["tag_id"], r["bucket"], r["count"], r["sum"], r["min"], r["max"]) for r in finer]
+        built: dict[tuple, dict] = {}
+        for tag_id, at, count, total, low, high in rows:
+            if not start <= at < end:
+                continue
+            bucket = BASE + (at - BASE) // resolution * resolution
+            stats = built.setdefault((tag_id, bucket), {"tag_id": tag_id, "bucket": bucket, "count": 0,
+                                                        "sum": 0.0, "min": low, "max": high})
+            stats["count"] += count
+            stats["sum"] += total
+            stats["min"], stats["max"] = min(stats["min"], low), max(stats["max"], high)
+        # Buckets are replaced whole, like $merge with whenMatched: "replace"
+        self.rollups[level].update(built)
+
+
+def rollup_scenario(repo: FakeRollupRepository, late: datetime, now: datetime, expire_before: datetime):
+    """Roll up two minutes of points, then write one late point and roll up again at `now`"""
+    worker = TelemetryRollupWorker(
+        repo, lag_sec=5, source_retention_sec={"1s": 7 * 86400, "1m": 30 * 86400, "1h": None},
+    )
+
+    async def scenario():
+        await worker.run_once(BASE + timedelta(days=6))
+        before = {level: dict(buckets) for level, buckets in repo.rollups.items()}
+        marks = dict(repo.state)
+
+        repo.expire_raw(expire_before)
+        repo.add(late, 100.0)
+        worker.mark_written((late - datetime(1970, 1, 1)) // timedelta(microseconds=1))
+        await worker.close()
+        watermarks = await worker.watermarks(now)
+        built = await worker.run_once(now)
+        return before, marks, watermarks, built
+
+    for second in range(120):
+        repo.add(BASE + timedelta(seconds=second), float(second))
+    return worker, *asyncio.run(scenario())
+
+
+def test_late_point_within_retention_is_rolled_up():
+    repo = FakeRollupRepository()
+    late = BASE + timedelta(seconds=30, milliseconds=500)
+    now = BASE + timedelta(days=6, hours=1)
+    worker, before, marks, _, built = rollup_scenario(repo, late, now, expire_before=BASE)
+
+    assert built > 0
+    assert repo.state == marks
+    second = repo.rollups["1s"][("pump-1/flow", BASE + timedelta(seconds=30))]
+    assert (second["count"], second["sum"], second["max"]) == (2, 130.0, 100.0)
+    minute = repo.rollups["1m"][("pump-1/flow", BASE)]
+    assert (minute["count"], minute["sum"]) == (61, sum(range(60)) + 100.0)
+    assert worker.get_metrics()["skipped_rewinds"] == 0
+
+
+def test_late_point_past_raw_retention_leaves_rollups_alone():
+    repo = FakeRollupRepository()
+    late = BASE + timedelta(seconds=30, milliseconds=500)
+    now = BASE + timedelta(days=8)
+    # TTL has removed every raw point the finished buckets were built from
+    worker, before, marks, watermarks, built = rollup_scenario(repo, late, now, expire_before=now - timedelta(days=7))
+
+    assert built == 0
+    assert repo.rollups == before
+    assert repo.state == marks
+    # Queries keep reading those buckets from the rollups
+    stored = {level: (mark - datetime(1970, 1, 1)) // timedelta(microseconds=1) for level, mark in marks.items()}
+    assert watermarks == stored
+    assert worker.get_metrics()["skipped_rewinds"] == 1
+
+
+# ============================================================================
+# Rollup stitching
+# ============================================================================
+
+def test_cover_range_reads_whole_buckets_from_rollups():
+    levels = [("1m", 60, 120), ("1s", 1, 150)]
+    assert cover_range(30, 200, levels) == [
+        ("1s", 30, 60),
+        ("1m", 60, 120),
+        ("1s", 120, 150),
+        (None, 150, 200),
+    ]
+    assert cover_range(None, None, [("1m", 60, 120)]) == [("1m", None, 120), (None, 120, None)]
+    # Nothing rolled up covers the range
+    assert cover_range(130, 140, [("1m", 60, 120)]) == [(None, 130, 140)]
+    assert cover_range(10, 50, []) == [(None, 10, 50)]
+
+
+def test_cover_range_partitions_random_ranges():
+    rng = random.Random(3)
+    for _ in range(2000):
+        hour_mark = rng.randrange(0, 5) * 3600
+        minute_mark = hour_mark + rng.randrange(0, 90) * 60
+        second_mark = minute_mark + rng.randrange(0, 200)
+        levels = [("1h", 3600, hour_mark), ("1m", 60, minute_mark), ("1s", 1, second_mark)]
+        levels = levels[rng.randrange(0, 3):]
+        start = rng.randrange(-100, 20000) if rng.random() < 0.8 else None
+        end = (start or 0) + rng.randrange(1, 20000) if rng.random() < 0.8 else None
+
+        parts = cover_range(start, end, levels)
+        assert parts[0][1] == start and parts[-1][2] == end
+        for (_, _, hi), (_, lo, _) in zip(parts, parts[1:]):
+            assert hi == lo
+        resolutions = {level: (resolution, watermark) for level, resolution, watermark in levels}
+        for level, lo, hi in parts:
+            assert lo is None or hi is None or lo < hi
+            if level is not None:
+                resolution, watermark = resolutions[level]
+                assert (lo is None or lo % resolution == 0) and hi % resolution == 0
+                assert hi <= watermark
+
+
+# ============================================================================
+# Aggregation specs
+# ============================================================================
+
+def test_parse_aggregation():
+    assert parse_aggregation(None) is None
+    assert parse_aggregation("") is None
+    assert parse_aggregation("avg:1m") == Aggregation("avg", 60_000_000)
+    assert parse_aggregation("max:500ms") == Aggregation("max", 500_000)
+    assert parse_aggregation(" MIN:2H ") == Aggregation("min", 7_200_000_000)
+    assert parse_aggregation("avg:250us") == Aggregation("avg", 250)
+    assert parse_aggregation("min:1d") == Aggregation("min", 86_400_000_000)
+    for spec in ("sum:1m", "avg", "avg:", "avg:0s", "avg:1w", "avg:-1m", "avg:1.5s", "avg 1m"):
+        with pytest.raises(ValueError):
+            parse_aggregation(spec)
+
+
+def test_query_route_rejects_invalid_aggregation():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(telemetry_api.query_telemetry(telemetry_api.TelemetryQuery(aggregation="median:1m")))
+    assert error.value.status_code == 400
+    assert "median:1m" in error.value.detail
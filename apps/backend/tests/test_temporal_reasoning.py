@@ -0,0 +1,309 @@
+"""
+Temporal Reasoning Tests - Index-backed analyses against straight scans of
+the loaded records.
+
+Run with: python -m pytest tests/test_temporal_reasoning.py -v
+"""
+
+import asyncio
+import random
+import sys
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.routes import temporal as temporal_routes
+from app.core.temporal_reasoning import (
+    CASCADE_WINDOW_SEC,
+    AuditEvent,
+    ContradictionRecord,
+    DecisionReceipt,
+    TemporalReasoningEngine,
+    TimeSlice,
+    TrustUpdate,
+)
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "data"
+BASE = datetime(2026, 1, 1)
+RUNS = ["run_a", "run_b", "run_c"]
+TAGS = ["FT-101", "PT-201", "TT-301", "LT-401"]
+CODES = ["RC1", "RC2", "RC3"]
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_engine(seed: int) -> TemporalReasoningEngine:
+    """An engine over shuffled records with many equal time_secs"""
+    rng = random.Random(seed)
+    engine = TemporalReasoningEngine(Path("/nonexistent"), use_record_cache=False)
+    for i in range(400):
+        previous = rng.random()
+        new = max(0.0, min(1.0, previous + rng.uniform(-0.4, 0.2)))
+        t = rng.randint(0, 60)
+        engine._trust_updates.append(TrustUpdate(
+            event_id=f"tu-{i}", run_id=rng.choice(RUNS), tag_id=rng.choice(TAGS),
+            timestamp=BASE + timedelta(seconds=t), time_sec=t,
+            previous_score=previous, new_score=new, delta=new - previous,
+            reason_codes=rng.sample(CODES, rng.randint(0, 2)),
+            trust_state=rng.choice(["trusted", "degraded", "quarantined"]),
+        ))
+    for i in range(150):
+        t = rng.randint(0, 60)
+        engine._contradictions.append(ContradictionRecord(
+            contradiction_id=f"c-{i}", run_id=rng.choice(RUNS), timestamp=BASE + timedelta(seconds=t),
+            time_sec=t, primary_tag_id=rng.choice(TAGS), secondary_tag_ids=rng.sample(TAGS, 2),
+            reason_code=rng.choice(CODES), description=f"contradiction {i}", values={},
+            expected_relationship="", resolved=False,
+        ))
+    for i in range(40):
+        t = rng.randint(0, 60)
+        engine._receipts.append(DecisionReceipt(
+            receipt_id=f"r-{rng.randint(0, 25)}", run_id=rng.choice(RUNS), timestamp=BASE + timedelta(seconds=t),
+            time_sec=t, operator_id="op", action_type="acknowledge", description="", rationale=f"why {i}",
+            uncertainty_snapshot={}, active_contradictions=[], evidence_refs=[], content_hash=f"h{i}",
+        ))
+    for i in range(30):
+        engine._audit_events.append(AuditEvent(
+            event_id=f"a-{i}", chain_id=f"chain-{i % 4}", run_id=rng.choice(RUNS), timestamp=BASE,
+            actor="system", action="log", payload={}, prev_hash="", current_hash="",
+        ))
+    engine._build_indexes()
+    engine._loaded = True
+    return engine
+
+
+def cascade_engine(seed: int) -> TemporalReasoningEngine:
+    """Contradictions in bursts and lulls, with ties and gaps right at the window"""
+    rng = random.Random(seed)
+    engine = TemporalReasoningEngine(Path("/nonexistent"), use_record_cache=False)
+    codes = CODES[:rng.choice([1, 2, 3])]
+    t = 0.0
+    for i in range(rng.randint(0, 120)):
+        t += rng.choice([0.0, 0.0, 0.5, 1.0, 1.5, 2.0, 2.0, 2.5, 3.0, 10.0, rng.uniform(0, 4)])
+        engine._contradictions.append(ContradictionRecord(
+            contradiction_id=f"c-{i}", run_id=rng.choice(RUNS[:2]), timestamp=BASE + timedelta(seconds=t),
+            # Shuffled a little so load order is not time order
+            time_sec=max(0.0, t - rng.choice([0.0, 0.0, 0.0, 1.0, 2.5])), primary_tag_id=rng.choice(TAGS),
+            secondary_tag_ids=[], reason_code=rng.choice(codes), description="", values={},
+            expected_relationship="", resolved=False,
+        ))
+    engine._build_indexes()
+    engine._loaded = True
+    return engine
+
+
+def scan_cascades(engine: TemporalReasoningEngine, run_id=None) -> tuple[dict, list]:
+    """Pairwise checks over every contradiction of the run"""
+    records = sorted(
+        (c for c in engine._contradictions if not run_id or c.run_id == run_id),
+        key=lambda c: c.time_sec,
+    )
+    cascading = {}
+    for c in records:
+        cascading[c.reason_code] = cascading.get(c.reason_code, False) or any(
+            o.reason_code != c.reason_code and 0 < o.time_sec - c.time_sec <= CASCADE_WINDOW_SEC
+            for o in records
+        )
+    lags: dict = {}
+    for i, c in enumerate(records):
+        earlier = [
+            o for o in records[:i]
+            if o.time_sec < c.time_sec and o.reason_code != c.reason_code
+        ]
+        if earlier and c.time_sec - earlier[-1].time_sec <= CASCADE_WINDOW_SEC:
+            lags.setdefault((earlier[-1].reason_code, c.reason_code), []).append(c.time_sec - earlier[-1].time_sec)
+    edges = [
+        {
+            "trigger_code": trigger,
+            "triggered_code": triggered,
+            "count": len(pair_lags),
+            "min_lag": min(pair_lags),
+            "max_lag": max(pair_lags),
+            "mean_lag": sum(pair_lags) / len(pair_lags),
+        }
+        for (trigger, triggered), pair_lags in lags.items()
+    ]
+    edges.sort(key=lambda e: e["count"], reverse=True)
+    return cascading, edges
+
+
+def shipped_engine() -> TemporalReasoningEngine:
+    engine = TemporalReasoningEngine(DATA_DIR, use_record_cache=False)
+    engine.load_all()
+    return engine
+
+
+def scan_trust_evolution(engine: TemporalReasoningEngine, tag_id: str, run_id=None) -> dict:
+    updates = [u for u in engine._trust_updates if u.tag_id == tag_id and (not run_id or u.run_id == run_id)]
+    if not updates:
+        return asdict(engine.analyze_trust_evolution("no-such-tag"))
+    updates.sort(key=lambda u: u.time_sec)
+    point = engine._evolution_point
+    quarantined = [u for u in updates if u.trust_state == "quarantined"]
+    duration = updates[-1].time_sec - updates[0].time_sec
+    total = updates[0].previous_score - updates[-1].new_score
+    return {
+        "tag_id": tag_id,
+        "start_score": updates[0].previous_score,
+        "end_score": updates[-1].new_score,
+        "total_degradation": total,
+        "degradation_rate": total / duration if duration > 0 else 0,
+        "time_to_quarantine": quarantined[0].time_sec - updates[0].time_sec if quarantined else None,
+        "significant_drops": [asdict(point(u)) for u in updates if u.delta < -0.2],
+        "evolution_curve": [asdict(point(u)) for u in updates[::5]],
+    }
+
+
+def scan_provenance(engine: TemporalReasoningEngine, receipt_id=None, time_sec=None) -> list:
+    """The flat-list implementation the indexes replaced: last N in file order"""
+    receipts = engine._receipts
+    if receipt_id:
+        receipts = [r for r in receipts if r.receipt_id == receipt_id]
+    if time_sec:
+        receipts = [r for r in receipts if r.time_sec <= time_sec]
+    provenance = []
+    for receipt in receipts:
+        contradictions = [
+            c for c in engine._contradictions
+            if c.time_sec <= receipt.time_sec and c.run_id == receipt.run_id
+        ]
+        degradations = [
+            u for u in engine._trust_updates
+            if u.time_sec <= receipt.time_sec and u.run_id == receipt.run_id and u.delta < 0
+        ]
+        provenance.append({
+            "receipt": {
+                "id": receipt.receipt_id,
+                "time_sec": receipt.time_sec,
+                "action": receipt.action_type,
+                "rationale": receipt.rationale,
+                "content_hash": receipt.content_hash,
+            },
+            "contradictions": [
+                {"id": c.contradiction_id, "time_sec": c.time_sec, "reason_code": c.reason_code, "description": c.description}
+                for c in contradictions[-3:]
+            ],
+            "trust_degradation": [
+                {"tag_id": u.tag_id, "time_sec": u.time_sec, "score": u.new_score, "delta": u.delta}
+                for u in degradations[-5:]
+            ],
+        })
+    return provenance
+
+
+def scan_summary(engine: TemporalReasoningEngine, run_id=None) -> dict:
+    def of_run(records):
+        return [r for r in records if not run_id or r.run_id == run_id]
+
+    updates, contradictions = of_run(engine._trust_updates), of_run(engine._contradictions)
+    audit = of_run(engine._audit_events)
+    return {
+        "total_trust_updates": len(updates),
+        "total_contradictions": len(contradictions),
+        "total_receipts": len(of_run(engine._receipts)),
+        "total_audit_events": len(audit),
+        "unique_sensors": len({u.tag_id for u in updates}),
+        "unique_reason_codes": len({c.reason_code for c in contradictions}),
+        "unique_chains": len({a.chain_id for a in audit}),
+        "csv_events": len(engine._events),
+        "csv_claims": len(engine._claims),
+        "csv_zone_states": len(engine._zone_states),
+    }
+
+
+# ============================================================================
+# Time slices
+# ============================================================================
+
+def test_last_in_load_order_matches_scan():
+    rng = random.Random(0)
+    records = [SimpleNamespace(time_sec=rng.randint(0, 30), n=n) for n in range(300)]
+    slice_ = TimeSlice(list(enumerate(records)))
+    for t in range(-1, 32):
+        upto = [r for r in records if r.time_sec <= t]
+        assert slice_.upto_in_load_order(t) == upto
+        for count in (0, 1, 3, 5, 400):
+            assert slice_.last_in_load_order(t, count) == (upto[-count:] if count else []), (t, count)
+
+
+# ============================================================================
+# Analyses
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_records_match_scans(seed):
+    engine = random_engine(seed)
+    for tag_id in TAGS + ["no-such-tag"]:
+        for run_id in [None] + RUNS:
+            assert asdict(engine.analyze_trust_evolution(tag_id, run_id)) == scan_trust_evolution(engine, tag_id, run_id)
+
+    assert engine.get_decision_provenance() == scan_provenance(engine)
+    for t in range(0, 62, 3):
+        assert engine.get_decision_provenance(time_sec=t) == scan_provenance(engine, time_sec=t), t
+    for receipt_id in {r.receipt_id for r in engine._receipts}:
+        assert engine.get_decision_provenance(receipt_id) == scan_provenance(engine, receipt_id)
+        assert engine.get_decision_provenance(receipt_id, 30) == scan_provenance(engine, receipt_id, 30)
+
+    for run_id in [None, "no-such-run"] + RUNS:
+        assert engine.get_summary(run_id) == scan_summary(engine, run_id)
+
+
+def test_shipped_data_matches_scans():
+    engine = shipped_engine()
+    runs = sorted({u.run_id for u in engine._trust_updates})
+    for tag_id in sorted({u.tag_id for u in engine._trust_updates}):
+        for run_id in [None] + runs:
+            assert asdict(engine.analyze_trust_evolution(tag_id, run_id)) == scan_trust_evolution(engine, tag_id, run_id)
+
+    assert engine.get_decision_provenance() == scan_provenance(engine)
+    for receipt in engine._receipts:
+        assert engine.get_decision_provenance(receipt.receipt_id) == scan_provenance(engine, receipt.receipt_id)
+    # Receipts at every time, against trust updates that are out of order in the file
+    for t in range(0, 201):
+        engine._receipts[0].time_sec = t
+        assert engine.get_decision_provenance(engine._receipts[0].receipt_id) == scan_provenance(
+            engine, engine._receipts[0].receipt_id
+        ), t
+
+
+# ============================================================================
+# Contradiction cascades
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(300))
+def test_cascades_match_pairwise_scan(seed):
+    engine = cascade_engine(seed)
+    for run_id in [None, "no-such-run"] + RUNS[:2]:
+        cascading, edges = scan_cascades(engine, run_id)
+        patterns = engine.analyze_contradiction_patterns(run_id)
+        assert {p.reason_code: p.cascading for p in patterns} == cascading, run_id
+        assert [asdict(e) for e in engine.analyze_contradiction_cascades(run_id)] == edges, run_id
+
+
+def test_cascade_routes_report_the_engine(monkeypatch):
+    engine = cascade_engine(6)
+    monkeypatch.setattr(temporal_routes, "temporal_reasoning_engine", engine)
+    for run_id in [None] + RUNS[:2]:
+        cascading, edges = scan_cascades(engine, run_id)
+        assert edges
+        assert asyncio.run(temporal_routes.analyze_contradiction_cascades(run_id)) == [
+            {
+                "trigger_code": e["trigger_code"],
+                "triggered_code": e["triggered_code"],
+                "count": e["count"],
+                "min_lag_sec": round(e["min_lag"], 2),
+                "max_lag_sec": round(e["max_lag"], 2),
+                "mean_lag_sec": round(e["mean_lag"], 2),
+            }
+            for e in edges
+        ]
+        patterns = asyncio.run(temporal_routes.analyze_contradiction_patterns(run_id))
+        assert {p["reason_code"]: p["cascading"] for p in patterns} == cascading
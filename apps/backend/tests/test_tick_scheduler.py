@@ -0,0 +1,133 @@
+"""
+Tick Scheduler Tests - Timer wheel expiry against a heap, catch-up batching
+and cancellation.
+
+Run with: python -m pytest tests/test_tick_scheduler.py -v
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.tick_scheduler import TickScheduler, TimerWheel
+
+
+# ============================================================================
+# Timer wheel
+# ============================================================================
+
+@pytest.mark.parametrize("slots,levels", [(4, 2), (8, 3), (16, 2)])
+def test_wheel_expires_like_a_heap(slots, levels):
+    rng = random.Random(slots * levels)
+    wheel = TimerWheel(slots, levels)
+    heap: list[tuple[int, int]] = []
+    # Twice the top level's span, so some deadlines wait in the overflow list
+    horizon = 2 * slots ** levels
+    item = 0
+    for _ in range(3000):
+        if rng.random() < 0.6:
+            # Past deadlines, near ones, and some beyond the top level
+            at = wheel.current + rng.choice([
+                rng.randint(-3, 1),
+                rng.randint(1, slots),
+                rng.randint(1, horizon),
+            ])
+            wheel.schedule(item, at)
+            heapq.heappush(heap, (max(at, wheel.current + 1), item))
+            item += 1
+        else:
+            to_tick = wheel.current + rng.choice([0, 1, rng.randint(1, slots), rng.randint(1, horizon // 2)])
+            expected = []
+            while heap and heap[0][0] <= to_tick:
+                expected.append(heapq.heappop(heap))
+            expired = wheel.advance(to_tick)
+            assert [at for at, _ in expired] == sorted(at for at, _ in expired)
+            assert sorted(expired) == expected
+            assert wheel.current == to_tick
+        assert len(wheel) == len(heap)
+
+    rest = wheel.advance(wheel.current + horizon * 2)
+    assert sorted(rest) == sorted(heap)
+    assert len(wheel) == 0
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+def test_missed_ticks_run_as_one_batch():
+    batches = []
+
+    async def handler(jobs):
+        batches.append(sorted(jobs))
+
+    async def scenario():
+        scheduler = TickScheduler(handler, tick_sec=0.01)
+        for n, delay in enumerate([0.01, 0.02, 0.03, 0.04]):
+            scheduler.schedule(f"job-{n}", delay)
+        # Block the loop past every deadline
+        time.sleep(0.08)
+        await asyncio.sleep(0.05)
+        return scheduler.get_metrics()
+
+    metrics = asyncio.run(scenario())
+    assert batches == [["job-0", "job-1", "job-2", "job-3"]]
+    assert metrics["last_batch_size"] == 4
+    assert metrics["max_lag_ms"] >= 50
+
+
+def test_cancelled_and_rescheduled_jobs_skip_stale_deadlines():
+    runs = []
+
+    async def handler(jobs):
+        loop = asyncio.get_running_loop()
+        runs.extend((job, loop.time()) for job in jobs)
+
+    async def scenario():
+        scheduler = TickScheduler(handler, tick_sec=0.01)
+        start = asyncio.get_running_loop().time()
+        scheduler.schedule("kept", 0.02)
+        scheduler.schedule("cancelled", 0.02)
+        scheduler.schedule("moved", 0.02)
+        scheduler.cancel("cancelled")
+        # The earlier wheel entry no longer matches the live deadline
+        scheduler.schedule("moved", 0.08)
+        assert not scheduler.is_scheduled("cancelled")
+        await asyncio.sleep(0.2)
+        return start, scheduler
+
+    start, scheduler = asyncio.run(scenario())
+    assert [job for job, _ in runs] == ["kept", "moved"]
+    assert runs[1][1] - start >= 0.08 - 0.005
+    assert not scheduler.is_scheduled("moved")
+    assert scheduler.get_metrics()["scheduled_jobs"] == 0
+
+
+def test_handler_errors_are_logged_and_the_loop_continues(caplog):
+    calls = []
+
+    async def handler(jobs):
+        calls.append(jobs)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    async def scenario():
+        scheduler = TickScheduler(handler, tick_sec=0.01)
+        scheduler.schedule("first", 0.01)
+        scheduler.schedule("second", 0.05)
+        await asyncio.sleep(0.15)
+
+    with caplog.at_level(logging.ERROR, logger="app.services.tick_scheduler"):
+        asyncio.run(scenario())
+    assert calls == [["first"], ["second"]]
+    (record,) = caplog.records
+    assert record.exc_info[0] is RuntimeError
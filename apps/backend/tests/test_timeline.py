@@ -0,0 +1,213 @@
+"""
+Timeline Indexer Tests - Chunked index and posting-list queries against the
+flat sorted list they replaced.
+
+Run with: python -m pytest tests/test_timeline.py -v
+"""
+
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.replay import timeline
+from app.core.replay.timeline import EventSeverity, TimelineEvent, TimelineEventType, TimelineIndexer
+
+BASE = datetime(2026, 1, 1)
+TAGS = ["FT-101", "PT-201", "TT-301", "LT-401", "VL-501"]
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+class FlatTimeline:
+    """The single sorted list the indexer used before, as a reference"""
+
+    def __init__(self):
+        self.events: list[TimelineEvent] = []
+
+    def index(self, event: TimelineEvent) -> None:
+        lo, hi = 0, len(self.events)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.events[mid].timestamp < event.timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.events.insert(lo, event)
+
+    def get_events(self, start=None, end=None, event_types=None, severity=None, tag_id=None, limit=100) -> list[dict]:
+        start_time = datetime.fromisoformat(start) if start else None
+        end_time = datetime.fromisoformat(end) if end else None
+        type_filter = {TimelineEventType(t) for t in event_types} if event_types else None
+        result = []
+        for event in self.events:
+            if start_time and event.timestamp < start_time:
+                continue
+            if end_time and event.timestamp >= end_time:
+                break
+            if type_filter and event.event_type not in type_filter:
+                continue
+            if severity and event.severity.value != severity:
+                continue
+            if tag_id and tag_id not in event.related_tags:
+                continue
+            result.append(event.to_dict())
+            if len(result) >= limit:
+                break
+        return result
+
+    def get_event_markers(self, start=None, end=None) -> list[dict]:
+        return [
+            {"timestamp": e["timestamp"], "event_type": e["event_type"], "severity": e["severity"]}
+            for e in self.get_events(start, end, limit=len(self.events) + 1)
+        ]
+
+    def get_event_by_id(self, event_id: str) -> dict | None:
+        for event in self.events:
+            if event.event_id == event_id:
+                return event.to_dict()
+        return None
+
+
+def random_event(rng: random.Random, n: int, span_sec: int) -> TimelineEvent:
+    return TimelineEvent(
+        # Some repeated ids, as when a saved timeline is loaded twice
+        event_id=f"evt_{rng.randrange(n + 1) if rng.random() < 0.05 else n}",
+        # Whole seconds over a short span, so many timestamps tie
+        timestamp=BASE + timedelta(seconds=rng.randrange(span_sec)),
+        event_type=rng.choice(list(TimelineEventType)),
+        severity=rng.choice(list(EventSeverity)),
+        summary=f"event {n}",
+        related_tags=rng.sample(TAGS, rng.choice([0, 1, 1, 2, 3])),
+    )
+
+
+def random_query(rng: random.Random, span_sec: int) -> dict:
+    def iso():
+        return (BASE + timedelta(seconds=rng.randrange(-5, span_sec + 5))).isoformat()
+
+    start, end = (iso() if rng.random() < 0.6 else None), (iso() if rng.random() < 0.5 else None)
+    types = list(TimelineEventType)
+    return {
+        "start": start,
+        "end": end,
+        # One type reads its posting list; several heap-merge theirs
+        "event_types": rng.choice([None, None, [rng.choice(types).value], [t.value for t in rng.sample(types, 3)]]),
+        "severity": rng.choice([None, None, "info", "warning", "critical"]),
+        "tag_id": rng.choice([None, None, rng.choice(TAGS), "no-such-tag"]),
+        "limit": rng.choice([1, 10, 100, 10 ** 6]),
+    }
+
+
+def get_events(indexer: TimelineIndexer, query: dict) -> list[dict]:
+    return asyncio.run(indexer.get_events(
+        query["start"], query["end"], query["event_types"], query["severity"], query["tag_id"], query["limit"],
+    ))
+
+
+def assert_chunks_consistent(events: "timeline._SortedEvents") -> None:
+    keys = [key for chunk in events._keys for key in chunk]
+    assert keys == sorted(keys)
+    assert len(keys) == len(events)
+    assert all(0 < len(chunk) <= 2 * timeline._CHUNK_SIZE for chunk in events._keys)
+    assert events._maxes == [chunk[-1] for chunk in events._keys]
+    assert [len(chunk) for chunk in events._keys] == [len(chunk) for chunk in events._events]
+
+
+def build(rng: random.Random, count: int, span_sec: int) -> tuple[TimelineIndexer, FlatTimeline]:
+    indexer, flat = TimelineIndexer(), FlatTimeline()
+    for n in range(count):
+        event = random_event(rng, n, span_sec)
+        indexer.index(event)
+        flat.index(event)
+    return indexer, flat
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+def test_chunks_split_past_twice_the_chunk_size():
+    rng = random.Random(0)
+    indexer, flat = build(rng, 5000, 600)
+
+    events = indexer._events
+    assert len(events._keys) > 4
+    assert_chunks_consistent(events)
+    assert list(events) == flat.events
+    assert events.first() is flat.events[0] and events.last() is flat.events[-1]
+
+    # Appends at the end split the last chunk too
+    tail = TimelineIndexer()
+    for n in range(2 * timeline._CHUNK_SIZE + 1):
+        tail.index(TimelineEvent(f"e{n}", BASE + timedelta(seconds=n), TimelineEventType.ALARM, EventSeverity.INFO, ""))
+    assert [len(chunk) for chunk in tail._events._keys] == [timeline._CHUNK_SIZE, timeline._CHUNK_SIZE + 1]
+
+
+def test_equal_timestamps_put_the_newest_event_first():
+    indexer = TimelineIndexer()
+    at = (BASE + timedelta(seconds=5)).isoformat()
+    for n in range(3):
+        indexer.index({"event_id": f"tie-{n}", "timestamp": at, "severity": "warning", "related_tags": ["FT-101"]})
+    indexer.index({"event_id": "before", "timestamp": BASE.isoformat(), "related_tags": ["FT-101"]})
+
+    expected = ["before", "tie-2", "tie-1", "tie-0"]
+    assert [e["event_id"] for e in asyncio.run(indexer.get_events())] == expected
+    assert [e["event_id"] for e in asyncio.run(indexer.get_events(tag_id="FT-101"))] == expected
+    assert [e["event_id"] for e in asyncio.run(indexer.get_events(start_iso=at, severity="warning"))] == expected[1:]
+
+
+@pytest.mark.parametrize("chunk_size", [2, 512])
+def test_queries_match_flat_list(monkeypatch, chunk_size):
+    # Tiny chunks split on almost every insert
+    monkeypatch.setattr(timeline, "_CHUNK_SIZE", chunk_size)
+    rng = random.Random(chunk_size)
+    indexer, flat = TimelineIndexer(), FlatTimeline()
+    span_sec = 300
+    for step in range(20):
+        for _ in range(rng.choice([1, 10, 200])):
+            event = random_event(rng, len(flat.events), span_sec)
+            indexer.index(event)
+            flat.index(event)
+
+        for _ in range(30):
+            query = random_query(rng, span_sec)
+            assert get_events(indexer, query) == flat.get_events(**query), (step, query)
+        start, end = random_query(rng, span_sec)["start"], random_query(rng, span_sec)["end"]
+        assert indexer.get_event_markers(start, end) == flat.get_event_markers(start, end)
+
+    assert_chunks_consistent(indexer._events)
+    for postings in [*indexer._by_type.values(), *indexer._by_severity.values(), *indexer._by_tag.values()]:
+        assert_chunks_consistent(postings)
+    for n in range(len(flat.events) + 1):
+        assert indexer.get_event_by_id(f"evt_{n}") == flat.get_event_by_id(f"evt_{n}")
+
+    stats = indexer.get_stats()
+    assert stats["total_events"] == len(flat.events)
+    assert stats["by_type"] == {
+        t.value: sum(e.event_type == t for e in flat.events) for t in {e.event_type for e in flat.events}
+    }
+    assert stats["by_severity"] == {
+        s.value: sum(e.severity == s for e in flat.events) for s in {e.severity for e in flat.events}
+    }
+
+
+def test_unknown_severity_matches_nothing():
+    rng = random.Random(3)
+    indexer, flat = build(rng, 300, 60)
+    for severity in ["fatal", "INFO"]:
+        query = {"start": None, "end": None, "event_types": None, "severity": severity, "tag_id": None, "limit": 100}
+        assert get_events(indexer, query) == flat.get_events(**query) == []
+        query["event_types"] = [t.value for t in TimelineEventType]
+        assert get_events(indexer, query) == []
+    # Unknown event types are rejected as before
+    with pytest.raises(ValueError):
+        asyncio.run(indexer.get_events(event_types=["no_such_type"]))
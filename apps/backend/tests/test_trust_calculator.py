@@ -0,0 +1,101 @@
+"""
+Trust Calculator Tests - Batch scoring against the scalar calculate_trust path.
+
+Run with: python -m pytest tests/test_trust_calculator.py -v
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.trust_calculator import EvidenceInput, TrustCalculator
+
+NOW = datetime(2026, 1, 1, 12, 0)
+SOURCES = [
+    "primary_sensor_array",
+    "Backup Telemetry",
+    "external-feed-alpha",
+    "external_feed_beta",
+    "legacy_system_link",
+    "remote_station_c",
+    "operator_manual",
+    "unknown_source",
+]
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def random_value(rng: random.Random) -> float:
+    roll = rng.random()
+    if roll < 0.05:
+        return 0.0
+    if roll < 0.15:
+        # Mirror images and exact threshold edges of the nominal value
+        return rng.choice([-100.0, 85.0, 115.0, -115.0, 100.0])
+    if roll < 0.25:
+        return round(rng.uniform(-300.0, 300.0), 2)
+    return round(rng.gauss(100.0, 8.0), 2)
+
+
+def random_evidence(rng: random.Random, count: int) -> list[EvidenceInput]:
+    return [
+        EvidenceInput(
+            id=f"ev_{i:04d}",
+            source=rng.choice(SOURCES),
+            value=random_value(rng),
+            # Some from the future, some old enough to hit the freshness floor
+            timestamp=NOW - timedelta(minutes=rng.uniform(-5, 300)),
+        )
+        for i in range(count)
+    ]
+
+
+def scalar_scores(calculator: TrustCalculator, evidence: list[EvidenceInput]) -> list:
+    return [calculator.calculate_trust(e, evidence, NOW) for e in evidence]
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(12))
+def test_score_batch_matches_scalar(seed):
+    rng = random.Random(seed)
+    calculator = TrustCalculator()
+    evidence = random_evidence(rng, rng.choice([1, 2, 3, 10, 40, 120]))
+    assert calculator.score_batch(evidence, NOW) == scalar_scores(calculator, evidence)
+
+
+def test_score_batch_edge_sets():
+    calculator = TrustCalculator()
+    rng = random.Random(99)
+    cases = [
+        [0.0, 0.0, 0.0],
+        [0.0, 5.0],
+        [100.0, -100.0],
+        [100.0, 115.0, 85.0, 100.0],
+        [-1e-9, 1e-9, 1e9, -1e9],
+        [1.0] * 30,
+    ]
+    for values in cases:
+        evidence = [
+            EvidenceInput(id=f"e{i}", source=rng.choice(SOURCES), value=v, timestamp=NOW)
+            for i, v in enumerate(values)
+        ]
+        assert calculator.score_batch(evidence, NOW) == scalar_scores(calculator, evidence), values
+    assert calculator.score_batch([], NOW) == []
+
+
+def test_score_batch_with_repeated_ids_falls_back_to_scalar():
+    calculator = TrustCalculator()
+    evidence = random_evidence(random.Random(5), 20)
+    evidence[7].id = evidence[3].id
+    assert calculator.score_batch(evidence, NOW) == scalar_scores(calculator, evidence)
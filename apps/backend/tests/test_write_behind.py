@@ -0,0 +1,121 @@
+"""
+Write-Behind Tests - Acknowledgement of audit appends and the pending cap.
+
+Run with: python -m pytest tests/test_write_behind.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db import write_behind
+from app.db.write_behind import WriteBehindBuffer
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+class FakeCollection:
+    """Async collection double that stores inserts, or fails while `down`"""
+
+    def __init__(self, db: "FakeDatabase"):
+        self.db = db
+        self.docs: list[dict] = []
+
+    def with_options(self, **kwargs):
+        return self
+
+    async def insert_many(self, docs, ordered=True):
+        if self.db.down:
+            raise ConnectionError("MongoDB unreachable")
+        self.docs.extend(docs)
+
+    async def bulk_write(self, ops, ordered=False):
+        if self.db.down:
+            raise ConnectionError("MongoDB unreachable")
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.down = False
+        self.collections: dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection(self))
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeDatabase()
+    connection = type("Connection", (), {"get_async_db": lambda self: db})()
+    monkeypatch.setattr(write_behind, "get_db", lambda: connection)
+    return db
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+def test_append_resolves_once_batch_is_stored(fake_db):
+    async def scenario():
+        buffer = WriteBehindBuffer(batch_size=10, flush_interval_sec=0.01)
+        acks = [buffer.append("audit_events", {"n": n}) for n in range(3)]
+        assert not any(ack.done() for ack in acks)
+        assert await asyncio.wait_for(asyncio.gather(*acks), 1) == [True] * 3
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    assert [doc["n"] for doc in fake_db["audit_events"].docs] == [0, 1, 2]
+    assert buffer.pending == 0
+
+
+def test_unacknowledged_append_waits_out_an_outage(fake_db):
+    async def scenario():
+        fake_db.down = True
+        buffer = WriteBehindBuffer(batch_size=10, flush_interval_sec=0.01, max_backoff_sec=0.02)
+        ack = buffer.append("audit_events", {"n": 1})
+        await asyncio.sleep(0.05)
+        assert not ack.done()
+        fake_db.down = False
+        assert await asyncio.wait_for(ack, 1)
+
+    asyncio.run(scenario())
+    assert len(fake_db["audit_events"].docs) == 1
+
+
+def test_full_queue_drops_new_writes(fake_db):
+    async def scenario():
+        fake_db.down = True
+        buffer = WriteBehindBuffer(batch_size=2, max_pending=2, flush_interval_sec=10)
+        buffer.append("audit_events", {"n": 1})
+        assert buffer.upsert("incidents", "incident_id", "INC-1", {"state": "open"})
+        # A write to an already queued document still merges
+        assert buffer.upsert("incidents", "incident_id", "INC-1", {"state": "triaged"})
+        assert not buffer.upsert("incidents", "incident_id", "INC-2", {"state": "open"})
+        assert await buffer.append("audit_events", {"n": 2}) is False
+        metrics = buffer.get_metrics()
+        await buffer.close()
+        return metrics
+
+    metrics = asyncio.run(scenario())
+    assert metrics["queue_depth"] == 2
+    assert metrics["dropped"] == 2
+
+
+def test_wait_for_room_applies_backpressure(fake_db):
+    async def scenario():
+        buffer = WriteBehindBuffer(batch_size=2, max_pending=2, flush_interval_sec=10)
+        buffer.append("audit_events", {"n": 1})
+        buffer.append("audit_events", {"n": 2})
+        await buffer.wait_for_room()
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    assert buffer.pending < buffer.max_pending
+    assert buffer.get_metrics()["backpressure_waits"] == 1